@@ -0,0 +1,85 @@
+"""
+异步视图的执行器（ASGI 部署时事件循环只做调度，不做阻塞工作）：
+- run_cpu：CPU 密集的建议计算放入有界线程池（ASYNC_CPU_WORKERS，默认 min(4, CPU 数)）；
+  提交的函数不得访问 ORM
+- run_db：ORM 读写经 asgiref sync_to_async(thread_sensitive=True)，与 Django 同步视图共用
+  同一线程与数据库连接（事务、SQLite 写锁语义不变）
+- run_store：手牌存储读写；memory 后端是进程内 dict，直接调用，db/shm 后端走 run_db
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from asgiref.sync import sync_to_async
+
+from .hand_store import HandStore, MemoryHandStore
+
+T = TypeVar("T")
+
+_EXECUTOR: ThreadPoolExecutor | None = None
+_LOCK = threading.Lock()
+
+
+def cpu_workers() -> int:
+    try:
+        n = int(os.environ.get("ASYNC_CPU_WORKERS", "") or 0)
+    except ValueError:
+        n = 0
+    return n if n > 0 else min(4, os.cpu_count() or 1)
+
+
+def cpu_executor() -> ThreadPoolExecutor:
+    """进程内共享的有界线程池（首次使用时创建）。"""
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(
+                    max_workers=cpu_workers(), thread_name_prefix="suggest"
+                )
+    return _EXECUTOR
+
+
+def shutdown_cpu_executor(wait: bool = True) -> None:
+    global _EXECUTOR
+    with _LOCK:
+        ex, _EXECUTOR = _EXECUTOR, None
+    if ex is not None:
+        ex.shutdown(wait=wait)
+
+
+async def run_cpu(fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """在计算线程池中执行 fn（携带当前 contextvars，日志/指标上下文不丢）。"""
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, fn, *args, **kwargs)
+    return await loop.run_in_executor(cpu_executor(), call)
+
+
+async def run_db(fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    return await sync_to_async(fn, thread_sensitive=True)(*args, **kwargs)
+
+
+async def run_store(store: HandStore, method: str, /, *args: Any) -> Any:
+    fn = getattr(store, method)
+    if isinstance(store, MemoryHandStore):
+        return fn(*args)
+    return await run_db(fn, *args)
+
+
+__all__ = [
+    "cpu_executor",
+    "cpu_workers",
+    "run_cpu",
+    "run_db",
+    "run_store",
+    "shutdown_cpu_executor",
+]
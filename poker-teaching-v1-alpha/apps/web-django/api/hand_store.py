@@ -0,0 +1,572 @@
+"""
+进行中手牌的存储（替代进程内全局 HANDS 字典）。
+
+条目形如 {"gs": GameState, "session_id": str, "seed": int | None, "cfg": dict}。
+三种后端，经环境变量 HAND_STORE 选择：
+- memory（默认）：进程内 TTL + LRU，单 worker / 测试
+- db：Django ORM（SQLite/Postgres）表 HandState，多 worker / 多机共享
+- shm：/dev/shm 下的 SQLite 文件（WAL），同机多 worker 进程共享，无需外部服务
+外部后端以 poker_core.state_codec 打包 GameState（状态字段 + 剩余牌序 + 事件流，取出时不重放动作），
+其余字段存 JSON；旧版按 replay_codec 存的行仍可读。SCHEMA_VERSION 不一致的行视为已过期。
+
+注意：外部后端 get() 返回的是新构造的条目，修改后须调用 put()/update_gs() 写回。
+
+会话索引：每个后端维护 session_id → [hand_id]（创建顺序）与“当前手”指针
+（hand_start / session_next 时 set_current），“会话最新一手”查询与进程内手牌总数无关。
+
+相关环境变量：
+- HAND_STORE=memory|db|shm
+- HAND_STORE_TTL_SECONDS（默认 21600）：超过该时长未写入的手牌视为过期
+- HAND_STORE_MAX_ENTRIES（默认 10000）：memory/shm 的条目上限（LRU 淘汰）
+- HAND_STORE_PATH：shm 后端的 SQLite 文件路径
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from datetime import timedelta
+from typing import Any
+
+from poker_core.replay_codec import ReplayCodecError, decode_hand
+from poker_core.state_codec import (
+    StateCodecError,
+    decode_state,
+    encode_state,
+    is_state_blob,
+)
+
+log = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 6 * 3600
+DEFAULT_MAX_ENTRIES = 10_000
+# 每写入多少次清理一次过期条目
+_PURGE_EVERY = 256
+
+
+class HandStore(ABC):
+    """按 hand_id 存取条目；items() / session_hands() 按创建顺序（旧 → 新）。"""
+
+    @abstractmethod
+    def get(self, hand_id: str, default: Any = None) -> dict | None: ...
+
+    @abstractmethod
+    def put(self, hand_id: str, entry: dict) -> None: ...
+
+    @abstractmethod
+    def delete(self, hand_id: str) -> None: ...
+
+    @abstractmethod
+    def items(self) -> Iterator[tuple[str, dict]]: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+    @abstractmethod
+    def session_hands(self, session_id: str) -> list[str]:
+        """该会话仍在存储中的手牌（创建顺序）。"""
+
+    @abstractmethod
+    def set_current(self, session_id: str, hand_id: str) -> None: ...
+
+    @abstractmethod
+    def _current_pointer(self, session_id: str) -> str | None: ...
+
+    def current_hand(self, session_id: str) -> str | None:
+        """当前手：指针指向的手牌仍在存储中则取之，否则取会话最新一手。"""
+        hid = self._current_pointer(session_id)
+        if hid is not None and self.get(hid) is not None:
+            return hid
+        hands = self.session_hands(session_id)
+        return hands[-1] if hands else None
+
+    def latest_for_session(
+        self, session_id: str, *, complete: bool = False
+    ) -> tuple[str | None, dict | None]:
+        """会话的当前手；complete=True 时要求手牌已结束，当前手未结束则向前找最近一手已结束的。"""
+        hid = self.current_hand(session_id)
+        entry = self.get(hid) if hid is not None else None
+        if not complete or entry is None or _is_complete(entry):
+            return hid, entry
+        for older in reversed(self.session_hands(session_id)):
+            if older == hid:
+                continue
+            e = self.get(older)
+            if e is not None and _is_complete(e):
+                return older, e
+        return None, None
+
+    def update_gs(self, hand_id: str, gs: Any) -> None:
+        """只替换状态；条目不存在时忽略（已过期）。"""
+        entry = self.get(hand_id)
+        if entry is None:
+            return
+        self.put(hand_id, {**entry, "gs": gs})
+
+    # dict 风格的便捷接口
+    def pop(self, hand_id: str, default: Any = None) -> dict | None:
+        entry = self.get(hand_id)
+        if entry is None:
+            return default
+        self.delete(hand_id)
+        return entry
+
+    def __contains__(self, hand_id: object) -> bool:
+        return isinstance(hand_id, str) and self.get(hand_id) is not None
+
+    def __getitem__(self, hand_id: str) -> dict:
+        entry = self.get(hand_id)
+        if entry is None:
+            raise KeyError(hand_id)
+        return entry
+
+    def __setitem__(self, hand_id: str, entry: dict) -> None:
+        self.put(hand_id, entry)
+
+
+def _is_complete(entry: dict) -> bool:
+    return getattr(entry.get("gs"), "street", None) == "complete"
+
+
+# ---------- 序列化（外部后端共用） ----------
+
+
+def dump_entry(entry: dict) -> tuple[bytes, str]:
+    """条目 → (GameState 二进制快照, 其余字段 JSON)。"""
+    meta = {k: v for k, v in entry.items() if k != "gs"}
+    return encode_state(entry["gs"]), json.dumps(meta, separators=(",", ":"))
+
+
+def load_entry(hand_id: str, blob: bytes, meta: str | dict) -> dict | None:
+    """解码失败（SCHEMA_VERSION 变更 / 损坏）返回 None，由调用方按不存在处理。"""
+    out = dict(json.loads(meta) if isinstance(meta, str | bytes) else meta or {})
+    blob = bytes(blob)
+    try:
+        out["gs"] = decode_state(blob) if is_state_blob(blob) else decode_hand(blob, hand_id).gs
+    except (StateCodecError, ReplayCodecError) as e:
+        log.warning("hand store: cannot decode %s: %s", hand_id, e)
+        return None
+    return out
+
+
+# ---------- memory ----------
+
+
+class MemoryHandStore(HandStore):
+    """进程内 TTL + LRU：get 刷新 LRU 顺序；TTL 自最后一次写入起算，过期条目在写入时按批清理。"""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self._clock = clock
+        # hand_id → (创建序号, 写入时间, 条目)；OrderedDict 顺序即 LRU 顺序
+        self._data: OrderedDict[str, tuple[int, float, dict]] = OrderedDict()
+        self._seq = 0
+        self._writes = 0
+        # 会话索引：session_id → [hand_id]（创建顺序）；当前手指针
+        self._sessions: dict[str, list[str]] = {}
+        self._current: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _unlink(self, hand_id: str, entry: dict) -> None:
+        sid = entry.get("session_id")
+        hands = self._sessions.get(sid)
+        if hands is not None:
+            try:
+                hands.remove(hand_id)
+            except ValueError:
+                pass
+            if not hands:
+                del self._sessions[sid]
+        if self._current.get(sid) == hand_id:
+            del self._current[sid]
+
+    def _expired(self, written: float) -> bool:
+        return self.ttl_seconds > 0 and self._clock() - written > self.ttl_seconds
+
+    def get(self, hand_id: str, default: Any = None) -> dict | None:
+        with self._lock:
+            slot = self._data.get(hand_id)
+            if slot is None:
+                return default
+            if self._expired(slot[1]):
+                del self._data[hand_id]
+                self._unlink(hand_id, slot[2])
+                return default
+            self._data.move_to_end(hand_id)
+            return slot[2]
+
+    def put(self, hand_id: str, entry: dict) -> None:
+        with self._lock:
+            slot = self._data.get(hand_id)
+            if slot is None:
+                self._seq += 1
+                seq = self._seq
+                sid = entry.get("session_id")
+                if sid is not None:
+                    self._sessions.setdefault(sid, []).append(hand_id)
+            else:
+                seq = slot[0]
+            self._data[hand_id] = (seq, self._clock(), entry)
+            self._data.move_to_end(hand_id)
+            while len(self._data) > self.max_entries:
+                old_hid, old_slot = self._data.popitem(last=False)
+                self._unlink(old_hid, old_slot[2])
+            self._writes += 1
+            if self._writes % _PURGE_EVERY == 0:
+                self._purge_locked()
+
+    def purge(self) -> int:
+        with self._lock:
+            return self._purge_locked()
+
+    def _purge_locked(self) -> int:
+        if self.ttl_seconds <= 0:
+            return 0
+        stale = [hid for hid, slot in self._data.items() if self._expired(slot[1])]
+        for hid in stale:
+            self._unlink(hid, self._data.pop(hid)[2])
+        return len(stale)
+
+    def delete(self, hand_id: str) -> None:
+        with self._lock:
+            slot = self._data.pop(hand_id, None)
+            if slot is not None:
+                self._unlink(hand_id, slot[2])
+
+    def items(self) -> Iterator[tuple[str, dict]]:
+        with self._lock:
+            live = [(s[0], hid, s[2]) for hid, s in self._data.items() if not self._expired(s[1])]
+        live.sort(key=lambda t: t[0])
+        return iter([(hid, entry) for _, hid, entry in live])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._sessions.clear()
+            self._current.clear()
+
+    def session_hands(self, session_id: str) -> list[str]:
+        with self._lock:
+            hands = self._sessions.get(session_id) or []
+            return [h for h in hands if not self._expired(self._data[h][1])]
+
+    def set_current(self, session_id: str, hand_id: str) -> None:
+        with self._lock:
+            self._current[session_id] = hand_id
+
+    def _current_pointer(self, session_id: str) -> str | None:
+        return self._current.get(session_id)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# ---------- db（Django ORM） ----------
+
+
+class DbHandStore(HandStore):
+    """HandState 表；多 worker / 多机共享。过期行在写入时按批清理。"""
+
+    def __init__(self, *, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.ttl_seconds = float(ttl_seconds)
+        self._writes = 0
+
+    @staticmethod
+    def _model():
+        from .models import HandState
+
+        return HandState
+
+    def _live(self):
+        qs = self._model().objects.all()
+        if self.ttl_seconds > 0:
+            from django.utils import timezone
+
+            qs = qs.filter(updated_at__gte=timezone.now() - timedelta(seconds=self.ttl_seconds))
+        return qs
+
+    def get(self, hand_id: str, default: Any = None) -> dict | None:
+        row = self._live().filter(hand_id=hand_id).values_list("state", "meta").first()
+        entry = load_entry(hand_id, row[0], row[1]) if row is not None else None
+        return default if entry is None else entry
+
+    def put(self, hand_id: str, entry: dict) -> None:
+        blob, meta = dump_entry(entry)
+        self._model().objects.update_or_create(
+            hand_id=hand_id,
+            defaults={
+                "session_id": entry.get("session_id") or "",
+                "state": blob,
+                "meta": json.loads(meta),
+            },
+        )
+        self._writes += 1
+        if self._writes % _PURGE_EVERY == 0:
+            self.purge()
+
+    def purge(self) -> int:
+        if self.ttl_seconds <= 0:
+            return 0
+        from django.utils import timezone
+
+        cutoff = timezone.now() - timedelta(seconds=self.ttl_seconds)
+        n, _ = self._model().objects.filter(updated_at__lt=cutoff).delete()
+        live = self._model().objects.values("hand_id")
+        self._pointer_model().objects.exclude(hand_id__in=live).delete()
+        return n
+
+    def delete(self, hand_id: str) -> None:
+        self._model().objects.filter(hand_id=hand_id).delete()
+
+    def items(self) -> Iterator[tuple[str, dict]]:
+        rows = self._live().order_by("pk").values_list("hand_id", "state", "meta")
+        for hid, blob, meta in rows.iterator():
+            entry = load_entry(hid, blob, meta)
+            if entry is not None:
+                yield hid, entry
+
+    def clear(self) -> None:
+        self._model().objects.all().delete()
+        self._pointer_model().objects.all().delete()
+
+    @staticmethod
+    def _pointer_model():
+        from .models import CurrentHand
+
+        return CurrentHand
+
+    def session_hands(self, session_id: str) -> list[str]:
+        qs = self._live().filter(session_id=session_id).order_by("pk")
+        return list(qs.values_list("hand_id", flat=True))
+
+    def set_current(self, session_id: str, hand_id: str) -> None:
+        self._pointer_model().objects.update_or_create(
+            session_id=session_id, defaults={"hand_id": hand_id}
+        )
+
+    def _current_pointer(self, session_id: str) -> str | None:
+        return (
+            self._pointer_model()
+            .objects.filter(session_id=session_id)
+            .values_list("hand_id", flat=True)
+            .first()
+        )
+
+
+# ---------- shm（共享内存上的 SQLite） ----------
+
+
+def default_shm_path() -> str:
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "poker_hands.sqlite3")
+
+
+class SharedMemoryHandStore(HandStore):
+    """同机多进程共享：SQLite（WAL）文件放在 tmpfs 上，读写不落盘。
+
+    每个线程一条连接；seq 为创建序号（更新时保留）。
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS hands ("
+        " hand_id TEXT PRIMARY KEY, seq INTEGER NOT NULL, session_id TEXT,"
+        " written REAL NOT NULL, meta TEXT NOT NULL, state BLOB NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS hands_written ON hands(written)",
+        "CREATE INDEX IF NOT EXISTS hands_seq ON hands(seq)",
+        "CREATE INDEX IF NOT EXISTS hands_session ON hands(session_id, seq)",
+        "CREATE TABLE IF NOT EXISTS session_current ("
+        " session_id TEXT PRIMARY KEY, hand_id TEXT NOT NULL)",
+    )
+
+    def __init__(
+        self,
+        path: str | None = None,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ):
+        self.path = path or default_shm_path()
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self._local = threading.local()
+        self._writes = 0
+        with self._conn() as conn:
+            for stmt in self._SCHEMA:
+                conn.execute(stmt)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            self._local.conn = conn
+        return conn
+
+    def _cutoff(self) -> float:
+        return time.time() - self.ttl_seconds if self.ttl_seconds > 0 else float("-inf")
+
+    def get(self, hand_id: str, default: Any = None) -> dict | None:
+        row = (
+            self._conn()
+            .execute(
+                "SELECT state, meta FROM hands WHERE hand_id = ? AND written >= ?",
+                (hand_id, self._cutoff()),
+            )
+            .fetchone()
+        )
+        entry = load_entry(hand_id, row[0], row[1]) if row is not None else None
+        return default if entry is None else entry
+
+    def put(self, hand_id: str, entry: dict) -> None:
+        blob, meta = dump_entry(entry)
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT INTO hands (hand_id, seq, session_id, written, meta, state)"
+                " VALUES (?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM hands), ?, ?, ?, ?)"
+                " ON CONFLICT(hand_id) DO UPDATE SET"
+                " written = excluded.written, meta = excluded.meta, state = excluded.state",
+                (hand_id, entry.get("session_id"), time.time(), meta, blob),
+            )
+        self._writes += 1
+        if self._writes % _PURGE_EVERY == 0:
+            self.purge()
+
+    def purge(self) -> int:
+        with self._conn() as conn:
+            n = conn.execute("DELETE FROM hands WHERE written < ?", (self._cutoff(),)).rowcount
+            over = conn.execute("SELECT COUNT(*) FROM hands").fetchone()[0] - self.max_entries
+            if over > 0:
+                n += conn.execute(
+                    "DELETE FROM hands WHERE hand_id IN"
+                    " (SELECT hand_id FROM hands ORDER BY written LIMIT ?)",
+                    (over,),
+                ).rowcount
+            conn.execute(
+                "DELETE FROM session_current WHERE hand_id NOT IN (SELECT hand_id FROM hands)"
+            )
+        return n
+
+    def delete(self, hand_id: str) -> None:
+        with self._conn() as conn:
+            conn.execute("DELETE FROM hands WHERE hand_id = ?", (hand_id,))
+
+    def items(self) -> Iterator[tuple[str, dict]]:
+        rows = (
+            self._conn()
+            .execute(
+                "SELECT hand_id, state, meta FROM hands WHERE written >= ? ORDER BY seq",
+                (self._cutoff(),),
+            )
+            .fetchall()
+        )
+        for hid, blob, meta in rows:
+            entry = load_entry(hid, blob, meta)
+            if entry is not None:
+                yield hid, entry
+
+    def clear(self) -> None:
+        with self._conn() as conn:
+            conn.execute("DELETE FROM hands")
+            conn.execute("DELETE FROM session_current")
+
+    def session_hands(self, session_id: str) -> list[str]:
+        rows = (
+            self._conn()
+            .execute(
+                "SELECT hand_id FROM hands WHERE session_id = ? AND written >= ? ORDER BY seq",
+                (session_id, self._cutoff()),
+            )
+            .fetchall()
+        )
+        return [r[0] for r in rows]
+
+    def set_current(self, session_id: str, hand_id: str) -> None:
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT INTO session_current (session_id, hand_id) VALUES (?, ?)"
+                " ON CONFLICT(session_id) DO UPDATE SET hand_id = excluded.hand_id",
+                (session_id, hand_id),
+            )
+
+    def _current_pointer(self, session_id: str) -> str | None:
+        row = (
+            self._conn()
+            .execute("SELECT hand_id FROM session_current WHERE session_id = ?", (session_id,))
+            .fetchone()
+        )
+        return row[0] if row else None
+
+
+# ---------- 选择后端 ----------
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+def build_hand_store(kind: str | None = None) -> HandStore:
+    kind = (kind or os.getenv("HAND_STORE") or "memory").strip().lower()
+    ttl = _env_float("HAND_STORE_TTL_SECONDS", DEFAULT_TTL_SECONDS)
+    max_entries = int(_env_float("HAND_STORE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+    if kind == "db":
+        return DbHandStore(ttl_seconds=ttl)
+    if kind == "shm":
+        return SharedMemoryHandStore(
+            os.getenv("HAND_STORE_PATH") or None, max_entries=max_entries, ttl_seconds=ttl
+        )
+    if kind != "memory":
+        raise ValueError(f"unknown HAND_STORE backend: {kind}")
+    return MemoryHandStore(max_entries=max_entries, ttl_seconds=ttl)
+
+
+_STORE: HandStore | None = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_hand_store() -> HandStore:
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                _STORE = build_hand_store()
+    return _STORE
+
+
+def set_hand_store(store: HandStore | None) -> HandStore | None:
+    """替换全局 store（测试 / 启动时显式配置）；返回旧值。None 表示下次按环境变量重建。"""
+    global _STORE
+    with _STORE_LOCK:
+        prev, _STORE = _STORE, store
+    return prev
+
+
+__all__ = [
+    "HandStore",
+    "MemoryHandStore",
+    "DbHandStore",
+    "SharedMemoryHandStore",
+    "build_hand_store",
+    "dump_entry",
+    "get_hand_store",
+    "load_entry",
+    "set_hand_store",
+]
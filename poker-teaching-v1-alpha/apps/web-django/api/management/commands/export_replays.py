@@ -0,0 +1,72 @@
+"""
+流式导出回放：python manage.py export_replays [--out FILE] [--format jsonl|blob]
+
+- jsonl：每行一手完整回放 JSON（blob 行按需重新模拟解码）
+- blob：原样导出紧凑编码，记录格式为 varint(len(hand_id)) hand_id varint(len(blob)) blob；
+  只存 JSON 的旧数据行跳过并计数
+按主键分块迭代（QuerySet.iterator），内存占用与回放总量无关。
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+
+from django.core.management.base import BaseCommand
+from poker_core.replay_codec import write_varint
+
+from ...replays import iter_replay_rows, replay_payload
+
+
+class Command(BaseCommand):
+    help = "Stream replays to a file or stdout (jsonl or compact blob records)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--out", default="-", help="output path; '-' for stdout")
+        parser.add_argument("--format", choices=("jsonl", "blob"), default="jsonl")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument("--limit", type=int, default=None)
+
+    def handle(self, *args, **opts):
+        fmt = opts["format"]
+        out_path = opts["out"]
+        binary = fmt == "blob"
+        if out_path == "-":
+            fh = sys.stdout.buffer if binary else sys.stdout
+            close = False
+        else:
+            fh = open(out_path, "wb" if binary else "w", encoding=None if binary else "utf-8")
+            close = True
+
+        written = skipped = failed = 0
+        try:
+            for obj in iter_replay_rows(chunk_size=max(1, int(opts["chunk_size"]))):
+                if opts["limit"] is not None and written >= opts["limit"]:
+                    break
+                if binary:
+                    if obj.blob is None:
+                        skipped += 1
+                        continue
+                    rec = bytearray()
+                    hid = obj.hand_id.encode()
+                    write_varint(rec, len(hid))
+                    rec.extend(hid)
+                    blob = bytes(obj.blob)
+                    write_varint(rec, len(blob))
+                    rec.extend(blob)
+                    fh.write(rec)
+                else:
+                    try:
+                        payload = replay_payload(obj)
+                    except Exception as e:
+                        failed += 1
+                        self.stderr.write(f"decode failed for {obj.hand_id}: {e}")
+                        continue
+                    fh.write(json.dumps(payload, ensure_ascii=False, separators=(",", ":")))
+                    fh.write("\n")
+                written += 1
+        finally:
+            fh.flush()
+            if close:
+                fh.close()
+        self.stderr.write(f"exported={written} skipped={skipped} failed={failed}")
@@ -10,6 +10,7 @@ try:
         CONTENT_TYPE_LATEST,
         REGISTRY,
         Counter,
+        Gauge,
         Histogram,
         generate_latest,
     )
@@ -30,6 +31,12 @@ try:
         except ValueError:
             return REGISTRY._names_to_collectors[name]  # type: ignore[attr-defined]
 
+    def _get_or_create_gauge(name: str, doc: str, labels: list[str]):
+        try:
+            return Gauge(name, doc, labels)
+        except ValueError:
+            return REGISTRY._names_to_collectors[name]  # type: ignore[attr-defined]
+
     # --- Suggest 专用指标（标签维度与视图保持一致） ---
     SUGGEST_LATENCY = _get_or_create_hist(
         "suggest_latency_seconds", "Suggest latency", ["policy", "street"]
@@ -84,8 +91,37 @@ try:
     def inc_api_error(route: str, kind: str):
         API_ERRORS.labels(route or "unknown", kind or "unknown").inc()
 
+    # --- 评估缓存（poker_core.providers.eval_cache）：抓取时按差值同步，热路径零开销 ---
+    EVAL_CACHE_EVENTS = _get_or_create_counter(
+        "eval_cache_events_total", "Hand-eval cache events", ["event"]
+    )
+    EVAL_CACHE_SIZE = _get_or_create_gauge(
+        "eval_cache_entries", "Hand-eval cache entries", ["kind"]
+    )
+    _EVAL_CACHE_SEEN = {"hit": 0, "miss": 0, "eviction": 0}
+
+    def sync_eval_cache_metrics() -> None:
+        try:
+            from poker_core.providers.eval_cache import get_eval_cache
+
+            st = get_eval_cache().stats()
+        except Exception:
+            return
+        for event, total in (
+            ("hit", st.hits),
+            ("miss", st.misses),
+            ("eviction", st.evictions),
+        ):
+            delta = total - _EVAL_CACHE_SEEN[event]
+            if delta > 0:
+                EVAL_CACHE_EVENTS.labels(event).inc(delta)
+            _EVAL_CACHE_SEEN[event] = total
+        EVAL_CACHE_SIZE.labels("size").set(st.size)
+        EVAL_CACHE_SIZE.labels("maxsize").set(st.maxsize)
+
     # --- 暴露端点 ---
     def prometheus_view(_request):
+        sync_eval_cache_metrics()
         return HttpResponse(generate_latest(), content_type=CONTENT_TYPE_LATEST)
 
     # --- 游戏流程扩展指标（可选） ---
@@ -183,6 +219,9 @@ except Exception as e:  # 无 Prometheus 或初始化失败时降级
     def inc_api_error(route: str, kind: str):
         pass
 
+    def sync_eval_cache_metrics() -> None:
+        pass
+
     def inc_value_raise(
         *,
         street: str = "flop",
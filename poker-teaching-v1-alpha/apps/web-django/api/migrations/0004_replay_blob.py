@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0003_session_end_fields"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="replay",
+            name="payload",
+            field=models.JSONField(null=True, blank=True),
+        ),
+        migrations.AddField(
+            model_name="replay",
+            name="blob",
+            field=models.BinaryField(null=True, blank=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0004_replay_blob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HandState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("hand_id", models.CharField(max_length=64, unique=True)),
+                ("session_id", models.CharField(db_index=True, max_length=64)),
+                ("state", models.BinaryField()),
+                ("meta", models.JSONField(default=dict)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0005_handstate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CurrentHand",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("session_id", models.CharField(max_length=64, unique=True)),
+                ("hand_id", models.CharField(max_length=64)),
+            ],
+        ),
+    ]
@@ -3,7 +3,9 @@ from django.db import models
 
 class Replay(models.Model):
     hand_id = models.CharField(max_length=64, unique=True)
-    payload = models.JSONField()
+    # 旧数据/无法紧凑编码的手牌存完整 JSON；新数据只存 blob（见 poker_core.replay_codec）
+    payload = models.JSONField(null=True, blank=True)
+    blob = models.BinaryField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self) -> str:
@@ -25,3 +27,27 @@ class Session(models.Model):
 
     def __str__(self):
         return f"Session({self.session_id})"
+
+
+class HandState(models.Model):
+    """进行中手牌（HAND_STORE=db 后端）；state 为 poker_core.replay_codec 紧凑编码。"""
+
+    hand_id = models.CharField(max_length=64, unique=True)
+    session_id = models.CharField(max_length=64, db_index=True)
+    state = models.BinaryField()
+    meta = models.JSONField(default=dict)  # session_id/seed/cfg
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    def __str__(self) -> str:
+        return self.hand_id
+
+
+class CurrentHand(models.Model):
+    """会话当前手指针（HAND_STORE=db 后端）。"""
+
+    session_id = models.CharField(max_length=64, unique=True)
+    hand_id = models.CharField(max_length=64)
+
+    def __str__(self) -> str:
+        return f"{self.session_id} -> {self.hand_id}"
@@ -0,0 +1,225 @@
+"""
+回放持久化：Replay 行只存紧凑 blob（poker_core.replay_codec），读取时重新模拟出完整 JSON。
+
+- save_hand_replay：HU 手牌结束时调用；编码后先解码校验，事件流不一致则退回存完整 JSON
+- save_deal_replay：/table/deal 的多人发底牌
+- replay_payload：Replay 行 → 对外 JSON（旧数据直接返回 payload）
+- iter_replay_rows：按主键分块流式遍历，供导出命令使用，不把全表读入内存
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from typing import Any
+
+from poker_core.analysis import annotate_player_hand
+from poker_core.cards import card_id, card_str, card_strs
+from poker_core.replay_codec import (
+    KIND_DEAL,
+    KIND_HU,
+    ReplayCodecError,
+    blob_kind,
+    decode_deal,
+    decode_hand,
+    encode_deal,
+    encode_hand,
+)
+from poker_core.version import ENGINE_COMMIT, SCHEMA_VERSION
+
+from .models import Replay
+
+log = logging.getLogger(__name__)
+
+
+# 从 events 中提取 outcome 信息
+def extract_outcome(gs) -> dict | None:
+    # 从最后往前找 showdown 事件
+    for e in reversed(getattr(gs, "events", []) or []):
+        if e.get("t") == "showdown":
+            return {"winner": e.get("winner"), "best5": e.get("best5")}
+    # 允许弃牌结束：返回 winner、best5=None
+    for e in reversed(getattr(gs, "events", []) or []):
+        if e.get("t") == "win_fold":
+            return {"winner": e.get("who"), "best5": None}
+        if e.get("t") == "win_showdown":
+            return {"winner": e.get("who"), "best5": None}
+    return None
+
+
+def hand_payload(
+    hand_id: str, gs, *, session_id: str | None, seed: int | None, created_at: str
+) -> dict[str, Any]:
+    """HU 手牌的完整回放 JSON（统一的 replay 数据结构）。"""
+    outcome = extract_outcome(gs)
+
+    # 获取玩家数据和注释
+    players_data = []
+    annotations_data = []
+    if hasattr(gs, "players"):
+        for i, player in enumerate(gs.players):
+            player_info = {
+                "pos": i,
+                "hole": card_strs(player.hole),
+                "stack": player.stack,
+                "invested": player.invested_street,
+                "folded": player.folded,
+                "all_in": player.all_in,
+            }
+            players_data.append(player_info)
+
+            # 生成教学注释
+            if player.hole and len(player.hole) == 2:
+                annotation = annotate_player_hand(player.hole)
+                annotations_data.append(annotation)
+            else:
+                annotations_data.append({"info": {}, "notes": []})
+
+    # 生成基础的steps数据
+    steps_data = []
+    if hasattr(gs, "events") and gs.events:
+        # 游戏开始步骤
+        steps_data.append(
+            {
+                "idx": 0,
+                "evt": "GAME_START",
+                "payload": {
+                    "session_id": session_id,
+                    "seed": seed,
+                    "players": len(players_data),
+                },
+            }
+        )
+
+        # 从events生成steps (选取关键事件)
+        key_events = ["deal_hole", "showdown", "win_fold", "win_showdown"]
+        for event in gs.events:
+            if event.get("t") in key_events:
+                steps_data.append(
+                    {
+                        "idx": len(steps_data),
+                        "evt": event.get("t", "").upper(),
+                        "payload": {k: v for k, v in event.items() if k != "t"},
+                    }
+                )
+
+        # 游戏结束步骤
+        if outcome:
+            steps_data.append({"idx": len(steps_data), "evt": "GAME_END", "payload": outcome})
+
+    return {
+        # 基本信息
+        "hand_id": hand_id,
+        "session_id": session_id,
+        "seed": seed,
+        # 游戏数据
+        "events": [dict(e) for e in (getattr(gs, "events", None) or [])],
+        "board": card_strs(getattr(gs, "board", [])),
+        "button": getattr(gs, "button", 0),  # 庄位信息
+        "winner": outcome.get("winner") if outcome else None,
+        "best5": outcome.get("best5") if outcome else None,
+        # 教学数据
+        "players": players_data,
+        "annotations": annotations_data,
+        "steps": steps_data,
+        # 元数据
+        "engine_commit": ENGINE_COMMIT,
+        "schema_version": SCHEMA_VERSION,
+        "created_at": created_at,
+    }
+
+
+def deal_payload(
+    hand_id: str, seed: int | None, players: list[dict], *, algo: str, created_at: str
+) -> dict[str, Any]:
+    """/table/deal 的回放 JSON；steps 与 poker_core.deal.deal_hand 的输出一致。"""
+    steps: list[dict] = [{"idx": 0, "evt": "DECK_INIT", "payload": {"algo": algo, "cards": 52}}]
+    for p in players:
+        steps.append(
+            {"idx": len(steps), "evt": "DEAL_HOLE", "payload": {"p": p["pos"], "cards": p["hole"]}}
+        )
+    return {
+        # 基本信息
+        "hand_id": hand_id,
+        "session_id": None,  # deal_hand_api 不涉及session概念
+        "seed": seed,
+        # 游戏数据
+        "events": [],
+        "board": [],
+        "winner": None,
+        "best5": None,
+        # 教学数据（保持兼容）
+        "players": players,
+        "annotations": [annotate_player_hand(p["hole"]) for p in players],
+        "steps": steps,
+        # 元数据
+        "engine_commit": ENGINE_COMMIT,
+        "schema_version": SCHEMA_VERSION,
+        "created_at": created_at,
+    }
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+def save_hand_replay(hand_id: str, gs, *, session_id: str | None, seed: int | None) -> Replay:
+    """编码并校验；重建的事件流与原手牌不一致时退回存完整 JSON（防御）。"""
+    blob: bytes | None = None
+    try:
+        blob = encode_hand(gs, seed=seed, session_id=session_id)
+        rebuilt = decode_hand(blob, hand_id).gs
+        if [dict(e) for e in rebuilt.events] != [dict(e) for e in gs.events]:
+            raise ReplayCodecError("re-simulated events differ")
+    except Exception as e:
+        log.warning("replay codec fallback for %s: %s", hand_id, e)
+        blob = None
+    if blob is not None:
+        defaults = {"blob": blob, "payload": None}
+    else:
+        payload = hand_payload(hand_id, gs, session_id=session_id, seed=seed, created_at=_now())
+        defaults = {"blob": None, "payload": payload}
+    obj, _ = Replay.objects.update_or_create(hand_id=hand_id, defaults=defaults)
+    return obj
+
+
+def save_deal_replay(hand_id: str, seed: int | None, players: list[dict], *, algo: str) -> Replay:
+    blob = encode_deal(seed, [[card_id(c) for c in p["hole"]] for p in players], algo=algo)
+    return Replay.objects.create(hand_id=hand_id, blob=blob)
+
+
+def replay_payload(obj: Replay) -> dict[str, Any]:
+    """Replay 行 → 完整回放 JSON。"""
+    if obj.blob is None:
+        return obj.payload
+    blob = bytes(obj.blob)
+    created_at = obj.created_at.isoformat() if obj.created_at else _now()
+    kind = blob_kind(blob)
+    if kind == KIND_HU:
+        dec = decode_hand(blob, obj.hand_id)
+        return hand_payload(
+            obj.hand_id, dec.gs, session_id=dec.session_id, seed=dec.seed, created_at=created_at
+        )
+    if kind == KIND_DEAL:
+        deal = decode_deal(blob)
+        players = [{"pos": i, "hole": [card_str(c) for c in h]} for i, h in enumerate(deal.holes)]
+        return deal_payload(obj.hand_id, deal.seed, players, algo=deal.algo, created_at=created_at)
+    raise ReplayCodecError(f"unknown replay kind: {kind}")
+
+
+def iter_replay_rows(*, chunk_size: int = 2000, queryset=None) -> Iterator[Replay]:
+    """按主键顺序流式遍历 Replay（服务端游标 / 分块读取，内存占用与总量无关）。"""
+    qs = queryset if queryset is not None else Replay.objects.all()
+    return qs.order_by("pk").iterator(chunk_size=chunk_size)
+
+
+__all__ = [
+    "deal_payload",
+    "extract_outcome",
+    "hand_payload",
+    "iter_replay_rows",
+    "replay_payload",
+    "save_deal_replay",
+    "save_hand_replay",
+]
@@ -4,13 +4,37 @@ Simple in-memory stores for demo purposes
 
 from __future__ import annotations
 
-from dataclasses import asdict, is_dataclass
+from collections import OrderedDict
+from collections.abc import Mapping
 from typing import Any
 
-# 进程内最小状态存储（教学期用；重启会清空）
-SESSIONS: dict[str, Any] = {}
-HANDS: dict[str, Any] = {}
-REPLAYS = {}
+from poker_core.cards import card_strs
+
+
+class BoundedLRU(OrderedDict):
+    """有界 LRU 字典：读写刷新顺序，超过上限时淘汰最久未用的条目。"""
+
+    def __init__(self, max_entries: int):
+        super().__init__()
+        self.max_entries = max(1, int(max_entries))
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        try:
+            self.move_to_end(key)
+        except KeyError:
+            return default
+        return super().__getitem__(key)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.max_entries:
+            self.popitem(last=False)
+
+
+# 进行中手牌见 hand_store.get_hand_store()（memory/db/shm 可切换）
+# 回放 JSON 的进程内缓存（持久化以 Replay 表为准）
+REPLAYS = BoundedLRU(max_entries=1024)
 METRICS = {
     "deals_total": 0,
     "last_latency_ms": None,
@@ -18,41 +42,74 @@ METRICS = {
 }
 
 
-def snapshot_state(gs: Any) -> dict:
+def _field(x: Any, name: str, default: Any = None) -> Any:
+    if isinstance(x, Mapping):
+        return x.get(name, default)
+    return getattr(x, name, default)
+
+
+def snapshot_state(gs: Any, *, viewer: int | None = None, reveal_opp: bool = True) -> dict:
     """
     把领域层 GameState 转成给 API 的最小视图，避免泄露内部实现。
-    你可按自己的 GameState 字段名做适配。
+    只读取视图需要的字段（不经 dataclasses.asdict，牌堆/事件流/玩家不做深拷贝）。
+    可见性：viewer 为观察者座位；reveal_opp=False 时其他座位的 hole 置空（默认全部可见，教学期）。
     """
-
-    def to_dict(x):
-        if is_dataclass(x):
-            return asdict(x)
-        if hasattr(x, "__dict__"):
-            return dict(x.__dict__)
-        return x
-
-    s = to_dict(gs)
-    # 规范化输出字段（按你的 GameState 实际字段调整）
     out = {
-        "street": s.get("street"),
-        "board": s.get("board", []),
-        "to_act": s.get("to_act"),
-        "button": s.get("button"),
-        "pot": s.get("pot"),
+        "street": _field(gs, "street"),
+        # 引擎内部为整数编码，API 边界统一转为 'Ah' 字符串
+        "board": card_strs(_field(gs, "board") or ()),
+        "to_act": _field(gs, "to_act"),
+        "button": _field(gs, "button"),
+        "pot": _field(gs, "pot"),
         "players": [],
     }
-    # players: 只暴露必要字段（stack/hole 可按权限裁剪）
-    for p in s.get("players", []):
-        if is_dataclass(p):
-            p = asdict(p)
-        out["players"].append(
+    # players: 只暴露必要字段
+    hide = viewer is not None and not reveal_opp
+    players = out["players"]
+    for i, p in enumerate(_field(gs, "players") or ()):
+        invested = _field(p, "invested_street")
+        players.append(
             {
-                "stack": p.get("stack"),
+                "stack": _field(p, "stack"),
                 # 将引擎的 invested_street 暴露为 bet，便于 UI 一致理解
-                "bet": p.get("invested_street", p.get("bet", 0)),
-                # 教学期可直接返回 hole；将来要做权限/隐藏
-                "hole": p.get("hole", []),
+                "bet": invested if invested is not None else _field(p, "bet", 0),
+                "hole": [] if hide and i != viewer else card_strs(_field(p, "hole") or ()),
             }
         )
     # legal_actions 调用领域函数（由视图层负责调用更合适，这里留出位）
     return out
+
+
+def ended_by_showdown(gs: Any) -> bool:
+    """判断本手是否以摊牌结束。
+
+    依据领域层事件：存在 showdown 或 win_showdown 事件且 street==complete。
+    若为 win_fold 结束则不算摊牌。
+    """
+    try:
+        if getattr(gs, "street", None) != "complete":
+            return False
+        evs = getattr(gs, "events", None) or []
+        # 优先判断 showdown / win_showdown
+        for e in evs:
+            t = e.get("t")
+            if t in ("showdown", "win_showdown"):
+                return True
+        # 明确存在 win_fold 则认为非摊牌
+        for e in evs:
+            if e.get("t") == "win_fold":
+                return False
+        return False
+    except Exception:
+        return False
+
+
+def request_viewer(request: Any) -> int | None:
+    """API 查询参数 ?viewer=0|1：观察者座位；缺省或非法为 None（全部可见，教学期）。"""
+    raw = request.GET.get("viewer")
+    return int(raw) if raw in ("0", "1") else None
+
+
+def player_view(gs: Any, viewer: int | None = None) -> dict:
+    """API 状态视图：给定 viewer 时对手底牌只在摊牌结束后公开。"""
+    return snapshot_state(gs, viewer=viewer, reveal_opp=ended_by_showdown(gs))
@@ -1,6 +1,8 @@
+import os
+
 from django.urls import path
 
-from . import metrics
+from . import metrics, views_async
 from .views_api import deal_hand_api, get_replay_api, metrics_api
 from .views_play import (
     hand_act_api,
@@ -11,7 +13,7 @@ from .views_play import (
     session_start_api,
     session_state_api,
 )
-from .views_suggest import SuggestView
+from .views_suggest import SuggestBatchView, SuggestView
 from .views_ui import (
     ui_coach_suggest,
     ui_game_view,
@@ -22,6 +24,14 @@ from .views_ui import (
     ui_toggle_teach,
 )
 
+# ASGI 部署：API_ASYNC_VIEWS=1 时对局 / 建议的高频端点改用 async 视图（views_async）
+ASYNC_VIEWS = os.environ.get("API_ASYNC_VIEWS", "0").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _pick(sync_view, async_view):
+    return async_view if ASYNC_VIEWS else sync_view
+
+
 urlpatterns = [
     path("table/deal", deal_hand_api, name="deal"),
     # Backward-compat route (kept): /api/v1/replay/<hand_id>
@@ -32,12 +42,27 @@ urlpatterns = [
     path("metrics/prometheus", metrics.prometheus_view, name="metrics_prom"),
     path("session/start", session_start_api, name="session_start"),
     path("hand/start", hand_start_api, name="hand_start"),
-    path("hand/state/<str:hand_id>", hand_state_api, name="hand_state"),
-    path("hand/act/<str:hand_id>", hand_act_api, name="hand_act"),
-    path("hand/auto-step/<str:hand_id>", hand_auto_step_api, name="hand_auto_step"),
-    path("session/<str:session_id>/state", session_state_api, name="session_state"),
+    path(
+        "hand/state/<str:hand_id>",
+        _pick(hand_state_api, views_async.hand_state_async),
+        name="hand_state",
+    ),
+    path(
+        "hand/act/<str:hand_id>", _pick(hand_act_api, views_async.hand_act_async), name="hand_act"
+    ),
+    path(
+        "hand/auto-step/<str:hand_id>",
+        _pick(hand_auto_step_api, views_async.hand_auto_step_async),
+        name="hand_auto_step",
+    ),
+    path(
+        "session/<str:session_id>/state",
+        _pick(session_state_api, views_async.session_state_async),
+        name="session_state",
+    ),
     path("session/next", session_next_api, name="session_next"),
-    path("suggest", SuggestView.as_view(), name="suggest"),
+    path("suggest", _pick(SuggestView.as_view(), views_async.suggest_async), name="suggest"),
+    path("suggest/batch", SuggestBatchView.as_view(), name="suggest_batch"),
     # UI glue (HTML, OOB fragments)
     path("ui/game/<str:session_id>/<str:hand_id>", ui_game_view, name="ui_game"),
     path("ui/replay/<str:hand_id>", ui_replay_view, name="ui_replay"),
@@ -11,6 +11,7 @@ from rest_framework.response import Response
 
 from . import metrics
 from .models import Replay
+from .replays import deal_payload, replay_payload, save_deal_replay
 from .state import METRICS, REPLAYS
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
@@ -75,31 +76,12 @@ def deal_hand_api(request):
             "players": hand["players"],
             "annotations": annotations,
         }
-        # 统一的replay数据结构
-        from datetime import datetime
-
-        replay = {
-            # 基本信息
-            "hand_id": hand_id,
-            "session_id": None,  # deal_hand_api 不涉及session概念
-            "seed": hand["seed"],
-            # 游戏数据（从hand中提取或设为None）
-            "events": hand.get("events", []),
-            "board": hand.get("board", []),
-            "winner": hand.get("winner"),
-            "best5": hand.get("best5"),
-            # 教学数据（保持兼容）
-            "players": hand["players"],
-            "annotations": annotations,
-            "steps": hand.get("steps", []),
-            # 元数据
-            "engine_commit": ENGINE_COMMIT,
-            "schema_version": SCHEMA_VERSION,
-            "created_at": datetime.now(UTC).isoformat(),
-        }
-        REPLAYS[hand_id] = replay
+        # 统一的replay数据结构：内存里留完整 JSON，落库只存紧凑 blob
+        REPLAYS[hand_id] = deal_payload(
+            hand_id, hand["seed"], hand["players"], algo=hand["algo"], created_at=ts
+        )
         try:
-            Replay.objects.create(hand_id=hand_id, payload=replay)
+            save_deal_replay(hand_id, hand["seed"], hand["players"], algo=hand["algo"])
         except Exception:
             pass
 
@@ -165,7 +147,7 @@ def get_replay_api(request, hand_id: str):
         if rep is None:
             try:
                 obj = Replay.objects.get(hand_id=hand_id)
-                rep = obj.payload
+                rep = replay_payload(obj)
             except Replay.DoesNotExist:
                 status_label = "404"
                 return Response({"error": "not found"}, status=status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,206 @@
+"""
+API 视图（async 版本）：对局 / 建议的高频端点，供 ASGI 部署使用。
+
+响应与同步 DRF 视图（views_play / views_suggest）一致，共用其中的纯函数：
+- 建议计算（build_suggestion / auto_play）经 async_exec.run_cpu 放入有界线程池
+- 手牌存储读写经 run_store，回放落库经 run_db（async-safe，不阻塞事件循环）
+- 引擎单步推进（apply_action / settle）为微秒级，直接在事件循环中执行
+
+会话开始 / 下一手等以事务为主的端点仍为同步视图（Django 在 ASGI 下自动放入线程执行）。
+urls.py 中由环境变量 API_ASYNC_VIEWS=1 切换到本模块。
+"""
+
+from __future__ import annotations
+
+import json
+import time
+
+from django.http import HttpRequest, JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from poker_core.state_hu import apply_action as _apply_action
+from poker_core.state_hu import legal_actions as _legal_actions
+from poker_core.state_hu import settle_if_needed as _settle_if_needed
+
+from . import metrics
+from .async_exec import run_cpu, run_db, run_store
+from .hand_store import get_hand_store
+from .state import player_view, request_viewer
+from .views_play import (
+    _persist_replay,
+    act_payload,
+    auto_play,
+    auto_step_params,
+    session_state_payload,
+)
+from .views_suggest import SuggestReqSerializer, suggest_one
+
+
+def _observe(route: str, method: str, status: int, t0: float) -> None:
+    try:
+        metrics.observe_request(route, method, str(status), time.perf_counter() - t0)
+    except Exception:
+        pass
+
+
+def _body(request: HttpRequest) -> dict | None:
+    """JSON 或表单请求体；JSON 非法时返回 None。"""
+    if request.content_type == "application/json":
+        try:
+            data = json.loads(request.body or b"{}")
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+    return request.POST.dict()
+
+
+def _version(gs) -> int:
+    """手牌进度：每个动作/发牌都追加事件，事件数即单调版本号（存储后端间可比）。"""
+    return len(getattr(gs, "events", None) or ())
+
+
+def _bad_body(route: str, method: str, t0: float) -> JsonResponse:
+    _observe(route, method, 400, t0)
+    return JsonResponse({"detail": "invalid request body"}, status=400)
+
+
+# ---------- GET /hand/state/{hand_id} ----------
+@require_GET
+async def hand_state_async(request: HttpRequest, hand_id: str) -> JsonResponse:
+    t0 = time.perf_counter()
+    route, method = "hand/state", "GET"
+    entry = await run_store(get_hand_store(), "get", hand_id)
+    if entry is None:
+        _observe(route, method, 404, t0)
+        return JsonResponse({"detail": "hand not found"}, status=404)
+    gs = entry["gs"]
+    payload = {
+        "hand_id": hand_id,
+        "state": player_view(gs, request_viewer(request)),
+        "legal_actions": list(_legal_actions(gs)),
+    }
+    _observe(route, method, 200, t0)
+    return JsonResponse(payload)
+
+
+# ---------- POST /hand/act/{hand_id} ----------
+@csrf_exempt
+@require_POST
+async def hand_act_async(request: HttpRequest, hand_id: str) -> JsonResponse:
+    t0 = time.perf_counter()
+    route, method = "hand/act", "POST"
+    data = _body(request)
+    if data is None:
+        return _bad_body(route, method, t0)
+    store = get_hand_store()
+    entry = await run_store(store, "get", hand_id)
+    if entry is None:
+        _observe(route, method, 404, t0)
+        return JsonResponse({"detail": "hand not found"}, status=404)
+    try:
+        gs = _apply_action(entry["gs"], data.get("action"), data.get("amount", None))
+    except ValueError as e:
+        _observe(route, method, 400, t0)
+        try:
+            metrics.inc_api_error(route, "validation")
+        except Exception:
+            pass
+        return JsonResponse({"detail": str(e)}, status=400)
+
+    gs = _settle_if_needed(gs)
+    entry = {**entry, "gs": gs}
+    await run_store(store, "put", hand_id, entry)
+    payload = act_payload(hand_id, gs, request_viewer(request))
+    if payload["hand_over"]:
+        await run_db(_persist_replay, hand_id, gs, entry)
+    _observe(route, method, 200, t0)
+    return JsonResponse(payload)
+
+
+# ---------- POST /hand/auto-step/{hand_id} ----------
+@csrf_exempt
+@require_POST
+async def hand_auto_step_async(request: HttpRequest, hand_id: str) -> JsonResponse:
+    t0 = time.perf_counter()
+    route, method = "hand/auto-step", "POST"
+    data = _body(request)
+    if data is None:
+        return _bad_body(route, method, t0)
+    params = auto_step_params(data)
+    if params is None:
+        return _bad_body(route, method, t0)
+    user_actor, max_steps = params
+
+    store = get_hand_store()
+    entry = await run_store(store, "get", hand_id)
+    if entry is None:
+        _observe(route, method, 404, t0)
+        return JsonResponse({"detail": "hand not found"}, status=404)
+    gs = entry["gs"]
+    if getattr(gs, "street", None) == "complete":
+        _observe(route, method, 409, t0)
+        payload = {
+            "hand_id": hand_id,
+            "steps": [],
+            "state": player_view(gs, request_viewer(request)),
+            "hand_over": True,
+            "legal_actions": [],
+        }
+        return JsonResponse(payload, status=409)
+
+    gs, steps = await run_cpu(auto_play, gs, user_actor, max_steps)
+    if steps:
+        # 计算期间让出了事件循环：写回前复核手牌未被并发的 hand/act 推进，避免静默覆盖
+        latest = await run_store(store, "get", hand_id)
+        if latest is None or _version(latest["gs"]) != _version(entry["gs"]):
+            _observe(route, method, 409, t0)
+            return JsonResponse({"detail": "hand changed concurrently, retry"}, status=409)
+        entry = {**entry, "gs": gs}
+        await run_store(store, "put", hand_id, entry)
+    payload = act_payload(hand_id, gs, request_viewer(request))
+    payload["steps"] = steps
+    if payload["hand_over"]:
+        await run_db(_persist_replay, hand_id, gs, entry)
+    _observe(route, method, 200, t0)
+    return JsonResponse(payload)
+
+
+# ---------- GET /session/{session_id}/state ----------
+@require_GET
+async def session_state_async(request: HttpRequest, session_id: str) -> JsonResponse:
+    t0 = time.perf_counter()
+    payload = await run_db(session_state_payload, session_id)
+    _observe("session/state", "GET", 200, t0)
+    return JsonResponse(payload)
+
+
+# ---------- POST /suggest ----------
+@csrf_exempt
+@require_POST
+async def suggest_async(request: HttpRequest) -> JsonResponse:
+    data = _body(request)
+    if data is None:
+        return JsonResponse({"detail": "invalid request body"}, status=400)
+    ser = SuggestReqSerializer(data=data)
+    if not ser.is_valid():
+        return JsonResponse(ser.errors, status=400)
+    hand_id = ser.validated_data["hand_id"]
+    actor = ser.validated_data["actor"]
+
+    entry = await run_store(get_hand_store(), "get", hand_id) or {}
+    gs = entry.get("gs")
+    if gs is None:
+        return JsonResponse({"detail": "hand not found"}, status=404)
+    if getattr(gs, "street", None) == "complete":
+        return JsonResponse({"detail": "hand already ended"}, status=409)
+    payload, code = await run_cpu(suggest_one, gs, hand_id, actor)
+    return JsonResponse(payload, status=code)
+
+
+__all__ = [
+    "hand_act_async",
+    "hand_auto_step_async",
+    "hand_state_async",
+    "session_state_async",
+    "suggest_async",
+]
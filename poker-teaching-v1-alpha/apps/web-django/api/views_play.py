@@ -11,7 +11,6 @@ from datetime import UTC
 from django.db import transaction
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema, inline_serializer
-from poker_core.analysis import annotate_player_hand
 from poker_core.session_flow import next_hand
 from poker_core.session_types import SessionView
 
@@ -27,8 +26,11 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
 from . import metrics
-from .models import Replay, Session
-from .state import HANDS, METRICS, snapshot_state
+from .hand_store import get_hand_store
+from .models import Session
+from .replays import extract_outcome as _extract_outcome_from_events
+from .replays import save_hand_replay
+from .state import METRICS, player_view, request_viewer
 
 # --- Session end helpers (MVP) ---
 
@@ -108,112 +110,78 @@ def finalize_session(s: Session, gs, reason: str, *, last_hand_id: str | None =
     return summary
 
 
-# 从 events 中提取 outcome 信息
-def _extract_outcome_from_events(gs) -> dict | None:
-    # 从最后往前找 showdown 事件
-    for e in reversed(getattr(gs, "events", []) or []):
-        if e.get("t") == "showdown":
-            return {"winner": e.get("winner"), "best5": e.get("best5")}
-    # 允许弃牌结束：返回 winner、best5=None
-    for e in reversed(getattr(gs, "events", []) or []):
-        if e.get("t") == "win_fold":
-            return {"winner": e.get("who"), "best5": None}
-        if e.get("t") == "win_showdown":
-            return {"winner": e.get("who"), "best5": None}
-    return None
+# 统一的回放持久化（手牌结束时调用）：紧凑编码存 blob，读取时按需重建 JSON
+def _persist_replay(hand_id: str, gs, entry: dict | None = None) -> None:
+    try:
+        if entry is None:
+            entry = get_hand_store().get(hand_id) or {}
+        save_hand_replay(hand_id, gs, session_id=entry.get("session_id"), seed=entry.get("seed"))
+    except Exception as e:
+        import logging
+
+        logging.warning(f"Failed to save replay for {hand_id}: {e}")
 
 
-# 统一的回放持久化（手牌结束时调用）
-def _persist_replay(hand_id: str, gs) -> None:
-    try:
-        session_id = HANDS.get(hand_id, {}).get("session_id")
-        seed = HANDS.get(hand_id, {}).get("seed")
-        # 统一的replay数据结构
-        from datetime import datetime
+def is_hand_over(gs) -> bool:
+    # 判断是否结束（按你的实现是 'complete' 或标志位）
+    street = getattr(gs, "street", None) or (getattr(gs, "state", {}) or {}).get("street")
+    return street in {"complete", "showdown_complete"} or bool(getattr(gs, "is_over", False))
 
-        from poker_core.version import ENGINE_COMMIT, SCHEMA_VERSION
 
+def act_payload(hand_id: str, gs, viewer: int | None = None) -> dict:
+    """act / auto-step 的响应体：状态、合法动作、是否结束（结束时附最小结果）。"""
+    hand_over = is_hand_over(gs)
+    payload = {
+        "hand_id": hand_id,
+        "state": player_view(gs, viewer),
+        "legal_actions": list(_legal_actions(gs)) if not hand_over else [],
+        "hand_over": hand_over,
+    }
+    if hand_over:
+        # API 直带最小结果（便于前端立即展示）
         outcome = _extract_outcome_from_events(gs)
+        if outcome:
+            payload["outcome"] = outcome
+    return payload
 
-        # 获取玩家数据和注释
-        players_data = []
-        annotations_data = []
-        if hasattr(gs, "players"):
-            for i, player in enumerate(gs.players):
-                player_info = {
-                    "pos": i,
-                    "hole": player.hole,
-                    "stack": player.stack,
-                    "invested": player.invested_street,
-                    "folded": player.folded,
-                    "all_in": player.all_in,
-                }
-                players_data.append(player_info)
-
-                # 生成教学注释
-                if player.hole and len(player.hole) == 2:
-                    annotation = annotate_player_hand(player.hole)
-                    annotations_data.append(annotation)
-                else:
-                    annotations_data.append({"info": {}, "notes": []})
-
-        # 生成基础的steps数据
-        steps_data = []
-        if hasattr(gs, "events") and gs.events:
-            # 游戏开始步骤
-            steps_data.append(
-                {
-                    "idx": 0,
-                    "evt": "GAME_START",
-                    "payload": {
-                        "session_id": session_id,
-                        "seed": seed,
-                        "players": len(players_data),
-                    },
-                }
-            )
 
-            # 从events生成steps (选取关键事件)
-            key_events = ["deal_hole", "showdown", "win_fold", "win_showdown"]
-            for event in gs.events:
-                if event.get("t") in key_events:
-                    steps_data.append(
-                        {
-                            "idx": len(steps_data),
-                            "evt": event.get("t", "").upper(),
-                            "payload": {k: v for k, v in event.items() if k != "t"},
-                        }
-                    )
-
-            # 游戏结束步骤
-            if outcome:
-                steps_data.append({"idx": len(steps_data), "evt": "GAME_END", "payload": outcome})
-
-        replay_data = {
-            # 基本信息
-            "hand_id": hand_id,
-            "session_id": session_id,
-            "seed": seed,
-            # 游戏数据
-            "events": getattr(gs, "events", []),
-            "board": list(getattr(gs, "board", [])),
-            "button": getattr(gs, "button", 0),  # 庄位信息
-            "winner": outcome.get("winner") if outcome else None,
-            "best5": outcome.get("best5") if outcome else None,
-            # 教学数据
-            "players": players_data,
-            "annotations": annotations_data,
-            "steps": steps_data,
-            # 元数据
-            "engine_commit": ENGINE_COMMIT,
-            "schema_version": SCHEMA_VERSION,
-            "created_at": datetime.now(UTC).isoformat(),
-        }
-        Replay.objects.update_or_create(hand_id=hand_id, defaults={"payload": replay_data})
-    except Exception as e:
-        import logging
+def auto_step_params(data) -> tuple[int, int] | None:
+    """auto-step 参数：user_actor ∈ {0,1}，max_steps ∈ [1,50]（同 AutoStepReq）；非法返回 None。"""
+    try:
+        user_actor = int(data.get("user_actor", 0))
+        max_steps = int(data.get("max_steps", 10))
+    except (TypeError, ValueError):
+        return None
+    if user_actor not in (0, 1) or not 1 <= max_steps <= 50:
+        return None
+    return user_actor, max_steps
 
-        logging.warning(f"Failed to save replay for {hand_id}: {e}")
+
+def auto_play(gs, user_actor: int, max_steps: int) -> tuple[object, list[dict]]:
+    """为对手执行建议动作，直到轮到用户、手牌结束或步数用尽；纯计算，不读写存储。"""
+    steps: list[dict] = []
+    while max_steps > 0:
+        cur = getattr(gs, "to_act", None)
+        if cur is None or cur == user_actor:
+            break
+        # 调用建议
+        resp = build_suggestion(gs, cur)
+        sug = resp.get("suggested", {})
+        # 应用动作
+        gs = _apply_action(gs, sug.get("action"), sug.get("amount", None))
+        gs = _settle_if_needed(gs)
+        steps.append(
+            {
+                "actor": cur,
+                "suggested": sug,
+                "rationale": resp.get("rationale", []),
+                "policy": resp.get("policy"),
+            }
+        )
+        max_steps -= 1
+        if getattr(gs, "street", None) == "complete":
+            break
+    return gs, steps
 
 
 # ---------- 1) POST /session/start ----------
@@ -350,9 +318,11 @@ def hand_start_api(request):
 
     gs = _start_hand(cfg, session_id=session_id, hand_id=hand_id, button=int(button), seed=seed)
 
-    HANDS[hand_id] = {"gs": gs, "session_id": session_id, "seed": seed, "cfg": cfg}
+    store = get_hand_store()
+    store.put(hand_id, {"gs": gs, "session_id": session_id, "seed": seed, "cfg": cfg})
+    store.set_current(session_id, hand_id)
     # 下一手按钮建议轮转（这里不直接改，交给结算后更新；先返回当前）
-    st = snapshot_state(gs)
+    st = player_view(gs, request_viewer(request))
     la = list(_legal_actions(gs))
     try:
         resp = Response({"hand_id": hand_id, "state": st, "legal_actions": la})
@@ -382,18 +352,19 @@ def hand_state_api(request, hand_id: str):
     t0 = time.perf_counter()
     route = "hand/state"
     method = "GET"
-    if hand_id not in HANDS:
+    entry = get_hand_store().get(hand_id)
+    if entry is None:
         try:
             metrics.observe_request(route, method, "404", time.perf_counter() - t0)
         except Exception:
             pass
         return Response({"detail": "hand not found"}, status=404)
-    gs = HANDS[hand_id]["gs"]
+    gs = entry["gs"]
     try:
         return Response(
             {
                 "hand_id": hand_id,
-                "state": snapshot_state(gs),
+                "state": player_view(gs, request_viewer(request)),
                 "legal_actions": list(_legal_actions(gs)),
             }
         )
@@ -444,13 +415,15 @@ def hand_act_api(request, hand_id: str):
     t0 = time.perf_counter()
     route = "hand/act"
     method = "POST"
-    if hand_id not in HANDS:
+    store = get_hand_store()
+    entry = store.get(hand_id)
+    if entry is None:
         try:
             metrics.observe_request(route, method, "404", time.perf_counter() - t0)
         except Exception:
             pass
         return Response({"detail": "hand not found"}, status=404)
-    gs = HANDS[hand_id]["gs"]
+    gs = entry["gs"]
 
     action = request.data.get("action")
     amount = request.data.get("amount", None)
@@ -466,26 +439,13 @@ def hand_act_api(request, hand_id: str):
 
     # 可能推进到下一街 / 结算
     gs = _settle_if_needed(gs)
-    HANDS[hand_id]["gs"] = gs
+    entry = {**entry, "gs": gs}
+    store.put(hand_id, entry)
 
-    # 判断是否结束（按你的实现是 'complete' 或标志位）
-    street = getattr(gs, "street", None) or (getattr(gs, "state", {}) or {}).get("street")
-    hand_over = street in {"complete", "showdown_complete"} or getattr(gs, "is_over", False)
-
-    payload = {
-        "hand_id": hand_id,
-        "state": snapshot_state(gs),
-        "legal_actions": list(_legal_actions(gs)) if not hand_over else [],
-        "hand_over": hand_over,
-    }
-
-    if hand_over:
-        # API 直带最小结果（便于前端立即展示）
-        outcome = _extract_outcome_from_events(gs)
-        if outcome:
-            payload["outcome"] = outcome
+    payload = act_payload(hand_id, gs, request_viewer(request))
+    if payload["hand_over"]:
         # 同步持久化回放
-        _persist_replay(hand_id, gs)
+        _persist_replay(hand_id, gs, entry)
 
     try:
         return Response(payload, status=status.HTTP_200_OK)
@@ -515,38 +475,35 @@ SessionStateResp = inline_serializer(
 )
 
 
+def session_state_payload(session_id: str) -> dict:
+    s = get_object_or_404(Session, session_id=session_id)
+    # 当前手（教学期：最后一次启动的 hand），经会话索引直接定位
+    current_hand_id, item = get_hand_store().latest_for_session(session_id)
+    latest_gs = item.get("gs") if item is not None else None
+    stacks_after_blinds = None
+    if latest_gs:
+        stacks_after_blinds = [latest_gs.players[0].stack, latest_gs.players[1].stack]
+    return {
+        "session_id": s.session_id,
+        "button": s.button,
+        "stacks": s.stacks,
+        "stacks_after_blinds": stacks_after_blinds,
+        "sb": int((s.config or {}).get("sb", 1)),
+        "bb": int((s.config or {}).get("bb", 2)),
+        "hand_counter": s.hand_counter,
+        "current_hand_id": current_hand_id,
+    }
+
+
 @extend_schema(responses={200: SessionStateResp})
 @api_view(["GET"])
 def session_state_api(request, session_id: str):
     t0 = time.perf_counter()
     route = "session/state"
     method = "GET"
-    s = get_object_or_404(Session, session_id=session_id)
-    # 尝试从内存映射取当前手（教学期：最后一次启动的 hand）
-    current_hand_id, latest_gs = None, None
-    for hid, item in reversed(list(HANDS.items())):
-        if item.get("session_id") == session_id:
-            current_hand_id = hid
-            latest_gs = item.get("gs")
-            break
-    stacks_after_blinds = None
-    if latest_gs:
-        stacks_after_blinds = [latest_gs.players[0].stack, latest_gs.players[1].stack]
-    sb = int((s.config or {}).get("sb", 1))
-    bb = int((s.config or {}).get("bb", 2))
+    payload = session_state_payload(session_id)
     try:
-        return Response(
-            {
-                "session_id": s.session_id,
-                "button": s.button,
-                "stacks": s.stacks,
-                "stacks_after_blinds": stacks_after_blinds,
-                "sb": sb,
-                "bb": bb,
-                "hand_counter": s.hand_counter,
-                "current_hand_id": current_hand_id,
-            }
-        )
+        return Response(payload)
     finally:
         try:
             metrics.observe_request(route, method, "200", time.perf_counter() - t0)
@@ -605,15 +562,11 @@ def session_next_api(request):
             )
 
         # 1) Find latest completed hand for this session
-        latest_gs, latest_cfg, latest_hid = None, None, None
-        for hid, item in reversed(list(HANDS.items())):
-            if item.get("session_id") == session_id:
-                gs = item.get("gs")
-                latest_gs = gs
-                latest_cfg = item.get("cfg")
-                latest_hid = hid
-                if getattr(gs, "street", None) == "complete":
-                    break
+        latest_gs, latest_cfg = None, None
+        latest_hid, item = get_hand_store().latest_for_session(session_id, complete=True)
+        if item is not None:
+            latest_gs = item.get("gs")
+            latest_cfg = item.get("cfg")
         if latest_gs is None or getattr(latest_gs, "street", None) != "complete":
             try:
                 metrics.observe_request(route, method, "409", time.perf_counter() - t0)
@@ -671,12 +624,17 @@ def session_next_api(request):
             except Exception:
                 pass
             return Response({"session_id": session_id, **summary}, status=status.HTTP_409_CONFLICT)
-        HANDS[new_hid] = {
-            "gs": gs_new,
-            "session_id": session_id,
-            "seed": seed,
-            "cfg": cfg_for_next,
-        }
+        store = get_hand_store()
+        store.put(
+            new_hid,
+            {
+                "gs": gs_new,
+                "session_id": session_id,
+                "seed": seed,
+                "cfg": cfg_for_next,
+            },
+        )
+        store.set_current(session_id, new_hid)
 
     # outside transaction: respond success
     try:
@@ -684,7 +642,7 @@ def session_next_api(request):
             {
                 "session_id": session_id,
                 "hand_id": new_hid,
-                "state": snapshot_state(gs_new),
+                "state": player_view(gs_new, request_viewer(request)),
             }
         )
     finally:
@@ -724,17 +682,24 @@ def hand_auto_step_api(request, hand_id: str):
     t0 = time.perf_counter()
     route = "hand/auto-step"
     method = "POST"
-    if hand_id not in HANDS:
+    params = auto_step_params(request.data)
+    if params is None:
+        try:
+            metrics.observe_request(route, method, "400", time.perf_counter() - t0)
+        except Exception:
+            pass
+        return Response({"detail": "invalid request body"}, status=400)
+    user_actor, max_steps = params
+
+    store = get_hand_store()
+    entry = store.get(hand_id)
+    if entry is None:
         try:
             metrics.observe_request(route, method, "404", time.perf_counter() - t0)
         except Exception:
             pass
         return Response({"detail": "hand not found"}, status=404)
 
-    user_actor = int(request.data.get("user_actor", 0))
-    max_steps = int(request.data.get("max_steps", 10))
-
-    entry = HANDS[hand_id]
     gs = entry["gs"]
     steps: list[dict] = []
 
@@ -748,7 +713,7 @@ def hand_auto_step_api(request, hand_id: str):
             {
                 "hand_id": hand_id,
                 "steps": steps,
-                "state": snapshot_state(gs),
+                "state": player_view(gs, request_viewer(request)),
                 "hand_over": True,
                 "legal_actions": [],
             },
@@ -756,47 +721,15 @@ def hand_auto_step_api(request, hand_id: str):
         )
 
     # 自动步进：为对手执行建议动作，直到轮到用户或结束
-    while max_steps > 0:
-        cur = getattr(gs, "to_act", None)
-        if cur is None or cur == user_actor:
-            break
-        # 调用建议
-        resp = build_suggestion(gs, cur)
-        sug = resp.get("suggested", {})
-        act_name = sug.get("action")
-        amt = sug.get("amount", None)
-        # 应用动作
-        gs = _apply_action(gs, act_name, amt)
-        gs = _settle_if_needed(gs)
-        entry["gs"] = gs
-        steps.append(
-            {
-                "actor": cur,
-                "suggested": sug,
-                "rationale": resp.get("rationale", []),
-                "policy": resp.get("policy"),
-            }
-        )
-        max_steps -= 1
-        # 重新检查to_act，因为_apply_action和_settle_if_needed可能改变了行动者
-        cur = getattr(gs, "to_act", None)
-        if cur is None or cur == user_actor or getattr(gs, "street", None) == "complete":
-            break
-
-    hand_over = getattr(gs, "street", None) == "complete"
-    payload = {
-        "hand_id": hand_id,
-        "steps": steps,
-        "state": snapshot_state(gs),
-        "hand_over": hand_over,
-        "legal_actions": list(_legal_actions(gs)) if not hand_over else [],
-    }
-
-    if hand_over:
-        outcome = _extract_outcome_from_events(gs)
-        if outcome:
-            payload["outcome"] = outcome
-        _persist_replay(hand_id, gs)
+    gs, steps = auto_play(gs, user_actor, max_steps)
+    if steps:
+        entry = {**entry, "gs": gs}
+        store.put(hand_id, entry)
+
+    payload = act_payload(hand_id, gs, request_viewer(request))
+    payload["steps"] = steps
+    if payload["hand_over"]:
+        _persist_replay(hand_id, gs, entry)
 
     try:
         metrics.observe_request(route, method, "200", time.perf_counter() - t0)
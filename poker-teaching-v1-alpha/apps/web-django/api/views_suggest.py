@@ -10,22 +10,30 @@ from drf_spectacular.utils import (
     extend_schema,
     inline_serializer,
 )
-from poker_core.suggest.service import build_suggestion
+from poker_core.suggest.service import build_suggestion, build_suggestions
 from rest_framework import serializers, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from . import metrics  # Prometheus/StatsD 封装
-from .state import HANDS
+from .hand_store import get_hand_store
 
 logger = logging.getLogger(__name__)
 
+# 单次批量请求的条目上限
+BATCH_MAX_ITEMS = 256
+
 
 class SuggestReqSerializer(serializers.Serializer):
     hand_id = serializers.CharField()
     actor = serializers.IntegerField(min_value=0, max_value=1)
 
 
+class SuggestBatchReqSerializer(serializers.Serializer):
+    items = SuggestReqSerializer(many=True, allow_empty=False, max_length=BATCH_MAX_ITEMS)
+    explain = serializers.BooleanField(required=False, default=False)
+
+
 class SuggestedSerializer(serializers.Serializer):
     action = serializers.ChoiceField(choices=["fold", "check", "call", "bet", "raise", "allin"])
     amount = serializers.IntegerField(required=False, min_value=1)
@@ -45,6 +53,67 @@ class SuggestRespSerializer(serializers.Serializer):
     policy = serializers.CharField()
 
 
+def suggest_one(gs, hand_id: str, actor: int) -> tuple[dict, int]:
+    """单条建议 + 指标；返回 (响应体, HTTP 状态码)。同步视图直接调用，异步视图放入计算线程池。"""
+    t0 = time.perf_counter()
+    policy = "unknown"
+    try:
+        resp = build_suggestion(gs, actor)
+        policy = resp.get("policy", "unknown")
+        logger.info(
+            "suggest",
+            extra={
+                "hand_id": hand_id,
+                "actor": actor,
+                "street": gs.street,
+                "policy": resp.get("policy"),
+                "action": resp.get("suggested", {}).get("action"),
+                "amount": resp.get("suggested", {}).get("amount"),
+            },
+        )
+        try:
+            # 常规动作计数
+            metrics.inc_action(
+                resp.get("policy"),
+                resp.get("suggested", {}).get("action"),
+                street=gs.street,
+            )
+            # 若发生钳制，记录细化指标（专用计数器）
+            rationale = resp.get("rationale", []) or []
+            if any((r or {}).get("code") == "W_CLAMPED" for r in rationale):
+                metrics.inc_clamped(
+                    resp.get("policy"),
+                    resp.get("suggested", {}).get("action"),
+                    street=gs.street,
+                )
+        except Exception:
+            pass
+        return resp, status.HTTP_200_OK
+    except PermissionError:
+        try:
+            metrics.inc_error("not_turn", street=gs.street)
+        except Exception:
+            pass
+        return {"detail": "not actor's turn"}, status.HTTP_409_CONFLICT
+    except ValueError as e:
+        try:
+            msg = str(e).lower()
+            if "illegal action" in msg:
+                metrics.inc_error("illegal_action", street=gs.street)
+            elif "no legal actions" in msg:
+                metrics.inc_no_legal_actions(street=gs.street)
+            else:
+                metrics.inc_error("value_error", street=gs.street)
+        except Exception:
+            pass
+        return {"detail": f"suggest failed: {e}"}, status.HTTP_422_UNPROCESSABLE_ENTITY
+    finally:
+        try:
+            metrics.observe_latency(policy, gs.street, time.perf_counter() - t0)
+        except Exception:
+            pass
+
+
 class SuggestView(APIView):
     @extend_schema(
         request=SuggestReqSerializer,
@@ -93,7 +162,7 @@ class SuggestView(APIView):
         hand_id = ser.validated_data["hand_id"]
         actor = ser.validated_data["actor"]
 
-        entry = HANDS.get(hand_id) or {}
+        entry = get_hand_store().get(hand_id) or {}
         gs = entry.get("gs")
         if gs is None:
             return Response({"detail": "hand not found"}, status=status.HTTP_404_NOT_FOUND)
@@ -102,63 +171,89 @@ class SuggestView(APIView):
         if getattr(gs, "street", None) == "complete":
             return Response({"detail": "hand already ended"}, status=status.HTTP_409_CONFLICT)
 
-        t0 = time.perf_counter()
-        policy = "unknown"
-        try:
-            resp = build_suggestion(gs, actor)
-            policy = resp.get("policy", "unknown")
-            logger.info(
-                "suggest",
-                extra={
+        payload, code = suggest_one(gs, hand_id, actor)
+        return Response(payload, status=code)
+
+
+class SuggestBatchView(APIView):
+    @extend_schema(
+        request=SuggestBatchReqSerializer,
+        responses={
+            200: inline_serializer(
+                name="SuggestBatchResp",
+                fields={"results": serializers.ListField(child=serializers.JSONField())},
+            ),
+        },
+        tags=["suggest"],
+        summary="Suggestions for many hand/actor pairs sharing one context snapshot",
+        description=(
+            "results 与 items 一一对应；单条失败以 {hand_id, actor, error, detail} 内联返回，"
+            "error ∈ not_found | hand_ended | not_turn | no_legal_actions | suggest_failed。"
+            "默认不渲染 explanations（explain=true 开启）。"
+        ),
+        examples=[
+            OpenApiExample(
+                name="Suggest Batch Request",
+                value={"items": [{"hand_id": "h_1234abcd", "actor": 0}], "explain": False},
+                request_only=True,
+            ),
+        ],
+    )
+    def post(self, request, *args, **kwargs):
+        ser = SuggestBatchReqSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        items = ser.validated_data["items"]
+
+        results: list[dict | None] = [None] * len(items)
+        pending: list[int] = []
+        states = []
+        store = get_hand_store()
+        # 同一手牌的多条请求只取一次（外部 store 每次 get 都要解码）
+        loaded: dict[str, object] = {}
+        for i, item in enumerate(items):
+            hand_id, actor = item["hand_id"], item["actor"]
+            if hand_id not in loaded:
+                loaded[hand_id] = (store.get(hand_id) or {}).get("gs")
+            gs = loaded[hand_id]
+            if gs is None:
+                results[i] = {
                     "hand_id": hand_id,
                     "actor": actor,
-                    "street": gs.street,
-                    "policy": resp.get("policy"),
-                    "action": resp.get("suggested", {}).get("action"),
-                    "amount": resp.get("suggested", {}).get("amount"),
-                },
-            )
+                    "error": "not_found",
+                    "detail": "hand not found",
+                }
+            elif getattr(gs, "street", None) == "complete":
+                results[i] = {
+                    "hand_id": hand_id,
+                    "actor": actor,
+                    "error": "hand_ended",
+                    "detail": "hand already ended",
+                }
+            else:
+                pending.append(i)
+                states.append((gs, actor))
+
+        t0 = time.perf_counter()
+        out = build_suggestions(states, explain=ser.validated_data["explain"])
+        for i, (gs, _), resp in zip(pending, states, out, strict=True):
+            results[i] = resp
             try:
-                # 常规动作计数
-                metrics.inc_action(
-                    resp.get("policy"),
-                    resp.get("suggested", {}).get("action"),
-                    street=gs.street,
-                )
-                # 若发生钳制，记录细化指标（专用计数器）
-                rationale = resp.get("rationale", []) or []
-                if any((r or {}).get("code") == "W_CLAMPED" for r in rationale):
-                    metrics.inc_clamped(
+                if "error" in resp:
+                    if resp["error"] == "no_legal_actions":
+                        metrics.inc_no_legal_actions("unknown", street=gs.street)
+                    else:
+                        metrics.inc_error(resp["error"], street=gs.street)
+                else:
+                    metrics.inc_action(
                         resp.get("policy"),
                         resp.get("suggested", {}).get("action"),
                         street=gs.street,
                     )
             except Exception:
                 pass
-            return Response(resp, status=status.HTTP_200_OK)
-        except PermissionError:
-            try:
-                metrics.inc_error("not_turn", street=gs.street)
-            except Exception:
-                pass
-            return Response({"detail": "not actor's turn"}, status=status.HTTP_409_CONFLICT)
-        except ValueError as e:
-            try:
-                msg = str(e).lower()
-                if "illegal action" in msg:
-                    metrics.inc_error("illegal_action", street=gs.street)
-                elif "no legal actions" in msg:
-                    metrics.inc_no_legal_actions(street=gs.street)
-                else:
-                    metrics.inc_error("value_error", street=gs.street)
-            except Exception:
-                pass
-            return Response(
-                {"detail": f"suggest failed: {e}"},
-                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            )
-        finally:
-            try:
-                metrics.observe_latency(policy, gs.street, time.perf_counter() - t0)
-            except Exception:
-                pass
+        try:
+            metrics.observe_latency("batch", None, time.perf_counter() - t0)
+        except Exception:
+            pass
+        logger.info("suggest_batch", extra={"items": len(items), "computed": len(pending)})
+        return Response({"results": results}, status=status.HTTP_200_OK)
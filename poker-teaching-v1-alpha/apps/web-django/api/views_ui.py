@@ -14,8 +14,10 @@ from poker_core.state_hu import settle_if_needed as _settle_if_needed
 from poker_core.state_hu import start_hand as _start_hand
 
 from . import metrics
+from .hand_store import get_hand_store
 from .models import Session
-from .state import HANDS, snapshot_state
+from .state import ended_by_showdown as _ended_by_showdown
+from .state import snapshot_state
 
 
 def _role_name(button: int, who: int) -> str:
@@ -84,28 +86,19 @@ def _is_hand_over(gs) -> bool:
     return street in {"complete", "showdown_complete"} or bool(getattr(gs, "is_over", False))
 
 
-def _ended_by_showdown(gs) -> bool:
-    """判断本手是否以摊牌结束。
+# UI 中用户固定坐 0 号位（_seats.html：下方 You = players[0]）
+_UI_SEAT = 0
+
+
+def _reveal_opp(request: HttpRequest, gs) -> bool:
+    """对手底牌是否可见：Teach ON 或摊牌结束。"""
+    teach = bool(request.session.get("teach", True))
+    return bool(teach or _ended_by_showdown(gs))
 
-    依据领域层事件：存在 showdown 或 win_showdown 事件且 street==complete。
-    若为 win_fold 结束则不算摊牌。
-    """
-    try:
-        if getattr(gs, "street", None) != "complete":
-            return False
-        evs = getattr(gs, "events", None) or []
-        # 优先判断 showdown / win_showdown
-        for e in evs:
-            t = e.get("t")
-            if t in ("showdown", "win_showdown"):
-                return True
-        # 明确存在 win_fold 则认为非摊牌
-        for e in evs:
-            if e.get("t") == "win_fold":
-                return False
-        return False
-    except Exception:
-        return False
+
+def _ui_state(request: HttpRequest, gs) -> dict[str, Any]:
+    """UI 视图状态：对手底牌只在 _reveal_opp 为真时下发到页面。"""
+    return snapshot_state(gs, viewer=_UI_SEAT, reveal_opp=_reveal_opp(request, gs))
 
 
 def _log_items(gs) -> list[str]:
@@ -259,7 +252,7 @@ def _render_oob_fragments(
 def ui_game_view(request: HttpRequest, session_id: str, hand_id: str) -> HttpResponse:
     """Game page: render skeleton + initial state (SSR)."""
     s = get_object_or_404(Session, session_id=session_id)
-    entry = HANDS.get(hand_id)
+    entry = get_hand_store().get(hand_id)
     st: dict[str, Any] = {}
     actions: dict[str, Any] = {
         "items": [],
@@ -268,7 +261,7 @@ def ui_game_view(request: HttpRequest, session_id: str, hand_id: str) -> HttpRes
     log = []
     if entry and entry.get("gs") is not None:
         gs = entry["gs"]
-        st = snapshot_state(gs)
+        st = _ui_state(request, gs)
         log = _log_items(gs)
         if _is_hand_over(gs):
             actions = {
@@ -288,19 +281,11 @@ def ui_game_view(request: HttpRequest, session_id: str, hand_id: str) -> HttpRes
         }
         ended_reason_text = m.get(s.ended_reason or "", s.ended_reason or "Ended")
     # last hand id for replay link (best-effort)
-    last_hid = None
-    for hid, item in reversed(list(HANDS.items())):
-        if item.get("session_id") == session_id:
-            last_hid = hid
-            break
+    last_hid = get_hand_store().current_hand(session_id)
     teach = bool(request.session.get("teach", True))
-    # 计算 reveal_opp：Teach ON 或摊牌结束
-    reveal_opp = False
-    try:
-        if entry and entry.get("gs") is not None:
-            reveal_opp = bool(teach or _ended_by_showdown(entry["gs"]))
-    except Exception:
-        reveal_opp = bool(teach)
+    reveal_opp = (
+        _reveal_opp(request, entry["gs"]) if entry and entry.get("gs") is not None else False
+    )
     ctx = {
         "session_id": session_id,
         "hand_id": hand_id,
@@ -324,7 +309,8 @@ def ui_hand_act(request: HttpRequest, hand_id: str) -> HttpResponse:
     method = "POST"
     status_label = "200"
     try:
-        entry = HANDS.get(hand_id)
+        store = get_hand_store()
+        entry = store.get(hand_id)
         if not entry or entry.get("gs") is None:
             status_label = "404"
             html = _render_error_only(request, "Object not found or expired")
@@ -335,7 +321,7 @@ def ui_hand_act(request: HttpRequest, hand_id: str) -> HttpResponse:
 
         # If hand already ended, return ended view, avoid engine calls
         if _is_hand_over(gs):
-            st = snapshot_state(gs)
+            st = _ui_state(request, gs)
             html = _render_oob_fragments(
                 request,
                 session=s,
@@ -348,7 +334,7 @@ def ui_hand_act(request: HttpRequest, hand_id: str) -> HttpResponse:
                 show_next_controls=True,
                 replay_url=f"/api/v1/ui/replay/{hand_id}",
                 log_items=_log_items(gs),
-                reveal_opp=bool(request.session.get("teach", True) or _ended_by_showdown(gs)),
+                reveal_opp=_reveal_opp(request, gs),
             )
             status_label = "409"
             return _oob_response(html, route=t0_route, method=method, status_label=status_label)
@@ -368,7 +354,7 @@ def ui_hand_act(request: HttpRequest, hand_id: str) -> HttpResponse:
             # Illegal action/amount → 422
             status_label = "422"
             entry["gs"] = gs
-            st = snapshot_state(gs)
+            st = _ui_state(request, gs)
             actions = _actions_model(gs)
             html = _render_oob_fragments(
                 request,
@@ -377,21 +363,22 @@ def ui_hand_act(request: HttpRequest, hand_id: str) -> HttpResponse:
                 actions=actions,
                 error_text="Invalid action or amount (adjusted or please retry)",
                 log_items=_log_items(gs),
-                reveal_opp=bool(request.session.get("teach", True) or _ended_by_showdown(gs)),
+                reveal_opp=_reveal_opp(request, gs),
             )
             return _oob_response(html, route=t0_route, method=method, status_label=status_label)
 
         gs = _settle_if_needed(gs)
-        entry["gs"] = gs
+        entry = {**entry, "gs": gs}
+        store.put(hand_id, entry)
 
-        st = snapshot_state(gs)
+        st = _ui_state(request, gs)
         # 结束判定优先于构建 actions，避免 to_act 无效触发错误
         hand_over = _is_hand_over(gs)
         if hand_over:
             # 手牌结束时持久化回放数据
             from .views_play import _persist_replay
 
-            _persist_replay(hand_id, gs)
+            _persist_replay(hand_id, gs, entry)
             actions = {
                 "items": [],
                 "amount": {"show": False, "min": 1, "max": 0, "step": 1},
@@ -407,7 +394,7 @@ def ui_hand_act(request: HttpRequest, hand_id: str) -> HttpResponse:
             show_next_controls=hand_over,
             replay_url=f"/api/v1/ui/replay/{hand_id}" if hand_over else None,
             log_items=_log_items(gs),
-            reveal_opp=bool(request.session.get("teach", True) or _ended_by_showdown(gs)),
+            reveal_opp=_reveal_opp(request, gs),
         )
         return _oob_response(html, route=t0_route, method=method, status_label=status_label)
     finally:
@@ -434,17 +421,13 @@ def ui_toggle_teach(request: HttpRequest) -> HttpResponse:
         session_id = request.POST.get("session_id") or request.GET.get("session_id") or ""
         st: dict[str, Any] = {}
         if hand_id:
-            entry = HANDS.get(hand_id)
+            entry = get_hand_store().get(hand_id)
             if entry and entry.get("gs") is not None:
-                st = snapshot_state(entry["gs"])
+                st = _ui_state(request, entry["gs"])
 
         parts: list[str] = []
         if st:
-            try:
-                gs = entry.get("gs") if hand_id else None
-                rev = bool(teach or _ended_by_showdown(gs)) if gs is not None else bool(teach)
-            except Exception:
-                rev = bool(teach)
+            rev = _reveal_opp(request, entry["gs"])
             parts.append(
                 render_to_string(
                     "ui/_seats.html",
@@ -503,15 +486,10 @@ def ui_session_next(request: HttpRequest, session_id: str) -> HttpResponse:
 
         # Find latest completed hand for this session
         latest_gs, latest_cfg = None, None
-        latest_hid = None
-        for hid, item in reversed(list(HANDS.items())):
-            if item.get("session_id") == session_id:
-                gs = item.get("gs")
-                latest_gs = gs
-                latest_cfg = item.get("cfg")
-                latest_hid = hid
-                if getattr(gs, "street", None) == "complete":
-                    break
+        latest_hid, item = get_hand_store().latest_for_session(session_id, complete=True)
+        if item is not None:
+            latest_gs = item.get("gs")
+            latest_cfg = item.get("cfg")
         if latest_gs is None or getattr(latest_gs, "street", None) != "complete":
             status_label = "409"
             html = _render_error_only(request, "Cannot start next hand now")
@@ -602,15 +580,20 @@ def ui_session_next(request: HttpRequest, session_id: str) -> HttpResponse:
             except Exception:
                 pass
             return _oob_response(html, route=t0_route, method=method, status_label=status_label)
-        HANDS[new_hid] = {
-            "gs": gs_new,
-            "session_id": session_id,
-            "seed": seed,
-            "cfg": cfg_for_next,
-        }
+        store = get_hand_store()
+        store.put(
+            new_hid,
+            {
+                "gs": gs_new,
+                "session_id": session_id,
+                "seed": seed,
+                "cfg": cfg_for_next,
+            },
+        )
+        store.set_current(session_id, new_hid)
 
         # 片段渲染
-        st = snapshot_state(gs_new)
+        st = _ui_state(request, gs_new)
         actions = _actions_model(gs_new)
         html = _render_oob_fragments(
             request,
@@ -650,7 +633,7 @@ def ui_coach_suggest(request: HttpRequest, hand_id: str) -> HttpResponse:
     method = "POST"
     status_label = "200"
     try:
-        entry = HANDS.get(hand_id)
+        entry = get_hand_store().get(hand_id)
         if not entry or entry.get("gs") is None:
             status_label = "404"
             html = _render_error_only(request, "Object not found or expired")
@@ -658,7 +641,7 @@ def ui_coach_suggest(request: HttpRequest, hand_id: str) -> HttpResponse:
 
         s = get_object_or_404(Session, session_id=entry.get("session_id"))
         gs = entry.get("gs")
-        st = snapshot_state(gs)
+        st = _ui_state(request, gs)
         # If ended, do not provide suggestion (avoid to_act validation)
         if _is_hand_over(gs):
             status_label = "409"
@@ -851,12 +834,13 @@ def ui_replay_view(request: HttpRequest, hand_id: str) -> HttpResponse:
         # Try to get replay data from database (primary source)
         try:
             from .models import Replay
+            from .replays import replay_payload
 
             obj = Replay.objects.get(hand_id=hand_id)
-            replay_data = obj.payload
+            replay_data = replay_payload(obj)
         except Replay.DoesNotExist:
             # Fallback: try to get from memory if available
-            replay_data = HANDS.get(hand_id, {}).get("replay_data")
+            replay_data = (get_hand_store().get(hand_id) or {}).get("replay_data")
             if replay_data is None:
                 return HttpResponse("Replay not found", status=404)
 
@@ -908,12 +892,17 @@ def ui_start(request: HttpRequest) -> HttpResponse:
             button=int(s.button),
             seed=None,
         )
-        HANDS[hand_id] = {
-            "gs": gs,
-            "session_id": session_id,
-            "seed": None,
-            "cfg": s.config,
-        }
+        store = get_hand_store()
+        store.put(
+            hand_id,
+            {
+                "gs": gs,
+                "session_id": session_id,
+                "seed": None,
+                "cfg": s.config,
+            },
+        )
+        store.set_current(session_id, hand_id)
 
         resp = HttpResponse("", status=200)
         resp["HX-Redirect"] = f"/api/v1/ui/game/{session_id}/{hand_id}"
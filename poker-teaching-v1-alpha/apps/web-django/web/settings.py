@@ -48,6 +48,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "web.wsgi.application"
+ASGI_APPLICATION = "web.asgi.application"
 
 # Database: PostgreSQL if DATABASE_URL provided, else SQLite
 from urllib.parse import urlparse  # noqa: E402
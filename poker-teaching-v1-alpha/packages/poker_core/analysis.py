@@ -5,18 +5,17 @@ from typing import Any
 
 from poker_core.suggest.codes import SCodes, mk_note
 
-from .cards import get_rank_value, parse_card
+from .cards import CARD_RANK, CARD_SUIT, card_id
 
 
 # --- 基础特征提取 ---
-def _hole_features(cards: list[str]) -> dict[str, Any]:
+def _hole_features(cards: list[int | str]) -> dict[str, Any]:
     assert len(cards) == 2, "need exactly 2 cards"
-    r1, s1 = parse_card(cards[0])
-    r2, s2 = parse_card(cards[1])
-    v1, v2 = get_rank_value(r1), get_rank_value(r2)
+    c1, c2 = card_id(cards[0]), card_id(cards[1])
+    v1, v2 = CARD_RANK[c1], CARD_RANK[c2]
     hi, lo = max(v1, v2), min(v1, v2)
-    pair = r1 == r2
-    suited = s1 == s2
+    pair = v1 == v2
+    suited = CARD_SUIT[c1] == CARD_SUIT[c2]
     gap = abs(v1 - v2) - 1
     has_ace = (v1 == 14) or (v2 == 14)
     is_broadway = hi >= 10 and lo >= 10  # 两张牌都是broadway牌（TJQKA）
@@ -70,7 +69,7 @@ def _derive_tags(feat: dict[str, Any]) -> tuple[set[str], str]:
     return tags, hand_class
 
 
-def classify_starting_hand(cards: list[str]) -> dict[str, Any]:
+def classify_starting_hand(cards: list[int | str]) -> dict[str, Any]:
     feat = _hole_features(cards)
     tags, hand_class = _derive_tags(feat)
 
@@ -104,7 +103,7 @@ def classify_starting_hand(cards: list[str]) -> dict[str, Any]:
     }
 
 
-def annotate_player_hand(cards: list[str]) -> dict[str, Any]:
+def annotate_player_hand(cards: list[int | str]) -> dict[str, Any]:
     info = classify_starting_hand(cards)
     notes = []
     if "weak" in info["tags"]:
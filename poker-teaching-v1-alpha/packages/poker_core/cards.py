@@ -1,15 +1,65 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
 SUITS = ["s", "h", "d", "c"]  # spades, hearts, diamonds, clubs
 RANKS = ["A", "K", "Q", "J", "T", "9", "8", "7", "6", "5", "4", "3", "2"]  # 按强度降序
 
 RANK_ORDER: dict[str, int] = {rank: 14 - i for i, rank in enumerate(RANKS)}
 SUIT_NAMES = {"s": "♠", "h": "♥", "d": "♦", "c": "♣"}
 
+# --- 整数编码（引擎内部表示）---
+# card id = rank_idx * 4 + suit_idx；rank_idx: '2'=0 … 'A'=12，suit_idx 按 SUITS 顺序。
+# 字符串只在 API / 回放边界生成。
+RANK_CHARS = "23456789TJQKA"
+CARD_STRS: tuple[str, ...] = tuple(r + s for r in RANK_CHARS for s in SUITS)
+CARD_IDS: dict[str, int] = {c: i for i, c in enumerate(CARD_STRS)}
+# 预计算：id → 点数值（2..14，与 RANK_ORDER 一致）/ 花色索引（0..3）
+CARD_RANK: tuple[int, ...] = tuple(i // 4 + 2 for i in range(52))
+CARD_SUIT: tuple[int, ...] = tuple(i % 4 for i in range(52))
+
+
+def card_id(card: int | str) -> int:
+    """单张牌 → 整数 id。接受 int（原样返回）或 'Ah' / '10h' 等字符串。"""
+    if isinstance(card, int):
+        if 0 <= card < 52:
+            return card
+        raise ValueError(f"Invalid card id: {card}")
+    cid = CARD_IDS.get(card)
+    if cid is not None:
+        return cid
+    s = card.strip()
+    if len(s) == 3 and s[:2] == "10":
+        s = "T" + s[-1]
+    cid = CARD_IDS.get(s[:1].upper() + s[1:].lower())
+    if cid is None:
+        raise ValueError(f"Invalid card format: {card}")
+    return cid
+
+
+def card_str(card: int | str) -> str:
+    """单张牌 → 'Ah' 形式字符串（边界输出用）。"""
+    if isinstance(card, int):
+        return CARD_STRS[card]
+    return CARD_STRS[card_id(card)]
+
+
+def card_ids(cards: Iterable[int | str]) -> list[int]:
+    return [card_id(c) for c in cards]
+
+
+def card_strs(cards: Iterable[int | str]) -> list[str]:
+    return [card_str(c) for c in cards]
+
 
-def make_deck() -> list[str]:
-    return [rank + suit for rank in RANKS for suit in SUITS]
+def make_deck() -> list[int]:
+    # 保持历史顺序（A→2，s/h/d/c），保证同一 seed 洗出的牌序不变
+    return [CARD_IDS[rank + suit] for rank in RANKS for suit in SUITS]
 
 
-def parse_card(card: str) -> tuple[str, str]:
+def parse_card(card: int | str) -> tuple[str, str]:
+    if isinstance(card, int):
+        return RANK_CHARS[card // 4], SUITS[card % 4]
     if len(card) != 2:
         raise ValueError(f"Invalid card format: {card}")
     return card[0], card[1]
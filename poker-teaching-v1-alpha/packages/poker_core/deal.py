@@ -1,4 +1,4 @@
-from .cards import make_deck
+from .cards import card_str, make_deck
 from .rng import RNG
 
 
@@ -18,12 +18,13 @@ def deal_hand(seed: int | None = None, num_players: int = 2):
     ]
     players = []
     for p in range(num_players):
-        hole = [deck.pop(), deck.pop()]
+        hole = [card_str(deck.pop()), card_str(deck.pop())]
         steps.append({"idx": len(steps), "evt": "DEAL_HOLE", "payload": {"p": p, "cards": hole}})
         players.append({"pos": p, "hole": hole})
 
     return {
         "seed": seed if seed is not None else None,
+        "algo": rng.algo,
         "players": players,
         "steps": steps,
     }
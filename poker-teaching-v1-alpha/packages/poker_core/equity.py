@@ -0,0 +1,366 @@
+# packages/poker_core/equity.py
+"""
+HU 胜率计算（基于 providers.get_evaluator）。
+
+- equity_vs_hand：对手具体两张；剩余公共牌组合不多时穷举，否则蒙特卡洛
+- equity_vs_range：对手 169 标签范围（可带权重）；蒙特卡洛 + 置信区间提前停止，
+  可选进程池并行（模块级进程池复用；评估器按类路径在子进程内重建，不做 pickle）；
+  支持时间预算，便于教练/策略在请求内调用
+
+牌可为字符串或 cards.card_id 整数；评估器若提供 evaluate7_many 且装了 numpy，则批量评估。
+"""
+
+from __future__ import annotations
+
+import importlib
+import math
+import threading
+import time
+from collections.abc import Iterable, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import combinations
+
+from poker_core.cards import RANK_CHARS, card_id
+from poker_core.providers.interfaces import HandEvaluator
+from poker_core.providers.selector import get_evaluator
+from poker_core.rng import RNG
+
+# 95% 置信区间
+_Z95 = 1.96
+
+_POOL: ProcessPoolExecutor | None = None
+_POOL_WORKERS = 0
+_POOL_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class EquityResult:
+    equity: float  # win + tie / 2
+    win: float
+    tie: float
+    samples: int
+    stderr: float  # 单样本 equity 均值的标准误；穷举时为 0
+    exhaustive: bool = False
+
+
+@dataclass
+class _Tally:
+    wins: int = 0
+    ties: int = 0
+    n: int = 0
+    sq: float = 0.0  # Σ x²，x ∈ {1, 0.5, 0}
+
+    def add(self, wins: int, ties: int, n: int) -> None:
+        self.wins += wins
+        self.ties += ties
+        self.n += n
+        self.sq += wins + 0.25 * ties
+
+    def merge(self, other: _Tally) -> None:
+        self.wins += other.wins
+        self.ties += other.ties
+        self.n += other.n
+        self.sq += other.sq
+
+    def stderr(self) -> float:
+        if self.n < 2:
+            return float("inf")
+        mean = (self.wins + 0.5 * self.ties) / self.n
+        var = max(0.0, self.sq / self.n - mean * mean) * self.n / (self.n - 1)
+        return math.sqrt(var / self.n)
+
+    def result(self, *, exhaustive: bool = False) -> EquityResult:
+        n = max(1, self.n)
+        return EquityResult(
+            equity=(self.wins + 0.5 * self.ties) / n,
+            win=self.wins / n,
+            tie=self.ties / n,
+            samples=self.n,
+            stderr=0.0 if exhaustive else self.stderr(),
+            exhaustive=exhaustive,
+        )
+
+
+def _ids(cards: Iterable[int | str]) -> list[int]:
+    return [card_id(c) for c in cards]
+
+
+def _check_distinct(*groups: Sequence[int]) -> None:
+    allc = [c for g in groups for c in g]
+    if len(set(allc)) != len(allc):
+        raise ValueError("duplicate cards between hands/board")
+
+
+def _compare(ev: HandEvaluator, hero_rows: list[list[int]], vill_rows: list[list[int]]):
+    """逐行比较 hero/villain 的 7 张牌，返回 (wins, ties)。"""
+    if not hero_rows:
+        return 0, 0
+    try:
+        import numpy as np
+
+        many = ev.evaluate7_many(np.array(hero_rows + vill_rows, dtype=np.int64))
+        h, v = many[: len(hero_rows)], many[len(hero_rows) :]
+        return int((h > v).sum()), int((h == v).sum())
+    except ImportError:
+        pass
+    wins = ties = 0
+    for hr, vr in zip(hero_rows, vill_rows, strict=True):
+        hs = ev.evaluate7(hr[:2], hr[2:]).strength
+        vs = ev.evaluate7(vr[:2], vr[2:]).strength
+        if hs > vs:
+            wins += 1
+        elif hs == vs:
+            ties += 1
+    return wins, ties
+
+
+def _label_combos(label: str, dead: set[int]) -> list[tuple[int, int]]:
+    """169 标签（'AKs' / 'KQo' / 'TT'）→ 不含死牌的具体组合。"""
+    lab = label.strip()
+    r1, r2 = RANK_CHARS.index(lab[0].upper()), RANK_CHARS.index(lab[1].upper())
+    suited = lab[2:3].lower()
+    out: list[tuple[int, int]] = []
+    for s1 in range(4):
+        for s2 in range(4):
+            a, b = r1 * 4 + s1, r2 * 4 + s2
+            if r1 == r2:
+                if s1 >= s2:
+                    continue
+            elif suited == "s" and s1 != s2:
+                continue
+            elif suited == "o" and s1 == s2:
+                continue
+            if a in dead or b in dead:
+                continue
+            out.append((a, b))
+    return out
+
+
+def equity_vs_hand(
+    hole: Sequence[int | str],
+    villain_hole: Sequence[int | str],
+    board: Sequence[int | str] = (),
+    *,
+    evaluator: HandEvaluator | None = None,
+    max_enum: int = 50_000,
+    iters: int = 20_000,
+    seed: int | None = None,
+) -> EquityResult:
+    """Hero 对具体两张牌的胜率。
+
+    剩余公共牌组合数 ≤ max_enum（翻牌/转牌/河牌）时穷举；否则（翻前）按 seed 抽样 iters 次。
+    """
+    ev = evaluator or get_evaluator()
+    h, v, b = _ids(hole), _ids(villain_hole), _ids(board)
+    if len(h) != 2 or len(v) != 2 or len(b) > 5:
+        raise ValueError("expects 2 hole cards per player and at most 5 board cards")
+    _check_distinct(h, v, b)
+    live = [c for c in range(52) if c not in set(h + v + b)]
+    missing = 5 - len(b)
+
+    tally = _Tally()
+    if math.comb(len(live), missing) <= max_enum:
+        hero_rows, vill_rows = [], []
+        for runout in combinations(live, missing):
+            full = b + list(runout)
+            hero_rows.append(h + full)
+            vill_rows.append(v + full)
+        w, t = _compare(ev, hero_rows, vill_rows)
+        tally.add(w, t, len(hero_rows))
+        return tally.result(exhaustive=True)
+
+    rnd = RNG(seed=seed).create()
+    hero_rows, vill_rows = [], []
+    for _ in range(iters):
+        full = b + rnd.sample(live, missing)
+        hero_rows.append(h + full)
+        vill_rows.append(v + full)
+    w, t = _compare(ev, hero_rows, vill_rows)
+    tally.add(w, t, iters)
+    return tally.result()
+
+
+def _range_weights(range_169: Iterable[str] | Mapping[str, float]) -> list[tuple[str, float]]:
+    if isinstance(range_169, Mapping):
+        return [(k, float(w)) for k, w in range_169.items() if float(w) > 0]
+    return [(k, 1.0) for k in range_169]
+
+
+def _evaluator_spec(ev: HandEvaluator | None) -> str | None:
+    """评估器 → "模块:类名"（None 表示子进程内用 get_evaluator()）。
+
+    实例本身可能持有锁/缓存（如 PokerKitEvaluator 的 EvalCache）而无法 pickle，
+    子进程按类路径无参重建，并在进程内复用。
+    """
+    if ev is None:
+        return None
+    cls = type(ev)
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+@lru_cache(maxsize=8)
+def _evaluator_from_spec(spec: str) -> HandEvaluator:
+    module, _, name = spec.partition(":")
+    obj = importlib.import_module(module)
+    for part in name.split("."):
+        obj = getattr(obj, part)
+    return obj()
+
+
+def _process_pool(workers: int) -> ProcessPoolExecutor:
+    """进程内共享的进程池；请求的并行度超过现有池时重建。"""
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_WORKERS < workers:
+            if _POOL is not None:
+                _POOL.shutdown(wait=False)
+            _POOL = ProcessPoolExecutor(max_workers=workers)
+            _POOL_WORKERS = workers
+        return _POOL
+
+
+def shutdown_pool(wait: bool = True) -> None:
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        pool, _POOL, _POOL_WORKERS = _POOL, None, 0
+    if pool is not None:
+        pool.shutdown(wait=wait)
+
+
+def _mc_vs_range_worker(
+    hole: list[int],
+    board: list[int],
+    combos: list[tuple[int, int]],
+    cum_weights: list[float],
+    iters: int,
+    seed: int | None,
+    batch: int,
+    ci_halfwidth: float,
+    budget_s: float | None,
+    evaluator_spec: str | None,
+) -> _Tally:
+    ev = _evaluator_from_spec(evaluator_spec) if evaluator_spec else None
+    return _mc_vs_range(
+        hole, board, combos, cum_weights, iters, seed, batch, ci_halfwidth, budget_s, ev
+    )
+
+
+def _mc_vs_range(
+    hole: list[int],
+    board: list[int],
+    combos: list[tuple[int, int]],
+    cum_weights: list[float],
+    iters: int,
+    seed: int | None,
+    batch: int,
+    ci_halfwidth: float,
+    budget_s: float | None,
+    evaluator: HandEvaluator | None,
+) -> _Tally:
+    # 截止时间在执行进程内计算：perf_counter 的参考点跨进程无定义
+    deadline = None if budget_s is None else time.perf_counter() + budget_s
+    ev = evaluator or get_evaluator()
+    rnd = RNG(seed=seed).create()
+    dead = set(hole + board)
+    live = [c for c in range(52) if c not in dead]
+    missing = 5 - len(board)
+    tally = _Tally()
+    while tally.n < iters:
+        k = min(batch, iters - tally.n)
+        picks = rnd.choices(combos, cum_weights=cum_weights, k=k)
+        hero_rows, vill_rows = [], []
+        for a, b in picks:
+            draw = rnd.sample(live, missing + 2)
+            runout = [c for c in draw if c != a and c != b][:missing]
+            full = board + runout
+            hero_rows.append(hole + full)
+            vill_rows.append([a, b] + full)
+        w, t = _compare(ev, hero_rows, vill_rows)
+        tally.add(w, t, k)
+        if ci_halfwidth > 0 and _Z95 * tally.stderr() <= ci_halfwidth:
+            break
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+    return tally
+
+
+def equity_vs_range(
+    hole: Sequence[int | str],
+    range_169: Iterable[str] | Mapping[str, float],
+    board: Sequence[int | str] = (),
+    iters: int = 20_000,
+    *,
+    seed: int | None = None,
+    evaluator: HandEvaluator | None = None,
+    ci_halfwidth: float = 0.0,
+    batch: int = 1_000,
+    workers: int = 1,
+    time_budget_ms: float | None = None,
+) -> EquityResult:
+    """Hero 对 169 标签范围的蒙特卡洛胜率。
+
+    - range_169：标签序列，或 {标签: 权重}；组合按具体 combo 计数（对子 6 / 同花 4 / 杂色 12）
+    - 每批 batch 个样本后检查：95% 置信半宽 ≤ ci_halfwidth 即停止（0 表示跑满 iters）
+    - workers>1：进程池并行（池在调用间复用），各进程使用由 seed 派生的独立种子；
+      evaluator 在子进程内按类无参重建
+    - time_budget_ms：超时即返回当前估计
+    """
+    h, b = _ids(hole), _ids(board)
+    if len(h) != 2 or len(b) > 5:
+        raise ValueError("expects 2 hole cards and at most 5 board cards")
+    _check_distinct(h, b)
+    dead = set(h + b)
+    combos: list[tuple[int, int]] = []
+    cum_weights: list[float] = []
+    acc = 0.0
+    for label, w in _range_weights(range_169):
+        for combo in _label_combos(label, dead):
+            acc += w
+            combos.append(combo)
+            cum_weights.append(acc)
+    if not combos:
+        raise ValueError("range is empty after removing dead cards")
+
+    budget_s = None if time_budget_ms is None else float(time_budget_ms) / 1000.0
+
+    workers = max(1, int(workers))
+    if workers == 1:
+        tally = _mc_vs_range(
+            h, b, combos, cum_weights, iters, seed, batch, ci_halfwidth, budget_s, evaluator
+        )
+        return tally.result()
+
+    # 并行：均分样本，余数归最后一个进程（总数恰为 iters）；
+    # 置信目标按 √workers 放宽，合并后整体半宽约等于 ci_halfwidth
+    workers = min(workers, max(1, iters))
+    share = iters // workers
+    shares = [share] * (workers - 1) + [iters - share * (workers - 1)]
+    ci_each = ci_halfwidth * math.sqrt(workers)
+    base = seed if seed is not None else int(time.time_ns() & 0xFFFFFFFF)
+    spec = _evaluator_spec(evaluator)
+    pool = _process_pool(workers)
+    futs = [
+        pool.submit(
+            _mc_vs_range_worker,
+            h,
+            b,
+            combos,
+            cum_weights,
+            n,
+            base * 1009 + i,
+            batch,
+            ci_each,
+            budget_s,
+            spec,
+        )
+        for i, n in enumerate(shares)
+    ]
+    tally = _Tally()
+    for f in futs:
+        tally.merge(f.result())
+    return tally.result()
+
+
+__all__ = ["EquityResult", "equity_vs_hand", "equity_vs_range", "shutdown_pool"]
@@ -0,0 +1,261 @@
+# packages/poker_core/event_log.py
+"""
+持久化（只追加）事件流。
+
+GameState 是冻结 dataclass，事件流也应随状态“不可变”：旧状态看到的事件永远不变。
+EventLog = 共享缓冲区 + 本视图长度：
+- append() 返回新视图，O(1) 均摊：若缓冲区尾部恰是本视图末尾，则原地追加并共享；
+  否则（旧状态上分叉）复制前缀后追加（copy-on-branch）
+- 快照即视图本身，O(1)；旧状态无需 deepcopy 也不会被后继污染
+
+事件以 EventRecord（__slots__ + EventType 类型码）存储，仍可按 dict 读取（e["t"] / e.get）。
+每个视图附带增量维护的 EventIndex（街边界偏移、翻前加注次数、各街最后进攻者、PFR），
+suggest 层据此 O(1) 取值，无需重扫事件。
+
+按只读序列使用（len / 下标 / 切片 / 迭代 / reversed / 与 list 比较）；需要 JSON 时
+[dict(e) for e in log]。同一缓冲区上的并发写分支不加锁（一手牌只在单个请求内推进）。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, replace
+from enum import IntEnum
+from itertools import islice
+from typing import Any, overload
+
+
+class EventType(IntEnum):
+    OTHER = 0
+    BLIND = 1
+    DEAL_HOLE = 2
+    BOARD = 3
+    CHECK = 4
+    FOLD = 5
+    CALL = 6
+    CALL_SHORT = 7
+    BET = 8
+    RAISE = 9
+    ALLIN = 10
+    WIN_FOLD = 11
+    SHOWDOWN = 12
+    SPLIT = 13
+    WIN_SHOWDOWN = 14
+
+
+_CODES: dict[str, EventType] = {e.name.lower(): e for e in EventType if e is not EventType.OTHER}
+
+# 相同字段集合的记录共享同一个 keys 元组
+_KEYSETS: dict[tuple[str, ...], tuple[str, ...]] = {}
+
+
+class EventRecord(Mapping[str, Any]):
+    """紧凑事件记录：类型码 + 共享字段名元组 + 值元组；对外表现为只读 dict。"""
+
+    __slots__ = ("code", "_k", "_v")
+
+    def __init__(self, fields: Mapping[str, Any]):
+        k = tuple(fields)
+        self._k = _KEYSETS.setdefault(k, k)
+        self._v = tuple(fields.values())
+        self.code = _CODES.get(fields.get("t"), EventType.OTHER)  # type: ignore[arg-type]
+
+    @classmethod
+    def of(cls, ev: Mapping[str, Any]) -> EventRecord:
+        return ev if isinstance(ev, EventRecord) else cls(ev)
+
+    @classmethod
+    def from_items(cls, keys: tuple[str, ...], values: tuple[Any, ...]) -> EventRecord:
+        """由字段名元组与值元组直接构造（解码路径，免去中间 dict）。"""
+        rec = object.__new__(cls)
+        rec._k = _KEYSETS.setdefault(keys, keys)
+        rec._v = values
+        rec.code = _CODES.get(values[keys.index("t")] if "t" in keys else None, EventType.OTHER)
+        return rec
+
+    @property
+    def items_tuple(self) -> tuple[tuple[str, ...], tuple[Any, ...]]:
+        """(字段名元组, 值元组)，编码路径按位置读取。"""
+        return self._k, self._v
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._v[self._k.index(key)]
+        except ValueError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._k
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._k)
+
+    def __len__(self) -> int:
+        return len(self._k)
+
+    @property
+    def who(self) -> int | None:
+        return self.get("who")
+
+    def __repr__(self) -> str:
+        return f"EventRecord({dict(zip(self._k, self._v, strict=True))!r})"
+
+
+_SEGMENTS = ("preflop", "flop", "turn", "river")
+_SEGMENT_IDX = {s: i for i, s in enumerate(_SEGMENTS)}
+
+
+def _is_aggressive(rec: EventRecord) -> bool:
+    code = rec.code
+    if code is EventType.BET or code is EventType.RAISE:
+        return True
+    return code is EventType.ALLIN and str(rec.get("as") or "").lower() in ("bet", "raise")
+
+
+@dataclass(frozen=True, slots=True)
+class EventIndex:
+    """随 append 增量维护的派生字段（与 suggest.utils 中 infer_* 的扫描口径一致）。"""
+
+    segment: int = 0  # 当前所处街段：0 preflop / 1 flop / 2 turn / 3 river
+    street_offsets: tuple[int, int, int, int] = (0, -1, -1, -1)  # 各街 board 事件下标
+    preflop_raises: int = 0  # raise 与 allin(as=raise)，不含 bet
+    aggressors: tuple[int | None, ...] = (None, None, None, None)  # 各街最后进攻者
+
+    @property
+    def pfr(self) -> int | None:
+        return self.aggressors[0]
+
+    def street_offset(self, street: str) -> int | None:
+        i = _SEGMENT_IDX.get(street)
+        if i is None or self.street_offsets[i] < 0:
+            return None
+        return self.street_offsets[i]
+
+    def last_aggressor(self, street: str) -> int | None:
+        i = _SEGMENT_IDX.get(street)
+        return None if i is None else self.aggressors[i]
+
+    def advance(self, rec: EventRecord, pos: int) -> EventIndex:
+        code = rec.code
+        if code is EventType.BOARD:
+            seg = _SEGMENT_IDX.get(str(rec.get("street") or "").lower())
+            if seg is None or seg == 0:
+                return self
+            offsets = list(self.street_offsets)
+            offsets[seg] = pos
+            return replace(self, segment=seg, street_offsets=tuple(offsets))  # type: ignore[arg-type]
+        if not _is_aggressive(rec):
+            return self
+        seg = self.segment
+        raises = self.preflop_raises
+        if seg == 0 and (code is EventType.RAISE or str(rec.get("as") or "").lower() == "raise"):
+            raises += 1
+        aggr = self.aggressors
+        if "who" in rec:
+            lst = list(aggr)
+            lst[seg] = int(rec["who"])
+            aggr = tuple(lst)
+        return replace(self, aggressors=aggr, preflop_raises=raises)
+
+
+_EMPTY_INDEX = EventIndex()
+
+
+class EventLog(Sequence[EventRecord]):
+    __slots__ = ("_buf", "_n", "_idx")
+
+    def __init__(self, items: Iterable[Mapping[str, Any]] = ()):
+        self._buf: list[EventRecord] = []
+        self._n = 0
+        self._idx = _EMPTY_INDEX
+        for ev in items:
+            rec = EventRecord.of(ev)
+            self._idx = self._idx.advance(rec, self._n)
+            self._buf.append(rec)
+            self._n += 1
+
+    @classmethod
+    def _view(cls, buf: list[EventRecord], n: int, idx: EventIndex) -> EventLog:
+        log = object.__new__(cls)
+        log._buf = buf
+        log._n = n
+        log._idx = idx
+        return log
+
+    @property
+    def index(self) -> EventIndex:
+        return self._idx
+
+    def append(self, ev: Mapping[str, Any]) -> EventLog:
+        rec = EventRecord.of(ev)
+        buf = self._buf
+        if len(buf) != self._n:
+            buf = buf[: self._n]
+        buf.append(rec)
+        return EventLog._view(buf, self._n + 1, self._idx.advance(rec, self._n))
+
+    def extend(self, evs: Iterable[Mapping[str, Any]]) -> EventLog:
+        log = self
+        for ev in evs:
+            log = log.append(ev)
+        return log
+
+    def street_events(self, street: str) -> list[EventRecord]:
+        """某街段的事件（含该街的 board 事件）；未到达的街返回空列表。"""
+        start = self._idx.street_offset(street)
+        if start is None:
+            return []
+        i = _SEGMENT_IDX[street]
+        end = self._n
+        for nxt in self._idx.street_offsets[i + 1 :]:
+            if nxt >= 0:
+                end = nxt
+                break
+        return self._buf[start:end]
+
+    def __len__(self) -> int:
+        return self._n
+
+    @overload
+    def __getitem__(self, i: int) -> EventRecord: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> list[EventRecord]: ...
+
+    def __getitem__(self, i: int | slice) -> Any:
+        if isinstance(i, slice):
+            return self._buf[: self._n][i]
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError("event index out of range")
+        return self._buf[i]
+
+    def __iter__(self) -> Iterator[EventRecord]:
+        return islice(self._buf, self._n)
+
+    def __reversed__(self) -> Iterator[EventRecord]:
+        buf = self._buf
+        for i in range(self._n - 1, -1, -1):
+            yield buf[i]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, EventLog):
+            return self._n == other._n and (
+                (self._buf is other._buf) or self._buf[: self._n] == other._buf[: other._n]
+            )
+        if isinstance(other, Sequence) and not isinstance(other, str | bytes):
+            return len(other) == self._n and all(a == b for a, b in zip(self, other, strict=True))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"EventLog({[dict(e) for e in self]!r})"
+
+    def to_list(self) -> list[dict]:
+        """JSON 友好的副本（普通 dict）。"""
+        return [dict(e) for e in self]
+
+
+__all__ = ["EventLog", "EventRecord", "EventType", "EventIndex"]
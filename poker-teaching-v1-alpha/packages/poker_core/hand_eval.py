@@ -20,15 +20,15 @@ except Exception:  # pragma: no cover - defensive import
     _POKERKIT_AVAILABLE = False
 
 
-def _fallback_strength(cards7: list[str]) -> int:
+def _fallback_strength(cards7: list[int | str]) -> int:
     """Very rough heuristic based on top-5 rank sum.
 
     Keeps behavior compatible with existing tests when `pokerkit` is not
     installed. Uses project-local card utilities.
     """
-    from .cards import get_rank_value, parse_card
+    from .cards import CARD_RANK, card_id
 
-    values = [get_rank_value(parse_card(c)[0]) for c in cards7]
+    values = [CARD_RANK[card_id(c)] for c in cards7]
     return sum(sorted(values, reverse=True)[:5])
 
 
@@ -0,0 +1,107 @@
+"""
+评估结果缓存（进程内共享）
+
+- 键：规范化的 7 张牌元组（与评估器实例无关）
+- 大小/策略来自环境变量：
+  - POKER_EVAL_CACHE_SIZE：条目上限（默认 4096；0 表示不缓存）
+  - POKER_EVAL_CACHE_POLICY：lru（默认）| none
+- 统计命中/未命中/淘汰次数，供 Web 层导出到 Prometheus
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+DEFAULT_SIZE = 4096
+POLICIES = ("lru", "none")
+
+# get() 未命中时的默认返回值（哨兵）
+MISS = object()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+    policy: str
+
+
+class EvalCache:
+    def __init__(self, maxsize: int = DEFAULT_SIZE, policy: str = "lru"):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown eval cache policy: {policy}")
+        self.maxsize = max(0, int(maxsize))
+        self.policy = policy if self.maxsize > 0 else "none"
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = MISS) -> Any:
+        with self._lock:
+            if self.policy == "none":
+                self.misses += 1
+                return default
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.policy == "none":
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                size=len(self._data),
+                maxsize=self.maxsize,
+                policy=self.policy,
+            )
+
+
+def cache_from_env() -> EvalCache:
+    try:
+        size = int(os.getenv("POKER_EVAL_CACHE_SIZE") or DEFAULT_SIZE)
+    except ValueError:
+        size = DEFAULT_SIZE
+    policy = (os.getenv("POKER_EVAL_CACHE_POLICY") or "lru").strip().lower()
+    if policy not in POLICIES:
+        policy = "lru"
+    return EvalCache(maxsize=size, policy=policy)
+
+
+@lru_cache(maxsize=1)
+def get_eval_cache() -> EvalCache:
+    """进程内共享的评估缓存（首次调用时按环境变量创建）。"""
+    return cache_from_env()
+
+
+__all__ = ["EvalCache", "CacheStats", "MISS", "cache_from_env", "get_eval_cache"]
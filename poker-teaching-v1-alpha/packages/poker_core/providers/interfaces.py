@@ -2,6 +2,8 @@
 提供评估 7 张牌强度的接口。
 
 - 使用 `HandEvaluator` 接口，实现 `evaluate7` 方法
+- 牌可为字符串（'Ah'）或 `cards.card_id` 整数编码（引擎内部表示）
+- 批量入口 `evaluate7_many`：默认逐个调用 `evaluate7`，查表评估器提供向量化实现
 - 返回 `EvalResult` 对象，包含最佳五张牌和强度值
 - 强度值是一个可比较的对象，用于比较两张手牌的强度
 - 可选的教学分类（先留空，或简单实现）
@@ -23,7 +25,31 @@ class EvalResult:
 
 
 class HandEvaluator(Protocol):
-    def evaluate7(self, hole: Sequence[str], board: Sequence[str]) -> EvalResult: ...
+    def evaluate7(self, hole: Sequence[int | str], board: Sequence[int | str]) -> EvalResult: ...
+
+    def evaluate7_many(self, cards: Any) -> Any:
+        """批量评估。
+
+        cards: 形如 (N, 7) 的整数牌数组（cards.card_id 编码，前 2 张为手牌）。
+        返回长度 N 的 numpy 数组；同一评估器返回的值可逐元素比较（越大越强）。
+        默认实现逐行调用 evaluate7（object 数组，元素为 Strength）。
+        """
+        import numpy as np
+
+        arr = _as_card_matrix(cards)
+        out = np.empty(arr.shape[0], dtype=object)
+        for i, row in enumerate(arr.tolist()):
+            out[i] = self.evaluate7(row[:2], row[2:]).strength
+        return out
+
+
+def _as_card_matrix(cards: Any) -> Any:
+    import numpy as np
+
+    arr = np.asarray(cards)
+    if arr.ndim != 2 or arr.shape[1] != 7:
+        raise ValueError("evaluate7_many expects an array of shape (N, 7)")
+    return arr
 
 
 class Strength:
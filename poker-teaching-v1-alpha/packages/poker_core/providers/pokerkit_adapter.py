@@ -4,13 +4,18 @@ PokerKit 适配器
 使用 PokerKit 库评估 7 张牌的强度。
 """
 
-import functools
 from collections.abc import Sequence
 
+from poker_core.cards import CARD_STRS
+
+from .eval_cache import MISS, EvalCache, get_eval_cache
 from .interfaces import EvalResult, EvaluationError, HandEvaluator, Strength
 
 
-def _canon_card(c: str) -> str:
+def _canon_card(c: int | str) -> str:
+    if isinstance(c, int):
+        # 引擎内部的整数编码，直接查表
+        return CARD_STRS[c]
     c = c.strip()
     if len(c) == 3 and c[:2] == "10":
         return "T" + c[-1].lower()  # 花色保持小写，PokerKit期望小写
@@ -18,7 +23,7 @@ def _canon_card(c: str) -> str:
     return r + s
 
 
-def _canon7(hole: Sequence[str], board: Sequence[str]) -> tuple[str, ...]:
+def _canon7(hole: Sequence[int | str], board: Sequence[int | str]) -> tuple[str, ...]:
     if len(hole) != 2 or len(board) != 5:
         raise ValueError("evaluate7 expects exactly 2 hole cards and 5 board cards")
     cards = tuple(sorted(_canon_card(x) for x in list(hole) + list(board)))
@@ -29,14 +34,23 @@ def _canon7(hole: Sequence[str], board: Sequence[str]) -> tuple[str, ...]:
 
 
 class PokerKitEvaluator(HandEvaluator):
-    def __init__(self):
+    def __init__(self, cache: EvalCache | None = None):
         # 延迟导入，隔离依赖
         from pokerkit import StandardHighHand
 
         self._StandardHighHand = StandardHighHand
+        # 默认使用进程内共享缓存（大小/策略见 eval_cache）
+        self._cache = cache if cache is not None else get_eval_cache()
 
-    @functools.lru_cache(maxsize=4096)
     def _eval_cached(self, canon: tuple[str, ...]) -> EvalResult:
+        hit = self._cache.get(canon)
+        if hit is not MISS:
+            return hit
+        res = self._eval(canon)
+        self._cache.put(canon, res)
+        return res
+
+    def _eval(self, canon: tuple[str, ...]) -> EvalResult:
         """
         canon: 7 张牌的规范化元组（已排序、去重校验过）
         注意：from_game 需要 2+5；对高牌评估来说分界不影响结果。
@@ -52,6 +66,6 @@ class PokerKitEvaluator(HandEvaluator):
             # 统一包装，方便上层降级到 FallbackEvaluator
             raise EvaluationError("pokerkit_error", original=str(e))
 
-    def evaluate7(self, hole: Sequence[str], board: Sequence[str]) -> EvalResult:
+    def evaluate7(self, hole: Sequence[int | str], board: Sequence[int | str]) -> EvalResult:
         canon = _canon7(hole, board)
         return self._eval_cached(canon)
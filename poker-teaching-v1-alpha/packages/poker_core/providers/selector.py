@@ -3,7 +3,7 @@
 
 - 优先使用 PokerKit 评估器
 - 若 PokerKit 不可用，则使用简单的启发式评估器
-- 支持环境变量控制：POKER_EVAL=pokerkit 或 POKER_EVAL=fallback
+- 支持环境变量控制：POKER_EVAL=pokerkit / fallback / table（查表评估器，无三方依赖）
 """
 
 import os
@@ -19,6 +19,12 @@ def _new_pokerkit() -> HandEvaluator:
     return PokerKitEvaluator()
 
 
+def _new_table() -> HandEvaluator:
+    from .table_eval import TableEvaluator
+
+    return TableEvaluator()
+
+
 @lru_cache(maxsize=1)
 def get_evaluator() -> HandEvaluator:
     want = (os.getenv("POKER_EVAL") or "").strip().lower()
@@ -27,6 +33,8 @@ def get_evaluator() -> HandEvaluator:
         return _new_pokerkit()
     if want == "fallback":
         return SimpleFallbackEvaluator()
+    if want == "table":
+        return _new_table()
 
     # 未设置：优先 pokerkit，失败则回退
     try:
@@ -4,22 +4,30 @@
 
 from collections.abc import Sequence
 
-from poker_core.cards import get_rank_value, parse_card
+from poker_core.cards import CARD_RANK, card_id, card_str
 
-from .interfaces import EvalResult, HandEvaluator, Strength
+from .interfaces import EvalResult, HandEvaluator, Strength, _as_card_matrix
 
 
-def _score7(hole: Sequence[str], board: Sequence[str]) -> tuple[int, list[str]]:
+def _score7(hole: Sequence[int | str], board: Sequence[int | str]) -> tuple[int, list[str]]:
     # 教学启发式：取7张里按 rank 值最高的5张求和，返回(分数, 最佳五张)
-    cards = list(hole) + list(board)
+    ids = [card_id(c) for c in list(hole) + list(board)]
     # 按 rank 值降序
-    cards_sorted = sorted(cards, key=lambda c: get_rank_value(parse_card(c)[0]), reverse=True)
-    best5 = cards_sorted[:5]
-    score = sum(get_rank_value(parse_card(c)[0]) for c in best5)
-    return score, best5
+    ids_sorted = sorted(ids, key=CARD_RANK.__getitem__, reverse=True)
+    best5 = ids_sorted[:5]
+    score = sum(CARD_RANK[c] for c in best5)
+    return score, [card_str(c) for c in best5]
 
 
 class SimpleFallbackEvaluator(HandEvaluator):
     def evaluate7(self, hole, board):
         score, best5 = _score7(hole, board)
         return EvalResult(best5=best5, strength=Strength(score), category=None)
+
+    def evaluate7_many(self, cards):
+        # 与 _score7 同口径：7 张中点数最高的 5 张求和（int64 数组）
+        import numpy as np
+
+        ranks = (_as_card_matrix(cards).astype(np.int64) >> 2) + 2
+        ranks.sort(axis=1)
+        return ranks[:, 2:].sum(axis=1)
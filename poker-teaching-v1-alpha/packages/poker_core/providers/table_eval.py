@@ -0,0 +1,231 @@
+"""
+查表式 7 张牌评估器
+
+- 非同花部分：7 张牌的点数多重集（约 5 万种）→ 预计算强度，键为 Σ5^rank
+- 同花部分：同花色 13 位点数掩码（8192 项）→ 预计算同花/同花顺强度
+- 单次评估只需若干次字典/列表查找，无三方依赖
+- 批量评估 `evaluate7_many` 用 numpy 向量化（排序键 + searchsorted、同花掩码直接索引）
+
+强度编码为整数：category << 20 | 五张牌点数（按重要性排序，每张 4 位）。
+数值越大越强，可直接比较；同一评估器内不同手牌可比。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Any
+
+from poker_core.cards import CARD_STRS, card_id
+
+from .interfaces import (
+    EvalResult,
+    EvaluationError,
+    HandEvaluator,
+    Strength,
+    _as_card_matrix,
+)
+
+CATEGORY_NAMES = (
+    "high_card",
+    "pair",
+    "two_pair",
+    "trips",
+    "straight",
+    "flush",
+    "full_house",
+    "quads",
+    "straight_flush",
+)
+
+_POW5 = [5**r for r in range(13)]
+
+# 顺子掩码：高张点数 → 5 位掩码（含 A-5 wheel，高张为 '5'）
+_STRAIGHTS: list[tuple[int, int]] = [(hi, 0b11111 << (hi - 4)) for hi in range(12, 3, -1)]
+_STRAIGHTS.append((3, (1 << 12) | 0b1111))
+
+
+def _pack(category: int, ranks: Sequence[int]) -> int:
+    v = category
+    for r in ranks:
+        v = (v << 4) | r
+    return v
+
+
+def _straight_high(mask: int) -> int:
+    for hi, m in _STRAIGHTS:
+        if mask & m == m:
+            return hi
+    return -1
+
+
+def _straight_ranks(hi: int) -> list[int]:
+    if hi == 3:
+        return [3, 2, 1, 0, 12]
+    return [hi, hi - 1, hi - 2, hi - 3, hi - 4]
+
+
+def _value_from_counts(counts: Sequence[int]) -> int:
+    """由点数计数（忽略花色）计算最佳五张的强度。"""
+    by_count: dict[int, list[int]] = {4: [], 3: [], 2: [], 1: []}
+    mask = 0
+    for r in range(12, -1, -1):
+        c = counts[r]
+        if c:
+            by_count[c].append(r)
+            mask |= 1 << r
+    quads, trips, pairs, singles = by_count[4], by_count[3], by_count[2], by_count[1]
+
+    if quads:
+        q = quads[0]
+        kicker = max(r for r in range(13) if counts[r] and r != q)
+        return _pack(7, [q, q, q, q, kicker])
+    if trips and (len(trips) > 1 or pairs):
+        t = trips[0]
+        p = max([r for r in trips[1:]] + pairs)
+        return _pack(6, [t, t, t, p, p])
+    hi = _straight_high(mask)
+    if hi >= 0:
+        return _pack(4, _straight_ranks(hi))
+    if trips:
+        t = trips[0]
+        return _pack(3, [t, t, t] + singles[:2])
+    if len(pairs) >= 2:
+        p1, p2 = pairs[0], pairs[1]
+        kicker = max(pairs[2:] + singles[:1])
+        return _pack(2, [p1, p1, p2, p2, kicker])
+    if pairs:
+        p = pairs[0]
+        return _pack(1, [p, p] + singles[:3])
+    return _pack(0, singles[:5])
+
+
+def _value_from_suit_mask(mask: int) -> int:
+    """同花色点数掩码（≥5 张）→ 同花 / 同花顺强度；不足 5 张返回 0。"""
+    if bin(mask).count("1") < 5:
+        return 0
+    hi = _straight_high(mask)
+    if hi >= 0:
+        return _pack(8, _straight_ranks(hi))
+    ranks = [r for r in range(12, -1, -1) if mask >> r & 1][:5]
+    return _pack(5, ranks)
+
+
+@lru_cache(maxsize=1)
+def _rank_table() -> dict[int, int]:
+    """枚举所有 7 张点数多重集（每个点数 ≤4 张）。"""
+    table: dict[int, int] = {}
+    counts = [0] * 13
+
+    def _walk(rank: int, left: int, key: int) -> None:
+        if rank == 13:
+            if left == 0:
+                table[key] = _value_from_counts(counts)
+            return
+        for c in range(min(4, left) + 1):
+            counts[rank] = c
+            _walk(rank + 1, left - c, key + c * _POW5[rank])
+        counts[rank] = 0
+
+    _walk(0, 7, 0)
+    return table
+
+
+@lru_cache(maxsize=1)
+def _flush_table() -> list[int]:
+    return [_value_from_suit_mask(m) for m in range(1 << 13)]
+
+
+@lru_cache(maxsize=1)
+def _np_tables():
+    """numpy 版查找表：(排序后的点数键, 对应强度, 同花表, 5^rank)。"""
+    import numpy as np
+
+    table = _rank_table()
+    keys = np.fromiter(sorted(table), dtype=np.int64, count=len(table))
+    values = np.fromiter((table[k] for k in keys.tolist()), dtype=np.int64, count=len(table))
+    flush = np.asarray(_flush_table(), dtype=np.int64)
+    pow5 = np.asarray(_POW5, dtype=np.int64)
+    return keys, values, flush, pow5
+
+
+def value7(ids: Sequence[int]) -> int:
+    """7 张牌（cards.card_id 整数编码）→ 整数强度。不做合法性校验。"""
+    key = 0
+    suit_masks = [0, 0, 0, 0]
+    for c in ids:
+        r = c >> 2
+        key += _POW5[r]
+        suit_masks[c & 3] |= 1 << r
+    best = _rank_table()[key]
+    flush = _flush_table()
+    for m in suit_masks:
+        fv = flush[m]
+        if fv > best:
+            best = fv
+    return best
+
+
+def _best5(value: int, ids: Sequence[int]) -> list[str]:
+    category = value >> 20
+    ranks = [(value >> shift) & 0xF for shift in (16, 12, 8, 4, 0)]
+    pool = list(ids)
+    if category in (5, 8):
+        # 同花类：只从同花色中取
+        suit_counts = [0, 0, 0, 0]
+        for c in pool:
+            suit_counts[c & 3] += 1
+        suit = max(range(4), key=lambda s: suit_counts[s])
+        pool = [c for c in pool if c & 3 == suit]
+    out: list[str] = []
+    for r in ranks:
+        for i, c in enumerate(pool):
+            if c >> 2 == r:
+                out.append(CARD_STRS[c])
+                pool.pop(i)
+                break
+    return out
+
+
+def values7_many(cards) -> Any:
+    """(N, 7) 整数牌数组 → (N,) int64 强度数组。不做重复牌校验。"""
+    import numpy as np
+
+    keys, values, flush, pow5 = _np_tables()
+    arr = _as_card_matrix(cards).astype(np.int64, copy=False)
+    if arr.size and (arr.min() < 0 or arr.max() > 51):
+        raise ValueError("card ids must be in 0..51")
+    ranks = arr >> 2
+    suits = arr & 3
+    best = values[np.searchsorted(keys, pow5[ranks].sum(axis=1))]
+    bits = np.left_shift(1, ranks)
+    for s in range(4):
+        mask = np.where(suits == s, bits, 0).sum(axis=1)  # 同一花色内点数互异，求和即按位或
+        np.maximum(best, flush[mask], out=best)
+    return best
+
+
+class TableEvaluator(HandEvaluator):
+    def __init__(self):
+        # 预热查找表（首次约数百毫秒，之后进程内复用）
+        _rank_table()
+        _flush_table()
+
+    def evaluate7(self, hole: Sequence[int | str], board: Sequence[int | str]) -> EvalResult:
+        if len(hole) != 2 or len(board) != 5:
+            raise ValueError("evaluate7 expects exactly 2 hole cards and 5 board cards")
+        ids = [card_id(c) for c in list(hole) + list(board)]
+        if len(set(ids)) != 7:
+            raise EvaluationError("duplicate_card", detail={"cards": [CARD_STRS[c] for c in ids]})
+        value = value7(ids)
+        return EvalResult(
+            best5=_best5(value, ids),
+            strength=Strength(value),
+            category=CATEGORY_NAMES[value >> 20],
+        )
+
+    def evaluate7_many(self, cards) -> Any:
+        return values7_many(cards)
+
+
+__all__ = ["TableEvaluator", "CATEGORY_NAMES", "value7", "values7_many"]
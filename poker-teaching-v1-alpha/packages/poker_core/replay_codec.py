@@ -0,0 +1,371 @@
+"""
+紧凑回放编码：一手 HU 牌局 ≈ 几十字节。
+
+只存“重建所需的最小信息”，完整回放（events/players/steps…）按需经 state_hu 重新模拟得到：
+- 头部：编码版本、类型、标志位、seed（可选）、盲注、开局筹码、按钮
+- 牌：已发出的牌（底牌 4 张按发牌顺序 + 已发公共牌），每张 1 字节 card id；
+  未发出的牌按 make_deck 顺序补齐，不影响已结束手牌的重建（seed=None 的手牌同样可回放）。
+  进行中的手牌需 full_deck=True：连同剩余牌序一起存（共 52 字节），后续发牌保持不变
+- 动作流：每个动作 1 字节动作码；bet 附带 varint 下注额，raise 附带 varint “加注到”
+- session_id：UUID 形式存 16 字节，否则存 varint 长度 + UTF-8
+
+另有 deal 类型（/table/deal 的多人发底牌）：seed + 洗牌所用 RNG 算法（非 mt19937 时）+ 每位玩家两张底牌。
+
+整数统一用 LEB128 varint；有符号值（seed）先做 zigzag。
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .cards import make_deck
+from .rng import ALGO_CTR, ALGO_MT
+from .state_hu import (
+    GameState,
+    apply_action,
+    betting_bounds,
+    settle_if_needed,
+    start_hand_with_carry,
+)
+
+CODEC_VERSION = 1
+
+KIND_HU = 1
+KIND_DEAL = 2
+
+# 标志位
+_F_SEED = 1
+_F_SESSION_UUID = 2
+_F_SESSION_STR = 4
+_F_SETTLED = 8
+_F_ALGO = 16  # deal：RNG 算法码（缺省为 mt19937，兼容旧 blob）
+
+_ALGOS = (ALGO_MT, ALGO_CTR)
+
+# 动作码（事件类型 → 码）；bet 带下注额，raise 带“加注到”
+_ACTIONS = ("check", "fold", "call", "bet", "raise", "allin")
+_ACTION_CODE = {a: i for i, a in enumerate(_ACTIONS)}
+_EVENT_ACTION = {
+    "check": "check",
+    "fold": "fold",
+    "call": "call",
+    "call_short": "call",
+    "bet": "bet",
+    "raise": "raise",
+    "allin": "allin",
+}
+
+
+class ReplayCodecError(ValueError):
+    pass
+
+
+# ---------- varint ----------
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    if value < 0:
+        raise ReplayCodecError("varint must be non-negative")
+    while True:
+        b = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(b | 0x80)
+        else:
+            out.append(b)
+            return
+
+
+def read_varint(buf: bytes, pos: int) -> tuple[int, int]:
+    """返回 (值, 新位置)。"""
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(buf):
+            raise ReplayCodecError("truncated varint")
+        b = buf[pos]
+        pos += 1
+        value |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return value, pos
+        shift += 7
+
+
+def _zigzag(n: int) -> int:
+    return (n << 1) if n >= 0 else ((-n << 1) - 1)
+
+
+def _unzigzag(z: int) -> int:
+    return (z >> 1) if not z & 1 else -((z + 1) >> 1)
+
+
+def _write_session(out: bytearray, session_id: str | None) -> int:
+    if session_id is None:
+        return 0
+    try:
+        u = uuid.UUID(session_id)
+        if str(u) == session_id:
+            out.extend(u.bytes)
+            return _F_SESSION_UUID
+    except (ValueError, AttributeError, TypeError):
+        pass
+    raw = str(session_id).encode()
+    write_varint(out, len(raw))
+    out.extend(raw)
+    return _F_SESSION_STR
+
+
+def _read_session(buf: bytes, pos: int, flags: int) -> tuple[str | None, int]:
+    if flags & _F_SESSION_UUID:
+        if pos + 16 > len(buf):
+            raise ReplayCodecError("truncated session id")
+        return str(uuid.UUID(bytes=bytes(buf[pos : pos + 16]))), pos + 16
+    if flags & _F_SESSION_STR:
+        n, pos = read_varint(buf, pos)
+        if pos + n > len(buf):
+            raise ReplayCodecError("truncated session id")
+        return bytes(buf[pos : pos + n]).decode(), pos + n
+    return None, pos
+
+
+def _read_cards(buf: bytes, pos: int) -> tuple[list[int], int]:
+    n, pos = read_varint(buf, pos)
+    if pos + n > len(buf):
+        raise ReplayCodecError("truncated cards")
+    cards = list(buf[pos : pos + n])
+    if any(c >= 52 for c in cards) or len(set(cards)) != len(cards):
+        raise ReplayCodecError("invalid card ids")
+    return cards, pos + n
+
+
+# ---------- HU 手牌 ----------
+
+
+def action_stream(events: Iterable[Mapping[str, Any]]) -> list[tuple[str, int | None]]:
+    """事件流 → [(动作, 参数)]：bet 为下注额，raise 为“加注到”，其余为 None。"""
+    out: list[tuple[str, int | None]] = []
+    for e in events:
+        act = _EVENT_ACTION.get(e.get("t"))
+        if act is None:
+            continue
+        if act == "bet":
+            out.append((act, int(e.get("amt") or 0)))
+        elif act == "raise":
+            out.append((act, int(e.get("to") or 0)))
+        else:
+            out.append((act, None))
+    return out
+
+
+def start_stacks(gs: GameState) -> tuple[int, int]:
+    """由当前筹码与事件流反推开局筹码（投入与派彩按事件逐条回滚）。"""
+    inv = [0, 0]  # 本街投入
+    committed = [0, 0]
+    won = [0, 0]
+    for e in gs.events:
+        t = e.get("t")
+        who = e.get("who")
+        if t in ("blind", "call", "bet"):
+            inv[who] += int(e.get("amt") or 0)
+        elif t == "raise":
+            inv[who] = int(e.get("to") or 0)
+        elif t == "allin":
+            inv[who] += int(e.get("amt") or 0)
+            if e.get("as") == "call_short":
+                inv[1 - who] -= int(e.get("refund") or 0)
+        elif t == "call_short":
+            inv[who] += int(e.get("amt") or 0)
+            inv[1 - who] -= int(e.get("refund") or 0)
+        elif t == "board":
+            committed = [committed[0] + inv[0], committed[1] + inv[1]]
+            inv = [0, 0]
+        elif t in ("win_fold", "win_showdown"):
+            won[who] += int(e.get("amt") or 0)
+        elif t == "split":
+            amt = int(e.get("amt") or 0)
+            won[0] += amt // 2
+            won[1] += amt - amt // 2
+    out = []
+    for i, p in enumerate(gs.players):
+        # 未结算的手牌：本街投入仍在 invested_street，已从 stack 扣除
+        out.append(p.stack + committed[i] + inv[i] - won[i])
+    return out[0], out[1]
+
+
+def _dealt_cards(gs: GameState) -> list[int]:
+    p0, p1 = gs.players
+    # start_hand 的发牌顺序：deck[0]/deck[2] → p0，deck[1]/deck[3] → p1
+    return [p0.hole[0], p1.hole[0], p0.hole[1], p1.hole[1], *gs.board]
+
+
+def encode_hand(
+    gs: GameState,
+    *,
+    seed: int | None = None,
+    session_id: str | None = None,
+    full_deck: bool = False,
+) -> bytes:
+    """HU 手牌 → 紧凑字节串。session_id 缺省取 gs.session_id；full_deck 见模块说明。"""
+    if session_id is None:
+        session_id = gs.session_id
+    s0, s1 = start_stacks(gs)
+    body = bytearray()
+    flags = 0
+    if seed is not None:
+        flags |= _F_SEED
+        write_varint(body, _zigzag(int(seed)))
+    for v in (gs.sb, gs.bb, s0, s1, gs.button):
+        write_varint(body, int(v))
+    cards = _dealt_cards(gs)
+    if full_deck:
+        cards += list(gs.deck)
+    write_varint(body, len(cards))
+    body.extend(cards)
+    flags |= _write_session(body, session_id)
+    if gs.street == "complete":
+        flags |= _F_SETTLED
+    for act, arg in action_stream(gs.events):
+        body.append(_ACTION_CODE[act])
+        if arg is not None:
+            write_varint(body, arg)
+    return bytes([CODEC_VERSION, KIND_HU, flags]) + bytes(body)
+
+
+@dataclass(frozen=True)
+class DecodedHand:
+    gs: GameState
+    seed: int | None
+    session_id: str | None
+
+
+def _header(blob: bytes, kind: int) -> int:
+    if len(blob) < 3:
+        raise ReplayCodecError("blob too short")
+    if blob[0] != CODEC_VERSION:
+        raise ReplayCodecError(f"unsupported codec version: {blob[0]}")
+    if blob[1] != kind:
+        raise ReplayCodecError(f"unexpected kind: {blob[1]}")
+    return blob[2]
+
+
+def blob_kind(blob: bytes) -> int:
+    if len(blob) < 2:
+        raise ReplayCodecError("blob too short")
+    return blob[1]
+
+
+def decode_hand(blob: bytes, hand_id: str) -> DecodedHand:
+    """字节串 → 重新模拟得到的完整 GameState（事件流与原手牌逐条一致）。"""
+    flags = _header(blob, KIND_HU)
+    pos = 3
+    seed = None
+    if flags & _F_SEED:
+        z, pos = read_varint(blob, pos)
+        seed = _unzigzag(z)
+    vals = []
+    for _ in range(5):
+        v, pos = read_varint(blob, pos)
+        vals.append(v)
+    sb, bb, s0, s1, button = vals
+    dealt, pos = _read_cards(blob, pos)
+    if len(dealt) < 4:
+        raise ReplayCodecError("missing hole cards")
+    used = set(dealt)
+    deck = dealt + [c for c in make_deck() if c not in used]
+    session_id, pos = _read_session(blob, pos, flags)
+
+    cfg = {"sb": sb, "bb": bb, "init_stack": max(s0, s1)}
+    gs = start_hand_with_carry(
+        cfg,
+        session_id=session_id or "",
+        hand_id=hand_id,
+        button=button,
+        stacks=(s0, s1),
+        deck=deck,
+    )
+    while pos < len(blob):
+        code = blob[pos]
+        pos += 1
+        if code >= len(_ACTIONS):
+            raise ReplayCodecError(f"unknown action code: {code}")
+        act = _ACTIONS[code]
+        amount = None
+        if act in ("bet", "raise"):
+            amount, pos = read_varint(blob, pos)
+            if act == "raise":
+                # 存的是“加注到”；apply_action 需要增量（相对 min_raise_to 的基准）
+                bounds = betting_bounds(gs)
+                amount -= bounds.min_raise_to - bounds.min_raise
+        gs = apply_action(gs, act, amount)
+    if flags & _F_SETTLED:
+        gs = settle_if_needed(gs)
+    return DecodedHand(gs=gs, seed=seed, session_id=session_id)
+
+
+# ---------- /table/deal ----------
+
+
+@dataclass(frozen=True)
+class DecodedDeal:
+    seed: int | None
+    holes: list[list[int]]
+    algo: str = ALGO_MT
+
+
+def encode_deal(seed: int | None, holes: list[list[int]], *, algo: str = ALGO_MT) -> bytes:
+    """多人发底牌：seed + RNG 算法 + 每位玩家两张底牌（card id）。"""
+    body = bytearray()
+    flags = 0
+    if seed is not None:
+        flags |= _F_SEED
+        write_varint(body, _zigzag(int(seed)))
+    if algo != ALGO_MT:
+        if algo not in _ALGOS:
+            raise ReplayCodecError(f"unknown rng algo: {algo}")
+        flags |= _F_ALGO
+        write_varint(body, _ALGOS.index(algo))
+    cards = [c for hole in holes for c in hole]
+    write_varint(body, len(cards))
+    body.extend(cards)
+    return bytes([CODEC_VERSION, KIND_DEAL, flags]) + bytes(body)
+
+
+def decode_deal(blob: bytes) -> DecodedDeal:
+    flags = _header(blob, KIND_DEAL)
+    pos = 3
+    seed = None
+    if flags & _F_SEED:
+        z, pos = read_varint(blob, pos)
+        seed = _unzigzag(z)
+    algo = ALGO_MT
+    if flags & _F_ALGO:
+        code, pos = read_varint(blob, pos)
+        if code >= len(_ALGOS):
+            raise ReplayCodecError(f"unknown rng algo code: {code}")
+        algo = _ALGOS[code]
+    cards, pos = _read_cards(blob, pos)
+    if len(cards) % 2:
+        raise ReplayCodecError("odd number of hole cards")
+    return DecodedDeal(seed, [cards[i : i + 2] for i in range(0, len(cards), 2)], algo)
+
+
+__all__ = [
+    "CODEC_VERSION",
+    "KIND_HU",
+    "KIND_DEAL",
+    "DecodedDeal",
+    "DecodedHand",
+    "ReplayCodecError",
+    "action_stream",
+    "blob_kind",
+    "decode_deal",
+    "decode_hand",
+    "encode_deal",
+    "encode_hand",
+    "read_varint",
+    "start_stacks",
+    "write_varint",
+]
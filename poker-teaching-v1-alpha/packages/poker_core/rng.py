@@ -1,15 +1,174 @@
+"""
+随机数生成器。
+
+- mt19937（默认）：random.Random；历史回放均按此算法复现，行为不变
+- splitmix64-ctr：计数器模式，状态 = (key, counter)，key 由 (seed, stream) 派生。
+  第 n 个输出只依赖 key 与 n，任意位置 O(1) 跳转；stream 可取 hand_no，
+  并行 worker 可直接发第 N 手牌而无需重放 1..N-1。
+  牌序为计数器驱动的 Fisher–Yates：第 i 步的随机数只取决于 (key, i)，
+  前 k+1 步即确定前 k+1 张牌，发第 k 张无需洗完整副牌。
+
+RNG.algo / RNG.version 记录所用算法，回放据此选择生成器。
+"""
+
 import random
 from dataclasses import dataclass
 
+ALGO_MT = "mt19937"
+ALGO_CTR = "splitmix64-ctr"
+CTR_VERSION = "ctr-v2"
+
+_MASK64 = (1 << 64) - 1
+_GAMMA = 0x9E3779B97F4A7C15
+_DECK_SIZE = 52
+
+
+def splitmix64(x: int) -> int:
+    """SplitMix64 输出混合函数（64 位）。"""
+    z = (x + _GAMMA) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+def derive_key(seed: int | None, stream: int = 0) -> int:
+    """(seed, stream) → 64 位 key；seed=None 时取系统熵。"""
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    return splitmix64(splitmix64(int(seed) & _MASK64) ^ (int(stream) & _MASK64))
+
+
+class CounterRandom(random.Random):
+    """计数器模式的 random.Random：第 n 个 64 位输出 = splitmix64(key + n·γ)。
+
+    覆盖 random()/getrandbits()，shuffle/sample/choice 等沿用基类实现。
+    """
+
+    def __init__(self, key: int = 0, counter: int = 0):
+        super().__init__(key)
+        self._ctr = counter
+
+    def seed(self, a=None, version=2) -> None:  # noqa: D401 - random.Random 接口
+        self._key = derive_key(None) if a is None else int(a) & _MASK64
+        self._ctr = 0
+        self.gauss_next = None
+
+    def _next64(self) -> int:
+        v = splitmix64((self._key + self._ctr * _GAMMA) & _MASK64)
+        self._ctr += 1
+        return v
+
+    def random(self) -> float:
+        return (self._next64() >> 11) * (1.0 / (1 << 53))
+
+    def getrandbits(self, k: int) -> int:
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        out = 0
+        got = 0
+        while got < k:
+            out |= self._next64() << got
+            got += 64
+        return out & ((1 << k) - 1)
+
+    def jump(self, n: int) -> None:
+        """前进 n 个输出（O(1)）。"""
+        self._ctr += int(n)
+
+    @property
+    def counter(self) -> int:
+        return self._ctr
+
+    def getstate(self):
+        return (ALGO_CTR, self._key, self._ctr, self.gauss_next)
+
+    def setstate(self, state) -> None:
+        _, self._key, self._ctr, self.gauss_next = state
+
+
+class CounterDeck:
+    """key 控制的 52 张均匀洗牌：正向 Fisher–Yates，按需推进。
+
+    第 i 步在 [i, 52) 中均匀取位与 i 交换（拒绝采样，无取模偏差），随机数只依赖 (key, i)；
+    第 i 步后位置 i 不再变化，因此 card(k) 只需执行前 k+1 步。
+    """
+
+    __slots__ = ("_key", "_base", "_perm", "_done")
+
+    def __init__(self, key: int, base: list[int]):
+        if len(base) != _DECK_SIZE:
+            raise ValueError("deck must have 52 cards")
+        self._key = key
+        self._base = base
+        self._perm = list(range(_DECK_SIZE))
+        self._done = 0
+
+    def _uniform(self, step: int, n: int) -> int:
+        """第 step 步的 [0, n) 均匀整数；拒绝时在同一步内顺延子计数器。"""
+        limit = (1 << 64) - (1 << 64) % n
+        sub = splitmix64(self._key ^ ((step + 1) * _GAMMA & _MASK64))
+        t = 0
+        while True:
+            x = splitmix64((sub + t * _GAMMA) & _MASK64)
+            if x < limit:
+                return x % n
+            t += 1
+
+    def _advance(self, upto: int) -> None:
+        perm = self._perm
+        for i in range(self._done, min(upto, _DECK_SIZE - 1)):
+            j = i + self._uniform(i, _DECK_SIZE - i)
+            perm[i], perm[j] = perm[j], perm[i]
+        self._done = max(self._done, upto)
+
+    def position(self, k: int) -> int:
+        if not 0 <= k < _DECK_SIZE:
+            raise IndexError("deck offset out of range")
+        self._advance(k + 1)
+        return self._perm[k]
+
+    def card(self, k: int) -> int:
+        return self._base[self.position(k)]
+
+    def cards(self, n: int = _DECK_SIZE) -> list[int]:
+        """完整 52 张：前 n 张为洗牌结果，其后为尚未洗到的余牌（n=52 时整副均匀）。"""
+        self._advance(max(0, min(int(n), _DECK_SIZE)))
+        return [self._base[i] for i in self._perm]
+
 
 @dataclass
 class RNG:
     seed: int | None
-    algo: str = "mt19937"
+    algo: str = ALGO_MT
     version: str = "py-random"
+    stream: int = 0  # 计数器模式下的流号（如 hand_no）；mt19937 忽略
+
+    @classmethod
+    def counter(cls, seed: int | None, stream: int = 0) -> "RNG":
+        return cls(seed=seed, algo=ALGO_CTR, version=CTR_VERSION, stream=stream)
 
     def create(self) -> random.Random:
+        if self.algo == ALGO_CTR:
+            return CounterRandom(derive_key(self.seed, self.stream))
         r = random.Random()
         if self.seed is not None:
             r.seed(self.seed)
         return r
+
+    def deck(self, base: list[int]) -> CounterDeck:
+        """计数器模式下的惰性牌序（仅 splitmix64-ctr 支持）。"""
+        if self.algo != ALGO_CTR:
+            raise ValueError(f"lazy deck requires {ALGO_CTR}, got {self.algo}")
+        return CounterDeck(derive_key(self.seed, self.stream), base)
+
+    def shuffled(self, base: list[int], dealt: int | None = None) -> list[int]:
+        """按本生成器洗 base 的副本：mt19937 与历史 random.shuffle 完全一致。
+
+        dealt：计数器模式下只需保证前 dealt 张均匀（其余为未洗到的余牌），省去多余步数；
+        mt19937 总是整副洗。
+        """
+        if self.algo == ALGO_CTR:
+            return self.deck(base).cards(len(base) if dealt is None else dealt)
+        out = list(base)
+        self.create().shuffle(out)
+        return out
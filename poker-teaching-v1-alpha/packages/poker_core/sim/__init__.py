@@ -0,0 +1,5 @@
+"""Headless HU self-play (policy vs policy) for strategy regression runs."""
+
+from .selfplay import PlayerSpec, SimReport, SimTally, play_hand, run_decks, simulate
+
+__all__ = ["PlayerSpec", "SimReport", "SimTally", "play_hand", "run_decks", "simulate"]
@@ -0,0 +1,63 @@
+"""
+python -m poker_core.sim --hands 20000 --a v1:medium --b v0:tight --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from .selfplay import PlayerSpec, simulate
+
+
+def _print_report(rep) -> None:
+    print(f"{rep.a} vs {rep.b}: {rep.hands} hands @ {rep.hands_per_sec:.1f} hands/s")
+    print(f"  A bb/100 = {rep.bb_per_100:+.2f} ± {rep.ci95_bb_per_100:.2f} (95% CI)")
+    print(f"  showdown rate = {rep.showdown_rate:.3f}; suggest fallbacks = {rep.fallbacks}")
+    for who, streets in rep.action_freq.items():
+        for street in ("preflop", "flop", "turn", "river"):
+            freq = streets.get(street)
+            if not freq:
+                continue
+            parts = ", ".join(f"{a}={f:.3f}" for a, f in sorted(freq.items()))
+            print(f"  [{who.upper()}] {street:<7} {parts}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m poker_core.sim", description=__doc__)
+    ap.add_argument("--hands", type=int, default=2000)
+    ap.add_argument("--a", default="v1:medium", help="player A: version[:strategy]")
+    ap.add_argument("--b", default="v0:medium", help="player B: version[:strategy]")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--stack", type=int, default=200, help="starting stack in chips (BB=2)")
+    ap.add_argument("--chunk", type=int, default=250, help="decks per worker task")
+    ap.add_argument("--no-duplicate", action="store_true", help="do not replay decks seat-swapped")
+    ap.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = ap.parse_args(argv)
+
+    try:
+        a, b = PlayerSpec.parse(args.a), PlayerSpec.parse(args.b)
+    except ValueError as e:
+        ap.error(str(e))
+    rep = simulate(
+        a,
+        b,
+        args.hands,
+        seed=args.seed,
+        workers=max(1, args.workers),
+        duplicate=not args.no_duplicate,
+        init_stack=args.stack,
+        chunk_decks=max(1, args.chunk),
+    )
+    if args.json:
+        json.dump(rep.as_dict(), sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        _print_report(rep)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,282 @@
+# packages/poker_core/sim/selfplay.py
+"""
+HU 自博弈：策略 A 对 策略 B（build_suggestion 驱动双方），无 Django、无环境变量改写。
+
+- 每手用 RNG.counter(seed, deck_no) 发牌：任意一段手牌可在任意进程独立复现
+- duplicate=True：同一副牌打两次并交换座位（方差大幅降低）
+- 双方的策略版本（v0/v1）与策略档（loose/medium/tight）分别通过
+  build_suggestion(policy_version=...) 与 preflop_tables.strategy_override 注入
+- 可选进程池：按手牌区间切块，结果可合并
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from poker_core.rng import RNG
+from poker_core.state_hu import (
+    apply_action,
+    legal_actions,
+    settle_if_needed,
+    start_hand,
+    start_session,
+)
+from poker_core.suggest.preflop_tables import strategy_override
+from poker_core.suggest.service import build_suggestion
+
+STRATEGIES = ("loose", "medium", "tight")
+VERSIONS = ("v0", "v1")
+
+# 95% 置信区间
+_Z95 = 1.96
+# 单手动作数上限（防御：策略异常时避免死循环）
+_MAX_ACTIONS = 200
+
+
+@dataclass(frozen=True)
+class PlayerSpec:
+    version: str = "v1"
+    strategy: str = "medium"
+
+    def __post_init__(self):
+        if self.version not in VERSIONS:
+            raise ValueError(f"unknown policy version: {self.version}")
+        if self.strategy not in STRATEGIES:
+            raise ValueError(f"unknown strategy: {self.strategy}")
+
+    @classmethod
+    def parse(cls, text: str) -> PlayerSpec:
+        """'v1:tight' / 'v0' / 'loose' → PlayerSpec。"""
+        version, strategy = "v1", "medium"
+        for part in str(text).lower().replace("/", ":").split(":"):
+            part = part.strip()
+            if part in VERSIONS:
+                version = part
+            elif part in STRATEGIES:
+                strategy = part
+            elif part:
+                raise ValueError(f"cannot parse player spec: {text!r}")
+        return cls(version=version, strategy=strategy)
+
+    def label(self) -> str:
+        return f"{self.version}:{self.strategy}"
+
+
+@dataclass
+class SimTally:
+    """可合并的累加器；结果均以 A 的视角、单位 BB。"""
+
+    hands: int = 0
+    decks: int = 0
+    net_bb: float = 0.0
+    sq_deck_bb: float = 0.0  # Σ(每副牌净胜)²，用于置信区间
+    showdowns: int = 0
+    fallbacks: int = 0  # 建议失败时回退 check/fold 的次数
+    actions: Counter = field(default_factory=Counter)  # (player, street, action) → 次数
+
+    def merge(self, other: SimTally) -> None:
+        self.hands += other.hands
+        self.decks += other.decks
+        self.net_bb += other.net_bb
+        self.sq_deck_bb += other.sq_deck_bb
+        self.showdowns += other.showdowns
+        self.fallbacks += other.fallbacks
+        self.actions.update(other.actions)
+
+
+@dataclass(frozen=True)
+class SimReport:
+    a: str
+    b: str
+    hands: int
+    bb_per_100: float
+    ci95_bb_per_100: float
+    hands_per_sec: float
+    showdown_rate: float
+    fallbacks: int
+    action_freq: dict[str, dict[str, dict[str, float]]]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "a": self.a,
+            "b": self.b,
+            "hands": self.hands,
+            "bb_per_100": round(self.bb_per_100, 3),
+            "ci95_bb_per_100": round(self.ci95_bb_per_100, 3),
+            "hands_per_sec": round(self.hands_per_sec, 1),
+            "showdown_rate": round(self.showdown_rate, 4),
+            "fallbacks": self.fallbacks,
+            "action_freq": self.action_freq,
+        }
+
+
+def _choose(gs, actor: int, spec: PlayerSpec) -> tuple[str, int | None, bool]:
+    """返回 (action, amount, fallback)。"""
+    try:
+        with strategy_override(spec.strategy):
+            resp = build_suggestion(gs, actor, policy_version=spec.version)
+        sug = resp.get("suggested") or {}
+        return str(sug.get("action")), sug.get("amount"), False
+    except Exception:
+        acts = legal_actions(gs)
+        return ("check" if "check" in acts else "fold"), None, True
+
+
+def play_hand(
+    cfg: dict,
+    specs: tuple[PlayerSpec, PlayerSpec],
+    *,
+    seed: int,
+    deck_no: int,
+    button: int,
+    a_seat: int,
+    tally: SimTally | None = None,
+) -> float:
+    """打一手，返回 A 的净胜（BB）。specs 顺序为 (A, B)。"""
+    gs = start_hand(
+        cfg,
+        session_id="sim",
+        hand_id=f"sim_{seed}_{deck_no}",  # 换座重打同一 hand_id，策略内随机性也一致
+        button=button,
+        rng=RNG.counter(seed, deck_no),
+    )
+    start_stack = gs.players[a_seat].stack + gs.players[a_seat].invested_street
+    for _ in range(_MAX_ACTIONS):
+        if gs.street in ("showdown", "complete") or not legal_actions(gs):
+            break
+        actor = gs.to_act
+        who = 0 if actor == a_seat else 1
+        street = gs.street
+        action, amount, fallback = _choose(gs, actor, specs[who])
+        try:
+            gs = apply_action(gs, action, amount)
+        except ValueError:
+            action, fallback = ("check" if "check" in legal_actions(gs) else "fold"), True
+            gs = apply_action(gs, action)
+        if tally is not None:
+            tally.actions[("ab"[who], street, action)] += 1
+            tally.fallbacks += int(fallback)
+    if gs.street == "showdown" and tally is not None:
+        tally.showdowns += 1
+    gs = settle_if_needed(gs)
+    return (gs.players[a_seat].stack - start_stack) / float(cfg.get("bb", 2))
+
+
+def run_decks(
+    a: PlayerSpec,
+    b: PlayerSpec,
+    *,
+    seed: int,
+    first_deck: int,
+    n_decks: int,
+    duplicate: bool = True,
+    init_stack: int = 200,
+    sb: int = 1,
+    bb: int = 2,
+) -> SimTally:
+    """顺序打 [first_deck, first_deck + n_decks) 这些牌；duplicate 时每副牌两手。"""
+    cfg = start_session(init_stack=init_stack, sb=sb, bb=bb)
+    tally = SimTally()
+    for deck_no in range(first_deck, first_deck + n_decks):
+        button = deck_no % 2
+        seats = (0, 1) if duplicate else (deck_no % 2,)
+        deck_net = 0.0
+        for a_seat in seats:
+            deck_net += play_hand(
+                cfg, (a, b), seed=seed, deck_no=deck_no, button=button, a_seat=a_seat, tally=tally
+            )
+            tally.hands += 1
+        tally.decks += 1
+        tally.net_bb += deck_net
+        tally.sq_deck_bb += deck_net * deck_net
+    return tally
+
+
+def _run_chunk(args: tuple) -> SimTally:
+    a, b, kwargs = args
+    return run_decks(a, b, **kwargs)
+
+
+def _action_freq(actions: Counter) -> dict[str, dict[str, dict[str, float]]]:
+    totals: Counter = Counter()
+    for (who, street, _), n in actions.items():
+        totals[(who, street)] += n
+    out: dict[str, dict[str, dict[str, float]]] = {}
+    for (who, street, action), n in sorted(actions.items()):
+        out.setdefault(who, {}).setdefault(street, {})[action] = round(n / totals[(who, street)], 4)
+    return out
+
+
+def simulate(
+    a: PlayerSpec,
+    b: PlayerSpec,
+    hands: int,
+    *,
+    seed: int = 1,
+    workers: int = 1,
+    duplicate: bool = True,
+    init_stack: int = 200,
+    sb: int = 1,
+    bb: int = 2,
+    chunk_decks: int = 250,
+) -> SimReport:
+    """A 对 B 打约 hands 手（duplicate 时向上取偶数），返回 bb/100 及置信区间等统计。"""
+    per_deck = 2 if duplicate else 1
+    n_decks = max(1, -(-int(hands) // per_deck))
+    common = {"seed": seed, "duplicate": duplicate, "init_stack": init_stack, "sb": sb, "bb": bb}
+    jobs = [
+        (a, b, {**common, "first_deck": start, "n_decks": min(chunk_decks, n_decks - start)})
+        for start in range(0, n_decks, max(1, chunk_decks))
+    ]
+    t0 = time.perf_counter()
+    tally = SimTally()
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for part in pool.map(_run_chunk, jobs):
+                tally.merge(part)
+    else:
+        for job in jobs:
+            tally.merge(_run_chunk(job))
+    elapsed = max(1e-9, time.perf_counter() - t0)
+    return report(a, b, tally, elapsed)
+
+
+def report(a: PlayerSpec, b: PlayerSpec, tally: SimTally, elapsed: float) -> SimReport:
+    per_deck = tally.hands / max(1, tally.decks)
+    mean_deck = tally.net_bb / max(1, tally.decks)
+    if tally.decks > 1:
+        var = (
+            max(0.0, tally.sq_deck_bb / tally.decks - mean_deck**2)
+            * tally.decks
+            / (tally.decks - 1)
+        )
+        se_hand = math.sqrt(var / tally.decks) / per_deck
+    else:
+        se_hand = float("inf")
+    return SimReport(
+        a=a.label(),
+        b=b.label(),
+        hands=tally.hands,
+        bb_per_100=100.0 * tally.net_bb / max(1, tally.hands),
+        ci95_bb_per_100=100.0 * _Z95 * se_hand,
+        hands_per_sec=tally.hands / elapsed,
+        showdown_rate=tally.showdowns / max(1, tally.hands),
+        fallbacks=tally.fallbacks,
+        action_freq=_action_freq(tally.actions),
+    )
+
+
+__all__ = [
+    "PlayerSpec",
+    "SimTally",
+    "SimReport",
+    "play_hand",
+    "run_decks",
+    "simulate",
+    "report",
+]
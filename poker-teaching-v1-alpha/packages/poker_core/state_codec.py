@@ -0,0 +1,358 @@
+"""
+GameState 二进制快照编码（进行中手牌的跨 worker 交接 / 外部手牌存储）。
+
+与 replay_codec 的区别：replay_codec 只存“种子 + 动作流”，解码需经 state_hu 逐步重新模拟
+（毫秒级，适合落库的已结束手牌）；本模块直接打包状态字段，解码不重放任何动作（微秒级）：
+- 头部：魔数 b"GS"、编码版本、poker_core.version.SCHEMA_VERSION（不一致即拒绝解码）
+- 定长结构（struct）：按钮、行动者、街、open_bet、玩家标志位，盲注 / 底池 / 下注字段 / 筹码 / 本街投入
+- session_id / hand_id：varint 长度 + UTF-8
+- 牌：底牌、公共牌、剩余牌序（即发牌偏移之后的牌堆），每张 1 字节 card id
+- 事件流：字段名元组表（同类事件共享）+ 每条事件的字段名下标与带类型标记的值；
+  牌面字符串（"Ah"）存 1 字节 card id，常见字段名 / 事件类型 / 街名查静态词表存 1 字节
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import Any
+
+from .cards import CARD_IDS, CARD_STRS
+from .event_log import EventLog, EventRecord
+from .replay_codec import ReplayCodecError, read_varint, write_varint
+from .state_hu import GameState, Player
+from .version import SCHEMA_VERSION
+
+STATE_MAGIC = b"GS"
+STATE_CODEC_VERSION = 1
+
+_STREETS = ("preflop", "flop", "turn", "river", "showdown", "complete")
+_STREET_CODE = {s: i for i, s in enumerate(_STREETS)}
+
+# button, to_act, street, open_bet, 玩家标志位, 底牌张数（p0 | p1 << 4），
+# sb, bb, pot, last_bet, checks_in_round, last_raise_size, stack0, stack1, inv0, inv1
+_FIXED = struct.Struct("<BbBBBB10q")
+
+# 玩家标志位：每人 2 位（all_in, folded）
+_P_ALLIN = 1
+_P_FOLDED = 2
+
+# 事件值类型标记
+_T_NONE = 0
+_T_FALSE = 1
+_T_TRUE = 2
+_T_INT = 3
+_T_NEG = 4
+_T_STR = 5
+_T_CARD = 6
+_T_LIST = 7
+_T_WORD = 8
+
+# 静态词表：只可追加（改动已有顺序需提升 STATE_CODEC_VERSION）
+_WORDS: tuple[str, ...] = (
+    "t",
+    "who",
+    "amt",
+    "to",
+    "as",
+    "refund",
+    "p0",
+    "p1",
+    "street",
+    "cards",
+    "winner",
+    "is_tie",
+    "best5",
+    "board",
+    "blind",
+    "deal_hole",
+    "check",
+    "fold",
+    "call",
+    "call_short",
+    "bet",
+    "raise",
+    "allin",
+    "win_fold",
+    "showdown",
+    "split",
+    "win_showdown",
+    *_STREETS,
+)
+_WORD_CODE = {w: i for i, w in enumerate(_WORDS)}
+
+_SCHEMA = SCHEMA_VERSION.encode()
+
+
+class StateCodecError(ValueError):
+    pass
+
+
+def _write_str(out: bytearray, s: str) -> None:
+    raw = s.encode()
+    write_varint(out, len(raw))
+    out.extend(raw)
+
+
+def _read_str(buf: bytes, pos: int) -> tuple[str, int]:
+    n, pos = read_varint(buf, pos)
+    end = pos + n
+    if end > len(buf):
+        raise StateCodecError("truncated string")
+    return buf[pos:end].decode(), end
+
+
+def _write_cards(out: bytearray, cards: list[int]) -> None:
+    out.append(len(cards))
+    out.extend(cards)
+
+
+def _read_cards(buf: bytes, pos: int) -> tuple[list[int], int]:
+    if pos >= len(buf):
+        raise StateCodecError("truncated cards")
+    end = pos + 1 + buf[pos]
+    if end > len(buf):
+        raise StateCodecError("truncated cards")
+    return list(buf[pos + 1 : end]), end
+
+
+def _write_value(out: bytearray, v: Any) -> None:
+    if v is None:
+        out.append(_T_NONE)
+    elif v is True:
+        out.append(_T_TRUE)
+    elif v is False:
+        out.append(_T_FALSE)
+    elif isinstance(v, int):
+        if 0 <= v < 0x80:
+            out.append(_T_INT)
+            out.append(v)
+        elif v >= 0:
+            out.append(_T_INT)
+            write_varint(out, v)
+        else:
+            out.append(_T_NEG)
+            write_varint(out, -v)
+    elif isinstance(v, str):
+        cid = CARD_IDS.get(v)
+        if cid is not None:
+            out.append(_T_CARD)
+            out.append(cid)
+        elif v in _WORD_CODE:
+            out.append(_T_WORD)
+            out.append(_WORD_CODE[v])
+        else:
+            out.append(_T_STR)
+            _write_str(out, v)
+    elif isinstance(v, list | tuple):
+        out.append(_T_LIST)
+        write_varint(out, len(v))
+        for x in v:
+            _write_value(out, x)
+    else:
+        raise StateCodecError(f"unsupported event value: {type(v).__name__}")
+
+
+def _read_value(buf: bytes, pos: int) -> tuple[Any, int]:
+    tag = buf[pos]
+    pos += 1
+    if tag == _T_CARD:
+        return CARD_STRS[buf[pos]], pos + 1
+    if tag == _T_INT:
+        b = buf[pos]
+        if b < 0x80:
+            return b, pos + 1
+        return read_varint(buf, pos)
+    if tag == _T_WORD:
+        return _WORDS[buf[pos]], pos + 1
+    if tag == _T_NONE:
+        return None, pos
+    if tag == _T_LIST:
+        n, pos = read_varint(buf, pos)
+        out = []
+        for _ in range(n):
+            v, pos = _read_value(buf, pos)
+            out.append(v)
+        return out, pos
+    if tag == _T_STR:
+        return _read_str(buf, pos)
+    if tag == _T_TRUE:
+        return True, pos
+    if tag == _T_FALSE:
+        return False, pos
+    if tag == _T_NEG:
+        v, pos = read_varint(buf, pos)
+        return -v, pos
+    raise StateCodecError(f"unknown value tag: {tag}")
+
+
+def _pflags(p: Player) -> int:
+    return (_P_ALLIN if p.all_in else 0) | (_P_FOLDED if p.folded else 0)
+
+
+def encode_state(gs: GameState) -> bytes:
+    """GameState → 字节串（含完整事件流与剩余牌序，解码后可继续行动）。"""
+    p0, p1 = gs.players
+    out = bytearray(STATE_MAGIC)
+    out.append(STATE_CODEC_VERSION)
+    out.append(len(_SCHEMA))
+    out.extend(_SCHEMA)
+    try:
+        out.extend(
+            _FIXED.pack(
+                gs.button,
+                gs.to_act,
+                _STREET_CODE[gs.street],
+                1 if gs.open_bet else 0,
+                _pflags(p0) | (_pflags(p1) << 2),
+                len(p0.hole) | (len(p1.hole) << 4),
+                gs.sb,
+                gs.bb,
+                gs.pot,
+                gs.last_bet,
+                gs.checks_in_round,
+                gs.last_raise_size,
+                p0.stack,
+                p1.stack,
+                p0.invested_street,
+                p1.invested_street,
+            )
+        )
+    except (struct.error, KeyError) as e:
+        raise StateCodecError(f"cannot pack state: {e}") from None
+    _write_str(out, gs.session_id)
+    _write_str(out, gs.hand_id)
+    out.extend(p0.hole)
+    out.extend(p1.hole)
+    _write_cards(out, gs.board)
+    _write_cards(out, gs.deck)
+
+    # 事件流：先写字段名元组表，再逐条写（表下标 + 各字段值）
+    keysets: dict[tuple[str, ...], int] = {}
+    body = bytearray()
+    for ev in gs.events:
+        if isinstance(ev, EventRecord):
+            keys, vals = ev.items_tuple
+        else:
+            keys, vals = tuple(ev), tuple(ev.values())
+        idx = keysets.get(keys)
+        if idx is None:
+            idx = keysets[keys] = len(keysets)
+        write_varint(body, idx)
+        for v in vals:
+            _write_value(body, v)
+    write_varint(out, len(keysets))
+    for keys in keysets:
+        _write_value(out, keys)
+    write_varint(out, len(gs.events))
+    out.extend(body)
+    return bytes(out)
+
+
+def is_state_blob(blob: bytes) -> bool:
+    return blob[:2] == STATE_MAGIC
+
+
+def decode_state(blob: bytes) -> GameState:
+    """字节串 → GameState；编码版本或 SCHEMA_VERSION 不一致时抛 StateCodecError。"""
+    buf = bytes(blob)
+    if not is_state_blob(buf) or len(buf) < 4:
+        raise StateCodecError("not a state blob")
+    if buf[2] != STATE_CODEC_VERSION:
+        raise StateCodecError(f"unsupported state codec version: {buf[2]}")
+    pos = 4 + buf[3]
+    schema = buf[4:pos]
+    if schema != _SCHEMA:
+        raise StateCodecError(f"schema version mismatch: {schema.decode(errors='replace')}")
+    try:
+        (
+            button,
+            to_act,
+            street,
+            open_bet,
+            pflags,
+            nholes,
+            sb,
+            bb,
+            pot,
+            last_bet,
+            checks,
+            last_raise,
+            s0,
+            s1,
+            inv0,
+            inv1,
+        ) = _FIXED.unpack_from(buf, pos)
+        pos += _FIXED.size
+        street_name = _STREETS[street]
+        session_id, pos = _read_str(buf, pos)
+        hand_id, pos = _read_str(buf, pos)
+        n0, n1 = nholes & 0x0F, nholes >> 4
+        h0 = list(buf[pos : pos + n0])
+        h1 = list(buf[pos + n0 : pos + n0 + n1])
+        pos += n0 + n1
+        board, pos = _read_cards(buf, pos)
+        deck, pos = _read_cards(buf, pos)
+
+        nkeys, pos = read_varint(buf, pos)
+        keysets: list[tuple[str, ...]] = []
+        for _ in range(nkeys):
+            keys, pos = _read_value(buf, pos)
+            keysets.append(tuple(keys))
+        nev, pos = read_varint(buf, pos)
+        events = []
+        for _ in range(nev):
+            idx, pos = read_varint(buf, pos)
+            keys = keysets[idx]
+            vals = []
+            for _ in keys:
+                v, pos = _read_value(buf, pos)
+                vals.append(v)
+            events.append(EventRecord.from_items(keys, tuple(vals)))
+    except (struct.error, IndexError, UnicodeDecodeError, ReplayCodecError) as e:
+        raise StateCodecError(f"corrupt state blob: {e}") from None
+    if pos != len(buf):
+        raise StateCodecError("trailing bytes in state blob")
+
+    players = (
+        Player(
+            stack=s0,
+            hole=h0,
+            invested_street=inv0,
+            all_in=bool(pflags & _P_ALLIN),
+            folded=bool(pflags & _P_FOLDED),
+        ),
+        Player(
+            stack=s1,
+            hole=h1,
+            invested_street=inv1,
+            all_in=bool(pflags >> 2 & _P_ALLIN),
+            folded=bool(pflags >> 2 & _P_FOLDED),
+        ),
+    )
+    return GameState(
+        session_id=session_id,
+        hand_id=hand_id,
+        button=button,
+        street=street_name,
+        deck=deck,
+        board=board,
+        players=players,
+        sb=sb,
+        bb=bb,
+        pot=pot,
+        to_act=to_act,
+        last_bet=last_bet,
+        events=EventLog(events),
+        open_bet=bool(open_bet),
+        checks_in_round=checks,
+        last_raise_size=last_raise,
+    )
+
+
+__all__ = [
+    "STATE_CODEC_VERSION",
+    "StateCodecError",
+    "decode_state",
+    "encode_state",
+    "is_state_blob",
+]
@@ -0,0 +1,530 @@
+# packages/poker_core/state_fast.py
+"""
+可变的 HU 引擎（自博弈/模拟用快速路径）。
+
+规则与 state_hu 完全一致（legal_actions / apply_action / settle_if_needed），区别在于：
+- 单个 __slots__ 对象原地修改，不再每步 dataclasses.replace
+- 牌堆不复制，只移动发牌指针；公共牌 list 追加
+- 每次动作前压入一份紧凑快照，undo() O(1) 回退；clone() 浅拷贝分叉
+- events=False 时不记录事件（纯模拟时省去 dict 与字符串转换）
+
+与 GameState 互转：FastGameState.from_state(gs) / fs.to_state()。
+"""
+
+from __future__ import annotations
+
+from poker_core.cards import card_strs
+from poker_core.event_log import EventLog
+from poker_core.providers.selector import get_evaluator
+from poker_core.rng import RNG
+from poker_core.state_hu import GameState, Player, Street, _shuffle
+
+_NEXT_STREET: dict[str, Street] = {"preflop": "flop", "flop": "turn", "turn": "river"}
+_BOARD_COUNT = {"flop": 3, "turn": 1, "river": 1}
+
+
+class FastGameState:
+    __slots__ = (
+        "session_id",
+        "hand_id",
+        "button",
+        "street",
+        "deck",
+        "deck_pos",
+        "board",
+        "holes",
+        "stacks",
+        "invested",
+        "all_in",
+        "folded",
+        "sb",
+        "bb",
+        "pot",
+        "to_act",
+        "last_bet",
+        "open_bet",
+        "checks_in_round",
+        "last_raise_size",
+        "events",
+        "_history",
+    )
+
+    def __init__(
+        self,
+        *,
+        session_id: str,
+        hand_id: str,
+        button: int,
+        street: Street,
+        deck: list[int],
+        board: list[int],
+        holes: list[list[int]],
+        stacks: list[int],
+        invested: list[int],
+        all_in: list[bool],
+        folded: list[bool],
+        sb: int,
+        bb: int,
+        pot: int,
+        to_act: int,
+        last_bet: int,
+        open_bet: bool,
+        checks_in_round: int,
+        last_raise_size: int,
+        events: list[dict] | None,
+        deck_pos: int = 0,
+    ):
+        self.session_id = session_id
+        self.hand_id = hand_id
+        self.button = button
+        self.street = street
+        self.deck = deck  # 只读；发牌移动 deck_pos
+        self.deck_pos = deck_pos
+        self.board = board
+        self.holes = holes
+        self.stacks = stacks
+        self.invested = invested
+        self.all_in = all_in
+        self.folded = folded
+        self.sb = sb
+        self.bb = bb
+        self.pot = pot
+        self.to_act = to_act
+        self.last_bet = last_bet
+        self.open_bet = open_bet
+        self.checks_in_round = checks_in_round
+        self.last_raise_size = last_raise_size
+        self.events = events  # None 表示不记录
+        self._history: list[tuple] = []
+
+    # ---------- 构造与互转 ----------
+
+    @classmethod
+    def start_hand(
+        cls,
+        session_cfg: dict,
+        session_id: str,
+        hand_id: str,
+        button: int,
+        seed: int | None = None,
+        *,
+        rng: RNG | None = None,
+        events: bool = True,
+    ) -> FastGameState:
+        """与 state_hu.start_hand 同一发牌与盲注逻辑（同 seed / rng 同牌序）。"""
+        deck = _shuffle(seed, rng)
+        holes = [[deck[0], deck[2]], [deck[1], deck[3]]]
+        init_stack = session_cfg["init_stack"]
+        sb = int(session_cfg.get("sb", 1))
+        bb = int(session_cfg.get("bb", 2))
+        btn = button % 2
+        invested = [0, 0]
+        invested[btn] = sb
+        invested[1 - btn] = bb
+        fs = cls(
+            session_id=session_id,
+            hand_id=hand_id,
+            button=btn,
+            street="preflop",
+            deck=deck,
+            deck_pos=4,
+            board=[],
+            holes=holes,
+            stacks=[init_stack - invested[0], init_stack - invested[1]],
+            invested=invested,
+            all_in=[False, False],
+            folded=[False, False],
+            sb=sb,
+            bb=bb,
+            pot=0,
+            to_act=btn,
+            last_bet=bb,
+            open_bet=True,
+            checks_in_round=0,
+            last_raise_size=bb,
+            events=[] if events else None,
+        )
+        if fs.events is not None:
+            fs.events.append({"t": "blind", "who": btn, "amt": sb})
+            fs.events.append({"t": "blind", "who": 1 - btn, "amt": bb})
+            fs.events.append(
+                {"t": "deal_hole", "p0": card_strs(holes[0]), "p1": card_strs(holes[1])}
+            )
+        return fs
+
+    @classmethod
+    def from_state(cls, gs: GameState, *, events: bool = True) -> FastGameState:
+        p0, p1 = gs.players
+        return cls(
+            session_id=gs.session_id,
+            hand_id=gs.hand_id,
+            button=gs.button,
+            street=gs.street,
+            deck=list(gs.deck),
+            board=list(gs.board),
+            holes=[list(p0.hole), list(p1.hole)],
+            stacks=[p0.stack, p1.stack],
+            invested=[p0.invested_street, p1.invested_street],
+            all_in=[p0.all_in, p1.all_in],
+            folded=[p0.folded, p1.folded],
+            sb=gs.sb,
+            bb=gs.bb,
+            pot=gs.pot,
+            to_act=gs.to_act,
+            last_bet=gs.last_bet,
+            open_bet=gs.open_bet,
+            checks_in_round=gs.checks_in_round,
+            last_raise_size=gs.last_raise_size,
+            events=list(gs.events) if events else None,
+        )
+
+    def to_state(self) -> GameState:
+        players = tuple(
+            Player(
+                stack=self.stacks[i],
+                hole=list(self.holes[i]),
+                invested_street=self.invested[i],
+                all_in=self.all_in[i],
+                folded=self.folded[i],
+            )
+            for i in (0, 1)
+        )
+        return GameState(
+            session_id=self.session_id,
+            hand_id=self.hand_id,
+            button=self.button,
+            street=self.street,
+            deck=self.deck[self.deck_pos :],
+            board=list(self.board),
+            players=players,  # type: ignore[arg-type]
+            sb=self.sb,
+            bb=self.bb,
+            pot=self.pot,
+            to_act=self.to_act,
+            last_bet=self.last_bet,
+            events=EventLog(self.events or ()),
+            open_bet=self.open_bet,
+            checks_in_round=self.checks_in_round,
+            last_raise_size=self.last_raise_size,
+        )
+
+    def clone(self) -> FastGameState:
+        """分叉：牌堆共享（只读），其余可变容器复制；撤销栈随之复制。"""
+        new = object.__new__(FastGameState)
+        for name in FastGameState.__slots__:
+            setattr(new, name, getattr(self, name))
+        new.board = list(self.board)
+        new.holes = self.holes  # 手牌在一手内不变
+        new.stacks = list(self.stacks)
+        new.invested = list(self.invested)
+        new.all_in = list(self.all_in)
+        new.folded = list(self.folded)
+        new.events = None if self.events is None else list(self.events)
+        new._history = list(self._history)
+        return new
+
+    # ---------- 撤销 ----------
+
+    def _push(self) -> None:
+        self._history.append(
+            (
+                self.street,
+                self.deck_pos,
+                len(self.board),
+                self.stacks[0],
+                self.stacks[1],
+                self.invested[0],
+                self.invested[1],
+                self.all_in[0],
+                self.all_in[1],
+                self.folded[0],
+                self.folded[1],
+                self.pot,
+                self.to_act,
+                self.last_bet,
+                self.open_bet,
+                self.checks_in_round,
+                self.last_raise_size,
+                -1 if self.events is None else len(self.events),
+            )
+        )
+
+    def can_undo(self) -> bool:
+        return bool(self._history)
+
+    def undo(self) -> None:
+        """撤销最近一次 apply_action / settle_if_needed。"""
+        if not self._history:
+            raise IndexError("nothing to undo")
+        (
+            self.street,
+            self.deck_pos,
+            board_len,
+            self.stacks[0],
+            self.stacks[1],
+            self.invested[0],
+            self.invested[1],
+            self.all_in[0],
+            self.all_in[1],
+            self.folded[0],
+            self.folded[1],
+            self.pot,
+            self.to_act,
+            self.last_bet,
+            self.open_bet,
+            self.checks_in_round,
+            self.last_raise_size,
+            ev_len,
+        ) = self._history.pop()
+        del self.board[board_len:]
+        if self.events is not None and ev_len >= 0:
+            del self.events[ev_len:]
+
+    # ---------- 规则 ----------
+
+    def _emit(self, ev: dict) -> None:
+        if self.events is not None:
+            self.events.append(ev)
+
+    def to_call(self, actor: int | None = None) -> int:
+        a = self.to_act if actor is None else actor
+        return max(self.invested) - self.invested[a]
+
+    def _blind_raise_spot(self, actor: int) -> bool:
+        return (
+            self.street == "preflop"
+            and self.open_bet
+            and self.last_bet == self.bb
+            and actor == 1 - self.button
+        )
+
+    def legal_actions(self) -> list[str]:
+        if self.street in ("showdown", "complete"):
+            return []
+        a = self.to_act
+        if self.folded[a] or self.all_in[a]:
+            return []
+        to_call = self.to_call(a)
+        stack = self.stacks[a]
+        if self.all_in[1 - a]:
+            return [] if to_call == 0 else ["fold", "call"]
+        if to_call == 0:
+            acts = ["check"]
+            if stack > 0:
+                if not self.open_bet:
+                    acts.append("bet")
+                if self._blind_raise_spot(a):
+                    acts.append("raise")
+                acts.append("allin")
+            return acts
+        acts = ["fold"]
+        if stack > 0:
+            acts.append("call")
+            if stack > to_call:
+                acts.append("raise")
+            acts.append("allin")
+        return acts
+
+    def _pay(self, actor: int, amt: int) -> None:
+        self.stacks[actor] -= amt
+        self.invested[actor] += amt
+        self.all_in[actor] = self.stacks[actor] == 0
+
+    def _pass_turn(self, actor: int) -> None:
+        self.to_act = 1 - actor
+        self.open_bet = True
+        self.checks_in_round = 0
+
+    def _reset_street(self, nxt: Street) -> None:
+        self.pot += self.invested[0] + self.invested[1]
+        self.invested[0] = self.invested[1] = 0
+        self.last_bet = 0
+        self.last_raise_size = 0
+        self.street = nxt
+        n = _BOARD_COUNT.get(nxt)
+        if n:
+            p = self.deck_pos
+            self.board.extend(self.deck[p : p + n])
+            self.deck_pos = p + n
+            self._emit({"t": "board", "street": nxt, "cards": card_strs(self.board)})
+        self.to_act = self.button if nxt == "preflop" else 1 - self.button
+        self.open_bet = False
+        self.checks_in_round = 0
+
+    def _maybe_advance_street(self) -> None:
+        street = self.street
+        if street in ("showdown", "complete"):
+            return
+        aligned = self.invested[0] == self.invested[1]
+        a0, a1 = self.all_in
+        if (a0 and a1) or ((a0 or a1) and aligned):
+            # 有人全下且已对齐：一路发完到摊牌
+            while self.street in _NEXT_STREET:
+                self._reset_street(_NEXT_STREET[self.street])
+            if self.street == "river":
+                self._reset_street("showdown")
+            return
+        if self.open_bet:
+            if not aligned:
+                return
+            if street == "preflop" and self.last_bet <= self.bb and self.checks_in_round < 1:
+                return
+        elif self.checks_in_round < 2:
+            return
+        self._reset_street(_NEXT_STREET.get(street, "showdown"))
+
+    def apply_action(self, action: str, amount: int | None = None) -> FastGameState:
+        """原地执行动作并返回 self（便于链式调用）。非法动作抛 ValueError 且状态不变。"""
+        actor = self.to_act
+        if action not in self.legal_actions():
+            raise ValueError(f"illegal action: {action}")
+        to_call = self.to_call(actor)
+        stack = self.stacks[actor]
+        self._push()
+
+        if action == "check":
+            self._emit({"t": "check", "who": actor})
+            self.checks_in_round += 1
+            self.to_act = 1 - actor
+            self._maybe_advance_street()
+            return self
+
+        if action == "fold":
+            self.folded[actor] = True
+            self._emit({"t": "fold", "who": actor})
+            self._settle_fold(1 - actor)
+            return self
+
+        if action == "call":
+            pay = min(stack, to_call)
+            self._pay(actor, pay)
+            if pay < to_call:
+                opp = 1 - actor
+                refund = min(to_call - pay, self.invested[opp])
+                self.invested[opp] -= refund
+                self.stacks[opp] += refund
+                self._emit({"t": "call_short", "who": actor, "amt": pay, "refund": refund})
+            else:
+                self._emit({"t": "call", "who": actor, "amt": pay})
+            self._pass_turn(actor)
+            self._maybe_advance_street()
+            return self
+
+        if action == "bet":
+            if self.open_bet:
+                self._history.pop()
+                raise ValueError("cannot bet when betting already opened")
+            bet = amount if amount is not None else self.bb
+            bet = min(max(self.bb, bet), stack)
+            self._pay(actor, bet)
+            self._emit({"t": "bet", "who": actor, "amt": bet})
+            self.last_bet = bet
+            self.last_raise_size = bet
+            self._pass_turn(actor)
+            return self
+
+        if action == "raise":
+            blind_raise = to_call == 0 and self._blind_raise_spot(actor)
+            min_inc = max(1, self.last_raise_size)
+            req_add = max(min_inc, amount if amount is not None else min_inc)
+            max_add = stack if blind_raise else max(0, stack - to_call)
+            actual_add = min(req_add, max_add)
+            self._pay(actor, actual_add if blind_raise else to_call + actual_add)
+            self._emit({"t": "raise", "who": actor, "to": self.invested[actor]})
+            if actual_add >= min_inc:
+                self.last_bet += actual_add
+                self.last_raise_size = actual_add
+            self._pass_turn(actor)
+            return self
+
+        if action == "allin":
+            push = stack
+            if to_call == 0:
+                if not self.open_bet:
+                    self._pay(actor, push)
+                    self._emit({"t": "allin", "who": actor, "amt": push, "as": "bet"})
+                    self.last_bet = push
+                    self.last_raise_size = push
+                    self._pass_turn(actor)
+                    return self
+                if self._blind_raise_spot(actor):
+                    self._pay(actor, push)
+                    self._emit({"t": "allin", "who": actor, "amt": push, "as": "raise"})
+                    if push >= max(1, self.last_raise_size):
+                        self.last_bet += push
+                        self.last_raise_size = push
+                    self._pass_turn(actor)
+                    return self
+                self._history.pop()
+                raise ValueError("cannot all-in without open bet or blind-raise option")
+            self._pay(actor, push)
+            if push < to_call:
+                opp = 1 - actor
+                over = to_call - push
+                self.invested[opp] -= over
+                self.stacks[opp] += over
+                self._emit(
+                    {"t": "allin", "who": actor, "amt": push, "as": "call_short", "refund": over}
+                )
+            elif push == to_call:
+                self._emit({"t": "allin", "who": actor, "amt": push, "as": "call"})
+            else:
+                self._emit({"t": "allin", "who": actor, "amt": push, "as": "raise"})
+                add = push - to_call
+                if add >= max(1, self.last_raise_size):
+                    self.last_bet += add
+                    self.last_raise_size = add
+            self._pass_turn(actor)
+            self._maybe_advance_street()
+            return self
+
+        raise RuntimeError("unreachable")
+
+    def _settle_fold(self, winner: int) -> None:
+        pot_total = self.pot + self.invested[0] + self.invested[1]
+        self.stacks[winner] += pot_total
+        self.invested[0] = self.invested[1] = 0
+        self.pot = 0
+        self.street = "complete"
+        self.to_act = -1
+        self._emit({"t": "win_fold", "who": winner, "amt": pot_total})
+
+    def settle_if_needed(self) -> FastGameState:
+        """river 对齐进入 showdown 后摊牌派彩；其他街不变。"""
+        if self.street != "showdown":
+            return self
+        self._push()
+        pot_total = self.pot + self.invested[0] + self.invested[1]
+        self.invested[0] = self.invested[1] = 0
+        self.pot = 0
+        ev = get_evaluator()
+        r0 = ev.evaluate7(self.holes[0], self.board)
+        r1 = ev.evaluate7(self.holes[1], self.board)
+        if r0.strength > r1.strength:
+            winner, best5 = 0, [r0.best5, r1.best5]
+        elif r1.strength > r0.strength:
+            winner, best5 = 1, [r1.best5, r0.best5]
+        else:
+            winner, best5 = None, [r0.best5, r1.best5]
+        self._emit(
+            {
+                "t": "showdown",
+                "winner": winner,
+                "is_tie": winner is None,
+                "best5": best5,
+                "board": card_strs(self.board),
+            }
+        )
+        if winner is None:
+            self.stacks[0] += pot_total // 2
+            self.stacks[1] += pot_total - pot_total // 2
+            self._emit({"t": "split", "amt": pot_total})
+        else:
+            self.stacks[winner] += pot_total
+            self._emit({"t": "win_showdown", "who": winner, "amt": pot_total})
+        self.street = "complete"
+        self.to_act = -1
+        return self
+
+
+__all__ = ["FastGameState"]
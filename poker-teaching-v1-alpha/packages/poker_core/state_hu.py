@@ -5,7 +5,8 @@ import random
 from dataclasses import dataclass, replace
 from typing import Literal
 
-from poker_core.cards import make_deck
+from poker_core.cards import card_strs, make_deck
+from poker_core.event_log import EventLog
 from poker_core.providers.interfaces import Strength
 from poker_core.providers.selector import get_evaluator
 from poker_core.rng import RNG
@@ -21,7 +22,14 @@ def _rng(seed: int | None) -> random.Random:
     return rng.create()
 
 
-def _shuffle(seed: int | None) -> list[str]:
+# 一手 HU 最多用到的牌：4 张底牌 + 5 张公共牌
+_HU_DEALT = 9
+
+
+def _shuffle(seed: int | None, rng: RNG | None = None) -> list[int]:
+    if rng is not None:
+        # 计数器模式只推进用得到的前 9 步洗牌（mt19937 仍整副洗，兼容历史回放）
+        return rng.shuffled(make_deck(), dealt=_HU_DEALT)
     deck = make_deck()
     r = _rng(seed)
     r.shuffle(deck)
@@ -31,7 +39,7 @@ def _shuffle(seed: int | None) -> list[str]:
 @dataclass(frozen=True)
 class Player:
     stack: int
-    hole: list[str]  # len==2 once dealt
+    hole: list[int]  # len==2 once dealt；cards.card_id 整数编码
     invested_street: int = 0  # 本街已投入
     all_in: bool = False
     folded: bool = False
@@ -43,16 +51,16 @@ class GameState:
     hand_id: str
     button: int  # 0 或 1，表示谁是按钮（SB 一定是按钮）
     street: Street
-    deck: list[str]
-    board: list[str]
+    deck: list[int]  # 整数编码，字符串只在 API/回放边界生成
+    board: list[int]
     players: tuple[Player, Player]  # 固定为座位顺序：seat0, seat1。角色由 button 推导
     sb: int
     bb: int
     pot: int
     to_act: int  # 当前行动者 index
     last_bet: int  # 本街最近一次投注额（用于 min raise 的简化）
-    # 便于 UI/教学的事件流（可写可不写，先给上）
-    events: list[dict]
+    # 便于 UI/教学的事件流：持久化只追加日志，后继状态共享前缀，旧状态不受影响
+    events: EventLog
     open_bet: bool
     checks_in_round: int
     last_raise_size: int = 0  # 上一次“加注的增量”（用于最小加注规则）
@@ -73,15 +81,21 @@ def start_hand(
     hand_id: str,
     button: int,
     seed: int | None = None,
+    rng: RNG | None = None,
+    deck: list[int] | None = None,
 ) -> GameState:
     """
     按 HU 规则：
+    - rng 缺省为 RNG(seed)（mt19937，兼容历史回放）；传入 RNG.counter(seed, hand_no)
+      可按 (seed, hand_no) 独立发任意一手
+    - deck：预置完整牌序（52 张，回放重建用），给定时忽略 seed/rng
+
     - players 固定为座位顺序（seat0, seat1）；由 `button` 推导当手的 SB/BB
     - SB=按钮，BB=非按钮；盲注直接从 stack 扣，并计入本街 invested_street
     - preflop 行动权在 按钮（SB） 手上；翻后行动权在非按钮手上
     """
 
-    deck = _shuffle(seed)
+    deck = list(deck) if deck is not None else _shuffle(seed, rng)
     p0_hole = [deck[0], deck[2]]
     p1_hole = [deck[1], deck[3]]
     deck = deck[4:]
@@ -113,19 +127,23 @@ def start_hand(
         bb=bb,
         to_act=btn,  # HU 规则：preflop 由按钮（SB）先行动
         last_bet=bb,  # 视为当前最高注（BB），便于 min-raise 简化
-        events=[],
+        events=EventLog(),
         open_bet=True,
         checks_in_round=0,
         last_raise_size=bb,  # preflop 初始最小加注增量为 BB
     )
     # 依据按钮记录盲注事件（who 为座位 index）
     sb_idx, bb_idx = btn, 1 - btn
-    gs.events.append({"t": "blind", "who": sb_idx, "amt": sb})
-    gs.events.append({"t": "blind", "who": bb_idx, "amt": bb})
-    gs.events.append({"t": "deal_hole", "p0": p0_hole, "p1": p1_hole})
+    gs = _emit(gs, {"t": "blind", "who": sb_idx, "amt": sb})
+    gs = _emit(gs, {"t": "blind", "who": bb_idx, "amt": bb})
+    gs = _emit(gs, {"t": "deal_hole", "p0": card_strs(p0_hole), "p1": card_strs(p1_hole)})
     return gs
 
 
+def _emit(gs: GameState, ev: dict) -> GameState:
+    return replace(gs, events=gs.events.append(ev))
+
+
 def _to_call(gs: GameState, actor: int) -> int:
     me = gs.players[actor]
     other = gs.players[1 - actor]
@@ -134,6 +152,50 @@ def _to_call(gs: GameState, actor: int) -> int:
     return cur_max - me.invested_street
 
 
+@dataclass(frozen=True, slots=True)
+class BettingBounds:
+    """当前行动者的下注/加注边界（闭式计算，与 apply_action 的夹取规则一致）。
+
+    - bet：实际下注额落在 [min_bet, max_bet]
+    - raise：amount 为“加注增量”，实际增量落在 [min_raise, max_raise]；
+      对应本街总投入 [min_raise_to, max_raise_to]
+    """
+
+    to_call: int
+    min_bet: int
+    max_bet: int
+    min_raise: int
+    max_raise: int
+    min_raise_to: int
+    max_raise_to: int
+
+
+def _is_blind_raise_spot(gs: GameState, actor: int) -> bool:
+    return (
+        gs.street == "preflop" and gs.open_bet and gs.last_bet == gs.bb and actor == (1 - gs.button)
+    )
+
+
+def betting_bounds(gs: GameState) -> BettingBounds:
+    actor = gs.to_act
+    me = gs.players[actor]
+    to_call = _to_call(gs, actor)
+    stack = me.stack
+    blind_raise = to_call == 0 and _is_blind_raise_spot(gs, actor)
+    min_inc = max(1, gs.last_raise_size)
+    max_add = stack if blind_raise else max(0, stack - to_call)
+    base = me.invested_street + (0 if blind_raise else to_call)
+    return BettingBounds(
+        to_call=to_call,
+        min_bet=min(gs.bb, stack),
+        max_bet=stack,
+        min_raise=min(min_inc, max_add),
+        max_raise=max_add,
+        min_raise_to=base + min(min_inc, max_add),
+        max_raise_to=base + max_add,
+    )
+
+
 def legal_actions(gs: GameState) -> list[str]:
     if gs.street in ("showdown", "complete"):
         return []
@@ -220,7 +282,7 @@ def _reset_street(gs: GameState, next_street: Street) -> GameState:
     gs = replace(gs, street=next_street)
     if next_street in ("flop", "turn", "river"):
         gs = _deal_board(gs, next_street)
-        gs.events.append({"t": "board", "street": next_street, "cards": list(gs.board)})
+        gs = _emit(gs, {"t": "board", "street": next_street, "cards": card_strs(gs.board)})
     return replace(gs, to_act=_street_first_to_act(gs))
 
 
@@ -306,7 +368,7 @@ def apply_action(gs: GameState, action: str, amount: int | None = None) -> GameS
         raise ValueError(f"illegal action: {action}")
 
     if action == "check":
-        gs.events.append({"t": "check", "who": actor})
+        gs = _emit(gs, {"t": "check", "who": actor})
         # 交换行动者；若对齐则可能进下一街
         gs = replace(gs, checks_in_round=gs.checks_in_round + 1, to_act=1 - actor)
         return _maybe_advance_street(gs)
@@ -314,7 +376,7 @@ def apply_action(gs: GameState, action: str, amount: int | None = None) -> GameS
     if action == "fold":
         me = _replace_player(me, folded=True)
         gs = _update_player(gs, actor, me)
-        gs.events.append({"t": "fold", "who": actor})
+        gs = _emit(gs, {"t": "fold", "who": actor})
         # 直接结算到 complete（弃牌胜利）
         return _settle_fold(gs, winner=1 - actor)
 
@@ -340,12 +402,12 @@ def apply_action(gs: GameState, action: str, amount: int | None = None) -> GameS
                 stack=opp.stack + actual_refund,
             )
             gs = _update_player(gs, 1 - actor, opp)
-            gs.events.append({"t": "call_short", "who": actor, "amt": pay, "refund": actual_refund})
+            gs = _emit(gs, {"t": "call_short", "who": actor, "amt": pay, "refund": actual_refund})
             gs = replace(gs, to_act=1 - actor, open_bet=True, checks_in_round=0)
             return _maybe_advance_street(gs)
 
         # 精确跟注或常规跟注
-        gs.events.append({"t": "call", "who": actor, "amt": pay})
+        gs = _emit(gs, {"t": "call", "who": actor, "amt": pay})
         # call 保持本回合已有下注状态（open_bet 维持 True），并清空本轮 check 计数
         gs = replace(gs, to_act=1 - actor, open_bet=True, checks_in_round=0)
         return _maybe_advance_street(gs)
@@ -366,7 +428,7 @@ def apply_action(gs: GameState, action: str, amount: int | None = None) -> GameS
             all_in=(me.stack - bet == 0),
         )
         gs = _update_player(gs, actor, me)
-        gs.events.append({"t": "bet", "who": actor, "amt": bet})
+        gs = _emit(gs, {"t": "bet", "who": actor, "amt": bet})
         gs = replace(
             gs,
             last_bet=bet,
@@ -407,7 +469,7 @@ def apply_action(gs: GameState, action: str, amount: int | None = None) -> GameS
             all_in=(me.stack - total_put == 0),
         )
         gs = _update_player(gs, actor, me)
-        gs.events.append({"t": "raise", "who": actor, "to": me.invested_street})
+        gs = _emit(gs, {"t": "raise", "who": actor, "to": me.invested_street})
         # 若实际加注未达到最小增量，则按“跟注/不足额加注”处理：不更新 last_bet/last_raise_size（不重开行动）
         if actual_add >= min_inc:
             gs = replace(
@@ -434,7 +496,7 @@ def apply_action(gs: GameState, action: str, amount: int | None = None) -> GameS
                     me, stack=0, invested_street=me.invested_street + push, all_in=True
                 )
                 gs = _update_player(gs, actor, me)
-                gs.events.append({"t": "allin", "who": actor, "amt": push, "as": "bet"})
+                gs = _emit(gs, {"t": "allin", "who": actor, "amt": push, "as": "bet"})
                 gs = replace(
                     gs,
                     last_bet=push,
@@ -458,7 +520,7 @@ def apply_action(gs: GameState, action: str, amount: int | None = None) -> GameS
                     me, stack=0, invested_street=me.invested_street + push, all_in=True
                 )
                 gs = _update_player(gs, actor, me)
-                gs.events.append({"t": "allin", "who": actor, "amt": push, "as": "raise"})
+                gs = _emit(gs, {"t": "allin", "who": actor, "amt": push, "as": "raise"})
                 if actual_add >= min_inc:
                     gs = replace(
                         gs,
@@ -488,26 +550,27 @@ def apply_action(gs: GameState, action: str, amount: int | None = None) -> GameS
                     stack=opp.stack + over,
                 )
                 gs = _update_player(gs, 1 - actor, opp)
-                gs.events.append(
+                gs = _emit(
+                    gs,
                     {
                         "t": "allin",
                         "who": actor,
                         "amt": push,
                         "as": "call_short",
                         "refund": over,
-                    }
+                    },
                 )
                 gs = replace(gs, to_act=1 - actor, open_bet=True, checks_in_round=0)
                 return _maybe_advance_street(gs)
             # 精确跟注（push == to_call）
             if remaining == 0:
-                gs.events.append({"t": "allin", "who": actor, "amt": push, "as": "call"})
+                gs = _emit(gs, {"t": "allin", "who": actor, "amt": push, "as": "call"})
                 gs = replace(gs, to_act=1 - actor, open_bet=True, checks_in_round=0)
                 return _maybe_advance_street(gs)
             # 超额部分视为加注增量
             min_inc = max(1, gs.last_raise_size)
             actual_add = remaining
-            gs.events.append({"t": "allin", "who": actor, "amt": push, "as": "raise"})
+            gs = _emit(gs, {"t": "allin", "who": actor, "amt": push, "as": "raise"})
             if actual_add >= min_inc:
                 gs = replace(gs, last_bet=gs.last_bet + actual_add, last_raise_size=actual_add)
             gs = replace(gs, to_act=1 - actor, open_bet=True, checks_in_round=0)
@@ -516,7 +579,87 @@ def apply_action(gs: GameState, action: str, amount: int | None = None) -> GameS
     raise RuntimeError("unreachable")
 
 
-def _hand_strength(cards7: list[str]) -> Strength:
+# ---------- 撤销/重做 ----------
+#
+# GameState 与其 EventLog 均不可变，旧状态对象始终有效。
+# 因此一步动作的“增量”只需记下动作前的状态对象；撤销 = 换回旧状态，O(1)，无需 deepcopy。
+
+
+@dataclass(frozen=True, slots=True)
+class ActionDelta:
+    prev: GameState
+    action: str
+    amount: int | None = None
+
+
+def apply_action_recorded(
+    gs: GameState, action: str, amount: int | None = None
+) -> tuple[GameState, ActionDelta]:
+    """apply_action 并返回可供 undo_action 回退的增量。"""
+    new_gs = apply_action(gs, action, amount)
+    return new_gs, ActionDelta(prev=gs, action=action, amount=amount)
+
+
+def undo_action(delta: ActionDelta) -> GameState:
+    """回退一步：返回动作前的状态（其事件流视图不受后继追加影响）。"""
+    return delta.prev
+
+
+class ActionHistory:
+    """HU 引擎上的撤销/重做栈（搜索、教练 what-if 面板、合法区间探测）。
+
+    - apply(): 记录增量并清空重做栈
+    - settle(): 同 settle_if_needed，也可撤销
+    - undo()/redo(): O(1)
+    """
+
+    def __init__(self, gs: GameState):
+        self.state = gs
+        self._undo: list[ActionDelta] = []
+        self._redo: list[tuple[GameState, ActionDelta]] = []
+
+    def apply(self, action: str, amount: int | None = None) -> GameState:
+        self.state, delta = apply_action_recorded(self.state, action, amount)
+        self._undo.append(delta)
+        self._redo.clear()
+        return self.state
+
+    def settle(self) -> GameState:
+        new_gs = settle_if_needed(self.state)
+        if new_gs is not self.state:
+            self._undo.append(ActionDelta(prev=self.state, action="settle"))
+            self._redo.clear()
+            self.state = new_gs
+        return self.state
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def undo(self) -> GameState:
+        if not self._undo:
+            raise IndexError("nothing to undo")
+        delta = self._undo.pop()
+        self._redo.append((self.state, delta))
+        self.state = undo_action(delta)
+        return self.state
+
+    def redo(self) -> GameState:
+        if not self._redo:
+            raise IndexError("nothing to redo")
+        nxt, delta = self._redo.pop()
+        self._undo.append(delta)
+        self.state = nxt
+        return self.state
+
+    @property
+    def actions(self) -> list[tuple[str, int | None]]:
+        return [(d.action, d.amount) for d in self._undo]
+
+
+def _hand_strength(cards7: list[int]) -> Strength:
     # 使用 providers 适配层：优先调用 pokerkit，否则回退到简化强度
     hole, board = cards7[:2], cards7[2:]
     return get_evaluator().evaluate7(hole, board).strength
@@ -534,7 +677,7 @@ def _settle_fold(gs: GameState, winner: int) -> GameState:
         p1 = _replace_player(p1, stack=p1.stack + pot_total, invested_street=0)
         p0 = _replace_player(p0, invested_street=0)
     gs = replace(gs, players=(p0, p1), pot=0, street="complete", to_act=-1)
-    gs.events.append({"t": "win_fold", "who": winner, "amt": pot_total})
+    gs = _emit(gs, {"t": "win_fold", "who": winner, "amt": pot_total})
     return gs
 
 
@@ -564,28 +707,29 @@ def settle_if_needed(gs: GameState) -> GameState:
     gs = replace(gs, pot=0, players=(p0, p1))
 
     winner, tie, best5 = _showdown_eval(gs)
-    gs.events.append(
+    gs = _emit(
+        gs,
         {
             "t": "showdown",
             "winner": winner,
             "is_tie": tie,
             "best5": best5,
-            "board": list(gs.board),
-        }
+            "board": card_strs(gs.board),
+        },
     )
 
     if tie:
         p0 = _replace_player(gs.players[0], stack=gs.players[0].stack + pot_total // 2)
         p1 = _replace_player(gs.players[1], stack=gs.players[1].stack + pot_total - pot_total // 2)
         gs = replace(gs, players=(p0, p1))
-        gs.events.append({"t": "split", "amt": pot_total})
+        gs = _emit(gs, {"t": "split", "amt": pot_total})
     else:
         pw = gs.players[winner]
         pw = _replace_player(pw, stack=pw.stack + pot_total)
         lst = list(gs.players)
         lst[winner] = pw
         gs = replace(gs, players=tuple(lst))
-        gs.events.append({"t": "win_showdown", "who": winner, "amt": pot_total})
+        gs = _emit(gs, {"t": "win_showdown", "who": winner, "amt": pot_total})
 
     return replace(gs, street="complete", to_act=-1)
 
@@ -597,12 +741,16 @@ def start_hand_with_carry(
     button: int,
     stacks: tuple[int, int],
     seed: int | None = None,
+    rng: RNG | None = None,
+    deck: list[int] | None = None,
 ):
     """
     在沿用上一手 stacks 的前提下开新手。
     - 不改变原 start_hand 的签名/行为，避免破坏现有调用点。
     """
-    gs = start_hand(cfg, session_id=session_id, hand_id=hand_id, button=button, seed=seed)
+    gs = start_hand(
+        cfg, session_id=session_id, hand_id=hand_id, button=button, seed=seed, rng=rng, deck=deck
+    )
     # 用上一手后的筹码覆盖刚开局的玩家堆栈
     inv0 = gs.players[0].invested_street  # 本手 start_hand 已写入的 SB/BB
     inv1 = gs.players[1].invested_street
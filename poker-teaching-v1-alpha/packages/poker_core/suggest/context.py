@@ -1,19 +1,35 @@
-"""Centralised configuration/context snapshot for suggest policies."""
+"""Centralised configuration/context snapshot for suggest policies.
+
+SuggestContext.build() 走进程级注册表：按 (策略, 配置目录, 开关, 配置代号) 缓存
+已构建的不可变快照，命中时只是一次 dict 查找。配置代号在以下情况递增（并清空表缓存）：
+- 显式调用 bump_context_version()（如热更新配置后；替换表加载函数的测试亦需调用）
+- 后台线程每 SUGGEST_CONFIG_WATCH_SECONDS 秒（默认 5，设为 0 关闭）轮询配置文件 mtime，
+  发现变化即递增
+"""
 
 from __future__ import annotations
 
 import os
+import threading
 from collections.abc import Mapping
 from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
+from . import flop_rules as _flop_rules
+from . import preflop_tables as _tables
+from . import turn_river_rules as _turn_river_rules
+from .config_loader import _resolve_base_dir
 from .preflop_tables import (
     config_profile_name,
     config_strategy_name,
     get_modes,
     get_open_table,
     get_vs_table,
+    requested_strategy,
 )
+from .rule_compiler import clear_compiled
 
 
 @dataclass(frozen=True)
@@ -38,6 +54,21 @@ class SuggestContext:
 
     @classmethod
     def build(cls) -> SuggestContext:
+        """当前配置下的共享快照（注册表命中即返回，未命中时构建并登记）。"""
+        key = _registry_key()
+        ctx = _REGISTRY.get(key)
+        if ctx is None:
+            ctx = cls.fresh()
+            with _LOCK:
+                if len(_REGISTRY) >= _REGISTRY_MAX:
+                    _REGISTRY.clear()
+                _REGISTRY[key] = ctx
+            _maybe_start_watcher()
+        return ctx
+
+    @classmethod
+    def fresh(cls) -> SuggestContext:
+        """绕过注册表，按当前配置重新构建。"""
         open_table, ver_open = get_open_table()
         vs_table, ver_vs = get_vs_table()
         modes, ver_modes = get_modes()
@@ -51,11 +82,13 @@ class SuggestContext:
             config_profile=config_profile_name(),
         )
 
-        versions = {
-            "open": int(ver_open or 0),
-            "vs": int(ver_vs or 0),
-            "modes": int(ver_modes or 0),
-        }
+        versions = MappingProxyType(
+            {
+                "open": int(ver_open or 0),
+                "vs": int(ver_vs or 0),
+                "modes": int(ver_modes or 0),
+            }
+        )
 
         return cls(
             modes=modes,
@@ -81,4 +114,118 @@ def _env_flag(name: str, default: bool) -> bool:
     return value == "1"
 
 
-__all__ = ["SuggestContext", "SuggestFlags", "SuggestProfile"]
+# --- 进程级快照注册表 ---
+
+_REGISTRY: dict[tuple, SuggestContext] = {}
+_REGISTRY_MAX = 64
+_WATCH_SECONDS_DEFAULT = 5.0
+_LOCK = threading.Lock()
+_GENERATION = 0
+_WATCHER: ConfigWatcher | None = None
+
+
+def _registry_key() -> tuple:
+    return (
+        requested_strategy(),
+        os.getenv("SUGGEST_CONFIG_DIR"),
+        os.getenv("SUGGEST_FLOP_VALUE_RAISE"),
+        _GENERATION,
+    )
+
+
+def context_version() -> int:
+    return _GENERATION
+
+
+def bump_context_version() -> int:
+    """配置已变化：清空表/规则缓存与快照注册表，返回新的配置代号。
+
+    postflop 规则重新加载后是新对象，rule_compiler 会据此重编译查找表。
+    """
+    global _GENERATION
+    with _LOCK:
+        for fn in (
+            _tables._load_open,
+            _tables._load_vs,
+            _tables._load_modes,
+            _flop_rules.load_flop_rules,
+            _turn_river_rules._load_rules,
+        ):
+            clear = getattr(fn, "cache_clear", None)
+            if clear is not None:
+                clear()
+        clear_compiled()
+        _REGISTRY.clear()
+        _GENERATION += 1
+        return _GENERATION
+
+
+def config_mtimes(base: Path | None = None) -> tuple[tuple[str, float], ...]:
+    """配置目录下所有 JSON 的 (相对路径, mtime)，用于变更检测。"""
+    root = base or _resolve_base_dir()
+    out: list[tuple[str, float]] = []
+    try:
+        for fp in sorted(root.rglob("*.json")):
+            try:
+                out.append((str(fp.relative_to(root)), fp.stat().st_mtime))
+            except OSError:
+                continue
+    except OSError:
+        pass
+    return tuple(out)
+
+
+class ConfigWatcher(threading.Thread):
+    """后台轮询配置文件 mtime；变化时调用 bump_context_version()。"""
+
+    def __init__(self, interval: float):
+        super().__init__(name="suggest-config-watcher", daemon=True)
+        self.interval = max(0.1, float(interval))
+        self._stop_evt = threading.Event()
+        self._last = config_mtimes()
+
+    def poll(self) -> bool:
+        cur = config_mtimes()
+        if cur == self._last:
+            return False
+        self._last = cur
+        bump_context_version()
+        return True
+
+    def run(self) -> None:
+        while not self._stop_evt.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:
+                pass
+
+    def stop(self) -> None:
+        self._stop_evt.set()
+
+
+def _maybe_start_watcher() -> None:
+    global _WATCHER
+    if _WATCHER is not None:
+        return
+    raw = os.getenv("SUGGEST_CONFIG_WATCH_SECONDS")
+    try:
+        interval = _WATCH_SECONDS_DEFAULT if raw is None or raw.strip() == "" else float(raw)
+    except ValueError:
+        interval = _WATCH_SECONDS_DEFAULT
+    if interval <= 0:
+        return
+    with _LOCK:
+        if _WATCHER is None:
+            _WATCHER = ConfigWatcher(interval)
+            _WATCHER.start()
+
+
+__all__ = [
+    "SuggestContext",
+    "SuggestFlags",
+    "SuggestProfile",
+    "ConfigWatcher",
+    "bump_context_version",
+    "config_mtimes",
+    "context_version",
+]
@@ -40,6 +40,8 @@ class Decision:
     meta: dict | None = None
     rationale: list[dict] | None = None
     min_reopen_code: CodeDef | None = None
+    # 混合策略中所选分支的频率（纯策略为 None）；resolve 时写入 meta["frequency"]
+    frequency: float | None = None
 
     def resolve(
         self,
@@ -49,6 +51,8 @@ class Decision:
     ) -> tuple[dict[str, int | str], dict, list[dict]]:
         suggested: dict[str, int | str] = {"action": self.action}
         meta = dict(self.meta or {})
+        if self.frequency is not None:
+            meta["frequency"] = round(float(self.frequency), 4)
         rationale: list[dict] = list(self.rationale or [])
 
         if self.action in {"bet", "raise", "allin"} and self.sizing is not None:
@@ -23,9 +23,9 @@ def load_flop_rules(strategy: str) -> tuple[dict[str, Any], int]:
 
 
 def get_flop_rules() -> tuple[dict[str, Any], int]:
-    import os
+    from .preflop_tables import requested_strategy
 
-    s = os.getenv("SUGGEST_STRATEGY", "medium").lower()
+    s = requested_strategy()
     return load_flop_rules(s)
 
 
@@ -0,0 +1,223 @@
+"""Precomputed flop features: hand class, FD/NFD, OESD, gutshot.
+
+The 6-bucket flop hand class and the straight draws depend on ranks only; flush draws
+depend on the suit pattern only. (hole, flop) is therefore reduced by suit isomorphism
+in two parts:
+
+- rank part: sorted hole ranks + sorted flop ranks → dense index into a 13^5 uint8
+  table (made-hand bucket, OESD, gutshot). Built offline by
+  ``scripts/build_flop_table.py`` and memory-mapped on first use.
+- suit part: FD/NFD from the suit counts of the five card ids (a few integer ops).
+
+``canonical_flop`` returns the full suit-isomorphic canonical form of (hole, flop)
+(~1.29M classes) for callers that need a cache key across isomorphic spots.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import permutations
+from pathlib import Path
+from typing import Any
+
+from poker_core.cards import CARD_RANK, CARD_SUIT, card_id
+
+from .utils import (
+    HC_MID_OR_THIRD_MINUS,
+    HC_OP_TPTK,
+    HC_STRONG_DRAW,
+    HC_TOP_WEAK_OR_SECOND,
+    HC_VALUE,
+    HC_WEAK_OR_AIR,
+    _has_gutshot,
+    _has_oesd,
+    _made_hand_class,
+)
+
+DEFAULT_PATH = Path(__file__).resolve().parent.parent / "data" / "flop_rank_features_13p5.npy"
+TABLE_SIZE = 13**5
+
+# 表项编码（uint8）：bit0-2 成牌桶，bit3 OESD，bit4 卡顺，bit7 有效标记
+_MADE_CLASSES: tuple[str | None, ...] = (
+    None,
+    HC_VALUE,
+    HC_OP_TPTK,
+    HC_TOP_WEAK_OR_SECOND,
+    HC_MID_OR_THIRD_MINUS,
+)
+_MADE_CODE = {c: i for i, c in enumerate(_MADE_CLASSES)}
+_OESD = 1 << 3
+_GUTSHOT = 1 << 4
+_VALID = 1 << 7
+
+_SUIT_PERMS = tuple(permutations(range(4)))
+
+
+@dataclass(frozen=True)
+class FlopFeatures:
+    hand_class: str
+    fd: bool
+    nfd: bool
+    oesd: bool
+    gutshot: bool
+
+
+def table_path() -> Path:
+    return Path(os.getenv("POKER_FLOP_TABLE_PATH") or DEFAULT_PATH)
+
+
+def rank_index(hole_ranks: Sequence[int], flop_ranks: Sequence[int]) -> int:
+    """Rank values (2..14) → dense table index; order-insensitive within hole / flop."""
+    h = sorted(hole_ranks, reverse=True)
+    b = sorted(flop_ranks, reverse=True)
+    idx = 0
+    for v in (h[0], h[1], b[0], b[1], b[2]):
+        idx = idx * 13 + (v - 2)
+    return idx
+
+
+def rank_features(hole_ranks: Sequence[int], flop_ranks: Sequence[int]) -> int:
+    """Encoded rank-only features (reference computation used to build the table)."""
+    hr1, hr2 = hole_ranks[0], hole_ranks[1]
+    b_ranks = list(flop_ranks[:3])
+    made = _made_hand_class(hr1, hr2, b_ranks)
+    # 任意花色的代表牌：顺子听牌只看点数
+    hole_ids = [(v - 2) * 4 for v in (hr1, hr2)]
+    flop_ids = [(v - 2) * 4 for v in b_ranks]
+    v = _VALID | _MADE_CODE[made]
+    if _has_oesd(hole_ids, flop_ids):
+        v |= _OESD
+    if _has_gutshot(hole_ids, flop_ids):
+        v |= _GUTSHOT
+    return v
+
+
+def build_table() -> bytearray:
+    """Fill every valid rank combination (each rank at most 4 times)."""
+    out = bytearray(TABLE_SIZE)
+    for h0 in range(14, 1, -1):
+        for h1 in range(h0, 1, -1):
+            for b0 in range(14, 1, -1):
+                for b1 in range(b0, 1, -1):
+                    for b2 in range(b1, 1, -1):
+                        ranks = (h0, h1, b0, b1, b2)
+                        if max(ranks.count(r) for r in ranks) > 4:
+                            continue
+                        out[rank_index((h0, h1), (b0, b1, b2))] = rank_features(
+                            (h0, h1), (b0, b1, b2)
+                        )
+    return out
+
+
+@lru_cache(maxsize=1)
+def _table() -> Any:
+    try:
+        import numpy as np
+
+        t = np.load(table_path(), mmap_mode="r")
+        if t.shape != (TABLE_SIZE,) or t.dtype != np.uint8:
+            return None
+        # memoryview 索引直接得到 int，比 numpy 标量快；底层仍是 mmap
+        return memoryview(t)
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=8192)
+def _rank_features_cached(hole_ranks: tuple[int, int], flop_ranks: tuple[int, int, int]) -> int:
+    return rank_features(hole_ranks, flop_ranks)
+
+
+def _lookup(hole_ranks: tuple[int, int], flop_ranks: tuple[int, int, int]) -> int:
+    t = _table()
+    if t is not None:
+        v = t[rank_index(hole_ranks, flop_ranks)]
+        if v & _VALID:
+            return v
+    return _rank_features_cached(hole_ranks, flop_ranks)
+
+
+def _flush_draw(hole_ids: Sequence[int], flop_ids: Sequence[int]) -> tuple[bool, bool]:
+    # 与 utils._has_fd 同口径：看公共牌中张数最多的花色
+    counts = [0, 0, 0, 0]
+    for c in flop_ids:
+        counts[CARD_SUIT[c]] += 1
+    cnt = max(counts)
+    if cnt < 2:
+        return False, False
+    suit = counts.index(cnt)
+    hole_s = sum(1 for c in hole_ids if CARD_SUIT[c] == suit)
+    fd = (cnt == 2 and hole_s == 2) or (cnt == 3 and hole_s >= 1)
+    if not fd:
+        return False, False
+    nfd = any(CARD_RANK[c] == 14 and CARD_SUIT[c] == suit for c in hole_ids)
+    return True, nfd
+
+
+def flop_features(hole: Sequence[int | str], flop: Sequence[int | str]) -> FlopFeatures:
+    h = [card_id(c) for c in hole]
+    f = [card_id(c) for c in flop[:3]]
+    if len(h) != 2 or len(f) < 3:
+        return FlopFeatures(HC_WEAK_OR_AIR, False, False, False, False)
+    v = _lookup(
+        (CARD_RANK[h[0]], CARD_RANK[h[1]]), (CARD_RANK[f[0]], CARD_RANK[f[1]], CARD_RANK[f[2]])
+    )
+    fd, nfd = _flush_draw(h, f)
+    oesd = bool(v & _OESD)
+    made = _MADE_CLASSES[v & 0b111]
+    if made is not None:
+        hand_class = made
+    elif fd or oesd:
+        hand_class = HC_STRONG_DRAW
+    else:
+        hand_class = HC_WEAK_OR_AIR
+    return FlopFeatures(hand_class, fd, nfd, oesd, bool(v & _GUTSHOT))
+
+
+def flop_hand_class(hole: Sequence[int | str], flop: Sequence[int | str]) -> str:
+    """Table-backed equivalent of ``utils.infer_flop_hand_class``."""
+    try:
+        if len(hole) != 2 or len(flop) < 3:
+            return HC_WEAK_OR_AIR
+        h = [card_id(hole[0]), card_id(hole[1])]
+        f = [card_id(flop[0]), card_id(flop[1]), card_id(flop[2])]
+        v = _lookup(
+            (CARD_RANK[h[0]], CARD_RANK[h[1]]), (CARD_RANK[f[0]], CARD_RANK[f[1]], CARD_RANK[f[2]])
+        )
+        made = _MADE_CLASSES[v & 0b111]
+        if made is not None:
+            return made
+        if v & _OESD or _flush_draw(h, f)[0]:
+            return HC_STRONG_DRAW
+        return HC_WEAK_OR_AIR
+    except Exception:
+        return HC_WEAK_OR_AIR
+
+
+def canonical_flop(hole: Sequence[int | str], flop: Sequence[int | str]) -> tuple[int, ...]:
+    """Suit-isomorphic canonical form: min over the 24 suit relabelings of
+    (hole ids desc, flop ids desc)."""
+    h = [card_id(c) for c in hole]
+    f = [card_id(c) for c in flop]
+    best: tuple[int, ...] | None = None
+    for p in _SUIT_PERMS:
+        key = tuple(sorted(((c & ~3) | p[c & 3] for c in h), reverse=True)) + tuple(
+            sorted(((c & ~3) | p[c & 3] for c in f), reverse=True)
+        )
+        if best is None or key < best:
+            best = key
+    return best or ()
+
+
+__all__ = [
+    "FlopFeatures",
+    "flop_features",
+    "flop_hand_class",
+    "canonical_flop",
+    "build_table",
+    "rank_index",
+    "table_path",
+]
@@ -0,0 +1,153 @@
+"""
+混合频率（mixed strategy）支持。
+
+配置写法：
+- 翻前（ranges/preflop_vs_raise_HU_*.json 的桶节点、preflop_open_HU_*.json 顶层）：
+    "mix": {"A5s": {"reraise": 0.6, "call": 0.4}}          # vs_raise 桶
+    "mix": {"SB": {"K5o": 0.5}}                              # open 表：开局频率
+  未出现在 mix 中的组合沿用纯策略列表（频率 1.0）。
+- 翻后规则节点：
+    {"mix": [{"action": "bet", "size_tag": "half", "freq": 0.6},
+             {"action": "check", "freq": 0.4}], "plan": "..."}
+  每个分支与节点其余字段合并后即为最终节点。
+
+加载时编译为稠密频率数组（每个动作一条 169 长的 float 数组）；
+选择时以 stable_uniform(hand_id, salt) 得到 [0,1) 的稳定随机数：同一手牌、同一决策点
+结果恒定，可复现。所选分支的频率写入 meta["frequency"]。
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Mapping
+from hashlib import sha1
+from typing import Any
+
+from .range169 import N_CELLS, Range169, combo_index
+
+# 频率总和允许的浮点误差
+_EPS = 1e-9
+
+
+def stable_uniform(hand_id: str, salt: str = "") -> float:
+    """sha1(hand_id|salt) → [0, 1) 的稳定均匀数（与 stable_roll 同源思路）。"""
+    h = sha1(f"{hand_id or ''}|{salt}".encode()).hexdigest()
+    return int(h[:13], 16) / float(1 << 52)
+
+
+class MixedFreqs:
+    """按动作的 169 格频率数组；行和 ≤ 1，余量表示“都不选”（面对加注时弃牌，首入时不开局）。"""
+
+    __slots__ = ("actions", "_freq", "mixed")
+
+    def __init__(self, actions: tuple[str, ...], freq: dict[str, array]):
+        self.actions = actions
+        self._freq = freq
+        # 至少一个动作频率严格介于 0 与 1 之间的组合
+        self.mixed = Range169.from_indices(
+            i for i in range(N_CELLS) if any(_EPS < freq[a][i] < 1.0 - _EPS for a in actions)
+        )
+
+    @classmethod
+    def compile(
+        cls,
+        pure: Mapping[str, Iterable[str]],
+        mix: Mapping[str, Mapping[str, Any]] | None,
+        actions: tuple[str, ...],
+    ) -> MixedFreqs:
+        """pure：动作 → 纯策略组合（按 actions 顺序优先，重叠时靠前者得 1.0）；
+        mix：组合 → {动作: 频率}，覆盖该组合的整行；行和 > 1 时按比例归一。
+        """
+        freq = {a: array("d", bytes(8 * N_CELLS)) for a in actions}
+        taken = Range169()
+        for a in actions:
+            rng = Range169.coerce(pure.get(a)) - taken
+            for i in rng.indices():
+                freq[a][i] = 1.0
+            taken |= rng
+        for label, row in (mix or {}).items():
+            i = combo_index(str(label).strip())
+            if i is None or not isinstance(row, Mapping):
+                continue
+            vals = {a: max(0.0, _as_float(row.get(a))) for a in actions}
+            total = sum(vals.values())
+            scale = 1.0 / total if total > 1.0 else 1.0
+            for a in actions:
+                freq[a][i] = vals[a] * scale
+        return cls(actions, freq)
+
+    def frequency(self, action: str, index: int) -> float:
+        arr = self._freq.get(action)
+        return float(arr[index]) if arr is not None else 0.0
+
+    def row(self, index: int) -> dict[str, float]:
+        return {a: float(self._freq[a][index]) for a in self.actions}
+
+    def support(self, action: str) -> Range169:
+        """该动作频率 > 0 的组合。"""
+        arr = self._freq.get(action)
+        if arr is None:
+            return Range169()
+        return Range169.from_indices(i for i in range(N_CELLS) if arr[i] > _EPS)
+
+    def choose(self, index: int, u: float) -> tuple[str | None, float]:
+        """按累计频率选动作；落在余量时返回 (None, 余量频率)。"""
+        cum = 0.0
+        for a in self.actions:
+            f = self._freq[a][index]
+            cum += f
+            if u < cum:
+                return a, float(f)
+        return None, max(0.0, 1.0 - cum)
+
+
+def compile_node_mix(node: Mapping[str, Any]) -> tuple[tuple[float, ...], tuple[dict, ...]] | None:
+    """翻后规则节点的 mix → (累计频率, 合并后的分支节点)；无 mix 返回 None。"""
+    entries = node.get("mix") if isinstance(node, Mapping) else None
+    if not isinstance(entries, list) or not entries:
+        return None
+    base = {k: v for k, v in node.items() if k != "mix"}
+    weights: list[float] = []
+    variants: list[dict] = []
+    for entry in entries:
+        if not isinstance(entry, Mapping):
+            continue
+        weights.append(max(0.0, _as_float(entry.get("freq"))))
+        variants.append({**base, **{k: v for k, v in entry.items() if k != "freq"}})
+    total = sum(weights)
+    if total <= 0:
+        return None
+    scale = 1.0 / total if total > 1.0 else 1.0
+    cum: list[float] = []
+    acc = 0.0
+    for w in weights:
+        acc += w * scale
+        cum.append(acc)
+    return tuple(cum), tuple(variants)
+
+
+def choose_variant(
+    compiled: tuple[tuple[float, ...], tuple[dict, ...]], u: float
+) -> tuple[dict | None, float]:
+    cum, variants = compiled
+    prev = 0.0
+    for c, v in zip(cum, variants, strict=True):
+        if u < c:
+            return v, c - prev
+        prev = c
+    return None, max(0.0, 1.0 - prev)
+
+
+def _as_float(v: Any) -> float:
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+__all__ = [
+    "MixedFreqs",
+    "choose_variant",
+    "compile_node_mix",
+    "stable_uniform",
+]
@@ -15,6 +15,8 @@ from .decision import Decision, SizeSpec
 from .flop_rules import get_flop_rules
 from .policy_preflop import decide_bb_defend, decide_sb_open, decide_sb_vs_threebet
 from .preflop_tables import bucket_facing_size
+from .range169 import Range169
+from .rule_compiler import compiled_rules, walk_rules
 from .turn_river_rules import get_river_rules, get_turn_rules
 from .types import Observation, PolicyConfig
 from .utils import (
@@ -352,7 +354,7 @@ def policy_preflop_v1(
     # Fallbacks for edge cases not covered by dedicated helpers
     is_sb_first_in = obs.street == "preflop" and bool(obs.first_to_act)
     if is_sb_first_in:
-        open_set = set(open_tab.get("SB", set()) or set())
+        open_set = Range169.coerce(open_tab.get("SB"))
         betlike = pick_betlike_action(acts)
         if combo in open_set and not betlike:
             rationale.append(R(SCodes.PF_NO_LEGAL_RAISE))
@@ -367,8 +369,8 @@ def policy_preflop_v1(
         ip_like = bool(obs.last_to_act)
         defend_thr = defend_ip if ip_like else defend_oop
         node_vs = (vs_tab.get("BB_vs_SB", {}) or {}).get(bucket, {}) or {}
-        call_set = set(node_vs.get("call", set()) or set())
-        reraise_set = set(node_vs.get("reraise", set()) or set())
+        call_set = Range169.coerce(node_vs.get("call"))
+        reraise_set = Range169.coerce(node_vs.get("reraise"))
 
         is_out_of_range = combo and combo not in call_set and combo not in reraise_set
         vs_table_empty = not call_set and not reraise_set
@@ -430,23 +432,7 @@ def _match_rule_with_trace(
     node: dict[str, Any], keys: list[str]
 ) -> tuple[dict[str, Any] | None, str]:
     """Depth-first lookup with defaults fallback and trace of matched path."""
-    cur: Any = node
-    path: list[str] = []
-    try:
-        for k in keys:
-            if isinstance(cur, dict) and k in cur:
-                cur = cur[k]
-                path.append(k)
-            elif isinstance(cur, dict) and "defaults" in cur:
-                cur = cur["defaults"]
-                path.append(f"defaults:{k}")
-            else:
-                return None, "/".join(path)
-        if isinstance(cur, dict) and ("action" in cur or "size_tag" in cur):
-            return cur, "/".join(path)
-    except Exception:
-        return None, "/".join(path)
-    return None, "/".join(path)
+    return walk_rules(node, keys)
 
 
 def policy_flop_v1(
@@ -502,35 +488,19 @@ def policy_flop_v1(
 
     # 1) No bet yet: prefer c-bet on dry boards when PFR
     if to_call == 0:
-        node = None
-        if pot_type == "limped":
-            node, rule_path = _match_rule_with_trace(
-                rules,
-                [
-                    pot_type,
-                    "role",
-                    "na",
-                    ip_key,
-                    texture,
-                    spr,
-                    str(obs.hand_class or "unknown"),
-                ],
-            )
-            meta.setdefault("rule_path", rule_path)
-        else:
-            node, rule_path = _match_rule_with_trace(
-                rules,
-                [
-                    pot_type,
-                    "role",
-                    role,
-                    ip_key,
-                    texture,
-                    spr,
-                    str(obs.hand_class or "unknown"),
-                ],
-            )
-            meta.setdefault("rule_path", rule_path)
+        # 编译后的查找表：defaults 回退与 rule_path 均已预先算好
+        compiled = compiled_rules(rules)
+        node, rule_path = compiled.lookup(
+            pot_type,
+            "na" if pot_type == "limped" else role,
+            ip_key,
+            texture,
+            spr,
+            str(obs.hand_class or "unknown"),
+        )
+        meta.setdefault("rule_path", rule_path)
+        # 混合频率节点：按 hand_id 稳定抽取分支
+        node, frequency = compiled.pick(node, obs.hand_id, f"flop/{rule_path}")
 
         if node:
             action = str(node.get("action") or "bet")
@@ -545,6 +515,7 @@ def policy_flop_v1(
                     action=action,
                     sizing=SizeSpec.tag(size_tag),
                     meta={"size_tag": size_tag},
+                    frequency=frequency,
                 )
                 suggested, decision_meta, decision_rationale = decision.resolve(obs, acts, cfg)
                 meta.update(decision_meta)
@@ -565,7 +536,7 @@ def policy_flop_v1(
             if action == "check" and find_action(acts, "check"):
                 rationale.append(R(SCodes.FL_DELAYED_CBET_PLAN))
                 meta["rule_path"] = rule_path
-                decision = Decision(action="check", meta={})
+                decision = Decision(action="check", meta={}, frequency=frequency)
                 suggested, decision_meta, decision_rationale = decision.resolve(obs, acts, cfg)
                 meta.update(decision_meta)
                 rationale.extend(decision_rationale)
@@ -842,40 +813,22 @@ def _policy_postflop_generic(
         "plan": None,
     }
 
-    def _lookup_node() -> tuple[dict[str, Any] | None, str]:
-        keys = [
+    def _lookup_node() -> tuple[dict[str, Any] | None, str, float | None]:
+        compiled = compiled_rules(rules, early_stop=True)
+        node, path = compiled.lookup(
             pot_type,
-            "role",
             role if pot_type != "limped" else "na",
             ip_key,
             texture,
             spr,
             str(obs.hand_class or "unknown"),
-        ]
-        cur: Any = rules
-        path: list[str] = []
-        try:
-            for k in keys:
-                if isinstance(cur, dict) and k in cur:
-                    cur = cur[k]
-                    path.append(k)
-                elif isinstance(cur, dict) and "defaults" in cur:
-                    cur = cur["defaults"]
-                    path.append(f"defaults:{k}")
-                else:
-                    return None, "/".join(path)
-                # Early stop if current node already specifies action/sizing
-                if isinstance(cur, dict) and ("action" in cur or "size_tag" in cur):
-                    return cur, "/".join(path)
-            if isinstance(cur, dict) and ("action" in cur or "size_tag" in cur):
-                return cur, "/".join(path)
-        except Exception:
-            return None, "/".join(path)
-        return None, "/".join(path)
+        )
+        node, frequency = compiled.pick(node, obs.hand_id, f"{street}/{path}")
+        return node, path, frequency
 
     # 1) No bet yet: use table or safe default
     if to_call == 0:
-        node, rule_path = _lookup_node()
+        node, rule_path, frequency = _lookup_node()
         if node:
             action = str(node.get("action") or "bet")
             size_tag = str(node.get("size_tag") or "third")
@@ -888,13 +841,16 @@ def _policy_postflop_generic(
                 find_action(acts, action) or pick_betlike_action(acts)
             ):
                 decision = Decision(
-                    action=action, sizing=SizeSpec.tag(size_tag), meta={"size_tag": size_tag}
+                    action=action,
+                    sizing=SizeSpec.tag(size_tag),
+                    meta={"size_tag": size_tag},
+                    frequency=frequency,
                 )
                 suggested, dmeta, drat = decision.resolve(obs, acts, cfg)
                 meta.update(dmeta)
                 return suggested, rationale + drat, f"{street}_v1", meta
             if action == "check" and find_action(acts, "check"):
-                decision = Decision(action="check", meta={})
+                decision = Decision(action="check", meta={}, frequency=frequency)
                 suggested, dmeta, drat = decision.resolve(obs, acts, cfg)
                 meta.update(dmeta)
                 return suggested, rationale + drat, f"{street}_v1", meta
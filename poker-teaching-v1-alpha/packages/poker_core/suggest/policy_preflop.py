@@ -9,7 +9,10 @@ from poker_core.suggest.codes import SCodes
 from poker_core.suggest.codes import mk_rationale as R
 from poker_core.suggest.context import SuggestContext
 from poker_core.suggest.decision import Decision, SizeSpec
+from poker_core.suggest.mixing import MixedFreqs, stable_uniform
+from poker_core.suggest.preflop_equity import equity_vs_labels
 from poker_core.suggest.preflop_tables import bucket_facing_size
+from poker_core.suggest.range169 import EMPTY_RANGE, Range169, combo_index
 from poker_core.suggest.types import Observation, PolicyConfig
 from poker_core.suggest.utils import (
     find_action,
@@ -41,15 +44,44 @@ def _mode_thr(ctx: SuggestContext) -> tuple[float, float]:
     return small_le, mid_le
 
 
+def _equity_meta(combo: str, villain_labels) -> dict[str, float]:
+    """Precomputed all-in equity vs the villain range (omitted when the matrix is unavailable)."""
+    if not combo:
+        return {}
+    eq = equity_vs_labels(combo, villain_labels or ())
+    return {"equity_vs_range": round(eq, 3)} if eq is not None else {}
+
+
+def _pick_mixed(freq, combo: str, hand_id: str, salt: str) -> tuple[str | None, float] | None:
+    """组合在 freq 中为混合频率时按 hand_id 稳定抽取动作；纯策略组合返回 None。"""
+    if not isinstance(freq, MixedFreqs) or combo not in freq.mixed:
+        return None
+    return freq.choose(combo_index(combo), stable_uniform(hand_id, salt))
+
+
+def _leftover_decision(
+    obs: Observation, bucket: str, frequency: float, eq_meta: dict
+) -> PreflopDecision | None:
+    """混合行抽中未分配的剩余份额：显式弃牌（不可弃时过牌），不落入按范围判定的兜底。"""
+    if find_action(obs.acts, "fold"):
+        action, code = "fold", SCodes.PF_FOLD_EXPENSIVE
+    elif find_action(obs.acts, "check"):
+        action, code = "check", SCodes.PF_CHECK_NOT_IN_RANGE
+    else:
+        return None
+    decision = Decision(action=action, meta={"bucket": bucket}, frequency=frequency)
+    return PreflopDecision(decision, [R(code, data={"bucket": bucket})], meta=eq_meta)
+
+
 def _plan_sb_rfi(ctx: SuggestContext, combo: str) -> str:
     small_le, mid_le = _mode_thr(ctx)
     vs_sb = ctx.vs_table.get("SB_vs_BB_3bet", {}) or {}
-    fourbet_set = set()
-    call_set = set()
+    fourbet_set = EMPTY_RANGE
+    call_set = EMPTY_RANGE
     for bkt in ("small", "mid", "large"):
         node = vs_sb.get(bkt, {}) or {}
-        fourbet_set |= set(node.get("fourbet") or node.get("reraise") or [])
-        call_set |= set(node.get("call") or [])
+        fourbet_set |= Range169.coerce(node.get("fourbet") or node.get("reraise"))
+        call_set |= Range169.coerce(node.get("call"))
     if combo in fourbet_set:
         return f"若被 3bet：≤{int(small_le)}bb 四bet；≤{int(mid_le)}bb 四bet/跟注；更大 保守处理。"
     if combo in call_set:
@@ -80,9 +112,15 @@ def decide_sb_open(
         return None
 
     combo = obs.combo or ""
-    open_set = set(ctx.open_table.get("SB", set()) or set())
-    if combo not in open_set:
+    picked = _pick_mixed(
+        (ctx.open_table.get("mix") or {}).get("SB"), combo, obs.hand_id, "preflop/SB_open"
+    )
+    if picked is None:
+        if combo not in Range169.coerce(ctx.open_table.get("SB")):
+            return None
+    elif picked[0] != "open":
         return None
+    frequency = picked[1] if picked else None
 
     modes = ctx.modes.get("HU", {}) if isinstance(ctx.modes, dict) else {}
     open_bb = float(modes.get("open_bb", cfg.open_size_bb))
@@ -93,6 +131,7 @@ def decide_sb_open(
         action=betlike.action,
         sizing=SizeSpec.bb(open_bb),
         meta={"open_bb": open_bb, "plan": plan_str},
+        frequency=frequency,
     )
     return PreflopDecision(decision=decision, rationale=rationale, meta={})
 
@@ -120,14 +159,23 @@ def decide_bb_defend(
 
     bucket = bucket_facing_size(obs.to_call / float(obs.bb))
     vs_node = (ctx.vs_table.get("BB_vs_SB", {}) or {}).get(bucket, {}) or {}
-    call_set = set(vs_node.get("call", set()) or set())
-    reraise_set = set(vs_node.get("reraise", set()) or set())
+    call_set = Range169.coerce(vs_node.get("call"))
+    reraise_set = Range169.coerce(vs_node.get("reraise"))
 
     combo = obs.combo or ""
     price = pot_odds(obs.to_call, obs.pot_now)
     rationale: list[dict] = []
+    eq_meta = _equity_meta(combo, ctx.open_table.get("SB"))
+
+    picked = _pick_mixed(vs_node.get("freq"), combo, obs.hand_id, f"preflop/BB_vs_SB/{bucket}")
+    if picked is None:
+        in_reraise, in_call, frequency = combo in reraise_set, combo in call_set, None
+    elif picked[0] is None:
+        return _leftover_decision(obs, bucket, picked[1], eq_meta)
+    else:
+        in_reraise, in_call, frequency = picked[0] == "reraise", picked[0] == "call", picked[1]
 
-    if combo in reraise_set and find_action(obs.acts, "raise"):
+    if in_reraise and find_action(obs.acts, "raise"):
         to_call_bb = obs.to_call / float(obs.bb)
         open_to_bb = to_call_bb + 1.0
         mult = reraise_ip_mult if ip_like else reraise_oop_mult
@@ -146,10 +194,11 @@ def decide_bb_defend(
                 "plan": "若遭四bet 默认弃牌；仅 QQ+/AK 继续。",
             },
             min_reopen_code=SCodes.PF_DEFEND_3BET_MIN_RAISE_ADJUSTED,
+            frequency=frequency,
         )
-        return PreflopDecision(decision, rationale, meta={})
+        return PreflopDecision(decision, rationale, meta=eq_meta)
 
-    if combo in call_set and find_action(obs.acts, "call"):
+    if in_call and find_action(obs.acts, "call"):
         if price <= defend_thr:
             rationale.append(
                 R(
@@ -164,8 +213,9 @@ def decide_bb_defend(
                     "pot_odds": round(price, 4),
                     "plan": "进入翻牌：按 Flop v1（纹理+MDF）继续。",
                 },
+                frequency=frequency,
             )
-            return PreflopDecision(decision, rationale, meta={})
+            return PreflopDecision(decision, rationale, meta=eq_meta)
         else:
             rationale.append(
                 R(
@@ -176,7 +226,7 @@ def decide_bb_defend(
             if find_action(obs.acts, "fold"):
                 meta = {"bucket": bucket, "pot_odds": round(price, 4)}
                 decision = Decision(action="fold", meta=meta)
-                return PreflopDecision(decision, rationale, meta={})
+                return PreflopDecision(decision, rationale, meta=eq_meta)
 
     return None
 
@@ -200,12 +250,26 @@ def decide_sb_vs_threebet(
     threebet_to_bb = _threebet_to_bb(obs)
     bucket = _bucket_threebet_to(threebet_to_bb, ctx)
     node = vs_sb.get(bucket, {}) or {}
-    fourbet_set = set(node.get("fourbet", set()) or node.get("reraise", set()) or set())
-    call_set = set(node.get("call", set()) or set())
+    fourbet_set = Range169.coerce(node.get("fourbet") or node.get("reraise"))
+    call_set = Range169.coerce(node.get("call"))
 
     rationale: list[dict] = []
-
-    if combo in fourbet_set and find_action(obs.acts, "raise"):
+    # BB 3bet 范围：各开局尺寸桶 reraise 的并集
+    threebet_range = EMPTY_RANGE
+    for bb_node in (ctx.vs_table.get("BB_vs_SB", {}) or {}).values():
+        threebet_range |= Range169.coerce((bb_node or {}).get("reraise"))
+    eq_meta = _equity_meta(combo, threebet_range)
+
+    picked = _pick_mixed(node.get("freq"), combo, obs.hand_id, f"preflop/SB_vs_BB_3bet/{bucket}")
+    if picked is None:
+        in_fourbet, in_call, frequency = combo in fourbet_set, combo in call_set, None
+    elif picked[0] is None:
+        return _leftover_decision(obs, bucket, picked[1], eq_meta)
+    else:
+        in_fourbet = picked[0] in ("fourbet", "reraise")
+        in_call, frequency = picked[0] == "call", picked[1]
+
+    if in_fourbet and find_action(obs.acts, "raise"):
         modes = ctx.modes.get("HU", {}) if isinstance(ctx.modes, dict) else {}
         fourbet_ip_mult = float(modes.get("fourbet_ip_mult", 2.2))
         cap_ratio_4b = float(modes.get("cap_ratio_4b", modes.get("cap_ratio", 0.9)))
@@ -231,10 +295,11 @@ def decide_sb_vs_threebet(
                 "plan": f"面对 3bet：≤{int(small_le)}bb 4bet 到 {int(fourbet_to_bb)}bb；≤{int(mid_le)}bb 4bet；更大 谨慎/弃牌。",
             },
             min_reopen_code=SCodes.PF_ATTACK_4BET_MIN_RAISE_ADJUSTED,
+            frequency=frequency,
         )
-        return PreflopDecision(decision, rationale, meta={})
+        return PreflopDecision(decision, rationale, meta=eq_meta)
 
-    if combo in call_set and find_action(obs.acts, "call"):
+    if in_call and find_action(obs.acts, "call"):
         rationale.append(R(SCodes.PF_DEFEND_PRICE_OK, data={"bucket": bucket}))
         small_le, mid_le = _mode_thr(ctx)
         decision = Decision(
@@ -243,8 +308,9 @@ def decide_sb_vs_threebet(
                 "bucket": bucket,
                 "plan": f"面对 3bet：≤{int(small_le)}bb 跟注；≤{int(mid_le)}bb 跟注；更大 弃牌。",
             },
+            frequency=frequency,
         )
-        return PreflopDecision(decision, rationale, meta={})
+        return PreflopDecision(decision, rationale, meta=eq_meta)
 
     # Fallback: call if pot odds are good or 3bet is small
     if find_action(obs.acts, "call"):
@@ -262,12 +328,12 @@ def decide_sb_vs_threebet(
             decision = Decision(
                 action="call", meta={"bucket": bucket, "pot_odds": round(pot_odds, 4)}
             )
-            return PreflopDecision(decision, rationale, meta={})
+            return PreflopDecision(decision, rationale, meta=eq_meta)
 
     if find_action(obs.acts, "fold"):
         rationale.append(R(SCodes.PF_FOLD_EXPENSIVE, data={"bucket": bucket}))
         decision = Decision(action="fold", meta={"bucket": bucket})
-        return PreflopDecision(decision, rationale, meta={})
+        return PreflopDecision(decision, rationale, meta=eq_meta)
 
     return None
 
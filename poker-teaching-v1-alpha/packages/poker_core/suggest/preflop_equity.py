@@ -0,0 +1,79 @@
+"""HU preflop all-in equity matrix (169 x 169).
+
+The artifact is produced offline by ``scripts/build_preflop_equity.py`` and stored as a
+uint16 ``.npy`` (equity * 65535, row = hero label, col = villain label, grid order of
+``range169.COMBO_LABELS``). It is memory-mapped on first use; lookups are O(1).
+
+When numpy or the artifact is unavailable every getter returns None, so callers can
+simply omit the number.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from .range169 import COMBO_COUNTS, Range169, combo_index
+
+SCALE = 65535
+DEFAULT_PATH = Path(__file__).resolve().parent.parent / "data" / "preflop_equity_hu_169.npy"
+
+
+def matrix_path() -> Path:
+    return Path(os.getenv("POKER_PREFLOP_EQUITY_PATH") or DEFAULT_PATH)
+
+
+@lru_cache(maxsize=1)
+def _matrix() -> Any:
+    try:
+        import numpy as np
+
+        m = np.load(matrix_path(), mmap_mode="r")
+        if m.shape != (169, 169):
+            return None
+        return m
+    except Exception:
+        return None
+
+
+def preflop_equity(hero: str, villain: str) -> float | None:
+    """Equity of label ``hero`` all-in vs label ``villain`` (e.g. 'AKs' vs 'QQ')."""
+    m = _matrix()
+    i, j = combo_index(hero), combo_index(villain)
+    if m is None or i is None or j is None:
+        return None
+    return int(m[i, j]) / SCALE
+
+
+@lru_cache(maxsize=1024)
+def _equity_vs_bits(hero: str, villain_bits: int) -> float | None:
+    m = _matrix()
+    i = combo_index(hero)
+    if m is None or i is None:
+        return None
+    row = m[i]
+    num = 0.0
+    den = 0
+    for j in Range169(villain_bits).indices():
+        w = COMBO_COUNTS[j]
+        num += w * int(row[j])
+        den += w
+    if den == 0:
+        return None
+    return num / den / SCALE
+
+
+def equity_vs_labels(hero: str, villain: Iterable[str]) -> float | None:
+    """Equity of ``hero`` vs a range of 169 labels, weighted by combo counts (6/4/12).
+
+    ``villain`` may be a Range169 (cached by its bitset) or any iterable of labels.
+    Card removal between hero and the range is ignored (approximation good enough for
+    coaching copy).
+    """
+    return _equity_vs_bits(hero, Range169.coerce(villain).bits)
+
+
+__all__ = ["SCALE", "matrix_path", "preflop_equity", "equity_vs_labels"]
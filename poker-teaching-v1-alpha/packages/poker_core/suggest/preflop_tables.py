@@ -1,12 +1,45 @@
 from __future__ import annotations
 
 import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import lru_cache
 from typing import Any
 
-from poker_core.cards import RANK_ORDER, parse_card
+from poker_core.cards import CARD_RANK, CARD_SUIT, RANK_CHARS, card_id
 
 from .config_loader import load_json_cached
+from .mixing import MixedFreqs
+from .range169 import (  # noqa: F401 - 网格常量沿用旧导入路径
+    COMBO_COUNTS,
+    COMBO_LABELS,
+    EMPTY_RANGE,
+    GRID_RANKS,
+    Range169,
+    combo_index,
+)
+
+# 进程内覆盖 SUGGEST_STRATEGY（自博弈等需要双方不同策略时使用，不改环境变量）
+_STRATEGY_OVERRIDE: ContextVar[str | None] = ContextVar("suggest_strategy", default=None)
+
+
+def requested_strategy() -> str:
+    """当前请求的策略名（未校验）：上下文覆盖优先，其次 SUGGEST_STRATEGY。"""
+    override = _STRATEGY_OVERRIDE.get()
+    if override is not None:
+        return override
+    return os.getenv("SUGGEST_STRATEGY", "medium").lower()
+
+
+@contextmanager
+def strategy_override(strategy: str | None) -> Iterator[None]:
+    """在当前上下文内使用指定策略（loose|medium|tight）；None 表示不覆盖。"""
+    token = _STRATEGY_OVERRIDE.set(strategy.lower() if strategy else None)
+    try:
+        yield
+    finally:
+        _STRATEGY_OVERRIDE.reset(token)
 
 
 def _profile_root() -> str:
@@ -18,10 +51,10 @@ def _profile_root() -> str:
     return "builtin"
 
 
-def combo_from_hole(hole: list[str]) -> str | None:
+def combo_from_hole(hole: list[int | str]) -> str | None:
     """Convert two hole cards to 169-grid combo label: 'AKs'|'KQo'|'TT'.
 
-    - Accepts len==2 strings like 'Ah','Kd'.
+    - Accepts len==2 card ids (cards.card_id) or strings like 'Ah','Kd'.
     - Order-insensitive; use higher rank first.
     - Pair: 'TT'. Suitedness: 's'|'o'.
     - Returns None for invalid input.
@@ -29,17 +62,15 @@ def combo_from_hole(hole: list[str]) -> str | None:
     try:
         if not hole or len(hole) != 2:
             return None
-        r1, s1 = parse_card(str(hole[0]).strip())
-        r2, s2 = parse_card(str(hole[1]).strip())
-        v1, v2 = RANK_ORDER.get(r1), RANK_ORDER.get(r2)
-        if v1 is None or v2 is None:
-            return None
-        if r1 == r2:
+        c1, c2 = card_id(hole[0]), card_id(hole[1])
+        v1, v2 = CARD_RANK[c1], CARD_RANK[c2]
+        r1, r2 = RANK_CHARS[v1 - 2], RANK_CHARS[v2 - 2]
+        if v1 == v2:
             return f"{r1}{r2}"
         # high-first ordering
         if v1 < v2:
-            r1, r2, s1, s2 = r2, r1, s2, s1
-        suited = s1 == s2
+            r1, r2 = r2, r1
+        suited = CARD_SUIT[c1] == CARD_SUIT[c2]
         return f"{r1}{r2}{'s' if suited else 'o'}"
     except Exception:
         return None
@@ -61,7 +92,7 @@ def _config_paths() -> tuple[str, str, str]:
     base = "ranges"
 
     # 支持策略选择：loose, medium, tight
-    strategy = os.getenv("SUGGEST_STRATEGY", "medium").lower()
+    strategy = requested_strategy()
     if strategy not in ["loose", "medium", "tight"]:
         strategy = "medium"  # 默认使用medium策略
 
@@ -71,40 +102,74 @@ def _config_paths() -> tuple[str, str, str]:
     return open_rel, vs_rel, modes_rel
 
 
+# vs_raise 桶内的动作（顺序即重叠时的优先级）
+MIX_ACTIONS = ("fourbet", "reraise", "call")
+
+
+def _with_mix(
+    pure: dict[str, Range169], mix: Any, actions: tuple[str, ...]
+) -> tuple[dict[str, Range169], MixedFreqs | None]:
+    """编译 mix 频率；各动作集合改为“频率 > 0”的组合（mix 覆盖该组合整行）。"""
+    if not isinstance(mix, dict) or not mix:
+        return pure, None
+    freq = MixedFreqs.compile(pure, mix, actions)
+    mixed_labels = Range169.from_labels(mix.keys())
+    out = dict(pure)
+    for a in actions:
+        rng = (pure.get(a, EMPTY_RANGE) - mixed_labels) | (freq.support(a) & mixed_labels)
+        if rng or a in pure:
+            out[a] = rng
+    return out, freq
+
+
 @lru_cache(maxsize=16)
-def _load_open(rel_path: str) -> tuple[dict[str, set[str]], int]:
+def _load_open(rel_path: str) -> tuple[dict[str, Any], int]:
+    """{"SB": Range169, "BB": Range169}；配置含 mix 时另有 "mix": {pos: MixedFreqs}。"""
     data, ver = load_json_cached(rel_path)
-    out: dict[str, set[str]] = {"SB": set(), "BB": set()}
+    out: dict[str, Any] = {"SB": EMPTY_RANGE, "BB": EMPTY_RANGE}
     try:
+        mixes: dict[str, MixedFreqs] = {}
         for pos in ("SB", "BB"):
-            lst = data.get(pos, []) or []
-            out[pos] = set(str(x).strip() for x in lst if x)
+            pure = {"open": Range169.from_labels(x for x in (data.get(pos, []) or []) if x)}
+            row_mix = ((data.get("mix") or {}).get(pos)) or {}
+            # open 表的 mix 值为单个频率："K5o": 0.5
+            rows = {lab: {"open": f} for lab, f in row_mix.items()}
+            merged, freq = _with_mix(pure, rows, ("open",))
+            out[pos] = merged["open"]
+            if freq is not None:
+                mixes[pos] = freq
+        if mixes:
+            out["mix"] = mixes
     except Exception:
         pass
     return out, int(ver or 0)
 
 
 @lru_cache(maxsize=16)
-def _load_vs(rel_path: str) -> tuple[dict[str, dict[str, dict[str, set[str]]]], int]:
+def _load_vs(rel_path: str) -> tuple[dict[str, dict[str, dict[str, Any]]], int]:
     data, ver = load_json_cached(rel_path)
     # Structure examples:
     #   "BB_vs_SB": {"small": {"call": [...], "reraise": [...]}, ...}
     #   "SB_vs_BB_3bet": {"small": {"fourbet": [...], "call": [...]}, ...}
-    out: dict[str, dict[str, dict[str, set[str]]]] = {}
+    # 可选 "mix": {"A5s": {"reraise": 0.6, "call": 0.4}} → 节点内 "freq": MixedFreqs
+    out: dict[str, dict[str, dict[str, Any]]] = {}
     try:
         for k, v in (data or {}).items():
             out[k] = {}
             for bkt, obj in (v or {}).items():
                 # normalize keys; accept reraise as alias of fourbet for SB_vs_BB_3bet
-                call_set = set((obj or {}).get("call", []) or [])
-                reraise_set = set((obj or {}).get("reraise", []) or [])
-                fourbet_set = set((obj or {}).get("fourbet", []) or [])
-                merged: dict[str, set[str]] = {
+                call_set = Range169.from_labels((obj or {}).get("call", []) or [])
+                reraise_set = Range169.from_labels((obj or {}).get("reraise", []) or [])
+                fourbet_set = Range169.from_labels((obj or {}).get("fourbet", []) or [])
+                merged: dict[str, Any] = {
                     "call": call_set,
                     "reraise": reraise_set,
                 }
                 if fourbet_set:
                     merged["fourbet"] = fourbet_set
+                merged, freq = _with_mix(merged, (obj or {}).get("mix"), MIX_ACTIONS)
+                if freq is not None:
+                    merged["freq"] = freq
                 out[k][bkt] = merged
     except Exception:
         pass
@@ -117,12 +182,12 @@ def _load_modes(rel_path: str) -> tuple[dict[str, Any], int]:
     return (data or {}), int(ver or 0)
 
 
-def get_open_table() -> tuple[dict[str, set[str]], int]:
+def get_open_table() -> tuple[dict[str, Any], int]:
     open_rel, _, _ = _config_paths()
     return _load_open(open_rel)
 
 
-def get_vs_table() -> tuple[dict[str, dict[str, dict[str, set[str]]]], int]:
+def get_vs_table() -> tuple[dict[str, dict[str, dict[str, Any]]], int]:
     _, vs_rel, _ = _config_paths()
     return _load_vs(vs_rel)
 
@@ -140,7 +205,7 @@ def config_profile_name() -> str:
         profile_name = "builtin"
 
     # 添加策略信息
-    strategy = os.getenv("SUGGEST_STRATEGY", "medium").lower()
+    strategy = requested_strategy()
     if strategy != "medium":
         profile_name = f"{profile_name}({strategy})"
 
@@ -149,5 +214,5 @@ def config_profile_name() -> str:
 
 def config_strategy_name() -> str:
     """Return the selected strategy name (loose|medium|tight)."""
-    s = os.getenv("SUGGEST_STRATEGY", "medium").lower()
+    s = requested_strategy()
     return s if s in ("loose", "medium", "tight") else "medium"
@@ -0,0 +1,253 @@
+"""
+169 网格手牌范围（位集）。
+
+网格：行/列按 A→2；对角线为对子，右上（行<列）为同花，左下为杂色；index = row * 13 + col。
+Range169 以 169 位整数存储成员：
+- 成员判定 O(1)：标签经字典得 index（或 grid_index(r1, r2, suited) 直接算），再测位
+- 并/交/差/补/异或均为整数位运算（一次处理全部 169 格）
+- 组合数加权计数（对子 6 / 同花 4 / 杂色 12）用三类掩码 + popcount
+- 与 set[str] 接口兼容（in / 迭代标签 / len / 与 set 比较），旧调用方无需改动
+
+需要向量化时可 to_array()/from_array() 与 NumPy bool 数组互转（numpy 可选）。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Set
+from typing import Any
+
+from poker_core.cards import CARD_RANK, CARD_SUIT, card_id
+
+GRID_RANKS = "AKQJT98765432"
+N_CELLS = 169
+TOTAL_COMBOS = 1326
+
+
+def _grid_label(row: int, col: int) -> str:
+    if row == col:
+        return GRID_RANKS[row] * 2
+    if row < col:
+        return f"{GRID_RANKS[row]}{GRID_RANKS[col]}s"
+    return f"{GRID_RANKS[col]}{GRID_RANKS[row]}o"
+
+
+COMBO_LABELS: tuple[str, ...] = tuple(_grid_label(i // 13, i % 13) for i in range(N_CELLS))
+_COMBO_INDEX: dict[str, int] = {lab: i for i, lab in enumerate(COMBO_LABELS)}
+# 每个标签的具体组合数：对子 6 / 同花 4 / 杂色 12
+COMBO_COUNTS: tuple[int, ...] = tuple(
+    6 if i // 13 == i % 13 else (4 if i // 13 < i % 13 else 12) for i in range(N_CELLS)
+)
+
+_FULL = (1 << N_CELLS) - 1
+_PAIR_MASK = sum(1 << i for i in range(N_CELLS) if COMBO_COUNTS[i] == 6)
+_SUITED_MASK = sum(1 << i for i in range(N_CELLS) if COMBO_COUNTS[i] == 4)
+_OFFSUIT_MASK = sum(1 << i for i in range(N_CELLS) if COMBO_COUNTS[i] == 12)
+
+
+def combo_index(label: str) -> int | None:
+    """169 标签 → 网格 index（'AKs' / 'KQo' / 'TT'）；无效返回 None。"""
+    return _COMBO_INDEX.get(label)
+
+
+def grid_index(rank1: int, rank2: int, suited: bool) -> int:
+    """(点数 2..14, 点数 2..14, 是否同花) → 网格 index；顺序无关，对子忽略 suited。"""
+    a, b = 14 - rank1, 14 - rank2
+    if a == b:
+        return a * 13 + a
+    hi, lo = (a, b) if a < b else (b, a)
+    return hi * 13 + lo if suited else lo * 13 + hi
+
+
+def hole_index(hole: list[int | str]) -> int | None:
+    """两张底牌（card id 或 'Ah'）→ 网格 index；无效返回 None。不经过标签字符串。"""
+    try:
+        if not hole or len(hole) != 2:
+            return None
+        c1, c2 = card_id(hole[0]), card_id(hole[1])
+        return grid_index(CARD_RANK[c1], CARD_RANK[c2], CARD_SUIT[c1] == CARD_SUIT[c2])
+    except Exception:
+        return None
+
+
+class Range169(Set):
+    """不可变 169 格范围；对外表现为标签集合（frozenset 语义）。"""
+
+    __slots__ = ("bits", "_hash")
+
+    def __init__(self, bits: int = 0):
+        self.bits = int(bits) & _FULL
+        self._hash: int | None = None
+
+    # ---- 构造 ----
+    @classmethod
+    def from_labels(cls, labels: Iterable[str]) -> Range169:
+        """未知标签忽略（与旧 set[str] 查表口径一致：无效标签永远不会命中）。"""
+        bits = 0
+        for lab in labels or ():
+            i = _COMBO_INDEX.get(str(lab).strip())
+            if i is not None:
+                bits |= 1 << i
+        return cls(bits)
+
+    @classmethod
+    def _from_iterable(cls, it: Iterable[str]) -> Range169:
+        # Set 混入方法（如 set - Range169 走的 Set.__rsub__）用它构造结果：输入是标签
+        return cls.from_labels(it)
+
+    @classmethod
+    def from_indices(cls, indices: Iterable[int]) -> Range169:
+        bits = 0
+        for i in indices:
+            bits |= 1 << int(i)
+        return cls(bits)
+
+    @classmethod
+    def coerce(cls, value: Any) -> Range169:
+        """Range169 原样返回；其余可迭代标签转换；None → 空范围。"""
+        if isinstance(value, Range169):
+            return value
+        return cls.from_labels(value or ())
+
+    @classmethod
+    def full(cls) -> Range169:
+        return cls(_FULL)
+
+    @classmethod
+    def from_array(cls, mask: Any) -> Range169:
+        """长度 169 的 bool 序列 / NumPy 数组 → Range169。"""
+        return cls.from_indices(i for i, v in enumerate(mask) if v)
+
+    # ---- 成员 ----
+    def contains_index(self, index: int) -> bool:
+        return bool((self.bits >> index) & 1)
+
+    def __contains__(self, item: object) -> bool:
+        if isinstance(item, int):
+            return 0 <= item < N_CELLS and bool((self.bits >> item) & 1)
+        i = _COMBO_INDEX.get(item) if isinstance(item, str) else None
+        return i is not None and bool((self.bits >> i) & 1)
+
+    def indices(self) -> list[int]:
+        out = []
+        b = self.bits
+        while b:
+            low = b & -b
+            out.append(low.bit_length() - 1)
+            b ^= low
+        return out
+
+    def __iter__(self) -> Iterator[str]:
+        return (COMBO_LABELS[i] for i in self.indices())
+
+    def __len__(self) -> int:
+        return self.bits.bit_count()
+
+    def __bool__(self) -> bool:
+        return self.bits != 0
+
+    # ---- 集合运算（位运算；与其他标签集合混用时先转换） ----
+    def _other_bits(self, other: Any) -> int | None:
+        if isinstance(other, Range169):
+            return other.bits
+        if isinstance(other, Set):
+            return Range169.from_labels(other).bits
+        return None
+
+    def __or__(self, other: Any) -> Range169:
+        b = self._other_bits(other)
+        return NotImplemented if b is None else Range169(self.bits | b)
+
+    def __and__(self, other: Any) -> Range169:
+        b = self._other_bits(other)
+        return NotImplemented if b is None else Range169(self.bits & b)
+
+    def __sub__(self, other: Any) -> Range169:
+        b = self._other_bits(other)
+        return NotImplemented if b is None else Range169(self.bits & ~b)
+
+    def __xor__(self, other: Any) -> Range169:
+        b = self._other_bits(other)
+        return NotImplemented if b is None else Range169(self.bits ^ b)
+
+    def __rsub__(self, other: Any) -> Range169:
+        b = self._other_bits(other)
+        return NotImplemented if b is None else Range169(b & ~self.bits)
+
+    __ror__ = __or__
+    __rand__ = __and__
+    __rxor__ = __xor__
+
+    def __invert__(self) -> Range169:
+        return Range169(_FULL & ~self.bits)
+
+    def complement(self) -> Range169:
+        return ~self
+
+    def __le__(self, other: Any) -> bool:
+        b = self._other_bits(other)
+        return NotImplemented if b is None else (self.bits & ~b) == 0
+
+    def __ge__(self, other: Any) -> bool:
+        b = self._other_bits(other)
+        return NotImplemented if b is None else (b & ~self.bits) == 0
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Range169):
+            return self.bits == other.bits
+        if isinstance(other, Set):
+            return len(other) == len(self) and all(x in self for x in other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        # 与相等的 frozenset(标签) 同哈希，混放在 dict/set 中才一致
+        if self._hash is None:
+            self._hash = hash(frozenset(self))
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"Range169({len(self)} labels, {self.combos()} combos)"
+
+    # ---- 组合数 ----
+    def combos(self) -> int:
+        """具体组合数（对子 6 / 同花 4 / 杂色 12）。"""
+        b = self.bits
+        return (
+            6 * (b & _PAIR_MASK).bit_count()
+            + 4 * (b & _SUITED_MASK).bit_count()
+            + 12 * (b & _OFFSUIT_MASK).bit_count()
+        )
+
+    def frequency(self) -> float:
+        """占全部 1326 个组合的比例。"""
+        return self.combos() / TOTAL_COMBOS
+
+    # ---- NumPy ----
+    def to_array(self) -> Any:
+        """长度 169 的 NumPy bool 数组（需 numpy）。"""
+        import numpy as np
+
+        out = np.zeros(N_CELLS, dtype=bool)
+        out[self.indices()] = True
+        return out
+
+    def weights(self) -> Any:
+        """长度 169 的组合数权重向量（不在范围内为 0），便于与矩阵做加权运算。"""
+        import numpy as np
+
+        return self.to_array() * np.asarray(COMBO_COUNTS, dtype=np.int64)
+
+
+EMPTY_RANGE = Range169()
+
+
+__all__ = [
+    "GRID_RANKS",
+    "COMBO_LABELS",
+    "COMBO_COUNTS",
+    "TOTAL_COMBOS",
+    "EMPTY_RANGE",
+    "Range169",
+    "combo_index",
+    "grid_index",
+    "hole_index",
+]
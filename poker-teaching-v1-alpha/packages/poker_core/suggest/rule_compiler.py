@@ -0,0 +1,195 @@
+"""
+Postflop 规则编译器：嵌套 JSON 规则 → 扁平整数下标查找表。
+
+规则树的层级固定为 pot_type / "role" / role / ip / texture / spr / hand_class。
+编译时收集每层出现过的键作为词表（每轴额外一个“未知”槽），对笛卡尔积的每个格子
+执行一次参考遍历（walk_rules），把命中的节点与 rule_path 预先算好：
+- 查找 = 6 次 dict 取下标 + 混合进制求偏移，无需逐层回退 defaults、拼接路径
+- 未知键统一落在“未知”槽：其结果与具体键无关（必然走 defaults），路径中的占位符在
+  查找时替换为实际键，输出与逐层遍历逐字一致
+
+编译结果按规则对象缓存；规则重新加载（配置变化）后自动重编译。
+"""
+
+from __future__ import annotations
+
+import threading
+from itertools import product
+from typing import Any
+
+from .mixing import choose_variant, compile_node_mix, stable_uniform
+
+# 规则树第二层是字面量 "role"
+_ROLE_LITERAL = "role"
+AXES = ("pot_type", "role", "ip", "texture", "spr", "hand_class")
+_N_AXES = len(AXES)
+# 未知键占位符（JSON 键中不会出现 NUL）
+_PLACEHOLDERS = tuple(f"\x00{i}" for i in range(_N_AXES))
+
+
+def _is_leaf(node: Any) -> bool:
+    return isinstance(node, dict) and ("action" in node or "size_tag" in node or "mix" in node)
+
+
+def walk_rules(
+    rules: Any, keys: list[str], *, early_stop: bool = False
+) -> tuple[dict[str, Any] | None, str]:
+    """参考实现：逐层匹配键，缺失时回退 defaults，并记录路径。
+
+    叶子节点：含 action / size_tag / mix（混合频率）之一。
+    early_stop=True 时，中途遇到叶子节点即返回（turn/river 口径）。
+    """
+    cur: Any = rules
+    path: list[str] = []
+    try:
+        for k in keys:
+            if isinstance(cur, dict) and k in cur:
+                cur = cur[k]
+                path.append(k)
+            elif isinstance(cur, dict) and "defaults" in cur:
+                cur = cur["defaults"]
+                path.append(f"defaults:{k}")
+            else:
+                return None, "/".join(path)
+            if early_stop and _is_leaf(cur):
+                return cur, "/".join(path)
+        if _is_leaf(cur):
+            return cur, "/".join(path)
+    except Exception:
+        return None, "/".join(path)
+    return None, "/".join(path)
+
+
+def _full_keys(axis_keys: tuple[str, ...] | list[str]) -> list[str]:
+    return [axis_keys[0], _ROLE_LITERAL, *axis_keys[1:]]
+
+
+def _collect_vocab(rules: Any) -> list[list[str]]:
+    """每层出现过的键；第二层字面量 "role" 不计入轴。
+
+    defaults 也计入词表：查询键恰为 "defaults" 时逐层遍历会直接命中它。
+    """
+    levels: list[set[str]] = [set() for _ in range(_N_AXES + 1)]
+
+    def visit(node: Any, depth: int) -> None:
+        if depth > _N_AXES or not isinstance(node, dict):
+            return
+        for k, v in node.items():
+            levels[depth].add(str(k))
+            visit(v, depth + 1)
+
+    visit(rules, 0)
+    del levels[1]
+    return [sorted(lv) for lv in levels]
+
+
+class CompiledRules:
+    """扁平查找表：cell = Σ idx[axis] · stride[axis]；每轴最后一个槽为“未知键”。"""
+
+    __slots__ = (
+        "source",
+        "early_stop",
+        "vocab",
+        "_index",
+        "_strides",
+        "_nodes",
+        "_paths",
+        "_mixes",
+    )
+
+    def __init__(self, rules: dict[str, Any], *, early_stop: bool = False):
+        self.source = rules
+        self.early_stop = early_stop
+        self.vocab: tuple[tuple[str, ...], ...] = tuple(tuple(v) for v in _collect_vocab(rules))
+        self._index: tuple[dict[str, int], ...] = tuple(
+            {k: i for i, k in enumerate(v)} for v in self.vocab
+        )
+        strides = [1] * _N_AXES
+        for a in range(_N_AXES - 2, -1, -1):
+            strides[a] = strides[a + 1] * (len(self.vocab[a + 1]) + 1)
+        self._strides = tuple(strides)
+
+        axes = [(*v, ph) for v, ph in zip(self.vocab, _PLACEHOLDERS, strict=True)]
+        nodes: list[dict[str, Any] | None] = []
+        paths: list[str] = []
+        for combo in product(*axes):
+            node, path = walk_rules(rules, _full_keys(combo), early_stop=early_stop)
+            nodes.append(node)
+            paths.append(path)
+        self._nodes = nodes
+        self._paths = paths
+        # 含 mix 的叶子：预编译累计频率（同一节点对象常被多个格子共享，按 id 去重）
+        self._mixes: dict[int, tuple[tuple[float, ...], tuple[dict, ...]]] = {}
+        for node in nodes:
+            if node is not None and id(node) not in self._mixes:
+                compiled = compile_node_mix(node)
+                if compiled is not None:
+                    self._mixes[id(node)] = compiled
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def lookup(
+        self,
+        pot_type: str,
+        role: str,
+        ip: str,
+        texture: str,
+        spr: str,
+        hand_class: str,
+    ) -> tuple[dict[str, Any] | None, str]:
+        keys = (pot_type, role, ip, texture, spr, hand_class)
+        cell = 0
+        unknown: list[int] = []
+        for a in range(_N_AXES):
+            i = self._index[a].get(keys[a])
+            if i is None:
+                i = len(self.vocab[a])
+                unknown.append(a)
+            cell += i * self._strides[a]
+        node, path = self._nodes[cell], self._paths[cell]
+        if unknown:
+            for a in unknown:
+                path = path.replace(_PLACEHOLDERS[a], str(keys[a]))
+        return node, path
+
+    def pick(
+        self, node: dict[str, Any] | None, hand_id: str, salt: str
+    ) -> tuple[dict[str, Any] | None, float | None]:
+        """叶子含 mix 时按 hand_id 稳定选出分支节点及其频率；否则原样返回 (node, None)。
+
+        抽中余量（频率和 < 1）时返回 (None, 余量频率)，调用方走兜底逻辑。
+        """
+        if node is None:
+            return None, None
+        compiled = self._mixes.get(id(node))
+        if compiled is None:
+            return node, None
+        return choose_variant(compiled, stable_uniform(hand_id, salt))
+
+
+_CACHE: dict[tuple[int, bool], CompiledRules] = {}
+_CACHE_MAX = 32
+_LOCK = threading.Lock()
+
+
+def compiled_rules(rules: dict[str, Any], *, early_stop: bool = False) -> CompiledRules:
+    """按规则对象取编译结果；规则被重新加载（新对象）时重编译。"""
+    key = (id(rules), early_stop)
+    hit = _CACHE.get(key)
+    if hit is not None and hit.source is rules:
+        return hit
+    comp = CompiledRules(rules, early_stop=early_stop)
+    with _LOCK:
+        if len(_CACHE) >= _CACHE_MAX:
+            _CACHE.clear()
+        _CACHE[key] = comp
+    return comp
+
+
+def clear_compiled() -> None:
+    with _LOCK:
+        _CACHE.clear()
+
+
+__all__ = ["AXES", "CompiledRules", "compiled_rules", "clear_compiled", "walk_rules"]
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import logging
 import os
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from typing import Any
 
 from poker_core.analysis import annotate_player_hand_from_gs
@@ -122,25 +122,131 @@ POLICY_REGISTRY_V1: dict[str, PolicyFn] = {
 POLICY_REGISTRY: dict[str, PolicyFn] = POLICY_REGISTRY_V0
 
 
-def _choose_policy_version(hand_id: str) -> str:
-    """返回 'v0' 或 'v1'（PR-0 中 v1 与 v0 行为一致，仅用于灰度管控与调试展示）。"""
+def _policy_mode() -> tuple[str, int]:
+    """读取灰度配置 (SUGGEST_POLICY_VERSION, SUGGEST_V1_ROLLOUT_PCT)。"""
     mode = (os.getenv("SUGGEST_POLICY_VERSION") or "v0").strip().lower()
-    if mode in {"v0", "v1", "v1_preflop"}:  # v1_preflop 在 PR-0 等同 v1
-        return "v1" if mode != "v0" else "v0"
-    if mode == "auto":
-        pct = int(os.getenv("SUGGEST_V1_ROLLOUT_PCT") or 0)
+    pct = int(os.getenv("SUGGEST_V1_ROLLOUT_PCT") or 0) if mode == "auto" else 0
+    return mode, pct
+
+
+def _choose_policy_version(hand_id: str, mode: tuple[str, int] | None = None) -> str:
+    """返回 'v0' 或 'v1'（PR-0 中 v1 与 v0 行为一致，仅用于灰度管控与调试展示）。"""
+    name, pct = mode or _policy_mode()
+    if name in {"v0", "v1", "v1_preflop"}:  # v1_preflop 在 PR-0 等同 v1
+        return "v1" if name != "v0" else "v0"
+    if name == "auto":
         return "v1" if stable_roll(hand_id or "", pct) else "v0"
     return "v0"
 
 
-def build_suggestion(gs, actor: int, cfg: PolicyConfig | None = None) -> dict[str, Any]:
+def _debug_enabled() -> bool:
+    return (os.getenv("SUGGEST_DEBUG") or "0") == "1"
+
+
+def build_suggestion(
+    gs,
+    actor: int,
+    cfg: PolicyConfig | None = None,
+    *,
+    policy_version: str | None = None,
+) -> dict[str, Any]:
     """Suggest 入口（纯函数策略版）。
 
     契约：
     - 若 actor != gs.to_act → PermissionError（视图层转 409）
     - 若无法产生合法建议 → ValueError（视图层转 422）
     - cfg 可选：缺省使用 PolicyConfig()
+    - policy_version 可选（'v0'|'v1'）：显式指定时不读 SUGGEST_POLICY_VERSION 灰度
+    """
+    if policy_version in ("v0", "v1"):
+        version = policy_version
+    else:
+        version = _choose_policy_version(str(getattr(gs, "hand_id", "")))
+    return _suggest_one(
+        gs,
+        actor,
+        cfg,
+        ctx=SuggestContext.build(),
+        version=version,
+        explain=True,
+        log=True,
+        debug=_debug_enabled(),
+    )
+
+
+def build_suggestions(
+    states: Iterable[tuple[Any, int]],
+    *,
+    explain: bool = False,
+    cfg: PolicyConfig | None = None,
+    policy_version: str | None = None,
+) -> list[dict[str, Any]]:
+    """批量建议：整批共享一次 SuggestContext 与灰度/调试配置快照。
+
+    - 默认跳过可选阶段（自然语言解释、结构化日志）；explain=True 时渲染解释
+    - 单条失败不影响其他条目：该条返回 {"hand_id","actor","error","detail"}，
+      error ∈ {"not_turn","no_legal_actions","suggest_failed"}
     """
+    ctx = SuggestContext.build()
+    mode = _policy_mode()
+    debug = _debug_enabled()
+    out: list[dict[str, Any]] = []
+    for gs, actor in states:
+        if policy_version in ("v0", "v1"):
+            version = policy_version
+        else:
+            version = _choose_policy_version(str(getattr(gs, "hand_id", "")), mode)
+        try:
+            out.append(
+                _suggest_one(
+                    gs,
+                    actor,
+                    cfg,
+                    ctx=ctx,
+                    version=version,
+                    explain=explain,
+                    log=False,
+                    debug=debug,
+                )
+            )
+        except PermissionError as e:
+            out.append(_batch_error(gs, actor, "not_turn", e))
+        except ValueError as e:
+            kind = "no_legal_actions" if "no legal actions" in str(e).lower() else "suggest_failed"
+            out.append(_batch_error(gs, actor, kind, e))
+        except Exception as e:
+            # 策略内部异常（KeyError/TypeError 等）只影响本条，不中断整批
+            logging.getLogger(__name__).exception(
+                "suggest batch item failed", extra={"hand_id": getattr(gs, "hand_id", None)}
+            )
+            out.append(_batch_error(gs, actor, "suggest_failed", e))
+    return out
+
+
+def _batch_error(gs, actor: int, kind: str, exc: Exception) -> dict[str, Any]:
+    return {
+        "hand_id": getattr(gs, "hand_id", None),
+        "actor": actor,
+        "error": kind,
+        "detail": (
+            str(exc) or kind
+            if isinstance(exc, PermissionError | ValueError)
+            else f"{type(exc).__name__}: {exc}"
+        ),
+    }
+
+
+def _suggest_one(
+    gs,
+    actor: int,
+    cfg: PolicyConfig | None,
+    *,
+    ctx: SuggestContext,
+    version: str,
+    explain: bool,
+    log: bool,
+    debug: bool,
+) -> dict[str, Any]:
     cur = to_act_index(gs)
     if cur != actor:
         raise PermissionError("actor is not to_act")
@@ -150,15 +256,12 @@ def build_suggestion(gs, actor: int, cfg: PolicyConfig | None = None) -> dict[st
     if not acts:
         raise ValueError("No legal actions")
 
-    ctx = SuggestContext.build()
-
     # 组装 Observation
     obs, pre_rationale = build_observation(
         gs, actor, acts, annotate_fn=annotate_player_hand_from_gs, context=ctx
     )
 
     # 选择策略（按版本 + 街）
-    version = _choose_policy_version(str(getattr(gs, "hand_id", "")))
     reg = POLICY_REGISTRY_V1 if version == "v1" else POLICY_REGISTRY_V0
     policy_fn = reg.get(obs.street) or (
         policy_preflop_v0 if obs.street == "preflop" else policy_postflop_v0_3
@@ -335,7 +438,7 @@ def build_suggestion(gs, actor: int, cfg: PolicyConfig | None = None) -> dict[st
     except Exception:
         pass
 
-    if (os.getenv("SUGGEST_DEBUG") or "0") == "1":
+    if debug:
         cfg_versions = {
             "open": int(ctx.versions.get("open", 0)),
             "vs": int(ctx.versions.get("vs", 0)),
@@ -392,11 +495,10 @@ def build_suggestion(gs, actor: int, cfg: PolicyConfig | None = None) -> dict[st
 
     # Structured log for v1 (or when debug enabled), including profile
     try:
-        log = logging.getLogger(__name__)
-        if version == "v1" or (os.getenv("SUGGEST_DEBUG") or "0") == "1":
+        if log and (version == "v1" or debug):
             action = str(resp.get("suggested", {}).get("action", ""))
             amount = resp.get("suggested", {}).get("amount")
-            log.info(
+            logging.getLogger(__name__).info(
                 "suggest_v1",
                 extra={
                     "policy_name": policy_name,
@@ -423,17 +525,18 @@ def build_suggestion(gs, actor: int, cfg: PolicyConfig | None = None) -> dict[st
         pass
 
     # Optional: render natural-language explanations for teaching UI
-    try:
-        # Minimal extras to enrich templates
-        extras = {
-            "action": (resp.get("suggested") or {}).get("action"),
-            "amount": (resp.get("suggested") or {}).get("amount"),
-        }
-        exp = render_explanations(rationale=rationale, meta=resp.get("meta"), extras=extras)
-        if exp:
-            resp["explanations"] = exp
-    except Exception:
-        # Keep optional; never fail the main suggest flow
-        pass
+    if explain:
+        try:
+            # Minimal extras to enrich templates
+            extras = {
+                "action": (resp.get("suggested") or {}).get("action"),
+                "amount": (resp.get("suggested") or {}).get("amount"),
+            }
+            exp = render_explanations(rationale=rationale, meta=resp.get("meta"), extras=extras)
+            if exp:
+                resp["explanations"] = exp
+        except Exception:
+            # Keep optional; never fail the main suggest flow
+            pass
 
     return drop_nones(resp)
@@ -23,16 +23,16 @@ def _load_rules(strategy: str, street: str) -> tuple[dict[str, Any], int]:
 
 
 def get_turn_rules() -> tuple[dict[str, Any], int]:
-    import os
+    from .preflop_tables import requested_strategy
 
-    s = os.getenv("SUGGEST_STRATEGY", "medium").lower()
+    s = requested_strategy()
     return _load_rules(s, "turn")
 
 
 def get_river_rules() -> tuple[dict[str, Any], int]:
-    import os
+    from .preflop_tables import requested_strategy
 
-    s = os.getenv("SUGGEST_STRATEGY", "medium").lower()
+    s = requested_strategy()
     return _load_rules(s, "river")
 
 
@@ -5,8 +5,9 @@ from hashlib import sha1
 from math import isfinite
 from typing import Any
 
-from poker_core.cards import RANK_ORDER, parse_card
+from poker_core.cards import CARD_RANK, CARD_SUIT, card_id
 from poker_core.domain.actions import LegalAction
+from poker_core.event_log import EventIndex
 
 from .preflop_tables import get_modes
 
@@ -75,36 +76,23 @@ def classify_flop(board: list[str]) -> dict[str, Any]:
     if not board or len(board) < 3:
         return {"texture": "na", "paired": False, "fd": False, "sd": False}
 
-    # ranks / suits 提取
-    ranks = [c[:-1] for c in board[:3]]
-    suits = [c[-1] for c in board[:3]]
+    # ranks / suits 提取（整数编码查表）
+    try:
+        ids = [card_id(c) for c in board[:3]]
+    except Exception:
+        return {"texture": "na", "paired": False, "fd": False, "sd": False}
+    vals = sorted(CARD_RANK[c] for c in ids)
     # paired
-    paired = len(set(ranks)) < 3
+    paired = len(set(vals)) < 3
     # 同花倾向
-    s_counts: dict[str, int] = {}
-    for s in suits:
-        s_counts[s] = s_counts.get(s, 0) + 1
-    three_suited = any(v == 3 for v in s_counts.values())
-    two_suited = any(v == 2 for v in s_counts.values())
+    s_counts = [0, 0, 0, 0]
+    for c in ids:
+        s_counts[CARD_SUIT[c]] += 1
+    three_suited = 3 in s_counts
+    two_suited = 2 in s_counts
     fd = three_suited or two_suited  # 简化：两同花即认为有同花倾向
 
     # 顺听倾向（粗略，以排序后相邻差值衡量）
-    RANK_ORDER = {
-        "2": 2,
-        "3": 3,
-        "4": 4,
-        "5": 5,
-        "6": 6,
-        "7": 7,
-        "8": 8,
-        "9": 9,
-        "T": 10,
-        "J": 11,
-        "Q": 12,
-        "K": 13,
-        "A": 14,
-    }
-    vals = sorted(RANK_ORDER.get(r, 0) for r in ranks)
     gaps = [vals[1] - vals[0], vals[2] - vals[1]]
     connected = (gaps[0] <= 1 and gaps[1] <= 1) or (gaps[0] == 2 or gaps[1] == 2)
     sd = connected
@@ -122,6 +110,12 @@ def classify_flop(board: list[str]) -> dict[str, Any]:
 # ----- PR-2: role / facing-size helpers -----
 
 
+def _event_index(gs):
+    """引擎 EventLog 自带增量索引；测试桩等普通 list 返回 None（回退扫描）。"""
+    idx = getattr(getattr(gs, "events", None), "index", None)
+    return idx if isinstance(idx, EventIndex) else None
+
+
 def infer_pfr(gs) -> int | None:
     """Return seat index (0/1) of preflop aggressor (PFR) using event stream.
 
@@ -129,6 +123,9 @@ def infer_pfr(gs) -> int | None:
     'bet'/'raise'/'allin(as=raise|bet)' during preflop. Return its 'who'.
     Return None if not found (limped pot).
     """
+    idx = _event_index(gs)
+    if idx is not None:
+        return idx.pfr
     try:
         evts = list(getattr(gs, "events", []) or [])
     except Exception:
@@ -155,11 +152,16 @@ def infer_pot_type(gs) -> str:
     - 1 raise  → 'single_raised'
     - ≥2 raises → 'threebet' (coarse; includes 4-bet+ cases for now)
     """
-    try:
-        evts = list(getattr(gs, "events", []) or [])
-    except Exception:
-        return "single_raised"
-    raises = 0
+    idx = _event_index(gs)
+    if idx is not None:
+        raises = idx.preflop_raises
+        evts = ()
+    else:
+        try:
+            evts = list(getattr(gs, "events", []) or [])
+        except Exception:
+            return "single_raised"
+        raises = 0
     for e in evts:
         t = e.get("t")
         if t == "board" and e.get("street") == "flop":
@@ -189,6 +191,11 @@ def infer_last_aggressor_before(gs, street: str) -> int | None:
       - river：在 turn 段（board('turn') 之后、board('river') 之前）返回最后 aggressor。
     - 若没有匹配事件或结构缺失 → 返回 None。
     """
+    idx = _event_index(gs)
+    if idx is not None:
+        st = str(street or "preflop").lower()
+        prev = {"flop": "preflop", "turn": "flop", "river": "turn"}.get(st)
+        return idx.last_aggressor(prev) if prev else None
     try:
         evts = list(getattr(gs, "events", []) or [])
     except Exception:
@@ -304,29 +311,28 @@ HC_STRONG_DRAW = "strong_draw"
 HC_WEAK_OR_AIR = "weak_draw_or_air"
 
 
-def _rank_values(cards: list[str]) -> list[int]:
+def _rank_values(cards: list[int | str]) -> list[int]:
     vals: list[int] = []
     for c in cards:
         try:
-            r, _ = parse_card(c)
-            vals.append(RANK_ORDER.get(r, 0))
+            vals.append(CARD_RANK[card_id(c)])
         except Exception:
             vals.append(0)
     return vals
 
 
-def _suit_counts(cards: list[str]) -> dict[str, int]:
-    counts: dict[str, int] = {}
+def _suit_counts(cards: list[int | str]) -> dict[int, int]:
+    counts: dict[int, int] = {}
     for c in cards:
         try:
-            _, s = parse_card(c)
+            s = CARD_SUIT[card_id(c)]
             counts[s] = counts.get(s, 0) + 1
         except Exception:
             pass
     return counts
 
 
-def _has_fd(hole: list[str], board3: list[str]) -> tuple[bool, bool]:
+def _has_fd(hole: list[int | str], board3: list[int | str]) -> tuple[bool, bool]:
     """Return (fd, nfd) detection on flop.
     - If board is two-suited and hero holds two cards of that suit → FD.
     - If board is three-suited and hero holds one card of that suit → FD.
@@ -345,14 +351,14 @@ def _has_fd(hole: list[str], board3: list[str]) -> tuple[bool, bool]:
         return (False, False)
     # NFD: hero holds Ace of the suit
     try:
-        ranks = [parse_card(c)[0] for c in hole if parse_card(c)[1] == suit]
-        nfd = "A" in ranks
+        ids = [card_id(c) for c in hole]
+        nfd = any(CARD_RANK[c] == 14 and CARD_SUIT[c] == suit for c in ids)
     except Exception:
         nfd = False
     return (fd, nfd)
 
 
-def _has_oesd(hole: list[str], board3: list[str]) -> bool:
+def _has_oesd(hole: list[int | str], board3: list[int | str]) -> bool:
     # approximate: check any 4-consecutive window having 4 distinct ranks present in union(hole,board)
     vals = sorted(set(_rank_values(hole + board3)))
     if len(vals) < 4:
@@ -367,7 +373,7 @@ def _has_oesd(hole: list[str], board3: list[str]) -> bool:
     return False
 
 
-def _has_gutshot(hole: list[str], board3: list[str]) -> bool:
+def _has_gutshot(hole: list[int | str], board3: list[int | str]) -> bool:
     vals = sorted(set(_rank_values(hole + board3)))
     if len(vals) < 4:
         return False
@@ -382,54 +388,60 @@ def _has_gutshot(hole: list[str], board3: list[str]) -> bool:
     return False
 
 
-def infer_flop_hand_class(hole: list[str], board3: list[str]) -> str:
+def _made_hand_class(hr1: int, hr2: int, b_ranks: list[int]) -> str | None:
+    """Made-hand bucket from rank values only (hole hr1/hr2, flop b_ranks); None when no pair+."""
+    # counts across 5 cards
+    counts: dict[int, int] = {}
+    for r in b_ranks + [hr1, hr2]:
+        counts[r] = counts.get(r, 0) + 1
+    pairs = [r for r, c in counts.items() if c >= 2]
+    trips = [r for r, c in counts.items() if c >= 3]
+    if trips or len(pairs) >= 2:
+        return HC_VALUE
+
+    # overpair check
+    hole_pair = hr1 == hr2
+    b_vals = sorted(b_ranks, reverse=True)
+    topv = b_vals[0]
+    if hole_pair and hr1 > topv:
+        return HC_OP_TPTK
+
+    # top/second/third pair（b_vals 已按点数降序）
+    def _kicker_val() -> int:
+        # rank value of the non-paired hole card
+        if hr1 in b_ranks and hr2 not in b_ranks:
+            return hr2
+        if hr2 in b_ranks and hr1 not in b_ranks:
+            return hr1
+        return 0
+
+    if any(r == b_vals[0] for r in [hr1, hr2]):
+        # top pair
+        kv = _kicker_val()
+        return HC_OP_TPTK if kv >= 12 else HC_TOP_WEAK_OR_SECOND
+    if any(r == b_vals[1] for r in [hr1, hr2]):
+        return HC_TOP_WEAK_OR_SECOND
+    if any(r == b_vals[2] for r in [hr1, hr2]) or (hole_pair and hr1 < b_vals[2]):
+        return HC_MID_OR_THIRD_MINUS
+    return None
+
+
+def infer_flop_hand_class(hole: list[int | str], board3: list[int | str]) -> str:
     """Return one of 6 buckets for flop policy.
     Precedence: two_pair+/set > overpair/TPTK(strong) > top/second > third-/under > strong_draw > weak_draw_or_air
+
+    Reference implementation; the flop decision path uses the precomputed table in
+    ``flop_table.flop_hand_class`` (same result).
     """
     try:
         if len(hole) != 2 or len(board3) < 3:
             return HC_WEAK_OR_AIR
-        hr1, _ = parse_card(hole[0])
-        hr2, _ = parse_card(hole[1])
-        b_ranks = [parse_card(c)[0] for c in board3[:3]]
-        # counts across 5 cards
-        counts: dict[str, int] = {}
-        for r in b_ranks + [hr1, hr2]:
-            counts[r] = counts.get(r, 0) + 1
-        pairs = [r for r, c in counts.items() if c >= 2]
-        trips = [r for r, c in counts.items() if c >= 3]
-        if trips or len(pairs) >= 2:
-            return HC_VALUE
-
-        # overpair check
-        hole_pair = hr1 == hr2
-        b_vals = sorted([RANK_ORDER[r] for r in b_ranks], reverse=True)
-        topv = b_vals[0]
-        if hole_pair and RANK_ORDER[hr1] > topv:
-            return HC_OP_TPTK
-
-        # top/second/third pair
-        # Sort board ranks by value (highest first) for accurate comparison
-        sorted_b_ranks = sorted(b_ranks, key=lambda r: RANK_ORDER[r], reverse=True)
-
-        def _kicker_val() -> int:
-            # rank value of the non-paired hole card
-            if hr1 in b_ranks and hr2 not in b_ranks:
-                return RANK_ORDER[hr2]
-            if hr2 in b_ranks and hr1 not in b_ranks:
-                return RANK_ORDER[hr1]
-            return 0
-
-        if any(r == sorted_b_ranks[0] for r in [hr1, hr2]):
-            # top pair
-            kv = _kicker_val()
-            return HC_OP_TPTK if kv >= 12 else HC_TOP_WEAK_OR_SECOND
-        if any(r == sorted_b_ranks[1] for r in [hr1, hr2]):
-            return HC_TOP_WEAK_OR_SECOND
-        if any(r == sorted_b_ranks[2] for r in [hr1, hr2]) or (
-            hole_pair and RANK_ORDER[hr1] < b_vals[2]
-        ):
-            return HC_MID_OR_THIRD_MINUS
+        hr1 = CARD_RANK[card_id(hole[0])]
+        hr2 = CARD_RANK[card_id(hole[1])]
+        b_ranks = [CARD_RANK[card_id(c)] for c in board3[:3]]
+        made = _made_hand_class(hr1, hr2, b_ranks)
+        if made is not None:
+            return made
 
         # draws
         fd, nfd = _has_fd(hole, board3)
@@ -446,9 +458,11 @@ def infer_flop_hand_class(hole: list[str], board3: list[str]) -> str:
 
 def infer_flop_hand_class_from_gs(gs, actor: int) -> str:
     try:
+        from .flop_table import flop_hand_class
+
         hole = list(getattr(gs.players[actor], "hole", []) or [])
         board = list(getattr(gs, "board", []) or [])[:3]
-        return infer_flop_hand_class(hole, board)
+        return flop_hand_class(hole, board)
     except Exception:
         return HC_WEAK_OR_AIR
 
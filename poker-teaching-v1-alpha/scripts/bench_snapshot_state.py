@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+snapshot_state 基准：直接投影 vs 旧的 dataclasses.asdict 实现。
+
+对一手打到转牌的状态（完整牌堆 + 事件流）分别测：
+- 每次调用的内存分配（tracemalloc：调用期间峰值 / 返回结果常驻）
+- 每次调用耗时（timeit）
+
+用法：python scripts/bench_snapshot_state.py [--number 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+import tracemalloc
+from dataclasses import asdict
+from pathlib import Path
+
+
+def _ensure_path():
+    # Allow running from repo root without installation
+    root = Path(__file__).resolve().parent.parent
+    for p in (root / "packages", root / "apps" / "web-django"):
+        if str(p) not in sys.path:
+            sys.path.insert(0, str(p))
+
+
+_ensure_path()
+
+from api.state import snapshot_state  # type: ignore  # noqa: E402
+from poker_core.cards import card_strs  # type: ignore  # noqa: E402
+from poker_core.state_hu import apply_action, start_hand, start_session  # noqa: E402
+
+
+def snapshot_state_asdict(gs) -> dict:
+    """旧实现（基线）：asdict 递归深拷贝整个 GameState 后只取少数字段。"""
+    s = asdict(gs)
+    return {
+        "street": s.get("street"),
+        "board": card_strs(s.get("board", []) or []),
+        "to_act": s.get("to_act"),
+        "button": s.get("button"),
+        "pot": s.get("pot"),
+        "players": [
+            {
+                "stack": p.get("stack"),
+                "bet": p.get("invested_street", p.get("bet", 0)),
+                "hole": card_strs(p.get("hole", []) or []),
+            }
+            for p in s.get("players", [])
+        ],
+    }
+
+
+def _turn_state():
+    cfg = start_session(init_stack=200, sb=1, bb=2)
+    gs = start_hand(cfg, session_id="s_bench", hand_id="h_bench", button=0, seed=42)
+    for act, amt in (("call", None), ("check", None), ("bet", 6), ("call", None), ("check", None)):
+        gs = apply_action(gs, act, amt)
+    return gs
+
+
+def _alloc(fn, gs, rounds: int = 50) -> tuple[int, int]:
+    """返回 (单次调用的分配峰值字节, 结果常驻字节)。"""
+    fn(gs)  # 预热（缓存/驻留字符串不计入）
+    tracemalloc.start()
+    try:
+        peak = 0
+        for _ in range(rounds):
+            base, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            out = fn(gs)
+            cur, top = tracemalloc.get_traced_memory()
+            peak = max(peak, top - base)
+            del out
+        keep = cur - base
+    finally:
+        tracemalloc.stop()
+    return peak, keep
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--number", type=int, default=20000, help="timeit 次数")
+    args = ap.parse_args()
+
+    gs = _turn_state()
+    assert snapshot_state(gs) == snapshot_state_asdict(gs)
+    print(f"state: street={gs.street} deck={len(gs.deck)} events={len(gs.events)}")
+    print(f"{'impl':<12}{'peak B':>10}{'result B':>10}{'us/call':>10}")
+    rows = []
+    for name, fn in (("asdict", snapshot_state_asdict), ("projection", snapshot_state)):
+        peak, keep = _alloc(fn, gs)
+        us = timeit.timeit(lambda fn=fn: fn(gs), number=args.number) / args.number * 1e6
+        rows.append((peak, us))
+        print(f"{name:<12}{peak:>10}{keep:>10}{us:>10.2f}")
+    (p0, t0), (p1, t1) = rows
+    print(f"reduction: peak alloc x{p0 / p1:.1f}  time x{t0 / t1:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Build the rank-indexed flop feature table used by poker_core.suggest.flop_table.
+
+Writes a uint8 .npy of 13^5 entries (made-hand bucket / OESD / gutshot per sorted
+hole+flop rank combination); the loader memory-maps it.
+
+Usage:
+  python scripts/build_flop_table.py [--out PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+
+def _resolve_repo_root() -> Path:
+    here = Path(__file__).resolve()
+    return here.parent.parent
+
+
+def _ensure_path() -> None:
+    root = _resolve_repo_root()
+    pkg = root / "packages"
+    if str(pkg) not in sys.path:
+        sys.path.insert(0, str(pkg))
+
+
+_ensure_path()
+
+import numpy as np  # noqa: E402
+from poker_core.suggest.flop_table import (  # type: ignore  # noqa: E402
+    DEFAULT_PATH,
+    build_table,
+)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Build flop rank-feature table")
+    ap.add_argument("--out", default=str(DEFAULT_PATH))
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    table = np.frombuffer(bytes(build_table()), dtype=np.uint8)
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    np.save(out, table)
+    filled = int(np.count_nonzero(table))
+    print(f"wrote {out} ({filled} rank states) in {time.perf_counter() - t0:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Build the HU preflop all-in equity matrix (169 x 169).
+
+Monte Carlo per label pair (uniform over non-conflicting concrete combos, random
+5-card boards), evaluated in batches with the table evaluator. Only the upper
+triangle is simulated; eq[j, i] = 1 - eq[i, j] and the diagonal is exactly 0.5.
+
+Output: uint16 .npy (equity * 65535), loaded via poker_core.suggest.preflop_equity.
+
+Usage:
+  python scripts/build_preflop_equity.py --samples 6000 --seed 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+
+def _resolve_repo_root() -> Path:
+    here = Path(__file__).resolve()
+    return here.parent.parent
+
+
+def _ensure_path() -> None:
+    root = _resolve_repo_root()
+    pkg = root / "packages"
+    if str(pkg) not in sys.path:
+        sys.path.insert(0, str(pkg))
+
+
+_ensure_path()
+
+import numpy as np  # noqa: E402
+from poker_core.providers.table_eval import values7_many  # type: ignore  # noqa: E402
+from poker_core.suggest.preflop_equity import (  # type: ignore  # noqa: E402
+    DEFAULT_PATH,
+    SCALE,
+)
+from poker_core.suggest.preflop_tables import (  # type: ignore  # noqa: E402
+    COMBO_LABELS,
+    GRID_RANKS,
+)
+
+
+def _label_combos(label: str) -> np.ndarray:
+    ranks = "23456789TJQKA"
+    r1, r2 = ranks.index(label[0]), ranks.index(label[1])
+    out = []
+    for s1 in range(4):
+        for s2 in range(4):
+            if r1 == r2 and s1 >= s2:
+                continue
+            if r1 != r2 and (label[2] == "s") != (s1 == s2):
+                continue
+            out.append((r1 * 4 + s1, r2 * 4 + s2))
+    return np.array(out, dtype=np.int64)
+
+
+def _matchup(a: np.ndarray, b: np.ndarray, samples: int, rng: np.random.Generator) -> float:
+    # 所有无冲突的 (hero combo, villain combo) 对，均匀抽样
+    pairs = [(x, y) for x in range(len(a)) for y in range(len(b)) if not set(a[x]) & set(b[y])]
+    pick = np.array(pairs)[rng.integers(0, len(pairs), size=samples)]
+    hero = a[pick[:, 0]]
+    vill = b[pick[:, 1]]
+    # 随机公共牌：死牌置 +inf 后取最小的 5 个随机键
+    keys = rng.random((samples, 52))
+    rows = np.arange(samples)[:, None]
+    keys[rows, hero] = np.inf
+    keys[rows, vill] = np.inf
+    board = np.argpartition(keys, 5, axis=1)[:, :5]
+    hv = values7_many(np.concatenate([hero, board], axis=1))
+    vv = values7_many(np.concatenate([vill, board], axis=1))
+    return float(((hv > vv) + 0.5 * (hv == vv)).mean())
+
+
+def _row(args: tuple[int, int, int]) -> tuple[int, list[float]]:
+    i, samples, seed = args
+    rng = np.random.default_rng([seed, i])
+    combos = [_label_combos(lab) for lab in COMBO_LABELS]
+    return i, [_matchup(combos[i], combos[j], samples, rng) for j in range(i + 1, 169)]
+
+
+def build(samples: int, seed: int, workers: int) -> np.ndarray:
+    eq = np.full((169, 169), 0.5)
+    jobs = [(i, samples, seed) for i in range(169)]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_row, jobs))
+    else:
+        results = [_row(j) for j in jobs]
+    for i, vals in results:
+        for k, v in enumerate(vals):
+            j = i + 1 + k
+            eq[i, j] = v
+            eq[j, i] = 1.0 - v
+    return np.rint(eq * SCALE).astype(np.uint16)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Build HU preflop 169x169 equity matrix")
+    ap.add_argument("--samples", type=int, default=6000, help="boards per label pair")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--out", default=str(DEFAULT_PATH))
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    mat = build(args.samples, args.seed, max(1, args.workers))
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    np.save(out, mat)
+    dt = time.perf_counter() - t0
+    aa, kk = GRID_RANKS.index("A"), GRID_RANKS.index("K")
+    print(
+        f"wrote {out} ({out.stat().st_size} bytes) in {dt:.1f}s; "
+        f"AA vs KK = {mat[aa * 13 + aa, kk * 13 + kk] / SCALE:.3f}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
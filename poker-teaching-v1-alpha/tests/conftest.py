@@ -13,6 +13,8 @@ sys.path.insert(0, str(PACKAGES_DIR))
 sys.path.insert(0, str(DJANGO_DIR))
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "web.settings")
+# 测试里显式调用 bump_context_version()，不起后台配置轮询线程
+os.environ.setdefault("SUGGEST_CONFIG_WATCH_SECONDS", "0")
 
 try:
     import django
@@ -0,0 +1,46 @@
+import pytest
+from poker_core.providers.eval_cache import MISS, EvalCache, cache_from_env
+from poker_core.providers.pokerkit_adapter import PokerKitEvaluator
+
+
+def test_lru_counts_hits_misses_evictions():
+    c = EvalCache(maxsize=2)
+    assert c.get("a") is MISS
+    c.put("a", 1)
+    c.put("b", 2)
+    assert c.get("a") == 1  # a 变为最近使用
+    c.put("c", 3)  # 淘汰 b
+    assert c.get("b") is MISS
+    st = c.stats()
+    assert (st.hits, st.misses, st.evictions, st.size) == (1, 2, 1, 2)
+
+
+def test_policy_none_never_stores():
+    c = EvalCache(maxsize=8, policy="none")
+    c.put("a", 1)
+    assert c.get("a") is MISS
+    assert c.stats().size == 0
+    assert EvalCache(maxsize=0).policy == "none"
+    with pytest.raises(ValueError):
+        EvalCache(policy="fifo")
+
+
+def test_cache_from_env(monkeypatch):
+    monkeypatch.setenv("POKER_EVAL_CACHE_SIZE", "16")
+    monkeypatch.setenv("POKER_EVAL_CACHE_POLICY", "none")
+    c = cache_from_env()
+    assert c.maxsize == 16 and c.policy == "none"
+    monkeypatch.setenv("POKER_EVAL_CACHE_SIZE", "oops")
+    monkeypatch.setenv("POKER_EVAL_CACHE_POLICY", "lru")
+    assert cache_from_env().maxsize == 4096
+
+
+def test_pokerkit_evaluator_shares_cache_across_orderings():
+    pytest.importorskip("pokerkit")
+    cache = EvalCache(maxsize=4)
+    ev = PokerKitEvaluator(cache=cache)
+    r1 = ev.evaluate7(["As", "Ks"], ["Qs", "Js", "Ts", "2d", "3c"])
+    r2 = ev.evaluate7(["Ks", "As"], ["3c", "2d", "Ts", "Js", "Qs"])
+    assert r1 == r2
+    st = cache.stats()
+    assert (st.hits, st.misses, st.size) == (1, 1, 1)
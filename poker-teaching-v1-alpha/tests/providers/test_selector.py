@@ -52,3 +52,12 @@ def test_forced_pokerkit_raises_when_missing(monkeypatch):
     _reset_selector_cache()
     with pytest.raises(Exception):
         get_evaluator()
+
+
+def test_forced_table(monkeypatch):
+    monkeypatch.setenv("POKER_EVAL", "table")
+    _reset_selector_cache()
+    ev = get_evaluator()
+    assert ev.__class__.__name__ == "TableEvaluator"
+    monkeypatch.delenv("POKER_EVAL", raising=False)
+    _reset_selector_cache()
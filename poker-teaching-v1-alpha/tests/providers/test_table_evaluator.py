@@ -0,0 +1,93 @@
+import random
+
+import pytest
+from poker_core.providers.interfaces import EvaluationError, Strength
+from poker_core.providers.table_eval import TableEvaluator, value7
+
+E = TableEvaluator()
+
+_DECK = [r + s for r in "23456789TJQKA" for s in "shdc"]
+
+
+def test_category_and_best5():
+    r = E.evaluate7(["As", "Ks"], ["Qs", "Js", "Ts", "2d", "3c"])
+    assert r.category == "straight_flush"
+    assert set(r.best5) == {"As", "Ks", "Qs", "Js", "Ts"}
+
+    wheel = E.evaluate7(["Ah", "2d"], ["3c", "4s", "5h", "Kd", "Qc"])
+    six_high = E.evaluate7(["6h", "2d"], ["3c", "4s", "5h", "Kd", "Qc"])
+    assert wheel.category == "straight"
+    assert six_high.strength > wheel.strength
+
+    fh = E.evaluate7(["Kh", "Kd"], ["Kc", "Qs", "Qd", "Qh", "2c"])
+    assert fh.category == "full_house"
+    assert sorted(c[0] for c in fh.best5) == ["K", "K", "K", "Q", "Q"]
+
+
+def test_input_validation():
+    with pytest.raises(ValueError):
+        E.evaluate7(["As"], ["Qh", "Js", "Ts", "9c", "8d"])
+    with pytest.raises(EvaluationError):
+        E.evaluate7(["As", "As"], ["Qh", "Js", "Ts", "9c", "8d"])
+    r1 = E.evaluate7(["10s", "Ah"], ["Kh", "Qh", "Jh", "Th", "9h"])
+    r2 = E.evaluate7(["Ts", "Ah"], ["Kh", "Qh", "Jh", "Th", "9h"])
+    assert r1.strength == r2.strength
+
+
+def test_cross_check_against_pokerkit():
+    pytest.importorskip("pokerkit")
+    from poker_core.providers.pokerkit_adapter import PokerKitEvaluator
+
+    pk = PokerKitEvaluator()
+    rng = random.Random(20240501)
+    for _ in range(600):
+        cards = rng.sample(_DECK, 9)
+        board = cards[4:]
+        a = (cards[:2], board)
+        b = (cards[2:4], board)
+        ta, tb = E.evaluate7(*a), E.evaluate7(*b)
+        pa, pb = pk.evaluate7(*a), pk.evaluate7(*b)
+        assert (ta.strength > tb.strength) == (pa.strength > pb.strength)
+        assert (ta.strength == tb.strength) == (pa.strength == pb.strength)
+        # 同点数不同花色的选择可能不同，只比较点数
+        assert sorted(c[0] for c in ta.best5) == sorted(c[0] for c in pa.best5)
+
+
+def _random_batch(n, seed):
+    rng = random.Random(seed)
+    return [rng.sample(range(52), 7) for _ in range(n)]
+
+
+def test_evaluate7_many_matches_single():
+    np = pytest.importorskip("numpy")
+    rows = _random_batch(2000, 11)
+    out = E.evaluate7_many(np.array(rows, dtype=np.uint8))
+    assert out.shape == (2000,)
+    assert out.tolist() == [value7(row) for row in rows]
+
+
+def test_evaluate7_many_rejects_bad_shape():
+    np = pytest.importorskip("numpy")
+    with pytest.raises(ValueError):
+        E.evaluate7_many(np.zeros((3, 6), dtype=np.int64))
+
+
+def test_evaluate7_many_looped_fallbacks_agree_on_order():
+    np = pytest.importorskip("numpy")
+    from poker_core.providers.simple_fallback import SimpleFallbackEvaluator
+
+    rows = _random_batch(300, 5)
+    arr = np.array(rows)
+    simple = SimpleFallbackEvaluator()
+    s_many = simple.evaluate7_many(arr)
+    assert [simple.evaluate7(r[:2], r[2:]).strength for r in rows] == [
+        Strength(int(v)) for v in s_many
+    ]
+
+    pytest.importorskip("pokerkit")
+    from poker_core.providers.pokerkit_adapter import PokerKitEvaluator
+
+    pk_many = PokerKitEvaluator().evaluate7_many(arr)
+    t_many = E.evaluate7_many(arr)
+    for i in range(0, len(rows) - 1, 2):
+        assert (pk_many[i] > pk_many[i + 1]) == (t_many[i] > t_many[i + 1])
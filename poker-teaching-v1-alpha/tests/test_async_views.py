@@ -0,0 +1,126 @@
+import json
+import threading
+
+import pytest
+from api import async_exec, views_async
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory, Client
+
+rf = AsyncRequestFactory()
+
+
+def _post(c: Client, url: str, payload: dict):
+    return c.post(url, data=json.dumps(payload), content_type="application/json")
+
+
+def _call(view, request, **kwargs):
+    # async_to_sync 从测试主线程驱动：run_db 回到本线程执行，与测试事务共用连接
+    resp = async_to_sync(view)(request, **kwargs)
+    return resp.status_code, json.loads(resp.content)
+
+
+def _apost(url: str, payload: dict):
+    return rf.post(url, data=json.dumps(payload), content_type="application/json")
+
+
+def _new_hand(c: Client, seed: int = 13) -> tuple[str, str]:
+    sid = _post(c, "/api/v1/session/start", {}).json()["session_id"]
+    hid = _post(c, "/api/v1/hand/start", {"session_id": sid, "seed": seed}).json()["hand_id"]
+    return sid, hid
+
+
+@pytest.mark.django_db
+def test_async_views_match_sync_views(client: Client):
+    from api.models import Replay
+
+    sid, hid = _new_hand(client)
+    url = f"/api/v1/hand/state/{hid}"
+    code, body = _call(views_async.hand_state_async, rf.get(url), hand_id=hid)
+    assert code == 200 and body == client.get(url).json()
+
+    code, body = _call(views_async.session_state_async, rf.get("/s"), session_id=sid)
+    assert code == 200 and body == client.get(f"/api/v1/session/{sid}/state").json()
+
+    actor = client.get(url).json()["state"]["to_act"]
+    sync_sug = _post(client, "/api/v1/suggest", {"hand_id": hid, "actor": actor}).json()
+    code, body = _call(views_async.suggest_async, _apost("/s", {"hand_id": hid, "actor": actor}))
+    assert code == 200 and body == sync_sug
+
+    for _ in range(40):
+        la = client.get(url).json()["legal_actions"] or ["check"]
+        act = "call" if "call" in la else la[0]
+        code, body = _call(views_async.hand_act_async, _apost("/a", {"action": act}), hand_id=hid)
+        assert code == 200
+        if body["hand_over"]:
+            break
+    assert body["legal_actions"] == [] and "outcome" in body
+    assert Replay.objects.filter(hand_id=hid).exists()
+
+    code, body = _call(views_async.suggest_async, _apost("/s", {"hand_id": hid, "actor": 0}))
+    assert code == 409
+
+
+@pytest.mark.django_db
+def test_async_auto_step_and_bad_requests(client: Client):
+    _, hid = _new_hand(client, seed=21)
+    to_act = client.get(f"/api/v1/hand/state/{hid}").json()["state"]["to_act"]
+    code, body = _call(
+        views_async.hand_auto_step_async,
+        _apost("/x", {"user_actor": 1 - to_act, "max_steps": 1}),
+        hand_id=hid,
+    )
+    assert code == 200 and len(body["steps"]) == 1 and body["steps"][0]["actor"] == to_act
+    assert client.get(f"/api/v1/hand/state/{hid}").json()["state"] == body["state"]
+
+    bad = rf.post("/a", data=b"{nope", content_type="application/json")
+    assert _call(views_async.hand_act_async, bad, hand_id=hid)[0] == 400
+    assert _call(views_async.hand_act_async, _apost("/a", {}), hand_id="missing")[0] == 404
+    assert _call(views_async.suggest_async, _apost("/s", {"hand_id": hid}))[0] == 400
+
+
+@pytest.mark.django_db
+def test_auto_step_validation_matches_sync(client: Client):
+    _, hid = _new_hand(client, seed=22)
+    for bad in ({"max_steps": 0}, {"max_steps": 51}, {"user_actor": 2}, {"max_steps": "x"}):
+        sync = _post(client, f"/api/v1/hand/auto-step/{hid}", bad)
+        code, body = _call(views_async.hand_auto_step_async, _apost("/x", bad), hand_id=hid)
+        assert sync.status_code == code == 400 and sync.json() == body
+
+
+@pytest.mark.django_db
+def test_async_auto_step_refuses_to_overwrite_concurrent_act(client: Client, monkeypatch):
+    from api.hand_store import get_hand_store
+    from poker_core.state_hu import apply_action
+
+    _, hid = _new_hand(client, seed=23)
+    url = f"/api/v1/hand/state/{hid}"
+    to_act = client.get(url).json()["state"]["to_act"]
+    real_auto_play = views_async.auto_play
+
+    def _racing_auto_play(gs, user_actor, max_steps):
+        # 计算期间另一请求先把手牌推进了一步
+        store = get_hand_store()
+        entry = store.get(hid)
+        store.put(hid, {**entry, "gs": apply_action(entry["gs"], "call")})
+        return real_auto_play(gs, user_actor, max_steps)
+
+    monkeypatch.setattr(views_async, "auto_play", _racing_auto_play)
+    code, body = _call(
+        views_async.hand_auto_step_async,
+        _apost("/x", {"user_actor": 1 - to_act, "max_steps": 1}),
+        hand_id=hid,
+    )
+    assert code == 409
+    # 并发的 call 保留下来，未被 auto-step 的结果覆盖
+    assert client.get(url).json()["state"]["to_act"] == 1 - to_act
+
+
+def test_run_cpu_uses_bounded_pool(monkeypatch):
+    monkeypatch.setenv("ASYNC_CPU_WORKERS", "2")
+    async_exec.shutdown_cpu_executor()
+    try:
+        assert async_exec.cpu_executor()._max_workers == 2
+        name = async_to_sync(async_exec.run_cpu)(lambda: threading.current_thread().name)
+        assert name.startswith("suggest")
+    finally:
+        async_exec.shutdown_cpu_executor()
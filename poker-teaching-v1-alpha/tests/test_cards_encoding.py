@@ -0,0 +1,57 @@
+# tests/test_cards_encoding.py
+import random
+
+import pytest
+from poker_core.analysis import classify_starting_hand
+from poker_core.cards import (
+    CARD_RANK,
+    CARD_STRS,
+    RANK_ORDER,
+    RANKS,
+    SUITS,
+    card_id,
+    card_str,
+    card_strs,
+    make_deck,
+)
+from poker_core.state_hu import start_hand, start_session
+from poker_core.suggest.preflop_tables import combo_from_hole
+from poker_core.suggest.utils import classify_flop, infer_flop_hand_class
+
+
+def test_card_id_roundtrip():
+    assert len(set(CARD_STRS)) == 52
+    for i, s in enumerate(CARD_STRS):
+        assert card_id(s) == i
+        assert card_str(i) == s
+        assert CARD_RANK[i] == RANK_ORDER[s[0]]
+    assert card_id("10h") == card_id("Th")
+    with pytest.raises(ValueError):
+        card_id("Xx")
+    with pytest.raises(ValueError):
+        card_id(52)
+
+
+def test_make_deck_keeps_legacy_order():
+    # 与旧的字符串牌序一致，保证同一 seed 的发牌可复现
+    assert card_strs(make_deck()) == [r + s for r in RANKS for s in SUITS]
+
+
+def test_engine_carries_ints_and_events_carry_strings():
+    gs = start_hand(start_session(init_stack=200), session_id="s", hand_id="h", button=0, seed=7)
+    assert all(isinstance(c, int) for p in gs.players for c in p.hole)
+    assert all(isinstance(c, int) for c in gs.deck)
+    deal = next(e for e in gs.events if e["t"] == "deal_hole")
+    assert deal["p0"] == card_strs(gs.players[0].hole)
+
+
+def test_helpers_accept_ints_and_strings_equally():
+    rnd = random.Random(3)
+    for _ in range(300):
+        ids = rnd.sample(range(52), 5)
+        strs = card_strs(ids)
+        hole, board = ids[:2], ids[2:]
+        assert combo_from_hole(hole) == combo_from_hole(strs[:2])
+        assert classify_starting_hand(hole) == classify_starting_hand(strs[:2])
+        assert classify_flop(board) == classify_flop(strs[2:])
+        assert infer_flop_hand_class(hole, board) == infer_flop_hand_class(strs[:2], strs[2:])
@@ -0,0 +1,86 @@
+# tests/test_equity.py
+import poker_core.equity as equity_mod
+import pytest
+from poker_core.equity import equity_vs_hand, equity_vs_range
+from poker_core.providers.table_eval import TableEvaluator
+
+E = TableEvaluator()
+
+
+def test_river_is_deterministic():
+    r = equity_vs_hand(["As", "Ah"], ["Ks", "Kh"], ["2c", "7d", "9h", "Jc", "3s"], evaluator=E)
+    assert r.exhaustive and r.samples == 1
+    assert r.equity == 1.0
+
+    tie = equity_vs_hand(["2c", "3d"], ["4h", "5h"], ["As", "Ks", "Qs", "Js", "Ts"], evaluator=E)
+    assert tie.tie == 1.0 and tie.equity == 0.5
+
+
+def test_flop_enumerates_all_runouts():
+    r = equity_vs_hand(["As", "Ah"], ["Ks", "Kh"], ["2c", "7d", "9h"], evaluator=E)
+    assert r.exhaustive
+    assert r.samples == 990  # C(45, 2)
+    # KK 需要转/河出 K（2*43+1 种），其中同时出 A 的 4 种 AA 仍以三条 A 获胜
+    assert r.equity == pytest.approx(1 - (2 * 43 + 1 - 4) / 990, abs=1e-9)
+
+
+def test_preflop_monte_carlo_is_seeded():
+    pytest.importorskip("numpy")
+    a = equity_vs_hand(["As", "Ah"], ["Ks", "Kh"], evaluator=E, iters=20000, seed=1)
+    b = equity_vs_hand(["As", "Ah"], ["Ks", "Kh"], evaluator=E, iters=20000, seed=1)
+    assert a == b
+    assert not a.exhaustive
+    assert a.equity == pytest.approx(0.82, abs=0.015)
+
+
+def test_vs_range_matches_vs_hand_and_stops_early():
+    r = equity_vs_range(["As", "Ah"], ["KK"], iters=40000, seed=3, evaluator=E, ci_halfwidth=0.01)
+    assert r.equity == pytest.approx(0.82, abs=0.02)
+    # 置信半宽 1% 大约需要 ~6k 样本，远少于 iters
+    assert r.samples < 40000
+    assert 1.96 * r.stderr <= 0.01
+
+    same = equity_vs_range(
+        ["As", "Ah"], ["KK"], iters=40000, seed=3, evaluator=E, ci_halfwidth=0.01
+    )
+    assert same == r
+
+
+def test_vs_range_weights_and_dead_cards():
+    # AK 与 hero 共享 A/K，剩余组合受死牌影响；权重为 0 的标签被忽略
+    r = equity_vs_range(
+        ["As", "Kd"], {"AKo": 1.0, "22": 0.0}, ["Ah", "Kh", "2c"], iters=2000, seed=5, evaluator=E
+    )
+    assert 0.0 <= r.equity <= 1.0 and r.samples == 2000
+    with pytest.raises(ValueError):
+        equity_vs_range(["As", "Ah"], ["AA"], ["Ad", "Ac", "2c"], evaluator=E)
+
+
+def test_vs_range_process_pool():
+    r = equity_vs_range(["As", "Ah"], ["KK", "QQ"], iters=4000, seed=9, evaluator=E, workers=2)
+    assert r.samples == 4000
+    assert r.equity == pytest.approx(0.81, abs=0.03)
+    # 不能整除时总样本数仍恰为 iters；时间预算在各进程内计时
+    r = equity_vs_range(["As", "Ah"], ["KK"], iters=1001, seed=9, evaluator=E, workers=3, batch=200)
+    assert r.samples == 1001
+    r = equity_vs_range(
+        ["As", "Ah"], ["KK"], iters=10**7, seed=9, evaluator=E, workers=2, time_budget_ms=50
+    )
+    assert 0 < r.samples < 10**7
+
+
+def test_process_pool_is_reused_and_takes_unpicklable_evaluators():
+    pytest.importorskip("pokerkit")
+    from poker_core.providers.pokerkit_adapter import PokerKitEvaluator
+
+    equity_mod.shutdown_pool()
+    try:
+        r = equity_vs_range(
+            ["As", "Ah"], ["KK"], iters=400, seed=3, evaluator=PokerKitEvaluator(), workers=2
+        )
+        assert r.samples == 400
+        pool = equity_mod._POOL
+        equity_vs_range(["As", "Ah"], ["KK"], iters=400, seed=4, evaluator=E, workers=2)
+        assert equity_mod._POOL is pool
+    finally:
+        equity_mod.shutdown_pool()
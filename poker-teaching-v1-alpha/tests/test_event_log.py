@@ -0,0 +1,81 @@
+from poker_core.event_log import EventLog
+from poker_core.state_hu import apply_action, start_hand, start_session
+
+
+def test_append_shares_buffer_and_branches_copy():
+    a = EventLog([{"t": "x"}])
+    b = a.append({"t": "y"})
+    c = b.append({"t": "z"})
+    assert len(a) == 1 and len(b) == 2 and len(c) == 3
+    assert b._buf is a._buf is c._buf  # 线性追加共享缓冲区
+    d = b.append({"t": "w"})  # 在 b 上分叉
+    assert d._buf is not c._buf
+    assert [e["t"] for e in c] == ["x", "y", "z"]
+    assert [e["t"] for e in d] == ["x", "y", "w"]
+
+
+def test_sequence_protocol():
+    log = EventLog().extend({"t": str(i)} for i in range(4))
+    assert log[0] == {"t": "0"} and log[-1] == {"t": "3"}
+    assert log[1:3] == [{"t": "1"}, {"t": "2"}]
+    assert [e["t"] for e in reversed(log)] == ["3", "2", "1", "0"]
+    assert log == [{"t": str(i)} for i in range(4)]
+    assert log.to_list() == list(log)
+    shorter = EventLog(log[:2])
+    assert shorter != log
+
+
+def test_old_states_keep_their_events():
+    cfg = start_session(init_stack=200)
+    gs0 = start_hand(cfg, session_id="s", hand_id="h", button=0, seed=1)
+    n0 = len(gs0.events)
+    gs1 = apply_action(gs0, "call")
+    gs_a = apply_action(gs1, "check")
+    gs_b = apply_action(gs1, "raise", 4)
+    assert len(gs0.events) == n0
+    assert gs1.events[-1]["t"] == "call"
+    assert gs_a.events[len(gs1.events)]["t"] == "check"
+    assert gs_b.events[len(gs1.events)]["t"] == "raise"
+
+
+def test_records_are_typed_and_dict_compatible():
+    from poker_core.event_log import EventRecord, EventType
+
+    rec = EventRecord({"t": "allin", "who": 1, "amt": 40, "as": "raise"})
+    assert rec.code is EventType.ALLIN and rec.who == 1
+    assert rec["t"] == "allin" and rec.get("refund") is None and "as" in rec
+    assert rec == {"t": "allin", "who": 1, "amt": 40, "as": "raise"}
+    assert dict(rec) == {"t": "allin", "who": 1, "amt": 40, "as": "raise"}
+    assert EventRecord({"t": "custom"}).code is EventType.OTHER
+
+
+def test_index_matches_scanning_helpers():
+    import random
+    from types import SimpleNamespace
+
+    from poker_core.state_hu import legal_actions
+    from poker_core.suggest.utils import (
+        infer_last_aggressor_before,
+        infer_pfr,
+        infer_pot_type,
+    )
+
+    cfg = start_session(init_stack=120)
+    for seed in range(80):
+        rnd = random.Random(seed)
+        gs = start_hand(cfg, session_id="s", hand_id="h", button=seed % 2, seed=seed)
+        while True:
+            plain = SimpleNamespace(events=gs.events.to_list())
+            assert infer_pfr(gs) == infer_pfr(plain)
+            assert infer_pot_type(gs) == infer_pot_type(plain)
+            for st in ("preflop", "flop", "turn", "river"):
+                assert infer_last_aggressor_before(gs, st) == infer_last_aggressor_before(plain, st)
+            acts = legal_actions(gs)
+            if not acts:
+                break
+            a = rnd.choice(acts)
+            gs = apply_action(gs, a, rnd.choice([None, 3, 9]) if a in ("bet", "raise") else None)
+        flop_at = gs.events.index.street_offset("flop")
+        if flop_at is not None:
+            assert gs.events[flop_at]["street"] == "flop"
+            assert gs.events.street_events("flop")[0] is gs.events[flop_at]
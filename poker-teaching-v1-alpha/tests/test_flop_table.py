@@ -0,0 +1,63 @@
+# tests/test_flop_table.py
+import random
+
+import pytest
+from poker_core.cards import card_strs
+from poker_core.suggest.flop_table import (
+    _table,
+    canonical_flop,
+    flop_features,
+    flop_hand_class,
+)
+from poker_core.suggest.utils import (
+    _has_fd,
+    _has_gutshot,
+    _has_oesd,
+    infer_flop_hand_class,
+    infer_flop_hand_class_from_gs,
+)
+
+
+def test_table_is_memory_mapped():
+    np = pytest.importorskip("numpy")
+    t = _table()
+    assert isinstance(t, memoryview) and len(t) == 13**5
+    assert isinstance(t.obj, np.memmap)
+
+
+def test_matches_reference_on_random_spots():
+    rnd = random.Random(17)
+    for _ in range(30000):
+        ids = rnd.sample(range(52), 5)
+        hole, flop = ids[:2], ids[2:]
+        ff = flop_features(hole, flop)
+        assert ff.hand_class == infer_flop_hand_class(hole, flop) == flop_hand_class(hole, flop)
+        assert (ff.fd, ff.nfd) == _has_fd(hole, flop)
+        assert ff.oesd == _has_oesd(hole, flop)
+        assert ff.gutshot == _has_gutshot(hole, flop)
+
+
+def test_strings_and_invalid_input():
+    assert flop_hand_class(["Ah", "Kh"], ["Ad", "7c", "2d"]) == "overpair_or_top_pair_strong"
+    assert flop_hand_class(["Ah", "Kh"], ["Qh", "7h", "2d"]) == "strong_draw"
+    assert flop_hand_class(["Ah"], ["Qh", "7h", "2d"]) == "weak_draw_or_air"
+    assert flop_hand_class(["Xx", "Kh"], ["Qh", "7h", "2d"]) == "weak_draw_or_air"
+
+
+def test_from_gs_uses_table():
+    class _P:
+        hole = card_strs([48, 44])
+
+    class _GS:
+        players = (_P(), _P())
+        board = ["Ad", "7c", "2d", "Ts"]
+
+    assert infer_flop_hand_class_from_gs(_GS(), 0) == infer_flop_hand_class(_P.hole, _GS.board[:3])
+
+
+def test_canonical_flop_is_suit_isomorphic():
+    a = canonical_flop(["Ah", "Kh"], ["Qh", "7c", "2d"])
+    b = canonical_flop(["As", "Ks"], ["Qs", "7d", "2h"])
+    c = canonical_flop(["Kc", "Ac"], ["2s", "Qc", "7h"])
+    assert a == b == c
+    assert canonical_flop(["Ah", "Kd"], ["Qh", "7c", "2d"]) != a
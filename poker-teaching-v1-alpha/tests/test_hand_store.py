@@ -0,0 +1,189 @@
+import json
+
+import pytest
+from api.hand_store import (
+    DbHandStore,
+    MemoryHandStore,
+    SharedMemoryHandStore,
+    build_hand_store,
+    dump_entry,
+    get_hand_store,
+    load_entry,
+    set_hand_store,
+)
+from api.state import BoundedLRU
+from django.test import Client
+from poker_core.replay_codec import encode_hand
+from poker_core.state_hu import apply_action, start_hand, start_session
+
+
+def _entry(i: int, session_id: str = "s_store"):
+    cfg = start_session(init_stack=200, sb=1, bb=2)
+    gs = start_hand(cfg, session_id=session_id, hand_id=f"h_store_{i}", button=i % 2, seed=i)
+    gs = apply_action(gs, "call")
+    gs = apply_action(gs, "check")  # → flop：剩余牌序必须原样保存
+    return {"gs": gs, "session_id": session_id, "seed": i, "cfg": cfg}
+
+
+def _same(a: dict, b: dict) -> bool:
+    ga, gb = a["gs"], b["gs"]
+    return (
+        [dict(e) for e in ga.events] == [dict(e) for e in gb.events]
+        and ga.deck == gb.deck
+        and ga.players == gb.players
+        and {k: v for k, v in a.items() if k != "gs"} == {k: v for k, v in b.items() if k != "gs"}
+    )
+
+
+def test_memory_store_ttl_and_lru():
+    now = [0.0]
+    store = MemoryHandStore(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+    store.put("a", {"n": 1})
+    store.put("b", {"n": 2})
+    assert store.get("a") == {"n": 1}  # a 变为最近使用
+    store.put("c", {"n": 3})  # 淘汰 b
+    assert "b" not in store and "a" in store
+    assert [h for h, _ in store.items()] == ["a", "c"]  # 创建顺序
+    now[0] = 11.0
+    assert store.get("a") is None and len(store) == 1
+
+
+def test_memory_store_purges_expired_on_put(monkeypatch):
+    import api.hand_store as hs
+
+    monkeypatch.setattr(hs, "_PURGE_EVERY", 4)
+    now = [0.0]
+    store = MemoryHandStore(max_entries=100, ttl_seconds=10, clock=lambda: now[0])
+    store.put("a", {"session_id": "s1"})
+    store.put("b", {"session_id": "s1"})
+    now[0] = 11.0
+    store.put("c", {"session_id": "s2"})
+    assert len(store) == 3  # 未到清理批次，过期条目仍在
+    store.put("d", {"session_id": "s2"})
+    assert len(store) == 2 and store.session_hands("s1") == []
+    now[0] = 30.0
+    assert store.purge() == 2 and len(store) == 0
+
+
+def test_memory_store_session_index_follows_eviction():
+    store = MemoryHandStore(max_entries=2, ttl_seconds=0)
+    store.put("a", {"session_id": "s1"})
+    store.put("b", {"session_id": "s2"})
+    store.set_current("s1", "a")
+    store.put("c", {"session_id": "s1"})  # 淘汰 a
+    assert store.session_hands("s1") == ["c"]
+    assert store.current_hand("s1") == "c"
+    assert store.latest_for_session("s2") == ("b", {"session_id": "s2"})
+    assert store.latest_for_session("s3") == (None, None)
+
+
+def test_replay_cache_is_bounded_lru():
+    cache = BoundedLRU(max_entries=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache.get("a") == 1  # a 变为最近使用
+    cache["c"] = 3  # 淘汰 b
+    assert list(cache) == ["a", "c"] and cache.get("b") is None
+    assert cache.pop("a") == 1 and "a" not in cache
+
+
+def test_latest_for_session_complete_skips_running_hand():
+    store = MemoryHandStore()
+    done = _entry(0)
+    done["gs"] = apply_action(apply_action(done["gs"], "bet", 4), "fold")
+    assert done["gs"].street == "complete"
+    store.put("h_done", done)
+    store.put("h_run", _entry(1))
+    store.set_current("s_store", "h_run")
+    assert store.latest_for_session("s_store")[0] == "h_run"
+    assert store.latest_for_session("s_store", complete=True)[0] == "h_done"
+    store.delete("h_done")
+    assert store.latest_for_session("s_store", complete=True) == (None, None)
+
+
+def _exercise(store):
+    entries = {f"h_store_{i}": _entry(i) for i in range(3)}
+    for hid, e in entries.items():
+        store.put(hid, e)
+    for hid, e in entries.items():
+        assert _same(store.get(hid), e)
+    assert [h for h, _ in store.items()] == list(entries)
+
+    assert store.session_hands("s_store") == list(entries)
+    assert store.session_hands("s_other") == []
+    # 无指针时当前手为会话最新一手；指针优先
+    assert store.current_hand("s_store") == "h_store_2"
+    store.set_current("s_store", "h_store_0")
+    assert store.current_hand("s_store") == "h_store_0"
+
+    hid = "h_store_1"
+    nxt = apply_action(entries[hid]["gs"], "check")
+    store.update_gs(hid, nxt)
+    assert store.get(hid)["gs"].events == nxt.events
+    assert [h for h, _ in store.items()] == list(entries)  # 更新不改变创建顺序
+
+    store.delete(hid)
+    assert store.get(hid) is None and hid not in store
+    assert store.session_hands("s_store") == ["h_store_0", "h_store_2"]
+    store.delete("h_store_0")  # 指针指向的手牌被删除 → 回退到会话最新一手
+    assert store.current_hand("s_store") == "h_store_2"
+    store.clear()
+    assert list(store.items()) == []
+    assert store.current_hand("s_store") is None
+
+
+def test_shared_memory_store_round_trip(tmp_path):
+    path = str(tmp_path / "hands.sqlite3")
+    _exercise(SharedMemoryHandStore(path))
+    # 另一个实例（模拟另一 worker 进程）看到同一份数据
+    a, b = SharedMemoryHandStore(path), SharedMemoryHandStore(path)
+    e = _entry(7)
+    a.put("h_x", e)
+    assert _same(b.get("h_x"), e)
+
+
+def test_load_entry_reads_legacy_replay_blobs_and_skips_undecodable():
+    e = _entry(3)
+    legacy = encode_hand(e["gs"], seed=3, full_deck=True)
+    _, meta = dump_entry(e)
+    assert _same(load_entry("h_store_3", legacy, meta), e)
+    assert load_entry("h_store_3", b"GS\x01\x03999", meta) is None
+
+
+@pytest.mark.django_db
+def test_db_store_round_trip():
+    _exercise(DbHandStore())
+
+
+def test_build_hand_store_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("HAND_STORE", "shm")
+    monkeypatch.setenv("HAND_STORE_PATH", str(tmp_path / "x.sqlite3"))
+    assert isinstance(build_hand_store(), SharedMemoryHandStore)
+    monkeypatch.setenv("HAND_STORE", "nope")
+    with pytest.raises(ValueError):
+        build_hand_store()
+
+
+def _post(c: Client, url: str, payload: dict):
+    return c.post(url, data=json.dumps(payload), content_type="application/json")
+
+
+@pytest.mark.django_db
+def test_api_flow_on_db_store():
+    prev = set_hand_store(DbHandStore())
+    try:
+        c = Client()
+        sid = _post(c, "/api/v1/session/start", {}).json()["session_id"]
+        hid = _post(c, "/api/v1/hand/start", {"session_id": sid, "seed": 11}).json()["hand_id"]
+        for _ in range(40):
+            st = c.get(f"/api/v1/hand/state/{hid}").json()
+            la = st["legal_actions"]
+            act = "check" if "check" in la else "call"
+            if _post(c, f"/api/v1/hand/act/{hid}", {"action": act}).json()["hand_over"]:
+                break
+        assert get_hand_store().get(hid)["gs"].street == "complete"
+        assert c.get(f"/api/v1/session/{sid}/state").json()["current_hand_id"] == hid
+        nxt = _post(c, "/api/v1/session/next", {"session_id": sid})
+        assert nxt.status_code == 200, nxt.content
+    finally:
+        set_hand_store(prev)
@@ -0,0 +1,83 @@
+import random
+
+from poker_core.domain.actions import legal_actions_struct
+from poker_core.state_hu import (
+    apply_action,
+    apply_action_recorded,
+    betting_bounds,
+    legal_actions,
+    start_hand,
+    start_session,
+    undo_action,
+)
+
+
+def _random_states(n_hands=60, stacks=(3, 9, 50, 200)):
+    for seed in range(n_hands):
+        rnd = random.Random(seed)
+        cfg = start_session(init_stack=stacks[seed % len(stacks)])
+        gs = start_hand(cfg, session_id="s", hand_id="h", button=seed % 2, seed=seed)
+        while legal_actions(gs):
+            yield gs
+            a = rnd.choice(legal_actions(gs))
+            gs = apply_action(
+                gs, a, rnd.choice([None, 2, 7, 30]) if a in ("bet", "raise") else None
+            )
+
+
+def _paid(gs, action, amount) -> int:
+    """apply_action 实际执行的 amount（与其入参同单位）：bet 为下注额，raise 为跟注之外的加注增量。"""
+    me = gs.players[gs.to_act]
+    to_call = max(gs.players[1 - gs.to_act].invested_street - me.invested_street, 0)
+    nxt, delta = apply_action_recorded(gs, action, amount)
+    paid = me.stack - nxt.players[gs.to_act].stack - (to_call if action == "raise" else 0)
+    undo_action(delta)
+    return paid
+
+
+def test_struct_bounds_accepted_verbatim_by_apply_action():
+    checked = 0
+    for gs in _random_states():
+        struct = {la.action: la for la in legal_actions_struct(gs)}
+        for a in ("bet", "raise"):
+            if a not in legal_actions(gs):
+                assert a not in struct
+                continue
+            lo, hi = struct[a].min, struct[a].max
+            assert 1 <= lo <= hi <= gs.players[gs.to_act].stack
+            # 区间内任一 amount 原样执行；区间外被夹取到边界
+            for amt in {lo, (lo + hi) // 2, hi}:
+                assert _paid(gs, a, amt) == amt
+            assert _paid(gs, a, hi + 1) == hi
+            if lo > 1:
+                assert _paid(gs, a, lo - 1) == lo
+            checked += 1
+    assert checked > 50
+
+
+def test_min_reraise_is_enterable_after_open():
+    cfg = start_session(init_stack=200, sb=1, bb=2)
+    gs = start_hand(cfg, session_id="s", hand_id="h", button=0, seed=1)
+    gs = apply_action(gs, "raise", 4)  # SB 加注到 6
+    raise_ = {la.action: la for la in legal_actions_struct(gs)}["raise"]
+    bb = gs.to_act
+    assert (raise_.min, raise_.max) == (4, gs.players[bb].stack - 4)
+    after = apply_action(gs, "raise", raise_.min)
+    assert after.players[bb].invested_street == 10  # 最小再加注：到 10
+
+
+def test_betting_bounds_match_engine_clamping():
+    for gs in _random_states():
+        acts = legal_actions(gs)
+        b = betting_bounds(gs)
+        actor = gs.to_act
+        inv = gs.players[actor].invested_street
+        if "bet" in acts:
+            lo = apply_action(gs, "bet", 1).events[-1]
+            hi = apply_action(gs, "bet", 10**6).events[-1]
+            assert (lo["amt"], hi["amt"]) == (b.min_bet, b.max_bet)
+        if "raise" in acts:
+            lo = apply_action(gs, "raise", 1).players[actor].invested_street
+            hi = apply_action(gs, "raise", 10**6).players[actor].invested_street
+            assert (lo, hi) == (b.min_raise_to, b.max_raise_to)
+            assert b.min_raise_to - inv - (0 if b.to_call == 0 else b.to_call) == b.min_raise
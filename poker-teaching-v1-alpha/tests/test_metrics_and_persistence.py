@@ -19,3 +19,10 @@ def test_metrics_increment_and_persistence():
     m1 = c.get("/api/v1/metrics").json()["deals_total"]
     assert m1 == m0 + 1
     assert Replay.objects.filter(hand_id=hand_id).exists()
+
+
+def test_prometheus_exports_eval_cache_counters():
+    pytest.importorskip("prometheus_client")
+    body = Client().get("/api/v1/metrics/prometheus").content.decode()
+    assert "eval_cache_events_total" in body
+    assert "eval_cache_entries" in body
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+
+import pytest
+from poker_core.domain.actions import LegalAction
+from poker_core.suggest.context import SuggestContext, SuggestFlags, SuggestProfile
+from poker_core.suggest.decision import Decision
+from poker_core.suggest.hand_strength import HandStrength
+from poker_core.suggest.mixing import MixedFreqs, stable_uniform
+from poker_core.suggest.policy import policy_preflop_v1
+from poker_core.suggest.policy_preflop import decide_bb_defend, decide_sb_vs_threebet
+from poker_core.suggest.preflop_tables import MIX_ACTIONS, _load_vs
+from poker_core.suggest.range169 import combo_index
+from poker_core.suggest.rule_compiler import CompiledRules
+from poker_core.suggest.types import Observation, PolicyConfig
+
+
+def test_stable_uniform_is_deterministic_and_spread():
+    assert stable_uniform("h_1", "x") == stable_uniform("h_1", "x")
+    assert stable_uniform("h_1", "x") != stable_uniform("h_1", "y")
+    us = [stable_uniform(f"h_{i}", "s") for i in range(4000)]
+    assert all(0.0 <= u < 1.0 for u in us)
+    assert 0.45 < sum(u < 0.5 for u in us) / len(us) < 0.55
+
+
+def test_mixed_freqs_compile_and_choose():
+    pure = {"reraise": {"AA", "AKs"}, "call": {"AKs", "A5s", "22"}}
+    mix = {"A5s": {"reraise": 0.6, "call": 0.4}, "22": {"call": 1.5, "reraise": 0.5}}
+    freq = MixedFreqs.compile(pure, mix, ("reraise", "call"))
+    # 重叠：靠前动作优先
+    assert freq.row(combo_index("AKs")) == {"reraise": 1.0, "call": 0.0}
+    assert freq.row(combo_index("A5s")) == pytest.approx({"reraise": 0.6, "call": 0.4})
+    assert freq.row(combo_index("22")) == pytest.approx({"reraise": 0.25, "call": 0.75})
+    assert set(freq.mixed) == {"A5s", "22"}
+    i = combo_index("A5s")
+    assert freq.choose(i, 0.59) == ("reraise", pytest.approx(0.6))
+    assert freq.choose(i, 0.61) == ("call", pytest.approx(0.4))
+    half = MixedFreqs.compile({}, {"K5o": {"call": 0.3}}, ("call",))
+    assert half.choose(combo_index("K5o"), 0.9) == (None, pytest.approx(0.7))
+
+
+def test_vs_table_mix_loaded(tmp_path, monkeypatch):
+    from poker_core.suggest.config_loader import _CACHE
+
+    (tmp_path / "ranges").mkdir()
+    cfg = {
+        "BB_vs_SB": {
+            "small": {
+                "reraise": ["AA"],
+                "call": ["A5s", "KQo"],
+                "mix": {"A5s": {"reraise": 0.5, "call": 0.5}, "KQo": {"call": 0.0}},
+            }
+        }
+    }
+    (tmp_path / "ranges" / "mix.json").write_text(json.dumps(cfg), encoding="utf-8")
+    monkeypatch.setenv("SUGGEST_CONFIG_DIR", str(tmp_path))
+    try:
+        table, _ = _load_vs("ranges/mix.json")
+    finally:
+        _load_vs.cache_clear()
+        _CACHE.clear()
+    node = table["BB_vs_SB"]["small"]
+    assert isinstance(node["freq"], MixedFreqs) and node["freq"].actions == MIX_ACTIONS
+    assert set(node["reraise"]) == {"AA", "A5s"}
+    assert set(node["call"]) == {"A5s"}  # mix 将 KQo 的跟注频率覆盖为 0
+
+
+def _ctx(vs_node) -> SuggestContext:
+    return SuggestContext(
+        modes={"HU": {}},
+        open_table={"SB": set(), "BB": set()},
+        vs_table={"BB_vs_SB": {"small": vs_node}},
+        versions={"open": 1, "vs": 1, "modes": 1},
+        flags=SuggestFlags(enable_flop_value_raise=True),
+        profile=SuggestProfile(strategy_name="medium", config_profile="builtin"),
+    )
+
+
+def _obs(hand_id: str, acts) -> Observation:
+    return Observation(
+        hand_id=hand_id,
+        actor=1,
+        street="preflop",
+        bb=50,
+        pot=200,
+        to_call=50,
+        acts=acts,
+        tags=["Ax_suited"],
+        hand_class="A5s",
+        table_mode="HU",
+        button=0,
+        spr_bucket="na",
+        board_texture="na",
+        ip=False,
+        first_to_act=False,
+        last_to_act=True,
+        pot_now=300,
+        combo="A5s",
+        hand_strength=HandStrength("preflop", "preflop_ax_suited", "A5s"),
+        pot_type="single_raised",
+    )
+
+
+def test_bb_defend_mixes_by_hand_id_and_reports_frequency():
+    freq = MixedFreqs.compile({}, {"A5s": {"reraise": 0.6, "call": 0.4}}, MIX_ACTIONS)
+    ctx = _ctx({"reraise": set(), "call": {"A5s"}, "freq": freq})
+    acts = [
+        LegalAction("fold"),
+        LegalAction("call", to_call=50),
+        LegalAction("raise", min=250, max=600),
+    ]
+    cfg = PolicyConfig()
+    seen = {}
+    for i in range(60):
+        hid = f"h_mix_{i}"
+        obs = _obs(hid, acts)
+        result = decide_bb_defend(obs, ctx, cfg)
+        suggested, meta, _ = result.resolve(obs, acts, cfg)
+        again, _, _ = decide_bb_defend(obs, ctx, cfg).resolve(obs, acts, cfg)
+        assert again == suggested  # 同一手牌结果稳定
+        expected = "raise" if stable_uniform(hid, "preflop/BB_vs_SB/small") < 0.6 else "call"
+        assert suggested["action"] == expected
+        assert meta["frequency"] == (0.6 if expected == "raise" else 0.4)
+        seen[expected] = seen.get(expected, 0) + 1
+    assert set(seen) == {"raise", "call"}
+
+
+def test_postflop_node_mix_is_compiled_and_picked():
+    rules = {
+        "single_raised": {
+            "role": {
+                "pfr": {
+                    "defaults": {
+                        "defaults": {
+                            "defaults": {
+                                "defaults": {
+                                    "mix": [
+                                        {"action": "bet", "size_tag": "half", "freq": 0.7},
+                                        {"action": "check", "freq": 0.3},
+                                    ],
+                                    "plan": "p",
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+    comp = CompiledRules(rules)
+    node, path = comp.lookup("single_raised", "pfr", "ip", "dry", "le3", "value")
+    assert "mix" in node
+    actions = set()
+    for i in range(50):
+        picked, freq = comp.pick(node, f"h_{i}", f"flop/{path}")
+        assert picked["plan"] == "p" and "mix" not in picked
+        assert freq == pytest.approx(0.7 if picked["action"] == "bet" else 0.3)
+        assert comp.pick(node, f"h_{i}", f"flop/{path}") == (picked, freq)
+        actions.add(picked["action"])
+    assert actions == {"bet", "check"}
+    plain = {"action": "check"}
+    assert comp.pick(plain, "h", "s") == (plain, None)
+
+
+def test_decision_reports_frequency_in_meta():
+    d = Decision(action="check", meta={"a": 1}, frequency=0.33333)
+    obs = _obs("h", [LegalAction("check")])
+    _, meta, _ = d.resolve(obs, [LegalAction("check")], PolicyConfig())
+    assert meta == {"a": 1, "frequency": 0.3333}
+    _, meta, _ = Decision(action="check").resolve(obs, [LegalAction("check")], PolicyConfig())
+    assert "frequency" not in meta
+
+
+def _leftover_hand(salt: str, share: float) -> str:
+    return next(f"h_left_{i}" for i in range(200) if stable_uniform(f"h_left_{i}", salt) >= share)
+
+
+def test_mix_leftover_draw_folds_with_frequency():
+    # 行和 0.3，其余 0.7 为弃牌份额；合并后的 call 集合仍含 A5s，不能被兜底当作范围内跟注
+    freq = MixedFreqs.compile({}, {"A5s": {"call": 0.3}}, MIX_ACTIONS)
+    node = {"reraise": set(), "call": {"A5s"}, "freq": freq}
+    ctx = dataclasses.replace(
+        _ctx(node), vs_table={"BB_vs_SB": {"small": node}, "SB_vs_BB_3bet": {"small": node}}
+    )
+    acts = [LegalAction("fold"), LegalAction("call", to_call=50)]
+    cfg = PolicyConfig()
+
+    obs = _obs(_leftover_hand("preflop/BB_vs_SB/small", 0.3), acts)
+    suggested, meta, _ = decide_bb_defend(obs, ctx, cfg).resolve(obs, acts, cfg)
+    assert suggested == {"action": "fold"} and meta["frequency"] == 0.7
+    suggested, _, _, meta = policy_preflop_v1(dataclasses.replace(obs, context=ctx), cfg)
+    assert suggested["action"] == "fold" and meta["frequency"] == 0.7
+
+    # SB 面对 9bb 3bet（small 档）
+    sb = dataclasses.replace(
+        obs,
+        hand_id=_leftover_hand("preflop/SB_vs_BB_3bet/small", 0.3),
+        actor=0,
+        last_to_act=False,
+        to_call=300,
+        pot_now=600,
+    )
+    suggested, meta, _ = decide_sb_vs_threebet(sb, ctx, cfg).resolve(sb, acts, cfg)
+    assert suggested == {"action": "fold"} and meta["frequency"] == 0.7
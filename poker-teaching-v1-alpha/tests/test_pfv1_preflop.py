@@ -1,9 +1,19 @@
 import os
 
+import pytest
 from poker_core.domain.actions import LegalAction
+from poker_core.suggest.context import bump_context_version
 from poker_core.suggest.service import build_suggestion
 
 
+@pytest.fixture(autouse=True)
+def _fresh_context():
+    # 部分用例替换表加载函数：前后各递增配置代号，快照不在用例间复用
+    bump_context_version()
+    yield
+    bump_context_version()
+
+
 class _P:
     def __init__(self, stack=10000, invested=0, hole=None):
         self.stack = stack
@@ -0,0 +1,98 @@
+# tests/test_preflop_equity.py
+import pytest
+from poker_core.suggest.preflop_equity import _matrix, equity_vs_labels, preflop_equity
+from poker_core.suggest.preflop_tables import COMBO_COUNTS, COMBO_LABELS, combo_index
+
+np = pytest.importorskip("numpy")
+
+
+def test_grid_labels():
+    assert len(set(COMBO_LABELS)) == 169
+    assert combo_index("AA") == 0 and combo_index("AKs") == 1 and combo_index("AKo") == 13
+    assert combo_index("22") == 168
+    assert sum(COMBO_COUNTS) == 1326
+    assert combo_index("XYZ") is None
+
+
+def test_matrix_is_memory_mapped_and_antisymmetric():
+    m = _matrix()
+    assert m is not None
+    assert isinstance(m, np.memmap)
+    assert m.shape == (169, 169) and m.dtype == np.uint16
+    total = m.astype(np.int64) + m.astype(np.int64).T
+    assert np.all(np.abs(total - 65535) <= 1)
+
+
+@pytest.mark.parametrize(
+    "hero,villain,expected",
+    [("AA", "KK", 0.82), ("AKs", "QQ", 0.46), ("22", "AKo", 0.52), ("72o", "AA", 0.12)],
+)
+def test_known_matchups(hero, villain, expected):
+    assert preflop_equity(hero, villain) == pytest.approx(expected, abs=0.02)
+
+
+def test_equity_vs_labels_weighting():
+    # AA vs {KK, AKs}：按组合数加权（6 : 4）
+    eq = equity_vs_labels("AA", {"KK", "AKs"})
+    expected = (6 * preflop_equity("AA", "KK") + 4 * preflop_equity("AA", "AKs")) / 10
+    assert eq == pytest.approx(expected, abs=1e-6)
+    assert equity_vs_labels("AA", set()) is None
+    assert preflop_equity("AA", "bogus") is None
+
+
+def _ctx():
+    from poker_core.suggest.context import SuggestContext, SuggestFlags, SuggestProfile
+
+    return SuggestContext(
+        modes={"HU": {"defend_threshold_ip": 0.42, "defend_threshold_oop": 0.38}},
+        open_table={"SB": {"AKs"}, "BB": set()},
+        vs_table={"BB_vs_SB": {"small": {"call": {"A5s"}, "reraise": {"AKs"}}}},
+        versions={"open": 1, "vs": 1, "modes": 1},
+        flags=SuggestFlags(enable_flop_value_raise=True),
+        profile=SuggestProfile(strategy_name="medium", config_profile="builtin"),
+    )
+
+
+def _obs(acts):
+    from poker_core.suggest.hand_strength import HandStrength
+    from poker_core.suggest.types import Observation
+
+    return Observation(
+        hand_id="h",
+        actor=1,
+        street="preflop",
+        bb=50,
+        pot=150,
+        to_call=50,
+        acts=acts,
+        tags=["suited_broadway"],
+        hand_class="AKs",
+        table_mode="HU",
+        button=0,
+        spr_bucket="na",
+        board_texture="na",
+        ip=False,
+        first_to_act=False,
+        last_to_act=True,
+        pot_now=300,
+        combo="AKs",
+        hand_strength=HandStrength("preflop", "preflop_suited_broadway", "AKs"),
+        pot_type="single_raised",
+    )
+
+
+def test_bb_defend_meta_quotes_equity():
+    from poker_core.domain.actions import LegalAction
+    from poker_core.suggest.policy_preflop import decide_bb_defend
+    from poker_core.suggest.types import PolicyConfig
+
+    acts = [
+        LegalAction("fold"),
+        LegalAction("call", to_call=50),
+        LegalAction("raise", min=250, max=600),
+    ]
+    obs = _obs(acts)
+    res = decide_bb_defend(obs, _ctx(), PolicyConfig())
+    _, meta, _ = res.resolve(obs, acts, PolicyConfig())
+    # SB 开局范围只有 AKs → AKs vs AKs ≈ 0.5
+    assert meta["equity_vs_range"] == pytest.approx(0.5, abs=0.01)
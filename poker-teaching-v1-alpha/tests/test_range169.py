@@ -0,0 +1,94 @@
+import json
+from itertools import combinations
+from pathlib import Path
+
+import pytest
+from poker_core.suggest.preflop_tables import _load_open, _load_vs, combo_from_hole
+from poker_core.suggest.range169 import (
+    COMBO_LABELS,
+    EMPTY_RANGE,
+    Range169,
+    combo_index,
+    grid_index,
+    hole_index,
+)
+
+_RANGES = Path(__file__).resolve().parents[1] / "packages/poker_core/suggest/config/ranges"
+
+
+def test_grid_index_matches_labels_for_all_holes():
+    seen = set()
+    for a, b in combinations(range(52), 2):
+        lab = combo_from_hole([a, b])
+        idx = hole_index([a, b])
+        assert idx == combo_index(lab) == hole_index([b, a])
+        assert COMBO_LABELS[idx] == lab
+        seen.add(idx)
+    assert len(seen) == 169
+    assert COMBO_LABELS[grid_index(14, 13, True)] == "AKs"
+    assert COMBO_LABELS[grid_index(13, 14, False)] == "AKo"
+    assert COMBO_LABELS[grid_index(10, 10, True)] == "TT"
+    assert hole_index(["Ah"]) is None
+
+
+def test_set_algebra_and_combo_counts():
+    a = Range169.from_labels(["AA", "AKs", "AKo", "bogus"])
+    b = Range169.from_labels({"AKs", "KQo"})
+    assert len(a) == 3 and "bogus" not in a and None not in a
+    assert a == {"AA", "AKs", "AKo"} and {"AA", "AKs", "AKo"} == a
+    assert set(a | b) == {"AA", "AKs", "AKo", "KQo"}
+    assert set(a & b) == {"AKs"}
+    assert set(a - b) == {"AA", "AKo"}
+    assert set(a ^ b) == {"AA", "AKo", "KQo"}
+    assert a | {"KQo"} == a | b
+    assert (a & b) <= a and a >= (a & b)
+    assert a.combos() == 6 + 4 + 12
+    assert len(~a) == 166 and (~a & a) == EMPTY_RANGE
+    assert Range169.full().combos() == 1326 and Range169.full().frequency() == 1.0
+    assert Range169.coerce(a) is a and Range169.coerce(None) == EMPTY_RANGE
+    assert combo_index("AKs") in a and 168 not in a
+    assert hash(a) == hash(Range169(a.bits))
+
+
+def test_mixed_type_set_algebra_and_hash():
+    r = Range169.from_labels(["AA", "KK"])
+    # 普通 set 在左侧：走反射运算，结果仍是 Range169
+    assert {"AA", "QQ"} - r == {"QQ"} and isinstance({"AA", "QQ"} - r, Range169)
+    assert {"AA", "QQ"} & r == {"AA"}
+    assert {"QQ"} | r == {"AA", "KK", "QQ"}
+    assert {"AA", "QQ"} ^ r == {"KK", "QQ"}
+    assert frozenset({"AA", "QQ"}) - r == {"QQ"}
+    # 与相等的 frozenset 同哈希：dict/set 中可互相命中
+    labels = frozenset({"AA", "KK"})
+    assert r == labels and hash(r) == hash(labels)
+    assert {labels: 1}[r] == 1 and len({r, labels}) == 1
+
+
+def test_numpy_roundtrip():
+    np = pytest.importorskip("numpy")
+    r = Range169.from_labels(["AA", "72o", "T9s"])
+    arr = r.to_array()
+    assert arr.dtype == bool and arr.sum() == 3
+    assert Range169.from_array(arr) == r
+    assert int(r.weights().sum()) == r.combos() == 6 + 12 + 4
+    assert np.array_equal((~r).to_array(), ~arr)
+
+
+@pytest.mark.parametrize("strategy", ["loose", "medium", "tight"])
+def test_loaded_tables_match_json(strategy):
+    open_tab, _ = _load_open(f"ranges/preflop_open_HU_{strategy}.json")
+    raw = json.loads((_RANGES / f"preflop_open_HU_{strategy}.json").read_text(encoding="utf-8"))
+    for pos in ("SB", "BB"):
+        assert isinstance(open_tab[pos], Range169)
+        assert open_tab[pos] == {x for x in raw.get(pos, []) if combo_index(x) is not None}
+
+    vs_tab, _ = _load_vs(f"ranges/preflop_vs_raise_HU_{strategy}.json")
+    raw_vs = json.loads(
+        (_RANGES / f"preflop_vs_raise_HU_{strategy}.json").read_text(encoding="utf-8")
+    )
+    for key, buckets in raw_vs.items():
+        if not isinstance(buckets, dict):
+            continue
+        for bkt, node in buckets.items():
+            if isinstance(node, dict):
+                assert vs_tab[key][bkt]["call"] == set(node.get("call", []))
@@ -0,0 +1,141 @@
+import json
+import random
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+from poker_core.replay_codec import (
+    DecodedDeal,
+    ReplayCodecError,
+    decode_deal,
+    decode_hand,
+    encode_deal,
+    encode_hand,
+    read_varint,
+    start_stacks,
+    write_varint,
+)
+from poker_core.rng import ALGO_CTR, ALGO_MT
+from poker_core.state_hu import (
+    apply_action,
+    legal_actions,
+    settle_if_needed,
+    start_hand_with_carry,
+    start_session,
+)
+
+
+def _random_hand(i: int, r: random.Random):
+    cfg = start_session(init_stack=200, sb=1, bb=2)
+    stacks = (r.randint(3, 300), r.randint(3, 300))
+    sid = "6f1c2a3e-8b7d-4c5e-9f00-1234567890ab" if i % 2 else "s_codec"
+    gs = start_hand_with_carry(cfg, sid, f"h_codec_{i}", i % 2, stacks, seed=(i if i % 3 else None))
+    while gs.street not in ("showdown", "complete") and legal_actions(gs):
+        act = r.choice(legal_actions(gs))
+        amt = r.randint(0, 60) if act in ("bet", "raise") else None
+        gs = apply_action(gs, act, amt)
+    return settle_if_needed(gs), stacks
+
+
+def test_varint_round_trip():
+    buf = bytearray()
+    vals = [0, 1, 127, 128, 300, 2**32, 2**63 + 5]
+    for v in vals:
+        write_varint(buf, v)
+    pos, out = 0, []
+    while pos < len(buf):
+        v, pos = read_varint(bytes(buf), pos)
+        out.append(v)
+    assert out == vals
+    with pytest.raises(ReplayCodecError):
+        read_varint(b"\x80", 0)
+
+
+def test_hand_round_trip_resimulates_identical_events():
+    r = random.Random(20)
+    sizes = []
+    for i in range(400):
+        gs, stacks = _random_hand(i, r)
+        assert start_stacks(gs) == stacks
+        seed = i if i % 3 else None
+        blob = encode_hand(gs, seed=seed)
+        sizes.append(len(blob))
+        dec = decode_hand(blob, gs.hand_id)
+        assert [dict(e) for e in dec.gs.events] == [dict(e) for e in gs.events]
+        assert dec.gs.players == gs.players
+        assert dec.gs.board == gs.board
+        assert dec.seed == seed
+        assert dec.session_id == gs.session_id
+    assert max(sizes) < 80
+    assert sum(sizes) / len(sizes) < 48
+
+
+def test_decode_rejects_bad_blobs():
+    with pytest.raises(ReplayCodecError):
+        decode_hand(b"\x09\x01\x00", "h")
+    with pytest.raises(ReplayCodecError):
+        decode_hand(encode_deal(1, [[0, 1], [2, 3]]), "h")
+
+
+def test_deal_round_trip():
+    blob = encode_deal(-7, [[0, 51], [12, 13], [30, 31]])
+    assert decode_deal(blob) == DecodedDeal(-7, [[0, 51], [12, 13], [30, 31]], ALGO_MT)
+    assert decode_deal(encode_deal(None, [[4, 5]])) == DecodedDeal(None, [[4, 5]], ALGO_MT)
+    ctr = encode_deal(3, [[4, 5]], algo=ALGO_CTR)
+    assert len(ctr) == len(encode_deal(3, [[4, 5]])) + 1
+    assert decode_deal(ctr) == DecodedDeal(3, [[4, 5]], ALGO_CTR)
+    with pytest.raises(ReplayCodecError):
+        encode_deal(3, [[4, 5]], algo="xorshift")
+
+
+def _post(c: Client, url: str, payload: dict):
+    return c.post(url, data=json.dumps(payload), content_type="application/json")
+
+
+def _play_to_end(c: Client, hid: str):
+    for _ in range(40):
+        la = c.get(f"/api/v1/hand/state/{hid}").json()["legal_actions"] or ["check"]
+        act = "call" if "call" in la else la[0]
+        if _post(c, f"/api/v1/hand/act/{hid}", {"action": act}).json()["hand_over"]:
+            return
+    raise AssertionError("hand did not finish")
+
+
+@pytest.mark.django_db
+def test_persisted_replay_is_blob_and_decodes(client: Client, tmp_path):
+    from api.models import Replay
+
+    sid = _post(client, "/api/v1/session/start", {}).json()["session_id"]
+    hid = _post(client, "/api/v1/hand/start", {"session_id": sid, "seed": 9}).json()["hand_id"]
+    _play_to_end(client, hid)
+
+    obj = Replay.objects.get(hand_id=hid)
+    assert obj.payload is None
+    assert len(bytes(obj.blob)) < 64
+    rep = client.get(f"/api/v1/replay/{hid}").json()
+    assert rep["session_id"] == sid and rep["seed"] == 9
+    assert rep["winner"] is not None
+    assert rep["steps"][0]["evt"] == "GAME_START"
+    assert rep["steps"][-1]["evt"] == "GAME_END"
+
+    deal = _post(client, "/api/v1/table/deal", {"seed": 3, "num_players": 3}).json()
+    # 内存缓存清空后从 blob 解码，结果与即时返回一致
+    from api.state import REPLAYS
+
+    cached = REPLAYS.pop(deal["hand_id"])
+    decoded = client.get(f"/api/v1/replay/{deal['hand_id']}").json()
+    assert {k: v for k, v in decoded.items() if k != "created_at"} == {
+        k: v for k, v in cached.items() if k != "created_at"
+    }
+
+    out = tmp_path / "replays.jsonl"
+    call_command("export_replays", out=str(out), chunk_size=1)
+    lines = [json.loads(x) for x in out.read_text().splitlines()]
+    assert [x["hand_id"] for x in lines] == [hid, deal["hand_id"]]
+    assert lines[0]["events"] == rep["events"]
+
+    raw = tmp_path / "replays.bin"
+    call_command("export_replays", out=str(raw), format="blob")
+    data = raw.read_bytes()
+    n, pos = read_varint(data, 0)
+    assert data[pos : pos + n].decode() == hid
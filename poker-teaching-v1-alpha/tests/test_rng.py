@@ -0,0 +1,98 @@
+import random
+from collections import Counter
+
+import pytest
+from poker_core.cards import make_deck
+from poker_core.rng import ALGO_CTR, RNG, CounterRandom, derive_key
+from poker_core.state_hu import start_hand, start_session
+
+
+def test_default_rng_keeps_mt19937_deals():
+    base = make_deck()
+    legacy = make_deck()
+    random.Random(42).shuffle(legacy)
+    assert RNG(seed=42).shuffled(base) == legacy
+    assert RNG(seed=42).algo == "mt19937"
+
+
+def test_counter_deck_is_permutation_and_lazy():
+    rng = RNG.counter(seed=7, stream=3)
+    assert rng.algo == ALGO_CTR
+    deck = rng.deck(make_deck())
+    full = deck.cards()
+    assert sorted(full) == sorted(make_deck())
+    assert [deck.card(k) for k in (51, 0, 17)] == [full[51], full[0], full[17]]
+    with pytest.raises(IndexError):
+        deck.card(52)
+    # 只推进前 9 步：前 9 张与整副洗牌一致，余牌仍是完整副牌
+    partial = rng.shuffled(make_deck(), dealt=9)
+    assert partial[:9] == full[:9] and sorted(partial) == sorted(full)
+    with pytest.raises(ValueError):
+        RNG(seed=1).deck(make_deck())
+
+
+def test_streams_are_independent_and_reproducible():
+    a = RNG.counter(seed=1, stream=0).shuffled(make_deck())
+    b = RNG.counter(seed=1, stream=1).shuffled(make_deck())
+    assert a != b
+    assert RNG.counter(seed=1, stream=1).shuffled(make_deck()) == b
+    # 第 N 手可直接发，不依赖前面的手
+    gs = start_hand(start_session(), "s", "h", button=0, rng=RNG.counter(seed=9, stream=1000))
+    again = start_hand(start_session(), "s", "h", button=0, rng=RNG.counter(seed=9, stream=1000))
+    assert gs.deck == again.deck and gs.players == again.players
+
+
+def test_counter_deck_first_card_roughly_uniform():
+    counts = Counter(RNG.counter(seed=s).deck(list(range(52))).card(0) for s in range(20800))
+    assert len(counts) == 52
+    # 期望 400/张；宽松界限只为捕获明显偏置
+    assert min(counts.values()) > 300 and max(counts.values()) < 500
+
+
+def _is_even(perm: list[int]) -> bool:
+    seen = [False] * len(perm)
+    swaps = 0
+    for i in range(len(perm)):
+        j, n = i, 0
+        while not seen[j]:
+            seen[j] = True
+            j = perm[j]
+            n += 1
+        swaps += max(0, n - 1)
+    return swaps % 2 == 0
+
+
+def test_counter_deck_parity_and_pairs_uniform():
+    # 整副置换奇偶各半（均匀洗牌期望 0.5）
+    n = 4000
+    even = sum(_is_even(RNG.counter(seed=s).deck(list(range(52))).cards()) for s in range(n))
+    assert 0.45 < even / n < 0.55
+    # 前两张联合分布：52*51 格卡方，df=2651，界限约 +6σ
+    samples = 26520
+    pairs = Counter()
+    for s in range(samples):
+        d = RNG.counter(seed=s, stream=1).deck(list(range(52)))
+        pairs[(d.card(0), d.card(1))] += 1
+    expected = samples / (52 * 51)
+    chi2 = sum(
+        (pairs.get((a, b), 0) - expected) ** 2 / expected
+        for a in range(52)
+        for b in range(52)
+        if a != b
+    )
+    assert chi2 < 3100
+
+
+def test_counter_random_jump_and_state():
+    r = CounterRandom(derive_key(5))
+    seq = [r.random() for _ in range(5)]
+    r2 = CounterRandom(derive_key(5))
+    r2.jump(3)
+    assert r2.random() == seq[3]
+    st = r.getstate()
+    x = r.randrange(1000)
+    r.setstate(st)
+    assert r.randrange(1000) == x
+    items = list(range(10))
+    RNG.counter(seed=2).create().shuffle(items)
+    assert sorted(items) == list(range(10))
@@ -0,0 +1,93 @@
+import json
+from itertools import product
+from pathlib import Path
+
+import pytest
+from poker_core.suggest.rule_compiler import CompiledRules, compiled_rules, walk_rules
+
+_CFG = Path(__file__).resolve().parents[1] / "packages/poker_core/suggest/config/postflop"
+
+
+def _axis_values(comp: CompiledRules):
+    # 词表内的键 + 词表外的键（走“未知”槽）
+    extra = ("zzz", "unknown")
+    return [tuple(v) + extra for v in comp.vocab]
+
+
+@pytest.mark.parametrize("path", sorted(_CFG.glob("*.json")), ids=lambda p: p.stem)
+@pytest.mark.parametrize("early_stop", [False, True])
+def test_compiled_lookup_matches_walk(path, early_stop):
+    rules = json.loads(path.read_text(encoding="utf-8"))
+    comp = CompiledRules(rules, early_stop=early_stop)
+    for keys in product(*_axis_values(comp)):
+        full = [keys[0], "role", *keys[1:]]
+        assert comp.lookup(*keys) == walk_rules(rules, full, early_stop=early_stop), keys
+
+
+def test_defaults_trace_uses_actual_key():
+    rules = {
+        "single_raised": {
+            "role": {
+                "pfr": {
+                    "ip": {
+                        "dry": {
+                            "defaults": {"defaults": {"action": "bet", "size_tag": "third"}},
+                            "le3": {"value": {"action": "bet", "size_tag": "pot"}},
+                        }
+                    }
+                }
+            }
+        }
+    }
+    comp = compiled_rules(rules)
+    node, path = comp.lookup("single_raised", "pfr", "ip", "dry", "ge6", "air")
+    assert node == {"action": "bet", "size_tag": "third"}
+    assert path == "single_raised/role/pfr/ip/dry/defaults:ge6/defaults:air"
+    node, path = comp.lookup("single_raised", "pfr", "ip", "dry", "le3", "value")
+    assert node["size_tag"] == "pot" and path == "single_raised/role/pfr/ip/dry/le3/value"
+    assert comp.lookup("threebet", "pfr", "ip", "dry", "le3", "value") == (None, "")
+
+
+def test_compiled_rules_cached_per_rules_object():
+    a = {"limped": {"role": {"na": {"defaults": {"action": "check"}}}}}
+    assert compiled_rules(a) is compiled_rules(a)
+    assert compiled_rules(a, early_stop=True) is not compiled_rules(a)
+    b = json.loads(json.dumps(a))
+    assert compiled_rules(b) is not compiled_rules(a)
+
+
+def test_recompiled_after_config_change(tmp_path, monkeypatch):
+    import os
+    import shutil
+
+    from poker_core.suggest.context import bump_context_version
+    from poker_core.suggest.flop_rules import get_flop_rules
+
+    shutil.copytree(_CFG.parent, tmp_path / "cfg")
+    monkeypatch.setenv("SUGGEST_CONFIG_DIR", str(tmp_path / "cfg"))
+    bump_context_version()
+    try:
+        rules, _ = get_flop_rules()
+        before = compiled_rules(rules)
+        key = ("single_raised", "pfr", "ip", "dry", "le3", "zzz")
+
+        fp = tmp_path / "cfg" / "postflop" / "flop_rules_HU_medium.json"
+        data = json.loads(fp.read_text(encoding="utf-8"))
+        node = data["single_raised"]["role"]["pfr"]["ip"]["dry"]
+        node["le3"] = {"defaults": {"action": "check", "plan": "edited"}}
+        fp.write_text(json.dumps(data), encoding="utf-8")
+        st = fp.stat()
+        os.utime(fp, (st.st_atime, st.st_mtime + 10))
+
+        assert get_flop_rules()[0] is rules  # 未递增版本前仍用旧规则
+        bump_context_version()
+        reloaded, _ = get_flop_rules()
+        after = compiled_rules(reloaded)
+        assert after is not before
+        assert after.lookup(*key) == (
+            {"action": "check", "plan": "edited"},
+            "single_raised/role/pfr/ip/dry/le3/defaults:zzz",
+        )
+    finally:
+        monkeypatch.delenv("SUGGEST_CONFIG_DIR")
+        bump_context_version()
@@ -0,0 +1,34 @@
+import pytest
+from poker_core.sim import PlayerSpec, run_decks, simulate
+from poker_core.sim.__main__ import main
+
+
+def test_player_spec_parse():
+    assert PlayerSpec.parse("v0:tight") == PlayerSpec("v0", "tight")
+    assert PlayerSpec.parse("loose") == PlayerSpec("v1", "loose")
+    with pytest.raises(ValueError):
+        PlayerSpec.parse("v9")
+
+
+def test_duplicate_mirror_match_is_exactly_even():
+    spec = PlayerSpec("v1", "medium")
+    t = run_decks(spec, spec, seed=3, first_deck=0, n_decks=6)
+    assert t.hands == 12 and t.decks == 6
+    assert t.net_bb == 0.0
+    assert sum(n for (who, _, _), n in t.actions.items() if who == "a") > 0
+
+
+def test_simulate_chunks_merge_like_single_run():
+    a, b = PlayerSpec("v1", "loose"), PlayerSpec("v0", "tight")
+    one = simulate(a, b, 16, seed=5, chunk_decks=8)
+    split = simulate(a, b, 16, seed=5, chunk_decks=3)
+    assert one.hands == split.hands == 16
+    assert one.bb_per_100 == pytest.approx(split.bb_per_100)
+    assert one.action_freq == split.action_freq
+    assert one.ci95_bb_per_100 >= 0
+
+
+def test_cli_json(capsys):
+    assert main(["--hands", "4", "--a", "v1:tight", "--b", "v0", "--json"]) == 0
+    out = capsys.readouterr().out
+    assert '"bb_per_100"' in out and '"hands": 4' in out
@@ -0,0 +1,46 @@
+import json
+
+import pytest
+from api.state import snapshot_state
+from django.test import Client
+from poker_core.state_hu import apply_action, start_hand, start_session
+
+
+def _gs():
+    cfg = start_session(init_stack=200, sb=1, bb=2)
+    gs = start_hand(cfg, session_id="s_snap", hand_id="h_snap", button=1, seed=5)
+    gs = apply_action(gs, "call")
+    return apply_action(gs, "check")
+
+
+def test_snapshot_projects_fields():
+    gs = _gs()
+    st = snapshot_state(gs)
+    assert st["street"] == "flop" and len(st["board"]) == 3
+    assert (st["to_act"], st["button"], st["pot"]) == (gs.to_act, 1, gs.pot)
+    assert [p["stack"] for p in st["players"]] == [p.stack for p in gs.players]
+    assert [p["bet"] for p in st["players"]] == [0, 0]
+    assert all(len(p["hole"]) == 2 and isinstance(p["hole"][0], str) for p in st["players"])
+
+
+def test_snapshot_visibility_and_mapping_input():
+    gs = _gs()
+    st = snapshot_state(gs, viewer=0, reveal_opp=False)
+    assert len(st["players"][0]["hole"]) == 2 and st["players"][1]["hole"] == []
+    assert snapshot_state(gs, viewer=0, reveal_opp=True) == snapshot_state(gs)
+
+    raw = {"street": "preflop", "board": [], "players": [{"stack": 9, "bet": 2, "hole": [0, 51]}]}
+    assert snapshot_state(raw)["players"] == [{"stack": 9, "bet": 2, "hole": ["2s", "Ac"]}]
+
+
+@pytest.mark.django_db
+def test_api_viewer_param_hides_opponent_hole_until_showdown():
+    c = Client()
+    sid = c.post("/api/v1/session/start", data="{}", content_type="application/json").json()
+    body = json.dumps({"session_id": sid["session_id"], "seed": 7})
+    hid = c.post("/api/v1/hand/start?viewer=1", data=body, content_type="application/json")
+    players = hid.json()["state"]["players"]
+    assert players[0]["hole"] == [] and len(players[1]["hole"]) == 2
+    url = f"/api/v1/hand/state/{hid.json()['hand_id']}"
+    assert all(len(p["hole"]) == 2 for p in c.get(url).json()["state"]["players"])
+    assert c.get(url + "?viewer=0").json()["state"]["players"][1]["hole"] == []
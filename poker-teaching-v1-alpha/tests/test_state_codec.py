@@ -0,0 +1,67 @@
+import random
+
+import pytest
+from poker_core import state_codec
+from poker_core.replay_codec import encode_hand
+from poker_core.state_codec import StateCodecError, decode_state, encode_state
+from poker_core.state_hu import (
+    apply_action,
+    legal_actions,
+    settle_if_needed,
+    start_hand_with_carry,
+    start_session,
+)
+
+
+def _states(n: int, seed: int = 23):
+    """随机对局的每个中间状态（含翻前 / 全下 / 摊牌 / 结束）。"""
+    r = random.Random(seed)
+    cfg = start_session(init_stack=200, sb=1, bb=2)
+    for i in range(n):
+        stacks = (r.randint(3, 300), r.randint(3, 300))
+        gs = start_hand_with_carry(cfg, f"s_{i}", f"h_state_{i}", i % 2, stacks, seed=i)
+        yield gs
+        while gs.street not in ("showdown", "complete") and legal_actions(gs):
+            act = r.choice(legal_actions(gs))
+            amt = r.randint(0, 60) if act in ("bet", "raise") else None
+            gs = apply_action(gs, act, amt)
+            yield gs
+        yield settle_if_needed(gs)
+
+
+def test_state_round_trip_is_exact():
+    for gs in _states(150):
+        dec = decode_state(encode_state(gs))
+        assert dec == gs
+        assert [dict(e) for e in dec.events] == [dict(e) for e in gs.events]
+        assert dec.events.index == gs.events.index
+
+
+def test_decoded_state_continues_identically():
+    r = random.Random(5)
+    for gs in _states(40, seed=7):
+        la = legal_actions(gs)
+        if gs.street in ("showdown", "complete") or not la:
+            continue
+        act = r.choice(la)
+        amt = 4 if act in ("bet", "raise") else None
+        a = apply_action(gs, act, amt)
+        b = apply_action(decode_state(encode_state(gs)), act, amt)
+        assert a == b
+
+
+def test_state_blob_is_compact_and_versioned(monkeypatch):
+    gs = list(_states(1))[-1]
+    blob = encode_state(gs)
+    assert len(blob) < 400
+    assert blob[:2] == b"GS"
+    monkeypatch.setattr(state_codec, "_SCHEMA", b"999")
+    with pytest.raises(StateCodecError):
+        decode_state(blob)
+
+
+def test_decode_rejects_bad_blobs():
+    blob = encode_state(next(_states(1)))
+    for bad in (b"", b"GS", encode_hand(next(_states(1))), blob[:-3], blob + b"\x00"):
+        with pytest.raises(StateCodecError):
+            decode_state(bad)
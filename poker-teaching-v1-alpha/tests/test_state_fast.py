@@ -0,0 +1,90 @@
+import random
+
+import pytest
+from poker_core.state_fast import FastGameState
+from poker_core.state_hu import (
+    apply_action,
+    legal_actions,
+    settle_if_needed,
+    start_hand,
+    start_session,
+)
+
+
+def _random_amount(rnd: random.Random, gs) -> int | None:
+    me = gs.players[gs.to_act]
+    return rnd.choice([None, 1, gs.bb, rnd.randint(1, max(1, me.stack)), me.stack + 5])
+
+
+def _play_both(seed: int, stack: int):
+    """同一随机动作序列分别驱动 state_hu 与 FastGameState，逐步比对。"""
+    rnd = random.Random(seed)
+    cfg = start_session(init_stack=stack)
+    gs = start_hand(cfg, session_id="s", hand_id=f"h{seed}", button=seed % 2, seed=seed)
+    fs = FastGameState.start_hand(cfg, "s", f"h{seed}", button=seed % 2, seed=seed)
+    assert fs.to_state() == gs
+    steps = 0
+    while gs.street not in ("showdown", "complete"):
+        acts = legal_actions(gs)
+        assert fs.legal_actions() == acts
+        if not acts:
+            break
+        action = rnd.choice(acts)
+        amount = _random_amount(rnd, gs) if action in ("bet", "raise") else None
+        gs = apply_action(gs, action, amount)
+        fs.apply_action(action, amount)
+        assert fs.to_state() == gs, (seed, steps, action, amount)
+        steps += 1
+    gs = settle_if_needed(gs)
+    fs.settle_if_needed()
+    assert fs.to_state() == gs
+    return fs, steps
+
+
+@pytest.mark.parametrize("stack", [7, 40, 200])
+def test_differential_random_sequences(stack):
+    for seed in range(150):
+        _play_both(seed, stack)
+
+
+def test_undo_restores_every_step():
+    cfg = start_session(init_stack=100)
+    for seed in range(40):
+        rnd = random.Random(seed)
+        fs = FastGameState.start_hand(cfg, "s", "h", button=seed % 2, seed=seed)
+        trail = [fs.to_state()]
+        while fs.legal_actions():
+            action = rnd.choice(fs.legal_actions())
+            amount = rnd.choice([None, 3, 11, 60]) if action in ("bet", "raise") else None
+            fs.apply_action(action, amount)
+            trail.append(fs.to_state())
+        fs.settle_if_needed()
+        if fs.street == "complete" and trail[-1].street == "showdown":
+            trail.append(fs.to_state())
+        for expected in reversed(trail[:-1]):
+            fs.undo()
+            assert fs.to_state() == expected
+        assert not fs.can_undo()
+        with pytest.raises(IndexError):
+            fs.undo()
+
+
+def test_clone_is_independent_and_illegal_action_is_noop():
+    cfg = start_session(init_stack=200)
+    fs = FastGameState.start_hand(cfg, "s", "h", button=0, seed=3)
+    fork = fs.clone()
+    fork.apply_action("call").apply_action("check")
+    assert fork.street == "flop" and fs.street == "preflop"
+    assert len(fs.board) == 0 and len(fork.board) == 3
+    before = fs.to_state()
+    with pytest.raises(ValueError):
+        fs.apply_action("bet", 10)
+    assert fs.to_state() == before and not fs.can_undo()
+
+
+def test_events_can_be_disabled():
+    cfg = start_session(init_stack=200)
+    fs = FastGameState.start_hand(cfg, "s", "h", button=1, seed=5, events=False)
+    fs.apply_action("allin").apply_action("call").settle_if_needed()
+    assert fs.street == "complete" and fs.events is None
+    assert sum(fs.stacks) == 400
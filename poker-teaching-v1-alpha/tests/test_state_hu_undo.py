@@ -0,0 +1,76 @@
+import copy
+import random
+
+import pytest
+from poker_core.domain.actions import legal_actions_struct
+from poker_core.state_hu import (
+    ActionHistory,
+    apply_action_recorded,
+    legal_actions,
+    start_hand,
+    start_session,
+    undo_action,
+)
+
+
+def test_undo_restores_state_and_events():
+    cfg = start_session(init_stack=200)
+    gs = start_hand(cfg, session_id="s", hand_id="h", button=0, seed=11)
+    before = copy.deepcopy(gs)
+    gs1, d1 = apply_action_recorded(gs, "call")
+    gs2, d2 = apply_action_recorded(gs1, "check")
+    assert gs2.street == "flop"
+    assert undo_action(d2) is gs1
+    back = undo_action(d1)
+    assert back == before
+
+
+def test_illegal_action_leaves_events_untouched():
+    cfg = start_session(init_stack=200)
+    gs = start_hand(cfg, session_id="s", hand_id="h", button=1, seed=2)
+    n = len(gs.events)
+    with pytest.raises(ValueError):
+        apply_action_recorded(gs, "bet", 10)
+    assert len(gs.events) == n
+
+
+def test_history_undo_redo_random_walk():
+    cfg = start_session(init_stack=60)
+    for seed in range(30):
+        rnd = random.Random(seed)
+        h = ActionHistory(start_hand(cfg, session_id="s", hand_id="h", button=seed % 2, seed=seed))
+        snaps = [copy.deepcopy(h.state)]
+        while legal_actions(h.state):
+            a = rnd.choice(legal_actions(h.state))
+            h.apply(a, rnd.choice([None, 4, 25]) if a in ("bet", "raise") else None)
+            snaps.append(copy.deepcopy(h.state))
+        h.settle()
+        if h.state.street != snaps[-1].street:
+            snaps.append(copy.deepcopy(h.state))
+        assert len(h.actions) == len(snaps) - 1
+        for expected in reversed(snaps[:-1]):
+            assert h.undo() == expected
+        assert not h.can_undo()
+        for expected in snaps[1:]:
+            assert h.redo() == expected
+        assert not h.can_redo()
+
+
+def test_apply_after_undo_clears_redo():
+    cfg = start_session(init_stack=200)
+    h = ActionHistory(start_hand(cfg, session_id="s", hand_id="h", button=0, seed=4))
+    h.apply("raise", 6)
+    h.undo()
+    assert h.can_redo()
+    h.apply("call")
+    assert not h.can_redo()
+    assert h.actions == [("call", None)]
+
+
+def test_probing_does_not_touch_events():
+    cfg = start_session(init_stack=200)
+    gs = start_hand(cfg, session_id="s", hand_id="h", button=0, seed=9)
+    events = list(gs.events)
+    acts = {a.action: a for a in legal_actions_struct(gs)}
+    assert acts["raise"].min is not None
+    assert gs.events == events
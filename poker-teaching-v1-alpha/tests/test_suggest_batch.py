@@ -0,0 +1,114 @@
+import json
+
+import poker_core.suggest.service as svc
+import pytest
+from django.test import Client
+from poker_core.state_hu import apply_action, start_hand, start_session
+
+
+def _states(n=6):
+    cfg = start_session(init_stack=200, sb=1, bb=2)
+    out = []
+    for i in range(n):
+        gs = start_hand(
+            cfg, session_id="s_batch", hand_id=f"h_batch_{i}", button=i % 2, seed=100 + i
+        )
+        if i % 3 == 1:
+            gs = apply_action(gs, "call")
+        out.append(gs)
+    return out
+
+
+def _strip(resp):
+    return {k: v for k, v in resp.items() if k != "explanations"}
+
+
+def test_build_suggestions_matches_single_calls():
+    states = _states()
+    batch = svc.build_suggestions([(gs, gs.to_act) for gs in states])
+    assert len(batch) == len(states)
+    for gs, got in zip(states, batch, strict=True):
+        assert "explanations" not in got
+        assert got == _strip(svc.build_suggestion(gs, gs.to_act))
+
+
+def test_build_suggestions_explain_and_inline_errors():
+    gs = _states(1)[0]
+    out = svc.build_suggestions([(gs, 1 - gs.to_act), (gs, gs.to_act)], explain=True)
+    assert out[0] == {
+        "hand_id": gs.hand_id,
+        "actor": 1 - gs.to_act,
+        "error": "not_turn",
+        "detail": "actor is not to_act",
+    }
+    assert out[1] == svc.build_suggestion(gs, gs.to_act)
+
+
+def test_build_suggestions_isolates_unexpected_item_errors(monkeypatch):
+    states = _states(3)
+    bad = states[1].hand_id
+    orig = svc._suggest_one
+
+    def _flaky(gs, *a, **kw):
+        if gs.hand_id == bad:
+            raise KeyError("missing_bucket")
+        return orig(gs, *a, **kw)
+
+    monkeypatch.setattr(svc, "_suggest_one", _flaky)
+    out = svc.build_suggestions([(gs, gs.to_act) for gs in states])
+    assert len(out) == 3
+    assert out[1] == {
+        "hand_id": bad,
+        "actor": states[1].to_act,
+        "error": "suggest_failed",
+        "detail": "KeyError: 'missing_bucket'",
+    }
+    assert "suggested" in out[0] and "suggested" in out[2]
+
+
+def test_build_suggestions_builds_context_once(monkeypatch):
+    calls = []
+    orig = svc.SuggestContext.build
+
+    def _build(*a, **kw):
+        calls.append(1)
+        return orig(*a, **kw)
+
+    monkeypatch.setattr(svc.SuggestContext, "build", staticmethod(_build))
+    states = _states(4)
+    svc.build_suggestions([(gs, gs.to_act) for gs in states])
+    assert len(calls) == 1
+
+
+def _post(c: Client, url: str, payload: dict):
+    return c.post(url, data=json.dumps(payload), content_type="application/json")
+
+
+@pytest.mark.django_db
+def test_suggest_batch_endpoint(client: Client):
+    s = _post(client, "/api/v1/session/start", {"init_stack": 200, "sb": 1, "bb": 2}).json()
+    hid = _post(client, "/api/v1/hand/start", {"session_id": s["session_id"], "seed": 5}).json()[
+        "hand_id"
+    ]
+    to_act = int(client.get(f"/api/v1/hand/state/{hid}").json()["state"]["to_act"])
+
+    r = _post(
+        client,
+        "/api/v1/suggest/batch",
+        {
+            "items": [
+                {"hand_id": hid, "actor": to_act},
+                {"hand_id": hid, "actor": 1 - to_act},
+                {"hand_id": "h_missing", "actor": 0},
+            ]
+        },
+    )
+    assert r.status_code == 200, r.content
+    results = r.json()["results"]
+    assert len(results) == 3
+    single = _post(client, "/api/v1/suggest", {"hand_id": hid, "actor": to_act}).json()
+    assert results[0]["suggested"] == single["suggested"]
+    assert results[1]["error"] == "not_turn"
+    assert results[2]["error"] == "not_found"
+
+    assert _post(client, "/api/v1/suggest/batch", {"items": []}).status_code == 400
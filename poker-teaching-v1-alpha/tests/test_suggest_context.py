@@ -24,3 +24,97 @@ def test_flop_value_raise_toggle(monkeypatch, value, expected):
 
     ctx = SuggestContext.build()
     assert ctx.flags.enable_flop_value_raise is expected
+
+
+@pytest.fixture
+def fresh_registry():
+    from poker_core.suggest.context import bump_context_version
+
+    bump_context_version()
+    yield
+    bump_context_version()
+
+
+def test_build_reuses_snapshot_until_version_bump(monkeypatch, fresh_registry):
+    from poker_core.suggest.context import (
+        SuggestContext,
+        bump_context_version,
+        context_version,
+    )
+
+    monkeypatch.delenv("SUGGEST_FLOP_VALUE_RAISE", raising=False)
+    a = SuggestContext.build()
+    assert SuggestContext.build() is a
+    with pytest.raises(TypeError):
+        a.versions["open"] = 1  # type: ignore[index]
+
+    ver = context_version()
+    assert bump_context_version() == ver + 1
+    b = SuggestContext.build()
+    assert b is not a and b == a
+
+    # 开关变化对应另一份快照
+    monkeypatch.setenv("SUGGEST_FLOP_VALUE_RAISE", "0")
+    assert SuggestContext.build() is not b
+    monkeypatch.delenv("SUGGEST_FLOP_VALUE_RAISE")
+    assert SuggestContext.build() is b
+
+
+def test_strategy_override_selects_separate_snapshot(fresh_registry):
+    from poker_core.suggest.context import SuggestContext
+    from poker_core.suggest.preflop_tables import strategy_override
+
+    with strategy_override("tight"):
+        tight = SuggestContext.build()
+    with strategy_override("loose"):
+        loose = SuggestContext.build()
+    assert tight.profile.strategy_name == "tight"
+    assert loose.profile.strategy_name == "loose"
+    assert tight.open_table != loose.open_table
+
+
+def test_config_watcher_reloads_on_mtime_change(tmp_path, monkeypatch, fresh_registry):
+    import json
+    import os
+    import shutil
+    from pathlib import Path
+
+    import poker_core.suggest.context as c
+
+    src = Path(c.__file__).parent / "config"
+    shutil.copytree(src, tmp_path / "cfg")
+    monkeypatch.setenv("SUGGEST_CONFIG_DIR", str(tmp_path / "cfg"))
+    c.bump_context_version()
+
+    watcher = c.ConfigWatcher(interval=60)
+    before = c.SuggestContext.build()
+    assert not watcher.poll()
+
+    fp = tmp_path / "cfg" / "table_modes_medium.json"
+    data = json.loads(fp.read_text(encoding="utf-8"))
+    data["HU"]["open_bb"] = 3.0
+    fp.write_text(json.dumps(data), encoding="utf-8")
+    st = fp.stat()
+    os.utime(fp, (st.st_atime, st.st_mtime + 10))
+
+    assert watcher.poll()
+    after = c.SuggestContext.build()
+    assert after is not before
+    assert after.modes["HU"]["open_bb"] == 3.0
+
+
+def test_config_watcher_on_by_default(monkeypatch):
+    import poker_core.suggest.context as c
+
+    monkeypatch.setattr(c, "_WATCHER", None)
+    monkeypatch.delenv("SUGGEST_CONFIG_WATCH_SECONDS")
+    c._maybe_start_watcher()
+    try:
+        assert c._WATCHER is not None and c._WATCHER.interval == 5.0
+    finally:
+        c._WATCHER.stop()
+
+    monkeypatch.setattr(c, "_WATCHER", None)
+    monkeypatch.setenv("SUGGEST_CONFIG_WATCH_SECONDS", "0")
+    c._maybe_start_watcher()
+    assert c._WATCHER is None
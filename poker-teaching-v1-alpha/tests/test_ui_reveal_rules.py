@@ -123,3 +123,22 @@ def test_reveal_rules_teach_on_always_reveals_opp():
     frag = _extract_opp_hole(page)
     assert frag, "opp-hole container not found"
     assert 'cid="?"' not in frag, "Teach ON should always reveal opponent cards"
+
+
+@pytest.mark.django_db
+def test_teach_off_does_not_ship_opp_hole_to_page():
+    c = Client()
+    sid = _post(c, "/api/v1/session/start", {}).json()["session_id"]
+    hid = _post(c, "/api/v1/hand/start", {"session_id": sid, "seed": 404}).json()["hand_id"]
+    opp = c.get(f"/api/v1/hand/state/{hid}").json()["state"]["players"][1]["hole"]
+
+    s = c.session
+    s["teach"] = False
+    s.save()
+
+    # 盖牌不只是模板层面：对手底牌根本不出现在页面里
+    page = c.get(f"/api/v1/ui/game/{sid}/{hid}").content.decode("utf-8")
+    assert all(f'cid="{card}"' not in page for card in opp)
+    # 切回 Teach ON 后的 OOB 片段重新下发
+    html = c.post("/api/v1/ui/prefs/teach", {"hand_id": hid}).content.decode("utf-8")
+    assert all(f'cid="{card}"' in html for card in opp)